@@ -0,0 +1,97 @@
+"""
+Compare extracting the links of a large directory listing with html5lib and ``extract_hrefs``.
+
+Run from the repository root (no network access needed)::
+
+    python benchmarks/bench_directory_listing.py --entries 20000
+
+An Apache-style auto-index page with ``--entries`` rows (about the size of ftp.gnu.org/gnu/ or a
+busy download.kde.org directory) is generated and the ``href`` of every anchor is extracted with:
+
+* ``html5lib``: ``BeautifulSoup(..., 'html5lib')``, as livecheck used to do.
+* ``html.parser``: ``BeautifulSoup(..., 'html.parser')``.
+* ``regex``: :py:func:`livecheck.special.directory.extract_hrefs`.
+"""
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from bs4 import BeautifulSoup
+from livecheck.special.directory import extract_hrefs
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ROW = ('<tr><td valign="top"><img src="/icons/compressed.gif" alt="[   ]"></td>'
+       '<td><a href="pkg{i}-{i}.{j}.tar.gz">pkg{i}-{i}.{j}.tar.gz</a></td>'
+       '<td align="right">2024-01-{day:02d} 12:00  </td><td align="right">{size}K</td>'
+       '<td>&nbsp;</td></tr>\n')
+
+
+def make_listing(entries: int) -> str:
+    """
+    Generate an Apache auto-index page.
+
+    Parameters
+    ----------
+    entries : int
+        Number of files.
+
+    Returns
+    -------
+    str
+        HTML document.
+    """
+    rows = ''.join(
+        ROW.format(i=i // 10, j=i % 10, day=i % 28 + 1, size=i % 9000) for i in range(entries))
+    return ('<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 3.2 Final//EN">\n<html><head>'
+            '<title>Index of /gnu</title></head><body><h1>Index of /gnu</h1><table>'
+            '<tr><th><a href="?C=N;O=D">Name</a></th><th><a href="?C=M;O=A">Last modified</a>'
+            '</th></tr><tr><td><a href="/">Parent Directory</a></td></tr>\n'
+            f'{rows}</table></body></html>')
+
+
+def soup_hrefs(parser: str) -> Callable[[str], list[str]]:
+    """
+    Get an extractor using a BeautifulSoup tree builder.
+
+    Parameters
+    ----------
+    parser : str
+        Tree builder name.
+
+    Returns
+    -------
+    Callable[[str], list[str]]
+        Function returning the ``href`` of every anchor.
+    """
+    def extract(html: str) -> list[str]:
+        return [str(a['href']) for a in BeautifulSoup(html, parser).find_all('a', href=True)]
+
+    return extract
+
+
+@click.command()
+@click.option('-n', '--entries', default=20000, help='Files in the listing.')
+def main(entries: int) -> None:
+    """Benchmark link extraction."""  # ruff:ignore[docstring-missing-exception]
+    html = make_listing(entries)
+    click.echo(f'{len(html) / 2**20:.1f} MiB, {entries} entries')
+    expected: list[str] | None = None
+    for name, func in (('html5lib', soup_hrefs('html5lib')),
+                       ('html.parser', soup_hrefs('html.parser')), ('regex', extract_hrefs)):
+        start = perf_counter()
+        hrefs = func(html)
+        elapsed = perf_counter() - start
+        click.echo(f'{name:<12} {elapsed * 1000:9.1f} ms')
+        if expected is None:
+            expected = hrefs
+        elif hrefs != expected:
+            msg = f'{name} extracted different links than html5lib.'
+            raise click.ClickException(msg)
+
+
+if __name__ == '__main__':
+    main()
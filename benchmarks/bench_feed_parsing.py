@@ -0,0 +1,125 @@
+"""
+Compare parsing a large SourceForge RSS feed whole and incrementally with an early stop.
+
+Run from the repository root (no network access needed)::
+
+    python benchmarks/bench_feed_parsing.py --items 5000
+
+A feed with ``--items`` release files and a description for each (about the size of the feed of a
+project with many platform builds) is generated and split into 64 KiB chunks, as it would arrive
+from :py:func:`livecheck.utils.stream_text`. The titles of the first 50 archives are read with:
+
+* ``fromstring``: ``defusedxml.ElementTree.fromstring`` on the joined text, as livecheck used to
+  do.
+* ``iter_elements``: :py:func:`livecheck.utils.xml_stream.iter_elements` over the chunks, stopping
+  after 50 archives.
+"""
+from __future__ import annotations
+
+from contextlib import aclosing
+from time import perf_counter
+from typing import TYPE_CHECKING
+import asyncio
+
+from defusedxml import ElementTree as ET  # ruff:ignore[camelcase-imported-as-acronym]
+from livecheck.utils.xml_stream import MAX_FEED_ENTRIES, iter_elements
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+ITEM = ('<item><title><![CDATA[/{i}/project-{i}.{j}.tar.gz]]></title>'
+        '<link>https://sourceforge.net/projects/project/files/{i}/project-{i}.{j}.tar.gz/download'
+        '</link><guid>https://sourceforge.net/projects/project/files/{i}/project-{i}.{j}.tar.gz'
+        '</guid><pubDate>Sat, 01 Jun 2024 12:00:00 UT</pubDate><description><![CDATA[{text}]]>'
+        '</description></item>\n')
+CHUNK_SIZE = 65536
+WANTED = MAX_FEED_ENTRIES
+
+
+def make_feed(items: int) -> str:
+    """
+    Generate a SourceForge-style RSS feed.
+
+    Parameters
+    ----------
+    items : int
+        Number of release files.
+
+    Returns
+    -------
+    str
+        XML document.
+    """
+    text = 'Release notes. ' * 40
+    body = ''.join(
+        ITEM.format(i=(items - n) // 10, j=(items - n) % 10, text=text) for n in range(items))
+    return ('<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<rss><channel><title>p</title>{body}</channel></rss>')
+
+
+def whole(chunks: list[str]) -> list[str]:
+    """
+    Parse the joined chunks.
+
+    Parameters
+    ----------
+    chunks : list[str]
+        Document.
+
+    Returns
+    -------
+    list[str]
+        First titles.
+    """
+    titles = [item.findtext('title') or '' for item in ET.fromstring(''.join(chunks)).iter('item')]
+    return titles[:WANTED]
+
+
+async def incremental(chunks: list[str]) -> list[str]:
+    """
+    Parse the chunks as they arrive and stop early.
+
+    Parameters
+    ----------
+    chunks : list[str]
+        Document.
+
+    Returns
+    -------
+    list[str]
+        First titles.
+    """
+    async def body() -> AsyncIterator[str]:  # ruff:ignore[unused-async]
+        for chunk in chunks:
+            yield chunk
+
+    titles: list[str] = []
+    async with aclosing(iter_elements(body(), 'item')) as items:
+        async for item in items:
+            titles.append(item.findtext('title') or '')
+            if len(titles) >= WANTED:
+                break
+    return titles
+
+
+@click.command()
+@click.option('-n', '--items', default=5000, help='Files in the feed.')
+def main(items: int) -> None:
+    """Benchmark feed parsing."""  # ruff:ignore[docstring-missing-exception]
+    feed = make_feed(items)
+    chunks = [feed[i:i + CHUNK_SIZE] for i in range(0, len(feed), CHUNK_SIZE)]
+    click.echo(f'{len(feed) / 2**20:.1f} MiB, {items} items')
+    start = perf_counter()
+    expected = whole(chunks)
+    click.echo(f'{"fromstring":<14} {(perf_counter() - start) * 1000:9.1f} ms')
+    start = perf_counter()
+    titles = asyncio.run(incremental(chunks))
+    click.echo(f'{"iter_elements":<14} {(perf_counter() - start) * 1000:9.1f} ms')
+    if titles != expected:
+        msg = 'iter_elements found different items than fromstring.'
+        raise click.ClickException(msg)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# ruff:file-ignore[builtin-argument-shadowing]
+"""
+Compare hashing a download on the event loop against :py:func:`livecheck.utils.requests.hash_url`.
+
+Run from the repository root (no network access needed)::
+
+    python benchmarks/bench_hash_url.py --size 2048
+
+A local HTTP server streams ``--size`` MiB of generated data. Each mode hashes it with BLAKE2b and
+SHA-512 while a ticker coroutine measures how long the event loop is blocked:
+
+* ``inline``: 8 KiB chunks hashed on the event loop, as livecheck used to do.
+* ``threaded``: ``hash_url``, which hashes large chunks on worker threads.
+"""
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import TYPE_CHECKING
+import asyncio
+import hashlib
+import os
+import threading
+
+from livecheck.utils.requests import (
+    HashedURL,
+    close_sessions,
+    hash_url,
+    init_sessions,
+    session_init,
+)
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+BLOCK = os.urandom(1024 * 1024)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    size = 0
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Content-Length', str(self.size * len(BLOCK)))
+        self.end_headers()
+        for _ in range(self.size):
+            self.wfile.write(BLOCK)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+async def hash_inline(url: str) -> HashedURL:
+    """
+    Hash a download on the event loop.
+
+    Parameters
+    ----------
+    url : str
+        URL to hash.
+
+    Returns
+    -------
+    HashedURL
+        Digests and size of the body.
+    """
+    r = await session_init('').get(url, stream=True, timeout=30)
+    h_blake2b = hashlib.blake2b()
+    h_sha512 = hashlib.sha512()
+    size = 0
+    async for chunk in await r.iter_content(chunk_size=8192):
+        h_blake2b.update(chunk)
+        h_sha512.update(chunk)
+        size += len(chunk)
+    return HashedURL(h_blake2b.hexdigest(), h_sha512.hexdigest(), size)
+
+
+async def run(func: Callable[[str], Awaitable[HashedURL]], url: str) -> tuple[float, float, int]:
+    """
+    Hash ``url`` while measuring event loop stalls.
+
+    Parameters
+    ----------
+    func : Callable[[str], Awaitable[HashedURL]]
+        Hashing function.
+    url : str
+        URL to hash.
+
+    Returns
+    -------
+    tuple[float, float, int]
+        Elapsed seconds, longest event loop stall in seconds and bytes hashed.
+    """
+    init_sessions(asyncio.Semaphore(4))
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def tick() -> None:
+        nonlocal worst
+        while not done.is_set():
+            start = perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, perf_counter() - start - 0.01)
+
+    ticker = asyncio.create_task(tick())
+    start = perf_counter()
+    size = (await func(url)).size
+    elapsed = perf_counter() - start
+    done.set()
+    await ticker
+    await close_sessions()
+    return elapsed, worst, size
+
+
+@click.command()
+@click.option('-s', '--size', default=2048, help='MiB to serve.')
+def main(size: int) -> None:
+    """Compare hashing a download on the event loop against hash_url."""
+    _Handler.size = size
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{httpd.server_port}/distfile.tar.gz'
+    try:
+        for name, func in (('inline', hash_inline), ('threaded', hash_url)):
+            elapsed, worst, received = asyncio.run(run(func, url))
+            click.echo(f'{name:<10} {elapsed:7.2f}s {received / elapsed / 2**20:8.1f} MiB/s '
+                       f'longest stall {worst * 1000:8.1f} ms')
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare HTTP/1.1 against HTTP/2 throughput for registry lookups.
+
+Run from the repository root (needs network access)::
+
+    python benchmarks/bench_http_protocols.py -n 40 -c 8
+
+Every mode fetches the same PyPI JSON documents without the HTTP cache:
+
+* ``http/1.1``: one request per pooled connection, as for hosts demoted to HTTP/1.1.
+* ``http/2``: the policy livecheck uses for ``pypi.org`` (pooled HTTP/2, no QUIC).
+* ``http/2-multiplexed``: every request issued as a stream of one connection.
+"""
+from __future__ import annotations
+
+from time import perf_counter
+import asyncio
+
+from livecheck.utils.session import HTTP11_ONLY, ConnectionStats, ProtocolPolicy
+import click
+import niquests
+
+PROJECTS = ('aiohttp', 'attrs', 'black', 'certifi', 'click', 'cryptography', 'django', 'flask',
+            'httpx', 'idna', 'jinja2', 'lxml', 'mypy', 'numpy', 'packaging', 'pandas', 'pillow',
+            'pip', 'pydantic', 'pytest', 'pyyaml', 'requests', 'rich', 'ruff', 'setuptools', 'six',
+            'sqlalchemy', 'typing-extensions', 'urllib3', 'wheel')
+URL = 'https://pypi.org/pypi/%s/json'
+
+
+async def run(policy: ProtocolPolicy, count: int, concurrency: int, *,
+              multiplexed: bool) -> tuple[float, ConnectionStats]:
+    """
+    Fetch ``count`` documents with one session.
+
+    Parameters
+    ----------
+    policy : ProtocolPolicy
+        HTTP versions the session may use.
+    count : int
+        Number of requests.
+    concurrency : int
+        Maximum number of requests in flight and connection pool size.
+    multiplexed : bool
+        Whether to send requests as concurrent streams of one connection.
+
+    Returns
+    -------
+    tuple[float, ConnectionStats]
+        Elapsed seconds and connection counters.
+    """
+    stats = ConnectionStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    urls = [URL % PROJECTS[i % len(PROJECTS)] for i in range(count)]
+    async with niquests.AsyncSession(
+            disable_http2=not policy.http2,
+            disable_http3=not policy.http3,
+            multiplexed=multiplexed,
+            pool_maxsize=concurrency,
+            hooks={'response': [stats.record]}  # type: ignore[list-item]
+    ) as session:
+
+        async def fetch(url: str) -> None:
+            async with semaphore:
+                r = await session.get(url, timeout=30)
+                if not multiplexed:
+                    r.raise_for_status()
+
+        start = perf_counter()
+        await asyncio.gather(*(fetch(url) for url in urls))
+        if multiplexed:
+            await session.gather()
+        return perf_counter() - start, stats
+
+
+@click.command()
+@click.option('-n', '--count', default=40, help='Requests per mode.')
+@click.option('-c', '--concurrency', default=8, help='Requests in flight.')
+def main(count: int, concurrency: int) -> None:
+    """Compare HTTP/1.1 against HTTP/2 throughput for registry lookups."""
+    modes = (('http/1.1', HTTP11_ONLY, False), ('http/2', ProtocolPolicy(http3=False), False),
+             ('http/2-multiplexed', ProtocolPolicy(http3=False), True))
+    for name, policy, multiplexed in modes:
+        elapsed, stats = asyncio.run(run(policy, count, concurrency, multiplexed=multiplexed))
+        host = stats.hosts.get('pypi.org')
+        connections = host.connections if host else 0
+        click.echo(f'{name:<20} {elapsed:6.2f}s {count / elapsed:7.1f} req/s '
+                   f'{connections:3d} connections')
+
+
+if __name__ == '__main__':
+    main()
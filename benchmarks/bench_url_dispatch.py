@@ -0,0 +1,128 @@
+"""
+Compare the old predicate chain of ``parse_url`` against the host-indexed handler registry.
+
+Run from the repository root against an ebuild repository with a metadata cache::
+
+    python benchmarks/bench_url_dispatch.py --repo /var/db/repos/gentoo
+
+Every ``SRC_URI`` and ``HOMEPAGE`` URL in ``metadata/md5-cache`` is dispatched with each mode:
+
+* ``chain``: every ``is_*`` predicate in priority order until one matches, as livecheck used to do.
+* ``registry``: :py:meth:`livecheck.special.url_handlers.URLHandlerRegistry.find`.
+
+The benchmark fails if the two modes pick a different handler for any URL.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from livecheck.special.url_handlers import url_handlers
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def read_urls(repo: Path) -> list[str]:
+    """
+    Read the ``SRC_URI`` and ``HOMEPAGE`` URLs of every ebuild in a metadata cache.
+
+    Parameters
+    ----------
+    repo : Path
+        Ebuild repository root.
+
+    Returns
+    -------
+    list[str]
+        URLs in cache order, with duplicates.
+    """
+    urls: list[str] = []
+    for entry in sorted((repo / 'metadata' / 'md5-cache').glob('*/*')):
+        for line in entry.read_text(encoding='utf-8', errors='replace').splitlines():
+            key, _, value = line.partition('=')
+            if key in {'SRC_URI', 'HOMEPAGE'}:
+                urls.extend(token for token in value.split() if '://' in token)
+    return urls
+
+
+def chain(url: str) -> str | None:
+    """
+    Dispatch a URL by trying every handler predicate in turn.
+
+    Parameters
+    ----------
+    url : str
+        URL to dispatch.
+
+    Returns
+    -------
+    str | None
+        Handler name.
+    """
+    return next((h.name for h in url_handlers.handlers if h.matches(url)), None)
+
+
+def registry(url: str) -> str | None:
+    """
+    Dispatch a URL with the handler registry.
+
+    Parameters
+    ----------
+    url : str
+        URL to dispatch.
+
+    Returns
+    -------
+    str | None
+        Handler name.
+    """
+    return handler.name if (handler := url_handlers.find(url)) else None
+
+
+def run(func: Callable[[str], str | None], urls: list[str]) -> tuple[float, list[str | None]]:
+    """
+    Dispatch every URL.
+
+    Parameters
+    ----------
+    func : Callable[[str], str | None]
+        Dispatch function.
+    urls : list[str]
+        URLs to dispatch.
+
+    Returns
+    -------
+    tuple[float, list[str | None]]
+        Elapsed seconds and the handler name of each URL.
+    """
+    start = perf_counter()
+    names = [func(url) for url in urls]
+    return perf_counter() - start, names
+
+
+@click.command()
+@click.option('-r',
+              '--repo',
+              default='/var/db/repos/gentoo',
+              type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Ebuild repository with a metadata cache.')
+def main(repo: Path) -> None:
+    """Benchmark URL dispatch."""  # ruff:ignore[docstring-missing-exception]
+    if not (urls := read_urls(repo)):
+        msg = f'No URLs found in {repo}/metadata/md5-cache.'
+        raise click.ClickException(msg)
+    click.echo(f'{len(urls)} URLs')
+    results = {}
+    for name, func in (('chain', chain), ('registry', registry)):
+        elapsed, results[name] = run(func, urls)
+        click.echo(f'{name:<10} {elapsed:7.3f}s {elapsed / len(urls) * 1e6:8.2f} us/URL')
+    if results['chain'] != results['registry']:
+        msg = 'The registry picked a different handler for some URLs.'
+        raise click.ClickException(msg)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from copy import copy
+from datetime import datetime, timezone
 from itertools import starmap
 from os import chdir
 from pathlib import Path
@@ -35,12 +36,7 @@ from .settings import (
     LivecheckSettings,
     gather_settings,
 )
-from .special.bitbucket import (
-    BITBUCKET_METADATA,
-    get_latest_bitbucket,
-    get_latest_bitbucket_metadata,
-    is_bitbucket,
-)
+from .special.bitbucket import BITBUCKET_METADATA, get_latest_bitbucket_metadata
 from .special.changelog import get_latest_changelog_package
 from .special.checksum import (
     get_latest_checksum_package,
@@ -60,21 +56,14 @@ from .special.dotnet import (
     update_dotnet_archive_ebuild,
     update_dotnet_ebuild,
 )
-from .special.gist import get_latest_gist_package, is_gist
+from .special.git import get_latest_git
 from .special.github import (
     GITHUB_METADATA,
     get_github_branch_for_commit,
-    get_latest_github,
     get_latest_github_metadata,
-    is_github,
     is_github_release_url,
 )
-from .special.gitlab import (
-    GITLAB_METADATA,
-    get_latest_gitlab,
-    get_latest_gitlab_metadata,
-    is_gitlab,
-)
+from .special.gitlab import GITLAB_METADATA, get_latest_gitlab_metadata
 from .special.golang import update_go_ebuild
 from .special.gomodule import (
     check_gomodule_requirements,
@@ -82,46 +71,36 @@ from .special.gomodule import (
     update_gomodule_ebuild,
 )
 from .special.ida_free import get_latest_ida_free_package
-from .special.jetbrains import get_latest_jetbrains_package, is_jetbrains, update_jetbrains_ebuild
+from .special.jetbrains import update_jetbrains_ebuild
 from .special.maven import check_maven_requirements, remove_maven_url, update_maven_ebuild
-from .special.metacpan import (
-    METACPAN_METADATA,
-    get_latest_metacpan_metadata,
-    get_latest_metacpan_package,
-    is_metacpan,
-)
+from .special.metacpan import METACPAN_METADATA, get_latest_metacpan_metadata
 from .special.nodejs import check_nodejs_requirements, remove_nodejs_url, update_nodejs_ebuild
-from .special.nuget import (
-    NUGET_METADATA,
-    get_latest_nuget_metadata,
-    get_latest_nuget_package,
-    is_nuget,
-)
-from .special.package import get_latest_package, is_package
-from .special.pecl import PECL_METADATA, get_latest_pecl_metadata, get_latest_pecl_package, is_pecl
-from .special.pypi import PYPI_METADATA, get_latest_pypi_metadata, get_latest_pypi_package, is_pypi
+from .special.nuget import NUGET_METADATA, get_latest_nuget_metadata
+from .special.pecl import PECL_METADATA, get_latest_pecl_metadata
+from .special.pypi import PYPI_METADATA, get_latest_pypi_metadata
 from .special.regex import get_latest_regex_package
-from .special.repology import get_latest_repology
-from .special.rubygems import (
-    RUBYGEMS_METADATA,
-    get_latest_rubygems_metadata,
-    get_latest_rubygems_package,
-    is_rubygems,
-)
-from .special.sourceforge import (
-    SOURCEFORGE_METADATA,
-    get_latest_sourceforge_metadata,
-    get_latest_sourceforge_package,
-    is_sourceforge,
-)
-from .special.sourcehut import (
-    SOURCEHUT_METADATA,
-    get_latest_sourcehut,
-    get_latest_sourcehut_metadata,
-    is_sourcehut,
-)
+from .special.repology import get_latest_repology, prefetch_repology
+from .special.rubygems import RUBYGEMS_METADATA, get_latest_rubygems_metadata
+from .special.sourceforge import SOURCEFORGE_METADATA, get_latest_sourceforge_metadata
+from .special.sourcehut import SOURCEHUT_METADATA, get_latest_sourcehut_metadata
+from .special.url_handlers import url_handlers
 from .special.yarn import check_yarn_requirements, update_yarn_ebuild
 from .utils import check_program, close_sessions, extract_sha, get_content, init_sessions, is_sha
+from .utils.http_cache import (
+    HTTP_CACHE_BACKENDS,
+    close_http_cache,
+    configure_http_cache,
+    get_http_cache,
+)
+from .utils.http_metrics import http_metrics
+from .utils.mirrors import configure_mirrors, resolve_mirror_uri
+from .utils.negative_cache import (
+    configure_negative_cache,
+    get_negative_result,
+    set_negative_result,
+    track_outcome,
+)
+from .utils.object_cache import close_object_cache, configure_object_cache, purge_object_cache
 from .utils.portage import (
     catpkg_catpkgsplit,
     catpkgsplit2,
@@ -134,9 +113,10 @@ from .utils.portage import (
     get_repository_root_if_inside,
     remove_leading_zeros,
 )
+from .utils.recording import configure_recording, recording_state_directory
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Mapping, Sequence
 
     from .typing import PropTuple
 
@@ -259,7 +239,8 @@ async def parse_url(src_uri: str, ebuild: str, settings: LivecheckSettings, *,
     Parameters
     ----------
     src_uri : str
-        Source URI to parse.
+        Source URI to parse. ``mirror://`` URIs without a handler are resolved to the fastest
+        mirror of their group first.
     ebuild : str
         Ebuild atom string for context.
     settings : LivecheckSettings
@@ -273,6 +254,11 @@ async def parse_url(src_uri: str, ebuild: str, settings: LivecheckSettings, *,
         Last version, top hash, hash date, and resolved URL.
     """
     parsed_uri = urlparse(src_uri)
+    if (parsed_uri.scheme == 'mirror' and url_handlers.find(src_uri, parsed_uri) is None
+            and (resolved := await resolve_mirror_uri(src_uri))):
+        # Groups without a handler of their own, such as ``sourceforge``, are checked on a mirror.
+        log.debug('Resolved %s to %s.', src_uri, resolved)
+        src_uri, parsed_uri = resolved, urlparse(resolved)
     last_version = top_hash = hash_date = ''
     url = src_uri
 
@@ -280,58 +266,76 @@ async def parse_url(src_uri: str, ebuild: str, settings: LivecheckSettings, *,
         return last_version, top_hash, hash_date, url
 
     log.debug('Parsed URI: %s', parsed_uri)
-    if is_gist(src_uri):
-        log.debug('Matched handler: gist for %s.', ebuild)
-        top_hash, hash_date = await get_latest_gist_package(src_uri)
-    elif is_github(src_uri):
-        log.debug('Matched handler: github for %s.', ebuild)
-        last_version, top_hash, hash_date = await get_latest_github(src_uri,
-                                                                    ebuild,
-                                                                    settings,
-                                                                    force_sha=force_sha)
-    elif is_sourcehut(src_uri):
-        log.debug('Matched handler: sourcehut for %s.', ebuild)
-        last_version, top_hash, hash_date = await get_latest_sourcehut(src_uri, ebuild, settings)
-    elif is_pypi(src_uri):
-        log.debug('Matched handler: pypi for %s.', ebuild)
-        last_version, url = await get_latest_pypi_package(src_uri, ebuild, settings)
-    elif is_nuget(src_uri):
-        log.debug('Matched handler: nuget for %s.', ebuild)
-        last_version, url = await get_latest_nuget_package(src_uri, ebuild, settings)
-    elif is_jetbrains(src_uri):
-        log.debug('Matched handler: jetbrains for %s.', ebuild)
-        last_version = await get_latest_jetbrains_package(ebuild, settings)
-    elif is_gitlab(src_uri):
-        log.debug('Matched handler: gitlab for %s.', ebuild)
-        last_version, top_hash, hash_date = await get_latest_gitlab(src_uri,
-                                                                    ebuild,
-                                                                    settings,
-                                                                    force_sha=force_sha)
-    elif is_package(src_uri):
-        log.debug('Matched handler: package for %s.', ebuild)
-        last_version = await get_latest_package(src_uri, ebuild, settings)
-    elif is_pecl(src_uri):
-        log.debug('Matched handler: pecl for %s.', ebuild)
-        last_version = await get_latest_pecl_package(ebuild, settings)
-    elif is_metacpan(src_uri):
-        log.debug('Matched handler: metacpan for %s.', ebuild)
-        last_version = await get_latest_metacpan_package(src_uri, ebuild, settings)
-    elif is_rubygems(src_uri):
-        log.debug('Matched handler: rubygems for %s.', ebuild)
-        last_version = await get_latest_rubygems_package(ebuild, settings)
-    elif is_sourceforge(src_uri):
-        log.debug('Matched handler: sourceforge for %s.', ebuild)
-        last_version = await get_latest_sourceforge_package(src_uri, ebuild, settings)
-    elif is_bitbucket(src_uri):
-        log.debug('Matched handler: bitbucket for %s.', ebuild)
-        last_version, top_hash, hash_date = await get_latest_bitbucket(src_uri,
-                                                                       ebuild,
-                                                                       settings,
-                                                                       force_sha=force_sha)
-    else:
+    if (handler := url_handlers.find(src_uri, parsed_uri)) is None:
         log_unhandled_pkg(ebuild, src_uri)
+        return last_version, top_hash, hash_date, url
+    log.debug('Matched handler: %s for %s.', handler.name, ebuild)
+    return await handler.check(src_uri, ebuild, settings, force_sha=force_sha)
 
-    return last_version, top_hash, hash_date, url
+
+async def _probe_homepage(home: str, ebuild: str,
+                          settings: LivecheckSettings) -> tuple[str, str, str, str]:
+    """
+    Run :py:func:`parse_url` on a ``HOMEPAGE`` unless it recently found nothing.
+
+    Finding nothing is only remembered if the server answered. Timeouts, connection errors, server
+    errors and rate limits are not.
+
+    Parameters
+    ----------
+    home : str
+        Homepage URL.
+    ebuild : str
+        Ebuild atom string for context.
+    settings : LivecheckSettings
+        Livecheck settings.
+
+    Returns
+    -------
+    tuple[str, str, str, str]
+        Last version, top hash, hash date, and resolved URL.
+    """
+    key = f'{ebuild} {home}'
+    if get_negative_result('homepage', key) is not None:
+        log.debug('Skipping HOMEPAGE %s for %s. It found nothing recently.', home, ebuild)
+        return '', '', '', home
+    with track_outcome() as outcome:
+        result = await parse_url(home, ebuild, settings, force_sha=False)
+    if not result[0] and not result[1] and (status_code := outcome.negative_status) is not None:
+        set_negative_result('homepage', key, status_code)
+    return result
+
+
+async def _probe_directory(url: str, ebuild: str, settings: LivecheckSettings) -> tuple[str, str]:
+    """
+    Run :py:func:`get_latest_directory_package` unless it recently found nothing at ``url``.
+
+    As with :py:func:`_probe_homepage`, failed requests are not remembered.
+
+    Parameters
+    ----------
+    url : str
+        URL whose directory is listed.
+    ebuild : str
+        Ebuild atom string for context.
+    settings : LivecheckSettings
+        Livecheck settings.
+
+    Returns
+    -------
+    tuple[str, str]
+        Last version and URL of the archive.
+    """
+    key = f'{ebuild} {url}'
+    if get_negative_result('directory', key) is not None:
+        log.debug('Skipping directory listing of %s for %s. It found nothing recently.', url,
+                  ebuild)
+        return '', ''
+    with track_outcome() as outcome:
+        result = await get_latest_directory_package(url, ebuild, settings)
+    if not result[0] and (status_code := outcome.negative_status) is not None:
+        set_negative_result('directory', key, status_code)
+    return result
 
 
 async def parse_metadata(repo_root: str, ebuild: str,
@@ -498,20 +502,25 @@ async def _check_one_package(  # ruff:ignore[complex-structure, too-many-branche
         headers = settings.request_headers.get(catpkg, {})
         params = settings.request_params.get(catpkg, {})
         check_url = settings.custom_livechecks.get(catpkg, (src_uri, ''))[0]
-        last_version, hash_date, url = await get_latest_checksum_package(check_url,
-                                                                         match,
-                                                                         str(repo_root),
-                                                                         headers=headers,
-                                                                         params=params)
+        last_version, hash_date, url = await get_latest_checksum_package(
+            check_url,
+            match,
+            str(repo_root),
+            headers=headers,
+            params=params,
+            save_to_distdir=settings.auto_update_flag,
+            all_distfiles=settings.checksum_all_distfiles.get(catpkg, False))
     elif settings.type_packages.get(catpkg) == TYPE_LOCATION_CHECKSUM:
         headers = settings.request_headers.get(catpkg, {})
         params = settings.request_params.get(catpkg, {})
         check_url = settings.custom_livechecks.get(catpkg, (src_uri, ''))[0]
-        last_version, hash_date, url = await get_latest_location_checksum_package(check_url,
-                                                                                  match,
-                                                                                  str(repo_root),
-                                                                                  headers=headers,
-                                                                                  params=params)
+        last_version, hash_date, url = await get_latest_location_checksum_package(
+            check_url,
+            match,
+            str(repo_root),
+            headers=headers,
+            params=params,
+            save_to_distdir=settings.auto_update_flag)
     elif settings.type_packages.get(catpkg) == TYPE_COMMIT:
         last_version, top_hash, hash_date, url = await parse_url(egit,
                                                                  match,
@@ -524,6 +533,13 @@ async def _check_one_package(  # ruff:ignore[complex-structure, too-many-branche
                                                                      match,
                                                                      settings,
                                                                      force_sha=True)
+            if not last_version and not top_hash:
+                # Any EGIT_REPO_URI is a git remote, even without a ``.git`` suffix.
+                log.debug('Trying git smart HTTP for %s: %s', catpkg, egit)
+                last_version, top_hash, hash_date = await get_latest_git(egit,
+                                                                         match,
+                                                                         settings,
+                                                                         force_sha=True)
         if not last_version and not top_hash:
             log.debug('Trying SRC_URI for %s: %s', catpkg, src_uri)
             last_version, top_hash, hash_date, url = await parse_url(src_uri,
@@ -539,18 +555,16 @@ async def _check_one_package(  # ruff:ignore[complex-structure, too-many-branche
         for home in homes:
             if not last_version and not top_hash:
                 log.debug('Trying HOMEPAGE for %s: %s', catpkg, home)
-                last_version, top_hash, hash_date, url = await parse_url(home,
-                                                                         match,
-                                                                         settings,
-                                                                         force_sha=False)
+                last_version, top_hash, hash_date, url = await _probe_homepage(
+                    home, match, settings)
         if not last_version and not top_hash:
             log.debug('Trying repology for %s.', catpkg)
             last_version = await get_latest_repology(match, settings)
         if not last_version and not top_hash:
             log.debug('Trying directory listing for %s.', catpkg)
-            last_version, url = await get_latest_directory_package(src_uri, match, settings)
+            last_version, url = await _probe_directory(src_uri, match, settings)
             for home in homes:
-                last_version, url = await get_latest_directory_package(home, match, settings)
+                last_version, url = await _probe_directory(home, match, settings)
                 if last_version:
                     break
 
@@ -561,6 +575,36 @@ async def _check_one_package(  # ruff:ignore[complex-structure, too-many-branche
     return None
 
 
+def _repology_projects(matches: Iterable[str], settings: LivecheckSettings,
+                       exclude: Sequence[str]) -> list[str]:
+    """
+    Get the Repology project names of the packages checked with Repology.
+
+    Parameters
+    ----------
+    matches : Iterable[str]
+        Package atoms, optionally with a ``:slot:`` restriction.
+    settings : LivecheckSettings
+        Livecheck configuration.
+    exclude : Sequence[str]
+        ``catpkg`` names or bare package names to skip.
+
+    Returns
+    -------
+    list[str]
+        Project names.
+    """
+    names: list[str] = []
+    if TYPE_REPOLOGY not in settings.type_packages.values():
+        return names
+    for match_ in matches:
+        catpkg, _, pkg, _ = catpkg_catpkgsplit(extract_restrict_version(match_)[0])
+        if (settings.type_packages.get(catpkg) == TYPE_REPOLOGY and catpkg not in exclude
+                and pkg not in exclude):
+            names.append(settings.custom_livechecks[catpkg][0] or pkg)
+    return names
+
+
 async def get_props(search_dir: Path,
                     repo_root: Path,
                     settings: LivecheckSettings,
@@ -617,7 +661,9 @@ async def get_props(search_dir: Path,
                 log.info('Progress: %d/%d packages checked.', completed, total)
             return result
 
-    results = await asyncio.gather(*(_bounded(m) for m in matches_list))
+    _, *results = await asyncio.gather(
+        prefetch_repology(_repology_projects(matches_list, settings, exclude)),
+        *(_bounded(m) for m in matches_list))
     return [r for r in results if r is not None]
 
 
@@ -1011,8 +1057,12 @@ async def _async_main(*,
                       exclude: tuple[str, ...] | None,
                       hook_dir: Path | None,
                       max_concurrent_http: int = 3,
+                      metrics_json: Path | None = None,
+                      metrics_prometheus: Path | None = None,
                       parallel: int = 1) -> None:
-    init_sessions(asyncio.Semaphore(max_concurrent_http))
+    init_sessions(asyncio.Semaphore(max_concurrent_http), settings.freshness_policies)
+    configure_negative_cache(settings.negative_cache_ttl)
+    configure_mirrors(Path(repo_root))
     sem = asyncio.Semaphore(parallel)
 
     async def _bounded_do_main(cat: str, pkg: str, ebuild_version: str, last_version: str,
@@ -1049,12 +1099,106 @@ async def _async_main(*,
         raise
     finally:
         await close_sessions()
+        close_object_cache()
+        try:
+            http_metrics.write(json_path=metrics_json, prometheus_path=metrics_prometheus)
+        except OSError:
+            # Never hide the error that ended the run.
+            log.exception('Failed to write HTTP metrics.')
     if any(failures):
         raise click.exceptions.Exit(1)
 
 
+_MIB = 1024 * 1024
+_HOUR = 60 * 60
+_DAY = 24 * _HOUR
+
+
+def _parse_replay_latency(_ctx: click.Context, _param: click.Parameter,
+                          value: tuple[str, ...]) -> dict[str, float]:
+    latency = {}
+    for item in value:
+        host, _, ms = item.partition('=')
+        try:
+            latency[host] = float(ms) / 1000
+        except ValueError:
+            msg = f'Expected HOST=MS, got {item!r}.'
+            raise click.BadParameter(msg) from None
+    return latency
+
+
+_http_cache_option = click.option('--http-cache',
+                                  type=click.Choice(HTTP_CACHE_BACKENDS),
+                                  default='sqlite',
+                                  show_default=True,
+                                  help='HTTP cache storage.')
+_http_cache_max_size_option = click.option(
+    '--http-cache-max-size',
+    type=click.IntRange(min=0),
+    default=512,
+    show_default=True,
+    help='Evict least recently used HTTP cache entries above this many MiB (0: no limit).')
+_http_cache_max_age_option = click.option(
+    '--http-cache-max-age',
+    type=click.IntRange(min=0),
+    default=30,
+    show_default=True,
+    help='Evict HTTP cache entries unused for this many days (0: no limit).')
+
+
+def _maintain_http_cache(kind: str,
+                         max_size: int,
+                         max_age: float,
+                         *,
+                         prune: bool = False,
+                         vacuum: bool = False,
+                         stats: bool = False) -> None:
+    """
+    Prune, vacuum and show the size of the HTTP cache, in that order.
+
+    Parameters
+    ----------
+    kind : str
+        HTTP cache backend.
+    max_size : int
+        Size cap in bytes for ``prune``.
+    max_age : float
+        Maximum seconds an entry may go unused for ``prune``.
+    prune : bool
+        Evict entries that are too old or exceed the size cap.
+    vacuum : bool
+        Reclaim disk space left behind by evicted entries.
+    stats : bool
+        Show the size of the cache.
+    """
+    configure_http_cache(kind)
+    try:
+        backend = get_http_cache()
+        if prune:
+            click.echo(f'Evicted {backend.prune(max_size=max_size, max_age=max_age)} entries.')
+        if vacuum:
+            backend.vacuum()
+        cache_stats = backend.stats() if stats else None
+    finally:
+        close_http_cache(prune=False)
+    if cache_stats is not None:
+        click.echo(f'Entries: {cache_stats.entries}')
+        click.echo(f'Size: {cache_stats.size / _MIB:.1f} MiB '
+                   f'({cache_stats.raw_size / _MIB:.1f} MiB uncompressed)')
+        if cache_stats.oldest:
+            oldest = datetime.fromtimestamp(cache_stats.oldest, tz=timezone.utc)
+            click.echo(f'Least recently used: {oldest:%Y-%m-%d %H:%M:%S} UTC')
+
+
 @click.command(context_settings={'help_option_names': ['-h', '--help']})
 @click.option('-a', '--auto-update', is_flag=True, help='Rename and modify ebuilds.')
+@click.option('--cache-prune',
+              is_flag=True,
+              help='Evict HTTP cache entries that are too old or exceed the size cap, and exit.')
+@click.option('--cache-stats', is_flag=True, help='Show the size of the HTTP cache and exit.')
+@click.option('--cache-vacuum',
+              is_flag=True,
+              help='Reclaim disk space left behind by evicted HTTP cache entries, and exit.')
 @click.option('-d', '--debug', is_flag=True, help='Enable debug logging.')
 @click.option('-D', '--development', is_flag=True, help='Include development packages.')
 @click.option('--dist-github-repository',
@@ -1068,18 +1212,42 @@ async def _async_main(*,
               help='Force rebuild and re-upload of vendor dist archives even when present.')
 @click.option('-e', '--exclude', multiple=True, help='Exclude package(s) from updates.')
 @click.option('-g', '--git', is_flag=True, help='Use git and pkgdev to make changes.')
+@click.option('--github-graphql',
+              is_flag=True,
+              help='Batch GitHub lookups into GraphQL queries (requires a token).')
 @click.option('-H',
               '--hook-dir',
               default=None,
               help='Run a hook directory scripts with various parameters.',
               type=click.Path(file_okay=False, exists=True, resolve_path=True, path_type=Path))
+@_http_cache_option
+@_http_cache_max_size_option
+@_http_cache_max_age_option
 @click.option('-k', '--keep-old', is_flag=True, help='Keep old ebuild versions.')
+@click.option('--max-body-size',
+              type=click.IntRange(min=1),
+              default=16,
+              show_default=True,
+              help='Stop reading scanned documents (regex, changelog) after this many MiB.')
 @click.option('-M',
               '--max-concurrent-http',
               type=int,
               default=3,
               show_default=True,
               help='Maximum concurrent HTTP requests.')
+@click.option('--metrics-json',
+              default=None,
+              help='Write per-host HTTP metrics to this file as JSON at the end of the run.',
+              type=click.Path(dir_okay=False, resolve_path=True, path_type=Path))
+@click.option('--metrics-prometheus',
+              default=None,
+              help='Write per-host HTTP metrics to this file in Prometheus text format.',
+              type=click.Path(dir_okay=False, resolve_path=True, path_type=Path))
+@click.option('--negative-cache-ttl',
+              type=click.IntRange(min=0),
+              default=24,
+              show_default=True,
+              help='Skip lookups that found nothing for this many hours (0: never skip).')
 @click.option('-p',
               '--parallel',
               type=int,
@@ -1087,11 +1255,28 @@ async def _async_main(*,
               show_default=True,
               help='Maximum parallel ebuilds to process.')
 @click.option('-P', '--progress', is_flag=True, help='Enable progress logging.')
+@click.option('--purge-immutable-cache',
+              is_flag=True,
+              help='Forget cached tag and commit lookups before checking.')
 @click.option('--package-manager',
               type=click.Choice(sorted(PACKAGE_MANAGERS)),
               default='npm',
               show_default=True,
               help='Package manager to use for Node.js packages.')
+@click.option('--record',
+              default=None,
+              help='Save every HTTP exchange to this directory.',
+              type=click.Path(file_okay=False, resolve_path=True, path_type=Path))
+@click.option(
+    '--replay',
+    default=None,
+    help='Answer HTTP requests from a directory saved with --record, without the network.',
+    type=click.Path(file_okay=False, exists=True, resolve_path=True, path_type=Path))
+@click.option('--replay-latency',
+              multiple=True,
+              callback=_parse_replay_latency,
+              metavar='HOST=MS',
+              help='Delay replayed responses from HOST (* for any host) by MS milliseconds.')
 @click.option('-W',
               '--working-dir',
               default='.',
@@ -1107,18 +1292,33 @@ def main(working_dir: Path,
          dist_github_repository: str = '',
          exclude: tuple[str, ...] | None = None,
          hook_dir: Path | None = None,
+         http_cache: str = 'sqlite',
+         http_cache_max_age: int = 30,
+         http_cache_max_size: int = 512,
+         max_body_size: int = 16,
          max_concurrent_http: int = 3,
+         metrics_json: Path | None = None,
+         metrics_prometheus: Path | None = None,
+         negative_cache_ttl: int = 24,
          package_names: tuple[str, ...] | list[str] | None = None,
          parallel: int = 1,
          *,
          auto_update: bool = False,
+         cache_prune: bool = False,
+         cache_stats: bool = False,
+         cache_vacuum: bool = False,
          debug: bool = False,
          development: bool = False,
          dist_force_upload: bool = False,
          git: bool = False,
+         github_graphql: bool = False,
          keep_old: bool = False,
          progress: bool = False,
-         package_manager: str = 'npm') -> None:
+         purge_immutable_cache: bool = False,
+         package_manager: str = 'npm',
+         record: Path | None = None,
+         replay: Path | None = None,
+         replay_latency: Mapping[str, float] | None = None) -> None:
     """Update ebuilds to their latest versions."""  # ruff:ignore[docstring-missing-exception]
     setup_logging(debug=debug,
                   log_colors={'INFO': 'green'},
@@ -1138,6 +1338,14 @@ def main(working_dir: Path,
                       },
                       'urllib3_future': {}
                   })
+    if cache_prune or cache_vacuum or cache_stats:
+        _maintain_http_cache(http_cache,
+                             http_cache_max_size * _MIB,
+                             http_cache_max_age * _DAY,
+                             prune=cache_prune,
+                             vacuum=cache_vacuum,
+                             stats=cache_stats)
+        return
     chdir(working_dir)
     if exclude:
         log.debug('Excluding %s.', ', '.join(exclude))
@@ -1179,15 +1387,37 @@ def main(working_dir: Path,
     settings.debug_flag = debug
     settings.development_flag = development
     settings.git_flag = git
+    settings.github_graphql_flag = github_graphql
     settings.keep_old_flag = keep_old
     settings.progress_flag = progress
     settings.default_package_manager = package_manager
+    settings.negative_cache_ttl = negative_cache_ttl * _HOUR
+    settings.max_body_size = max_body_size * _MIB
 
+    if record and replay:
+        msg = '`--record` and `--replay` cannot be used together.'
+        raise click.ClickException(msg)
+    if record or replay:
+        # Every request has to reach the recording, so nothing is answered from the HTTP cache.
+        configure_recording('record' if record else 'replay', record or replay, replay_latency)
+        settings.freshness_policies = {}
+        settings.negative_cache_ttl = 0
+    # The caches of a recorded run are kept with the recording instead of the user's.
+    if (state := recording_state_directory()) is not None:
+        configure_object_cache(state / 'objects.sqlite')
+    if purge_immutable_cache:
+        purge_object_cache()
+    configure_http_cache(http_cache,
+                         max_size=http_cache_max_size * _MIB,
+                         max_age=http_cache_max_age * _DAY,
+                         directory=state)
     package_names_list = sorted(package_names or [])
     asyncio.run(
         _async_main(exclude=exclude,
                     hook_dir=hook_dir,
                     max_concurrent_http=max_concurrent_http,
+                    metrics_json=metrics_json,
+                    metrics_prometheus=metrics_prometheus,
                     package_names=package_names_list,
                     parallel=parallel,
                     repo_root=repo_root,
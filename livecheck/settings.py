@@ -1,7 +1,7 @@
 """Settings."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 import json
 import logging
@@ -10,6 +10,7 @@ import re
 from . import utils
 from .constants import PACKAGE_MANAGERS
 from .settings_model import LivecheckSettings
+from .utils.freshness import DEFAULT_FRESHNESS_POLICIES, FreshnessPolicy
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -66,6 +67,7 @@ def gather_settings(search_dir: Path) -> LivecheckSettings:
     import livecheck.special.handlers as sc  # ruff:ignore[import-outside-top-level]
 
     branches: dict[str, str] = {}
+    checksum_all_distfiles: dict[str, bool] = {}
     custom_livechecks: dict[str, tuple[str, str]] = {}
     dist_github_repositories: dict[str, str] = {}
     dist_github_releases: dict[str, str] = {}
@@ -99,6 +101,7 @@ def gather_settings(search_dir: Path) -> LivecheckSettings:
     request_method: dict[str, str] = {}
     request_data: dict[str, dict[str, str]] = {}
     regex_multiline: dict[str, bool] = {}
+    freshness_policies: dict[str, FreshnessPolicy] = dict(DEFAULT_FRESHNESS_POLICIES)
 
     for path in search_dir.glob('**/livecheck.json'):
         log.debug('Opening %s.', path)
@@ -138,6 +141,9 @@ def gather_settings(search_dir: Path) -> LivecheckSettings:
                     custom_livechecks[catpkg] = (settings_parsed['url'], '')
                 if type_ == TYPE_CHECKSUM and settings_parsed.get('url') is not None:
                     custom_livechecks[catpkg] = (settings_parsed.get('url'), '')
+                if type_ == TYPE_CHECKSUM and 'all_distfiles' in settings_parsed:
+                    check_instance(settings_parsed['all_distfiles'], 'all_distfiles', 'bool', path)
+                    checksum_all_distfiles[catpkg] = settings_parsed['all_distfiles']
                 if type_ == TYPE_LOCATION_CHECKSUM:
                     if settings_parsed.get('url') is None:
                         log.error('No "url" in %s.', path)
@@ -287,8 +293,12 @@ def gather_settings(search_dir: Path) -> LivecheckSettings:
             if 'multiline' in settings_parsed:
                 check_instance(settings_parsed['multiline'], 'multiline', 'bool', path)
                 regex_multiline[catpkg] = settings_parsed['multiline']
+            if 'freshness' in settings_parsed:
+                check_instance(settings_parsed['freshness'], 'freshness', 'dict', path)
+                freshness_policies.update(parse_freshness(settings_parsed['freshness'], path))
 
     return LivecheckSettings(branches=branches,
+                             checksum_all_distfiles=checksum_all_distfiles,
                              composer_packages=composer_packages,
                              composer_path=composer_path,
                              custom_livechecks=custom_livechecks,
@@ -297,6 +307,7 @@ def gather_settings(search_dir: Path) -> LivecheckSettings:
                              dist_github_repositories=dist_github_repositories,
                              dotnet_packages=dotnet_packages,
                              dotnet_projects=dotnet_projects,
+                             freshness_policies=freshness_policies,
                              go_sum_uri=golang_packages,
                              gomodule_packages=gomodule_packages,
                              gomodule_path=gomodule_path,
@@ -324,6 +335,43 @@ def gather_settings(search_dir: Path) -> LivecheckSettings:
                              yarn_packages=yarn_packages)
 
 
+def parse_freshness(value: Any, path: str | object) -> dict[str, FreshnessPolicy]:
+    """
+    Parse the ``freshness`` key of a settings file.
+
+    Parameters
+    ----------
+    value : Any
+        Host name to an object with ``min_ttl``, ``stale_while_revalidate`` and ``stale_if_error``
+        in seconds. Missing fields are ``0``.
+    path : str | object
+        Settings file, for error messages.
+
+    Returns
+    -------
+    dict[str, FreshnessPolicy]
+        Policies of the hosts whose fields are valid. Invalid hosts are logged and skipped.
+    """
+    policies: dict[str, FreshnessPolicy] = {}
+    if not isinstance(value, dict):
+        return policies
+    for host, fields in value.items():
+        check_instance(fields, f'freshness.{host}', 'dict', path)
+        if not isinstance(fields, dict):
+            continue
+        if unknown := set(fields) - set(FreshnessPolicy._fields):
+            log.error('Unknown keys %s in "freshness.%s" in %s.', ', '.join(sorted(unknown)), host,
+                      path)
+            continue
+        valid = True
+        for name, seconds in fields.items():
+            check_instance(seconds, f'freshness.{host}.{name}', 'int', path)
+            valid = valid and isinstance(seconds, int) and not isinstance(seconds, bool)
+        if valid:
+            policies[host] = FreshnessPolicy(**fields)
+    return policies
+
+
 def check_instance(value: int | str | bool | list[str] | dict[str, str]
                    | None,
                    key: str,
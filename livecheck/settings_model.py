@@ -5,6 +5,9 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 from .dist_github import DistGitHubSettings
+from .utils.freshness import DEFAULT_FRESHNESS_POLICIES, FreshnessPolicy
+from .utils.negative_cache import DEFAULT_NEGATIVE_TTL
+from .utils.requests import DEFAULT_MAX_BODY_SIZE
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Mapping
@@ -16,6 +19,8 @@ __all__ = ('LivecheckSettings',)
 class LivecheckSettings:
     """All settings."""
     branches: dict[str, str] = field(default_factory=dict)
+    checksum_all_distfiles: dict[str, bool] = field(default_factory=dict)
+    """Dictionary of catpkg to whether every distfile is checked for ``checksum`` packages."""
     custom_livechecks: dict[str, tuple[str, str]] = field(default_factory=dict)
     dotnet_packages: dict[str, bool] = field(default_factory=dict)
     """Dictionary of catpkg to whether a NuGet packages vendor archive should be built."""
@@ -63,11 +68,20 @@ class LivecheckSettings:
     """Dictionary of catpkg to form data for POST requests."""
     regex_multiline: dict[str, bool] = field(default_factory=dict)
     """Dictionary of catpkg to multiline flag for regex."""
+    freshness_policies: dict[str, FreshnessPolicy] = field(
+        default_factory=lambda: dict(DEFAULT_FRESHNESS_POLICIES))
+    """Dictionary of host name to how long its cached responses are used without revalidation."""
+    negative_cache_ttl: float = DEFAULT_NEGATIVE_TTL
+    """Seconds a 404, 410 or empty handler result is remembered (from ``--negative-cache-ttl``)."""
+    max_body_size: int = DEFAULT_MAX_BODY_SIZE
+    """Bytes of a scanned document read before giving up on the rest (from ``--max-body-size``)."""
     # Settings from command line flag.
     auto_update_flag: bool = False
     debug_flag: bool = False
     development_flag: bool = False
     git_flag: bool = False
+    github_graphql_flag: bool = False
+    """Resolve GitHub tags and branch heads through batched GraphQL queries."""
     keep_old_flag: bool = False
     progress_flag: bool = False
     default_package_manager: str = 'npm'
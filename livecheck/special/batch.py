@@ -0,0 +1,159 @@
+"""Lookups batched across concurrent package checks."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Generic, TypeVar
+import asyncio
+import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Mapping, Sequence
+
+__all__ = ('BatchHandler',)
+
+KeyT = TypeVar('KeyT', bound='Hashable')
+ResultT = TypeVar('ResultT')
+
+log = logging.getLogger(__name__)
+
+
+class BatchHandler(ABC, Generic[KeyT, ResultT]):
+    """
+    Handler whose upstream can look up several packages with one request.
+
+    Packages are checked concurrently and each check calls :py:meth:`check`. Keys queued within
+    :py:attr:`window` seconds of the first pending one are grouped and passed to
+    :py:meth:`check_many`. Keys missing from its result, or every key of the batch if it fails,
+    are looked up one at a time with :py:meth:`check_one`. Identical keys share one lookup.
+    """
+    name = 'batch'
+    """Name for log messages."""
+    def __init__(self, *, window: float = 0.05, max_batch: int = 20) -> None:
+        """
+        Initialise the handler.
+
+        Parameters
+        ----------
+        window : float
+            Seconds to wait for more keys before sending a batch.
+        max_batch : int
+            Maximum number of keys per batch. A full batch is sent immediately.
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[KeyT, asyncio.Future[ResultT]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def check(self, key: KeyT) -> ResultT:
+        """
+        Queue a key and wait for its batch to be resolved.
+
+        Parameters
+        ----------
+        key : KeyT
+            Key identifying the package upstream.
+
+        Returns
+        -------
+        ResultT
+            The result for ``key``.
+        """
+        if (future := self._pending.get(key)) is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        # Other callers may wait for the same key, so cancelling this one must not cancel theirs.
+        return await asyncio.shield(future)
+
+    def reset(self) -> None:
+        """Forget the pending keys, which belong to the event loop of a previous run."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = {}
+        self._tasks.clear()
+
+    @abstractmethod
+    async def check_many(self, keys: Sequence[KeyT]) -> Mapping[KeyT, ResultT]:
+        """
+        Look up several keys with one upstream request.
+
+        Parameters
+        ----------
+        keys : Sequence[KeyT]
+            Distinct keys.
+
+        Returns
+        -------
+        Mapping[KeyT, ResultT]
+            Results of the keys that were found. The others are passed to :py:meth:`check_one`.
+        """
+
+    @abstractmethod
+    async def check_one(self, key: KeyT) -> ResultT:
+        """
+        Look up a single key.
+
+        Parameters
+        ----------
+        key : KeyT
+            Key missing from the result of :py:meth:`check_many`.
+
+        Returns
+        -------
+        ResultT
+            The result for ``key``.
+        """
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _check_all(self, keys: Sequence[KeyT]) -> dict[KeyT, ResultT | BaseException]:
+        log.debug('Checking %d %s key(s) with one request.', len(keys), self.name)
+        results: dict[KeyT, ResultT | BaseException] = {}
+        try:
+            results.update(await self.check_many(keys))
+        except Exception:
+            log.exception('Batched %s lookup failed. Checking its keys one at a time.', self.name)
+        if missing := [key for key in keys if key not in results]:
+            log.debug('Checking %d %s key(s) one at a time.', len(missing), self.name)
+            # A failed key only fails its own callers.
+            results.update(
+                zip(missing,
+                    await asyncio.gather(*map(self.check_one, missing), return_exceptions=True),
+                    strict=True))
+        return results
+
+    async def _resolve(self, batch: Mapping[KeyT, asyncio.Future[ResultT]]) -> None:
+        try:
+            results = await self._check_all(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:  # ruff:ignore[blind-except]
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if isinstance(result := results[key], asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
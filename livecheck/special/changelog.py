@@ -1,11 +1,13 @@
 """Special changelog handling."""
 from __future__ import annotations
 
+from contextlib import aclosing
 from typing import TYPE_CHECKING
 import re
 
-from livecheck.utils import get_content
+from livecheck.utils import stream_text
 from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
+from livecheck.utils.string import iter_matches
 
 if TYPE_CHECKING:
     from livecheck.settings_model import LivecheckSettings
@@ -26,6 +28,9 @@ async def get_latest_changelog_package(ebuild: str, url: str, settings: Livechec
     """
     Get the latest version of a package from a Markdown changelog.
 
+    The changelog is scanned as it is downloaded, up to ``settings.max_body_size`` bytes. Every
+    heading is read because changelogs are not always newest first.
+
     Parameters
     ----------
     ebuild : str
@@ -41,22 +46,21 @@ async def get_latest_changelog_package(ebuild: str, url: str, settings: Livechec
         Latest version found in changelog headings, or an empty string if none.
     """
     catpkg, _, _, ebuild_version = catpkg_catpkgsplit(ebuild)
-    if not (r := await get_content(url,
-                                   headers=settings.request_headers.get(catpkg, {}),
-                                   params=settings.request_params.get(catpkg, {}),
-                                   method=settings.request_method.get(catpkg, 'GET'),
-                                   data=settings.request_data.get(catpkg, {}))):
-        return ''
-
     # Date-only headings (such as ``2024-01-31``) are normalised by ``sanitize_version`` into
     # Portage-valid versions and would otherwise win over real semantic-versioning tags. Keep them
     # only when the ebuild itself uses a date-like version.
     ebuild_is_date = bool(_DATE_VERSION_RE.match(ebuild_version))
-    results = [{
+    body = stream_text(url,
+                       headers=settings.request_headers.get(catpkg, {}),
+                       params=settings.request_params.get(catpkg, {}),
+                       method=settings.request_method.get(catpkg, 'GET'),
+                       data=settings.request_data.get(catpkg, {}),
+                       max_size=settings.max_body_size)
+    async with aclosing(body), aclosing(iter_matches(body, _CHANGELOG_HEADING_RE)) as matches:
+        tags = [match.group('bracketed') or match.group('plain') async for match in matches]
+    results: list[dict[str, str]] = [{
         'tag': tag
-    } for match in _CHANGELOG_HEADING_RE.finditer(r.text or '')
-               if (tag := match.group('bracketed') or match.group('plain')) and (
-                   ebuild_is_date or not _DATE_HEADING_RE.match(tag))]
+    } for tag in tags if tag and (ebuild_is_date or not _DATE_HEADING_RE.match(tag))]
     if last_version := get_last_version(results, '', ebuild, settings):
         return last_version['version']
 
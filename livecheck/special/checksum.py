@@ -1,39 +1,262 @@
 """Checksum functions."""
 from __future__ import annotations
 
+from collections import defaultdict
+from contextlib import suppress
+from email.utils import parsedate_to_datetime
+from itertools import starmap
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
 import re
 
 from anyio import Path as AnyioPath
-from livecheck.utils import get_content, get_last_modified, hash_url
-from livecheck.utils.portage import catpkg_catpkgsplit
+from livecheck.utils import get_content, hash_url
+from livecheck.utils.mirrors import resolve_mirror_uri
+from livecheck.utils.object_cache import get_cached_object, set_cached_object
+from livecheck.utils.portage import catpkg_catpkgsplit, get_distdir, get_fetch_map
+from livecheck.utils.requests import HashedURL, Validators, get_validators, register_run_state
 
 from .utils import EbuildTempFile
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
-__all__ = ('get_latest_checksum_package', 'get_latest_location_checksum_package',
-           'update_checksum_metadata')
+__all__ = ('MAX_DISTFILES_PER_HOST', 'get_latest_checksum_package',
+           'get_latest_location_checksum_package', 'update_checksum_metadata')
+
+log = logging.getLogger(__name__)
 
 PATTERN = re.compile(r'^DIST\s+(?P<file>\S+)\s+(?P<size>\d+)\s+BLAKE2B\s+'
                      r'(?P<blake2b>[a-fA-F0-9]+)\s+SHA512\s+(?P<sha512>[a-fA-F0-9]+)$')
 
+_VALIDATORS_KIND = 'distfile-validators'
+"""Object cache namespace of the validators of a URL when it served a body with a given digest."""
+_hashes: dict[str, HashedURL] = {}
+"""Digests and sizes computed while checking, by URL, for :py:func:`update_checksum_metadata`."""
+_drifted: dict[str, list[tuple[str, str]]] = {}
+"""``Manifest`` name and URL of the changed distfiles of packages checked with ``all_distfiles``."""
+register_run_state(_hashes.clear)
+register_run_state(_drifted.clear)
+MAX_DISTFILES_PER_HOST = 2
+"""Distfiles of a package downloaded at the same time from one host."""
 
-async def get_latest_checksum_package(
-        url: str,
-        ebuild: str,
-        repo_root: str,
-        headers: Mapping[str, str] | None = None,
-        params: Mapping[str, str] | None = None) -> tuple[str, str, str]:
+
+def _distdir_file(name: str) -> Path | None:
+    distdir = get_distdir()
+    if not os.access(distdir, os.W_OK):
+        log.debug('Not saving %s because %s is not writable.', name, distdir)
+        return None
+    return distdir / name
+
+
+def _local_distfile(name: str) -> tuple[Path, os.stat_result] | None:
+    path = get_distdir() / name
+    try:
+        return path, path.stat()
+    except OSError:
+        return None
+
+
+def _hash_file(path: Path) -> tuple[str, str, int]:
+    with path.open('rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return hashlib.blake2b().hexdigest(), hashlib.sha512().hexdigest(), 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.blake2b(mm).hexdigest(), hashlib.sha512(mm).hexdigest(), len(mm)
+
+
+async def _hash_local_distfile(url: str, local: tuple[Path, os.stat_result],
+                               current: Validators | None) -> HashedURL | None:
+    """
+    Hash a distfile already in ``DISTDIR`` if it is the file currently served at a URL.
+
+    The size must match ``Content-Length``. Then the file must have been written after the
+    ``Last-Modified`` date, or validators recorded for its digest must still match.
+
+    Parameters
+    ----------
+    url : str
+        URL of the distfile.
+    local : tuple[Path, os.stat_result]
+        The file in ``DISTDIR`` and its status.
+    current : Validators | None
+        Validators the URL answers with now.
+
+    Returns
+    -------
+    HashedURL | None
+        Digests of the local file, or ``None`` if it has to be downloaded.
+    """
+    path, st = local
+    if not current or current.content_length != str(st.st_size):
+        return None
+    written_after_change = False
+    with suppress(TypeError, ValueError):
+        written_after_change = st.st_mtime >= parsedate_to_datetime(
+            current.last_modified).timestamp()
+    blake2b, sha512, size = await asyncio.to_thread(_hash_file, path)
+    if not written_after_change:
+        cached = get_cached_object(_VALIDATORS_KIND, f'{url} {blake2b}')
+        if not cached or not Validators(*json.loads(cached)).matches(current):
+            log.debug('%s may be outdated. Downloading %s.', path, url)
+            return None
+    log.debug('Hashed %s instead of downloading %s.', path, url)
+    return HashedURL(blake2b, sha512, size, url=url, validators=current)
+
+
+async def _distfile_changed(url: str,
+                            m: re.Match[str],
+                            headers: Mapping[str, str] | None,
+                            params: Mapping[str, str] | None,
+                            *,
+                            save_to_distdir: bool = False) -> Validators | None:
+    """
+    Check if a distfile no longer matches its ``Manifest`` entry.
+
+    The body is only downloaded and hashed if the validators (``ETag``, ``Last-Modified`` and
+    ``Content-Length``) seen when this digest was last hashed are unknown or have changed. An
+    up-to-date copy in ``DISTDIR`` is hashed instead of downloading it.
+
+    Parameters
+    ----------
+    url : str
+        URL of the distfile.
+    m : re.Match[str]
+        ``DIST`` line of the distfile.
+    headers : Mapping[str, str] | None
+        Optional HTTP headers for fetches.
+    params : Mapping[str, str] | None
+        Optional query parameters for fetches.
+    save_to_distdir : bool
+        Save the distfile to ``DISTDIR`` if it is downloaded.
+
+    Returns
+    -------
+    Validators | None
+        Validators of the distfile if it changed or could not be hashed (empty if unknown), or
+        ``None`` if it is unchanged.
+    """
+    known = None
+    if cached := get_cached_object(_VALIDATORS_KIND, f'{url} {m.group("blake2b")}'):
+        known = Validators(*json.loads(cached))
+    current = await get_validators(url, headers=headers, params=params, known=known)
+    if current and current.content_length not in {'', m.group('size')}:
+        log.debug('Size of %s changed to %s bytes.', url, current.content_length)
+        return current
+    if current and known and known.matches(current):
+        log.debug('Validators of %s are unchanged. Not hashing it.', url)
+        return None
+    hashed = None
+    if local := await asyncio.to_thread(_local_distfile, m.group('file')):
+        hashed = await _hash_local_distfile(url, local, current)
+    if hashed is None:
+        save_to = await asyncio.to_thread(_distdir_file,
+                                          m.group('file')) if save_to_distdir else None
+        hashed = await hash_url(url, headers=headers, params=params, save_to=save_to)
+    if not hashed.blake2b:
+        return current or Validators()
+    _hashes[url] = hashed
+    # Prefer the HEAD answer: the GET response may be compressed in transit.
+    validators = current or hashed.validators
+    set_cached_object(_VALIDATORS_KIND, f'{url} {hashed.blake2b}', json.dumps(validators))
+    if hashed.blake2b != m.group('blake2b') or hashed.sha512 != m.group('sha512'):
+        log.debug('Digests of %s changed (served from %s).', url, hashed.url)
+        return validators
+    return None
+
+
+async def _drifted_distfiles(url: str,
+                             ebuild: str,
+                             repo_root: str,
+                             dist_lines: list[re.Match[str]],
+                             headers: Mapping[str, str] | None,
+                             params: Mapping[str, str] | None,
+                             *,
+                             save_to_distdir: bool = False) -> list[tuple[str, str, Validators]]:
+    """
+    Check every distfile of an ebuild concurrently.
+
+    Parameters
+    ----------
+    url : str
+        URL to use for the distfile with the same base name instead of the one in ``SRC_URI``.
+    ebuild : str
+        Ebuild atom string.
+    repo_root : str
+        Repository root containing the ebuild.
+    dist_lines : list[re.Match[str]]
+        ``DIST`` lines of the package ``Manifest``.
+    headers : Mapping[str, str] | None
+        Optional HTTP headers for fetches.
+    params : Mapping[str, str] | None
+        Optional query parameters for fetches.
+    save_to_distdir : bool
+        Save downloaded distfiles to ``DISTDIR``.
+
+    Returns
+    -------
+    list[tuple[str, str, Validators]]
+        ``Manifest`` name, URL and validators of each changed distfile, in ``Manifest`` order.
+        The URL may have another base name, for example with ``SRC_URI`` arrows or mirrors.
+    """
+    try:
+        fetch_map = await get_fetch_map(ebuild, repo_root)
+    except KeyError:
+        log.exception('Error getting the distfiles of %s.', ebuild)
+        fetch_map = {}
+    fetch_map[Path(url).name] = (url,)
+    limits: defaultdict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(MAX_DISTFILES_PER_HOST))
+
+    async def check(m: re.Match[str]) -> tuple[str, str, Validators] | None:
+        for u in fetch_map.get(m.group('file'), ()):
+            if (uri := await resolve_mirror_uri(u)).startswith(('http://', 'https://')):
+                break
+        else:
+            # Older ebuilds of the package, or a distfile only on a mirror that did not answer.
+            return None
+        async with limits[urlparse(uri).hostname or '']:
+            changed = await _distfile_changed(uri,
+                                              m,
+                                              headers,
+                                              params,
+                                              save_to_distdir=save_to_distdir)
+        return (m.group('file'), uri, changed) if changed else None
+
+    return [r for r in await asyncio.gather(*(check(m) for m in dist_lines)) if r]
+
+
+async def get_latest_checksum_package(url: str,
+                                      ebuild: str,
+                                      repo_root: str,
+                                      headers: Mapping[str, str] | None = None,
+                                      params: Mapping[str, str] | None = None,
+                                      *,
+                                      save_to_distdir: bool = False,
+                                      all_distfiles: bool = False) -> tuple[str, str, str]:
     """
     Get the latest version of a package based on its checksum.
 
+    A conditional ``HEAD`` request is made first so unchanged distfiles are not downloaded again.
+    The last-modified hint comes from the headers of these requests.
+    A downloaded distfile can be saved to ``DISTDIR`` so ``ebuild digest`` and
+    :py:func:`update_checksum_metadata` do not download and hash it again.
+
+    With ``all_distfiles``, every distfile of the ebuild is checked concurrently (at most
+    :py:data:`MAX_DISTFILES_PER_HOST` at a time per host) and the changed ones are logged.
+
     Parameters
     ----------
     url : str
-        URL of the distfile to verify.
+        URL of the distfile to verify. ``mirror://`` URIs are fetched from the fastest mirror of
+        their group.
     ebuild : str
         Ebuild atom string.
     repo_root : str
@@ -42,13 +265,19 @@ async def get_latest_checksum_package(
         Optional HTTP headers for fetches.
     params : Mapping[str, str] | None
         Optional query parameters for fetches.
+    save_to_distdir : bool
+        Save the distfile to ``DISTDIR`` if it is downloaded.
+    all_distfiles : bool
+        Check every distfile of the ebuild instead of the one at ``url``.
 
     Returns
     -------
     tuple[str, str, str]
-        Current ebuild version, last-modified hint, and URL when checksums differ; otherwise empty
-        strings.
+        Current ebuild version, last-modified hint, and URL (of the first changed distfile with
+        ``all_distfiles``) when checksums differ; otherwise empty strings.
     """
+    if not (url := await resolve_mirror_uri(url)):
+        return '', '', ''
     catpkg, _, _, version = catpkg_catpkgsplit(ebuild)
     manifest_file = Path(repo_root) / catpkg / 'Manifest'
     bn = Path(url).name
@@ -59,21 +288,33 @@ async def get_latest_checksum_package(
         m for line in manifest_text.splitlines() if (m := PATTERN.match(line))
     ]
 
+    if all_distfiles and len(dist_lines) > 1:
+        if drifted := await _drifted_distfiles(url,
+                                               ebuild,
+                                               repo_root,
+                                               dist_lines,
+                                               headers,
+                                               params,
+                                               save_to_distdir=save_to_distdir):
+            log.info('Changed distfiles of %s: %s.', catpkg,
+                     ', '.join(name for name, _, _ in drifted))
+            _drifted[catpkg] = [(name, u) for name, u, _ in drifted]
+            return version, max(v.last_modified_date for _, _, v in drifted), drifted[0][1]
     # If only one DIST entry, check it regardless of filename
-    if len(dist_lines) == 1:
+    elif len(dist_lines) == 1:
         m = dist_lines[0]
-        blake2, sha512, _ = await hash_url(url, headers=headers, params=params)
-        if blake2 != m.group('blake2b') or sha512 != m.group('sha512'):
-            last_modified = await get_last_modified(url, headers=headers, params=params)
-            return version, last_modified, url
+        if changed := await _distfile_changed(url,
+                                              m,
+                                              headers,
+                                              params,
+                                              save_to_distdir=save_to_distdir):
+            return version, changed.last_modified_date, url
     else:
         # Multiple entries: match by filename
         for m in dist_lines:
-            if m.group('file') == bn:
-                blake2, sha512, _ = await hash_url(url, headers=headers, params=params)
-                if blake2 != m.group('blake2b') or sha512 != m.group('sha512'):
-                    last_modified = await get_last_modified(url, headers=headers, params=params)
-                    return version, last_modified, url
+            if m.group('file') == bn and (changed := await _distfile_changed(
+                    url, m, headers, params, save_to_distdir=save_to_distdir)):
+                return version, changed.last_modified_date, url
 
     return '', '', ''
 
@@ -83,7 +324,9 @@ async def get_latest_location_checksum_package(
         ebuild: str,
         repo_root: str,
         headers: Mapping[str, str] | None = None,
-        params: Mapping[str, str] | None = None) -> tuple[str, str, str]:
+        params: Mapping[str, str] | None = None,
+        *,
+        save_to_distdir: bool = False) -> tuple[str, str, str]:
     """
     Get the latest version of a package based on Location header and checksum.
 
@@ -99,6 +342,8 @@ async def get_latest_location_checksum_package(
         Optional HTTP headers for fetches.
     params : Mapping[str, str] | None
         Optional query parameters for fetches.
+    save_to_distdir : bool
+        Save the distfile to ``DISTDIR`` if it is downloaded.
 
     Returns
     -------
@@ -106,6 +351,8 @@ async def get_latest_location_checksum_package(
         Version, last-modified hint, and final URL when the redirected distfile differs; otherwise
         empty strings.
     """
+    if not (url := await resolve_mirror_uri(url)):
+        return '', '', ''
     # First, follow the redirect to get the Location header
     r = await get_content(url, allow_redirects=False, headers=headers, params=params)
 
@@ -119,7 +366,8 @@ async def get_latest_location_checksum_package(
                                              ebuild,
                                              repo_root,
                                              headers=headers,
-                                             params=params)
+                                             params=params,
+                                             save_to_distdir=save_to_distdir)
 
 
 async def update_checksum_metadata(ebuild: str,
@@ -127,19 +375,42 @@ async def update_checksum_metadata(ebuild: str,
                                    repo_root: str,
                                    headers: Mapping[str, str] | None = None,
                                    params: Mapping[str, str] | None = None) -> None:
-    """Update the checksum metadata in the Manifest file."""
+    """
+    Update the checksum metadata in the Manifest file.
+
+    Distfiles found to have changed by :py:func:`get_latest_checksum_package` with
+    ``all_distfiles`` are updated too. Digests computed while checking, or of an up-to-date copy
+    in ``DISTDIR``, are used instead of downloading the distfiles again.
+    """
     catpkg, _, _, _ = catpkg_catpkgsplit(ebuild)
     manifest_file = Path(repo_root) / catpkg / 'Manifest'
-    blake2, sha512, size = await hash_url(url, headers=headers, params=params)
-    bn = Path(url).name
+
+    async def get_hashes(name: str, url: str) -> HashedURL:
+        # The distfile was usually hashed when it was found to have changed.
+        if (hashed := _hashes.pop(url, None)) is not None:
+            return hashed
+        # Fetching for the digest usually leaves it in DISTDIR.
+        if (local := await asyncio.to_thread(
+                _local_distfile, name)) and (hashed := await _hash_local_distfile(
+                    url, local, await get_validators(url, headers=headers, params=params))):
+            return hashed
+        return await hash_url(url, headers=headers, params=params)
+
+    # Distfiles by Manifest name, which differs from the URL's with SRC_URI arrows or mirrors.
+    distfiles = dict(_drifted.pop(catpkg, ()))
+    if url not in distfiles.values():
+        distfiles.setdefault(Path(url).name, url)
+    hashes = dict(
+        zip(distfiles, await asyncio.gather(*starmap(get_hashes, distfiles.items())), strict=True))
 
     async with EbuildTempFile(str(manifest_file)) as temp_file:
         manifest_text = await AnyioPath(manifest_file).read_text(encoding='utf-8')
         out_lines: list[str] = []
         for line in manifest_text.splitlines(keepends=True):
             m = PATTERN.match(line)
-            if m and m.group('file') == bn:
-                out_lines.append(f'DIST {bn} {size} BLAKE2B {blake2} SHA512 {sha512}\n')
+            if m and (hashed := hashes.get(bn := m.group('file'))):
+                out_lines.append(f'DIST {bn} {hashed.size} BLAKE2B {hashed.blake2b} '
+                                 f'SHA512 {hashed.sha512}\n')
             else:
                 out_lines.append(line)
         await AnyioPath(temp_file).write_text(''.join(out_lines), encoding='utf-8')
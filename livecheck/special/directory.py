@@ -1,21 +1,94 @@
 """Directory functions."""
 from __future__ import annotations
 
+from html import unescape
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
+import asyncio
+import logging
 import re
 
 from bs4 import BeautifulSoup
 from livecheck.utils import get_content
+from livecheck.utils.mirrors import resolve_mirror_uri
 from livecheck.utils.portage import get_last_version
+from livecheck.utils.requests import register_run_state
 
 from .utils import get_archive_extension
 
 if TYPE_CHECKING:
     from livecheck.settings_model import LivecheckSettings
 
-__all__ = ('get_latest_directory_package',)
+__all__ = ('extract_hrefs', 'get_directory_listing', 'get_latest_directory_package')
+
+HREF_PATTERN = re.compile(r"""<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+                          re.IGNORECASE)
+
+log = logging.getLogger(__name__)
+
+_listings: dict[str, asyncio.Task[list[str] | None]] = {}
+register_run_state(_listings.clear)
+
+
+def extract_hrefs(html: str) -> list[str]:
+    """
+    Extract the link targets of the anchors in an HTML document.
+
+    This is a single regular expression pass, much faster than building a tree on large
+    auto-index pages.
+
+    Parameters
+    ----------
+    html : str
+        HTML document.
+
+    Returns
+    -------
+    list[str]
+        ``href`` values in document order with character references decoded.
+    """
+    return [
+        unescape(next(value for value in m.groups() if value is not None))
+        for m in HREF_PATTERN.finditer(html)
+    ]
+
+
+def _parse_listing(html: str) -> list[str]:
+    if hrefs := extract_hrefs(html):
+        return hrefs
+    # Broken markup (unquoted attributes with spaces, anchors split by comments, etc.).
+    return [str(a['href']) for a in BeautifulSoup(html, 'html5lib').find_all('a', href=True)]
+
+
+async def _fetch_listing(directory: str) -> list[str] | None:
+    if not (r := await get_content(directory)):
+        return None
+    return _parse_listing(r.text or '')
+
+
+async def get_directory_listing(directory: str) -> list[str] | None:
+    """
+    Get the link targets of a directory listing.
+
+    Listings are fetched and parsed once per run, so packages sharing a mirror directory reuse
+    them.
+
+    Parameters
+    ----------
+    directory : str
+        URL of the directory listing.
+
+    Returns
+    -------
+    list[str] | None
+        ``href`` values, or ``None`` if the listing could not be fetched.
+    """
+    if (task := _listings.get(directory)) is None:
+        task = _listings[directory] = asyncio.create_task(_fetch_listing(directory))
+    else:
+        log.debug('Using the cached listing of %s.', directory)
+    return await asyncio.shield(task)
 
 
 async def get_latest_directory_package(url: str, ebuild: str,
@@ -26,7 +99,8 @@ async def get_latest_directory_package(url: str, ebuild: str,
     Parameters
     ----------
     url : str
-        URL of a distfile or directory listing.
+        URL of a distfile or directory listing. ``mirror://`` URIs are listed on the fastest
+        mirror of their group.
     ebuild : str
         Ebuild atom string.
     settings : LivecheckSettings
@@ -37,16 +111,18 @@ async def get_latest_directory_package(url: str, ebuild: str,
     tuple[str, str]
         Latest version string and resolved URL, or empty strings if none found.
     """
+    if not (url := await resolve_mirror_uri(url)):
+        return '', ''
     if m := re.search(r'^(.*?)(?=-\d)', Path(url).name):
         directory = re.sub(r'/[^/]+$', '', url) + '/'
-        if not (r := await get_content(directory)):
+        if (hrefs := await get_directory_listing(directory)) is None:
             return '', ''
 
         archive = m.group(1).strip()
 
         results: list[dict[str, str]] = []
-        for item in BeautifulSoup(r.text or '', 'html5lib').find_all('a', href=True):
-            if (href := item['href']) and get_archive_extension(href):
+        for href in hrefs:
+            if href and get_archive_extension(href):
                 file = urlparse(urljoin(directory, href)).path
                 name = Path(file).name
                 if name.startswith(archive):
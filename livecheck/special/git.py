@@ -0,0 +1,289 @@
+"""Git smart HTTP functions."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import urlparse
+import logging
+import re
+
+from livecheck import __version__
+from livecheck.utils import is_sha, session_init
+from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
+import niquests
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from livecheck.settings_model import LivecheckSettings
+
+__all__ = ('GitRefs', 'get_latest_git', 'get_latest_git_commit', 'get_latest_git_package', 'is_git',
+           'ls_refs')
+
+log = logging.getLogger(__name__)
+
+GIT_UPLOAD_PACK_URL = '%s/git-upload-pack'
+FLUSH_PKT = b'0000'
+DELIM_PKT = b'0001'
+_PKT_LEN_SIZE = 4
+_OID_RE = re.compile(r'^(?:[0-9a-f]{40}|[0-9a-f]{64})$')
+
+
+class GitRefs(NamedTuple):
+    """References advertised by a remote in reply to ``ls-refs``."""
+    heads: dict[str, str]
+    """Branch name to commit SHA."""
+    tags: dict[str, str]
+    """Tag name to commit SHA. Annotated tags are already peeled."""
+    head: str = ''
+    """Default branch name (target of ``HEAD``), if advertised."""
+
+
+def _pkt_line(data: str) -> bytes:
+    encoded = data.encode()
+    return f'{len(encoded) + _PKT_LEN_SIZE:04x}'.encode() + encoded
+
+
+def _iter_pkt_lines(data: bytes) -> Iterator[bytes]:
+    """
+    Split a pkt-line stream into payloads up to the first flush packet.
+
+    Parameters
+    ----------
+    data : bytes
+        Raw response body.
+
+    Yields
+    ------
+    bytes
+        Payload of each data packet.
+
+    Raises
+    ------
+    ValueError
+        If the stream is truncated or a length prefix is not hexadecimal.
+    """
+    pos = 0
+    while pos < len(data):
+        length = int(data[pos:pos + _PKT_LEN_SIZE], 16)
+        if length < _PKT_LEN_SIZE:
+            return
+        if pos + length > len(data):
+            msg = 'Truncated pkt-line.'
+            raise ValueError(msg)
+        yield data[pos + _PKT_LEN_SIZE:pos + length]
+        pos += length
+
+
+def build_ls_refs_request() -> bytes:
+    """
+    Build a protocol v2 ``ls-refs`` request body.
+
+    Returns
+    -------
+    bytes
+        Request asking for peeled branches, tags and the ``HEAD`` symbolic reference.
+    """
+    return b''.join(
+        (_pkt_line('command=ls-refs\n'), _pkt_line(f'agent=livecheck/{__version__}\n'), DELIM_PKT,
+         _pkt_line('peel\n'), _pkt_line('symrefs\n'), _pkt_line('ref-prefix HEAD\n'),
+         _pkt_line('ref-prefix refs/heads/\n'), _pkt_line('ref-prefix refs/tags/\n'), FLUSH_PKT))
+
+
+def parse_ls_refs_response(data: bytes) -> GitRefs:
+    """
+    Parse a protocol v2 ``ls-refs`` response.
+
+    Parameters
+    ----------
+    data : bytes
+        Raw response body.
+
+    Returns
+    -------
+    GitRefs
+        Advertised branches, peeled tags and default branch. Empty if the server answered with an
+        error or a non-v2 response.
+    """
+    try:
+        lines = [line.decode().rstrip('\n') for line in _iter_pkt_lines(data)]
+    except (ValueError, UnicodeDecodeError):
+        log.debug('Invalid ls-refs response.')
+        return GitRefs({}, {})
+    heads: dict[str, str] = {}
+    tags: dict[str, str] = {}
+    head = ''
+    for line in lines:
+        if line.startswith('ERR '):
+            log.debug('Remote error: %s', line[4:])
+            return GitRefs({}, {})
+        oid, _, rest = line.partition(' ')
+        ref, *attributes = rest.split(' ')
+        peeled = oid
+        for attribute in attributes:
+            key, _, value = attribute.partition(':')
+            if key == 'peeled':
+                peeled = value
+            elif key == 'symref-target' and ref == 'HEAD':
+                head = value.removeprefix('refs/heads/')
+        if not _OID_RE.match(peeled):
+            continue
+        if ref.startswith('refs/heads/'):
+            heads[ref.removeprefix('refs/heads/')] = peeled
+        elif ref.startswith('refs/tags/'):
+            tags[ref.removeprefix('refs/tags/')] = peeled
+    return GitRefs(heads, tags, head)
+
+
+def extract_repository(url: str) -> str:
+    """
+    Get the smart HTTP repository URL from an ``EGIT_REPO_URI`` style URL.
+
+    Parameters
+    ----------
+    url : str
+        Repository URL, optionally suffixed with ``/commit/<sha>`` by the caller.
+
+    Returns
+    -------
+    str
+        Repository URL without query, fragment or commit suffix, or an empty string if the scheme
+        is not HTTP(S).
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in {'http', 'https'} or not parsed.netloc:
+        return ''
+    path = re.sub(r'/commit/[^/]*$', '', parsed.path).rstrip('/')
+    if not path:
+        return ''
+    return f'{parsed.scheme}://{parsed.netloc}{path}'
+
+
+async def ls_refs(url: str) -> GitRefs:
+    """
+    List the branches and tags of a remote over git smart HTTP (protocol v2).
+
+    A single ``POST`` to ``git-upload-pack`` returns every branch and tag with annotated tags
+    already peeled, without using any forge REST API quota.
+
+    Parameters
+    ----------
+    url : str
+        Repository URL.
+
+    Returns
+    -------
+    GitRefs
+        Advertised references, or empty mappings on failure.
+    """
+    if not (repository := extract_repository(url)):
+        return GitRefs({}, {})
+    session = session_init('git')
+    try:
+        r = await session.post(GIT_UPLOAD_PACK_URL % repository,
+                               data=build_ls_refs_request(),
+                               timeout=30)
+        r.raise_for_status()
+    except niquests.RequestException:
+        log.exception('Error listing references of %s.', repository)
+        return GitRefs({}, {})
+    return parse_ls_refs_response(r.content or b'')
+
+
+async def get_latest_git_package(url: str, ebuild: str,
+                                 settings: LivecheckSettings) -> tuple[str, str]:
+    """
+    Get the latest tagged version of a git repository.
+
+    Parameters
+    ----------
+    url : str
+        Repository URL.
+    ebuild : str
+        Ebuild atom string.
+    settings : LivecheckSettings
+        Livecheck settings.
+
+    Returns
+    -------
+    tuple[str, str]
+        Latest tag version and peeled commit SHA, or empty strings if unavailable.
+    """
+    refs = await ls_refs(url)
+    results = [{'tag': tag, 'id': sha} for tag, sha in refs.tags.items()]
+    repo = extract_repository(url).rsplit('/', 1)[-1].removesuffix('.git')
+    if last_version := get_last_version(results, repo, ebuild, settings):
+        return last_version['version'], last_version['id']
+    return '', ''
+
+
+async def get_latest_git_commit(url: str, branch: str = '') -> str:
+    """
+    Get the head commit of a branch of a git repository.
+
+    Parameters
+    ----------
+    url : str
+        Repository URL.
+    branch : str
+        Branch name. The remote's default branch is used when empty.
+
+    Returns
+    -------
+    str
+        Commit SHA, or an empty string if the branch does not exist.
+    """
+    refs = await ls_refs(url)
+    return refs.heads.get(branch or refs.head, '')
+
+
+async def get_latest_git(url: str, ebuild: str, settings: LivecheckSettings, *,
+                         force_sha: bool) -> tuple[str, str, str]:
+    """
+    Get the latest version or commit of a git repository.
+
+    Commit-pinned URLs (``/commit/<sha>``) and packages with a configured branch resolve the
+    branch head; anything else resolves the latest tag. Smart HTTP does not advertise commit dates,
+    so the hash date is always empty.
+
+    Parameters
+    ----------
+    url : str
+        Repository URL.
+    ebuild : str
+        Ebuild atom string.
+    settings : LivecheckSettings
+        Livecheck settings.
+    force_sha : bool
+        Whether to retain the commit hash from tag lookups.
+
+    Returns
+    -------
+    tuple[str, str, str]
+        Latest version, commit hash, and hash date.
+    """
+    catpkg, _, _, _ = catpkg_catpkgsplit(ebuild)
+    last_version = top_hash = ''
+    if (branch := settings.branches.get(catpkg, '')) or is_sha(urlparse(url).path):
+        top_hash = await get_latest_git_commit(url, branch)
+    else:
+        last_version, top_hash = await get_latest_git_package(url, ebuild, settings)
+        if not force_sha:
+            top_hash = ''
+    return last_version, top_hash, ''
+
+
+def is_git(url: str) -> bool:
+    """
+    Check if the URL is a git repository reachable over smart HTTP.
+
+    Parameters
+    ----------
+    url : str
+        URL to inspect.
+
+    Returns
+    -------
+    bool
+        ``True`` if the URL is HTTP(S) and its path ends with ``.git``.
+    """
+    return extract_repository(url).endswith('.git')
@@ -4,11 +4,15 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 from urllib.parse import quote, urlparse
+import asyncio
+import logging
 import re
 
 from livecheck.utils import get_content, is_sha
+from livecheck.utils.object_cache import get_cached_object, set_cached_object
 from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
 
+from .github_graphql import lookup_github_repository
 from .utils import get_archive_extension
 
 if TYPE_CHECKING:
@@ -18,12 +22,22 @@ __all__ = ('GITHUB_METADATA', 'get_github_branch_for_commit', 'get_latest_github
            'get_latest_github_commit', 'get_latest_github_commit2', 'get_latest_github_metadata',
            'get_latest_github_package', 'is_github', 'is_github_release_url')
 
+log = logging.getLogger(__name__)
+
 GITHUB_BRANCH_URL = 'https://api.github.com/repos/%s/%s/branches/%s'
+GITHUB_COMMIT_DATE_KIND = 'github-commit-date'
+"""Object cache namespace mapping ``owner/repo@sha`` to the commit date (``YYYYMMDD``)."""
+GITHUB_COMMIT_URL = 'https://api.github.com/repos/%s/%s/commits/%s'
 GITHUB_COMPARE_URL = 'https://api.github.com/repos/%s/%s/compare/%s...%s'
 GITHUB_COMPARE_REACHABLE_STATUSES = frozenset({'ahead', 'identical'})
 """GitHub compare ``status`` values meaning the base commit is reachable from the head ref."""
 GITHUB_DATE_URL = 'https://api.github.com/repos/%s/%s/git/refs/tags/%s'
+GITHUB_LATEST_RELEASE_URL = 'https://api.github.com/repos/%s/%s/releases/latest'
+GITHUB_MATCHING_HEADS_URL = 'https://api.github.com/repos/%s/%s/git/matching-refs/heads/'
 GITHUB_METADATA = 'github'
+GITHUB_SHA_MEDIA_TYPE = 'application/vnd.github.sha'
+GITHUB_TAG_OBJECT_KIND = 'github-tag'
+"""Object cache namespace mapping ``owner/repo@tag`` to the peeled commit SHA."""
 GITHUB_TAGS_URL = 'https://api.github.com/repos/%s/%s/tags?per_page=100'
 
 
@@ -84,6 +98,100 @@ def extract_owner_repo(url: str) -> tuple[str, str, str]:
     return '', '', ''
 
 
+def _format_github_date(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value[:10]).strftime('%Y%m%d')
+    except ValueError:
+        return value[:10]
+
+
+def _use_latest_release(url: str, ebuild: str, settings: LivecheckSettings) -> bool:
+    # Only trust ``releases/latest`` when the ebuild is fetched from release assets. It never
+    # includes pre-releases, so development packages still enumerate every tag.
+    return is_github_release_url(url) and not settings.is_devel(catpkg_catpkgsplit(ebuild)[0])
+
+
+def _is_date_versioned(ebuild: str) -> bool:
+    # Same 6 or 8 digit runs that ``replace_date_in_ebuild`` rewrites.
+    return bool(re.search(r'(?<!\d)(?:\d{6}|\d{8})(?!\d)', ebuild))
+
+
+async def _get_github_latest_release(owner: str, repo: str) -> str:
+    if not (r := await get_content(GITHUB_LATEST_RELEASE_URL % (owner, repo))):
+        return ''
+    try:
+        release = r.json()
+    except ValueError:
+        return ''
+    return str(release.get('tag_name') or '') if isinstance(release, dict) else ''
+
+
+async def _get_github_tags(owner: str, repo: str) -> list[str] | None:
+    if not (r := await get_content(GITHUB_TAGS_URL % (owner, repo))):
+        return None
+    try:
+        tags = r.json()
+    except ValueError:
+        return None
+    if not isinstance(tags, list):
+        return None
+    return [name for entry in tags if isinstance(entry, dict) and (name := entry.get('name'))]
+
+
+async def _get_github_commit_sha(owner: str, repo: str, ref: str) -> str:
+    if not (r := await get_content(GITHUB_COMMIT_URL % (owner, repo, quote(ref, safe='')),
+                                   headers={'Accept': GITHUB_SHA_MEDIA_TYPE})):
+        log.debug('Could not resolve %s/%s@%s with the SHA media type.', owner, repo, ref)
+        return ''
+    sha = (r.text or '').strip()
+    return sha if re.match(r'^[0-9a-f]{40}$', sha) else ''
+
+
+async def _get_github_commit_date(owner: str, repo: str, sha: str) -> str:
+    cache_key = f'{owner}/{repo}@{sha}'
+    if date := get_cached_object(GITHUB_COMMIT_DATE_KIND, cache_key):
+        return date
+    if not (r := await get_content(GITHUB_COMMIT_URL % (owner, repo, sha))):
+        return ''
+    date = _format_github_date(r.json()['commit']['committer']['date'])
+    set_cached_object(GITHUB_COMMIT_DATE_KIND, cache_key, date)
+    return date
+
+
+async def _get_github_branches(owner: str, repo: str) -> set[str]:
+    if not (r := await get_content(GITHUB_MATCHING_HEADS_URL % (owner, repo))):
+        return set()
+    try:
+        refs = r.json()
+    except ValueError:
+        return set()
+    if not isinstance(refs, list):
+        return set()
+    return {
+        ref.removeprefix('refs/heads/')
+        for entry in refs if isinstance(entry, dict) and isinstance(ref := entry.get('ref'), str)
+    }
+
+
+async def _get_github_tag_commit(owner: str, repo: str, tag: str) -> str:
+    # A published tag practically never moves, so its commit is cached without revalidation.
+    cache_key = f'{owner}/{repo}@{tag}'
+    if sha := get_cached_object(GITHUB_TAG_OBJECT_KIND, cache_key):
+        return sha
+    if not (r := await get_content(GITHUB_DATE_URL % (owner, repo, tag))):
+        return ''
+    ref_object = r.json().get('object', {})
+    object_url = ref_object.get('url')
+    if object_url and ref_object.get('type') == 'tag':
+        if not (r2 := await get_content(object_url)):
+            return ''
+        sha = r2.json().get('object', {}).get('sha')
+    else:
+        sha = ref_object.get('sha')
+    set_cached_object(GITHUB_TAG_OBJECT_KIND, cache_key, sha or '')
+    return sha or ''
+
+
 async def get_github_branch_for_commit(url: str, version: str, commit: str) -> str:
     """
     Find a likely GitHub branch containing a version commit.
@@ -105,21 +213,23 @@ async def get_github_branch_for_commit(url: str, version: str, commit: str) -> s
     _, owner, repo = extract_owner_repo(url)
     if not owner or not repo:
         return ''
-    for branch in _github_version_branch_candidates(version):
-        # Confirm the candidate is a real branch before trusting it. The compare API also
-        # resolves tags, so a version such as ``2.10.1`` that exists only as a tag would
-        # otherwise be returned as a branch and break ``git-r3`` (it fetches
-        # ``refs/heads/<branch>``).
-        branch_url = GITHUB_BRANCH_URL % (owner, repo, quote(branch, safe=''))
-        if not await get_content(branch_url):
-            continue
+    # Only consider real branches. The compare API also resolves tags, so a version such as
+    # ``2.10.1`` that exists only as a tag would otherwise be returned as a branch and break
+    # ``git-r3`` (it fetches ``refs/heads/<branch>``).
+    branches = await _get_github_branches(owner, repo)
+    candidates = [b for b in _github_version_branch_candidates(version) if b in branches]
+    if not candidates:
+        return ''
+
+    async def is_reachable(branch: str) -> bool:
         compare_url = GITHUB_COMPARE_URL % (owner, repo, quote(commit,
                                                                safe=''), quote(branch, safe=''))
         if not (r := await get_content(compare_url)):
-            continue
-        if r.json().get('status') in GITHUB_COMPARE_REACHABLE_STATUSES:
-            return branch
-    return ''
+            return False
+        return r.json().get('status') in GITHUB_COMPARE_REACHABLE_STATUSES
+
+    reachable = await asyncio.gather(*(is_reachable(branch) for branch in candidates))
+    return next((branch for branch, ok in zip(candidates, reachable, strict=True) if ok), '')
 
 
 async def get_latest_github_package(url: str, ebuild: str,
@@ -143,46 +253,46 @@ async def get_latest_github_package(url: str, ebuild: str,
     """
     version_reference = _github_tag_reference(url)
     _, owner, repo = extract_owner_repo(url)
-    if not owner or not repo or not (r := await get_content(GITHUB_TAGS_URL % (owner, repo))):
+    if not owner or not repo:
         return '', ''
 
-    try:
-        tags = r.json()
-    except ValueError:
-        return '', ''
-    if not isinstance(tags, list):
+    def pick(results: list[dict[str, str]]) -> dict[str, str]:
+        return get_last_version(results,
+                                repo,
+                                ebuild,
+                                settings,
+                                version_reference=version_reference)
+
+    use_release = _use_latest_release(url, ebuild, settings)
+    if settings.github_graphql_flag and (refs := await lookup_github_repository(owner, repo)):
+        # Tags arrive already peeled, so no per-tag reference lookups are needed.
+        release = refs.latest_release if use_release and refs.latest_release in refs.tags else ''
+        last_version = (release and pick([{
+            'tag': release,
+            'id': refs.tags[release]
+        }])) or pick([{
+            'tag': tag,
+            'id': sha
+        } for tag, sha in refs.tags.items()])
+        return (last_version['version'], last_version['id']) if last_version else ('', '')
+    if use_release and (release := await _get_github_latest_release(
+            owner, repo)) and (last_version := pick([{
+                'tag': release,
+                'id': release
+            }])):
+        return last_version['version'], await _get_github_tag_commit(owner, repo, release)
+    if (tags := await _get_github_tags(owner, repo)) is None:
         return '', ''
-
-    results = [{
-        'tag': name,
-        'id': name
-    } for entry in tags if isinstance(entry, dict) and (name := entry.get('name'))]
-
-    if not (last_version := get_last_version(
-            results, repo, ebuild, settings, version_reference=version_reference)):
+    if not (last_version := pick([{'tag': name, 'id': name} for name in tags])):
         return '', ''
+    return last_version['version'], await _get_github_tag_commit(owner, repo, last_version['id'])
 
-    url = GITHUB_DATE_URL % (owner, repo, last_version['id'])
-    if not (r := await get_content(url)):
-        return last_version['version'], ''
-
-    ref_object = r.json().get('object', {})
-    object_url = ref_object.get('url')
-
-    if object_url and ref_object.get('type') == 'tag':
-        r2 = await get_content(object_url)
-        if not r2:
-            return last_version['version'], ''
-
-        tag_data = r2.json()
-        sha = tag_data.get('object', {}).get('sha')
-    else:
-        sha = ref_object.get('sha')
-
-    return last_version['version'], sha or ''
 
-
-async def get_latest_github_commit(url: str, branch: str) -> tuple[str, str]:
+async def get_latest_github_commit(url: str,
+                                   branch: str,
+                                   *,
+                                   graphql: bool = False,
+                                   with_date: bool = True) -> tuple[str, str]:
     """
     Get the latest commit hash and date for a Github repository.
 
@@ -192,6 +302,10 @@ async def get_latest_github_commit(url: str, branch: str) -> tuple[str, str]:
         Repository URL in a form understood by :py:func:`extract_owner_repo`.
     branch : str
         Branch name.
+    graphql : bool
+        Whether to try the batched GraphQL backend before the REST API.
+    with_date : bool
+        Whether to look up the commit date. Skipping it saves a request with the REST API.
 
     Returns
     -------
@@ -201,14 +315,23 @@ async def get_latest_github_commit(url: str, branch: str) -> tuple[str, str]:
     _, owner, repo = extract_owner_repo(url)
     if not owner or not repo:
         return '', ''
+    if graphql and (refs := await lookup_github_repository(owner, repo, branch)):
+        return refs.branch_sha, refs.branch_date
 
-    return await get_latest_github_commit2(owner, repo, branch)
+    return await get_latest_github_commit2(owner, repo, branch, with_date=with_date)
 
 
-async def get_latest_github_commit2(owner: str, repo: str, branch: str) -> tuple[str, str]:
+async def get_latest_github_commit2(owner: str,
+                                    repo: str,
+                                    branch: str,
+                                    *,
+                                    with_date: bool = True) -> tuple[str, str]:
     """
     Get the latest commit hash and date for a Github repository.
 
+    The SHA is requested with the ``application/vnd.github.sha`` media type, whose body is the bare
+    40-character hash. The date of a commit never changes, so it is kept in the object cache.
+
     Parameters
     ----------
     owner : str
@@ -217,22 +340,28 @@ async def get_latest_github_commit2(owner: str, repo: str, branch: str) -> tuple
         Repository name.
     branch : str
         Branch name.
+    with_date : bool
+        Whether to look up the commit date.
 
     Returns
     -------
     tuple[str, str]
-        Commit SHA and formatted date string, or empty strings if the API call fails.
+        Commit SHA and formatted date string (empty if not requested), or empty strings if the API
+        call fails.
     """
-    url = GITHUB_BRANCH_URL % (owner, repo, quote(branch, safe=''))
-    if not (r := await get_content(url)):
-        return '', ''
-    d = r.json()['commit']['commit']['committer']['date'][:10]
-    try:
-        dt = datetime.fromisoformat(d.replace('Z', '+00:00'))
-        formatted_date = dt.strftime('%Y%m%d')
-    except ValueError:
-        formatted_date = d[:10]
-    return r.json()['commit']['sha'], formatted_date
+    if not (sha := await _get_github_commit_sha(owner, repo, branch)):
+        # Fall back to the full branch object.
+        url = GITHUB_BRANCH_URL % (owner, repo, quote(branch, safe=''))
+        if not (r := await get_content(url)):
+            return '', ''
+        commit = r.json()['commit']
+        sha = commit['sha']
+        date = _format_github_date(commit['commit']['committer']['date'])
+        set_cached_object(GITHUB_COMMIT_DATE_KIND, f'{owner}/{repo}@{sha}', date)
+        return sha, date if with_date else ''
+    if not with_date:
+        return sha, ''
+    return sha, await _get_github_commit_date(owner, repo, sha)
 
 
 def is_github(url: str) -> bool:
@@ -313,7 +442,10 @@ async def get_latest_github(url: str, ebuild: str, settings: LivecheckSettings,
     last_version = top_hash = hash_date = ''
 
     if (branch := get_branch(url, ebuild, settings)):
-        top_hash, hash_date = await get_latest_github_commit(url, branch)
+        top_hash, hash_date = await get_latest_github_commit(url,
+                                                             branch,
+                                                             graphql=settings.github_graphql_flag,
+                                                             with_date=_is_date_versioned(ebuild))
     else:
         last_version, top_hash = await get_latest_github_package(url, ebuild, settings)
         if not force_sha:
@@ -0,0 +1,222 @@
+"""Batched GitHub GraphQL functions."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+import logging
+
+from livecheck.utils import session_init
+from livecheck.utils.requests import register_run_state
+import niquests
+
+from .batch import BatchHandler
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+__all__ = ('GITHUB_GRAPHQL_URL', 'GitHubGraphQLBatcher', 'GitHubRepositoryRefs', 'build_query',
+           'lookup_github_repository', 'parse_repository')
+
+log = logging.getLogger(__name__)
+
+GITHUB_GRAPHQL_URL = 'https://api.github.com/graphql'
+_COMMIT_FIELDS = 'name target { oid ... on Commit { committedDate } }'
+_REPOSITORY_FIELDS = ('latestRelease { tagName } '
+                      f'defaultBranchRef {{ {_COMMIT_FIELDS} }} '
+                      'refs(refPrefix: "refs/tags/", first: 100, '
+                      'orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) '
+                      '{ nodes { name target { oid ... on Tag { target { oid } } } } }')
+
+RepositoryKey = tuple[str, str, str]
+"""Owner, repository name and branch (empty for the default branch)."""
+
+
+class GitHubRepositoryRefs(NamedTuple):
+    """Tags, latest release and a branch head of a GitHub repository."""
+    tags: dict[str, str]
+    """Tag name to commit SHA, newest first. Annotated tags are already peeled."""
+    latest_release: str = ''
+    """Tag name of the latest published release, if any."""
+    branch_sha: str = ''
+    """Head commit SHA of the requested (or default) branch."""
+    branch_date: str = ''
+    """Commit date of :py:attr:`branch_sha` as ``YYYYMMDD``."""
+
+
+def build_query(keys: Sequence[RepositoryKey]) -> tuple[str, dict[str, str]]:
+    """
+    Build one aliased GraphQL query covering several repositories.
+
+    Parameters
+    ----------
+    keys : Sequence[RepositoryKey]
+        Repositories to look up. The alias of each repository is ``r<index>``.
+
+    Returns
+    -------
+    tuple[str, dict[str, str]]
+        Query document and its variables.
+    """
+    declarations: list[str] = []
+    selections: list[str] = []
+    variables: dict[str, str] = {}
+    for i, (owner, repo, branch) in enumerate(keys):
+        declarations.extend((f'$o{i}: String!', f'$n{i}: String!'))
+        variables[f'o{i}'] = owner
+        variables[f'n{i}'] = repo
+        branch_field = ''
+        if branch:
+            declarations.append(f'$b{i}: String!')
+            variables[f'b{i}'] = f'refs/heads/{branch}'
+            branch_field = f' branch: ref(qualifiedName: $b{i}) {{ {_COMMIT_FIELDS} }}'
+        selections.append(
+            f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ {_REPOSITORY_FIELDS}{branch_field} }}')
+    return f'query({", ".join(declarations)}) {{ {" ".join(selections)} }}', variables
+
+
+def _format_date(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%Y%m%d')
+    except ValueError:
+        return value[:10]
+
+
+def parse_repository(data: Mapping[str, Any]) -> GitHubRepositoryRefs:
+    """
+    Convert one aliased ``repository`` object of a GraphQL response.
+
+    Parameters
+    ----------
+    data : Mapping[str, Any]
+        The ``repository`` object.
+
+    Returns
+    -------
+    GitHubRepositoryRefs
+        Parsed references. If a branch was requested but does not exist, the branch fields are
+        empty.
+    """
+    tags: dict[str, str] = {}
+    for node in (data.get('refs') or {}).get('nodes') or []:
+        target = node.get('target') or {}
+        sha = (target.get('target') or {}).get('oid') or target.get('oid')
+        if (name := node.get('name')) and sha:
+            tags[name] = sha
+    branch = data['branch'] if 'branch' in data else data.get('defaultBranchRef')
+    target = (branch or {}).get('target') or {}
+    return GitHubRepositoryRefs(tags=tags,
+                                latest_release=(data.get('latestRelease') or {}).get('tagName', ''),
+                                branch_sha=target.get('oid', ''),
+                                branch_date=_format_date(target.get('committedDate', '')))
+
+
+class GitHubGraphQLBatcher(BatchHandler[RepositoryKey, GitHubRepositoryRefs | None]):
+    """
+    Collect GitHub lookups from concurrent coroutines and resolve them in batches.
+
+    Lookups arriving within :py:attr:`window` seconds of the first pending one are sent together
+    as a single aliased GraphQL query. Identical lookups share one alias.
+    """
+    name = 'GitHub GraphQL'
+
+    async def lookup(self, owner: str, repo: str, branch: str = '') -> GitHubRepositoryRefs | None:
+        """
+        Queue a repository lookup and wait for its batch to be resolved.
+
+        Parameters
+        ----------
+        owner : str
+            Repository owner or organisation.
+        repo : str
+            Repository name.
+        branch : str
+            Branch whose head should be resolved. The default branch is used when empty.
+
+        Returns
+        -------
+        GitHubRepositoryRefs | None
+            References, or ``None`` if the query failed or the repository is not accessible.
+        """
+        return await self.check((owner, repo, branch))
+
+    async def check_many(
+            self,
+            keys: Sequence[RepositoryKey]) -> dict[RepositoryKey, GitHubRepositoryRefs | None]:
+        """
+        Resolve several repositories with one aliased GraphQL query.
+
+        Parameters
+        ----------
+        keys : Sequence[RepositoryKey]
+            Repositories to look up.
+
+        Returns
+        -------
+        dict[RepositoryKey, GitHubRepositoryRefs | None]
+            References of the accessible repositories.
+        """
+        data = await self._query(keys)
+        return {
+            key: parse_repository(repository)
+            for i, key in enumerate(keys) if (repository := data.get(f'r{i}'))
+        }
+
+    async def check_one(self, key: RepositoryKey) -> None:
+        """
+        Give up on a repository the batched query did not resolve.
+
+        Callers fall back to the REST API.
+
+        Parameters
+        ----------
+        key : RepositoryKey
+            Repository missing from the query result.
+        """
+
+    @staticmethod
+    async def _query(keys: Sequence[RepositoryKey]) -> dict[str, Any]:
+        query, variables = build_query(keys)
+        try:
+            r = await session_init('github').post(GITHUB_GRAPHQL_URL,
+                                                  json={
+                                                      'query': query,
+                                                      'variables': variables
+                                                  },
+                                                  timeout=30)
+            r.raise_for_status()
+            body = r.json()
+        except (niquests.RequestException, ValueError):
+            log.exception('GitHub GraphQL query for %d repositories failed.', len(keys))
+            return {}
+        if not isinstance(body, dict):
+            return {}
+        for error in body.get('errors') or []:
+            log.debug('GitHub GraphQL error: %s', error.get('message'))
+        return body.get('data') or {}
+
+
+_batcher = GitHubGraphQLBatcher()
+register_run_state(_batcher.reset)
+
+
+async def lookup_github_repository(owner: str,
+                                   repo: str,
+                                   branch: str = '') -> GitHubRepositoryRefs | None:
+    """
+    Look up a GitHub repository through the shared GraphQL batcher.
+
+    Parameters
+    ----------
+    owner : str
+        Repository owner or organisation.
+    repo : str
+        Repository name.
+    branch : str
+        Branch whose head should be resolved. The default branch is used when empty.
+
+    Returns
+    -------
+    GitHubRepositoryRefs | None
+        References, or ``None`` if the lookup failed. Callers should fall back to the REST API.
+    """
+    return await _batcher.lookup(owner, repo, branch)
@@ -2,21 +2,30 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
+import asyncio
 import re
 
 from livecheck.utils import get_content
 from livecheck.utils.portage import get_last_version
+from livecheck.utils.requests import register_run_state
+
+from .batch import BatchHandler
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from livecheck.settings_model import LivecheckSettings
 
-__all__ = ('METACPAN_METADATA', 'get_latest_metacpan_metadata', 'get_latest_metacpan_package',
-           'is_metacpan')
+__all__ = ('METACPAN_METADATA', 'MetaCPANReleases', 'get_latest_metacpan_metadata',
+           'get_latest_metacpan_package', 'is_metacpan')
 
 METACPAN_METADATA = 'cpan'
 METACPAN_DOWNLOAD_URL1 = 'https://fastapi.metacpan.org/v1/release/_search?q=distribution:%s'
 METACPAN_DOWNLOAD_URL2 = 'https://fastapi.metacpan.org/v1/release/%s'
+METACPAN_SEARCH_URL = 'https://fastapi.metacpan.org/v1/release/_search?q=%s&size=%d&sort=date:desc'
+METACPAN_SEARCH_HITS = 10
+"""Releases fetched per distribution, as many as a search for a single distribution returns."""
 
 
 def extract_perl_package(url: str) -> str:
@@ -41,20 +50,81 @@ async def get_latest_metacpan_package(url: str, ebuild: str, settings: Livecheck
     return await get_latest_metacpan_package2(package_name, ebuild, settings)
 
 
+class MetaCPANReleases(BatchHandler[str, list[dict[str, str]]]):
+    """Look up the releases of several CPAN distributions with one pair of searches."""
+    name = 'MetaCPAN'
+
+    async def check_many(  # ruff:ignore[no-self-use]
+            self, keys: Sequence[str]) -> dict[str, list[dict[str, str]]]:
+        """
+        Search the recent and the latest releases of several distributions.
+
+        Parameters
+        ----------
+        keys : Sequence[str]
+            Distribution names.
+
+        Returns
+        -------
+        dict[str, list[dict[str, str]]]
+            Release versions of each distribution that was found, with the latest release last.
+            If the recent releases fill the search, a distribution that releases often may have
+            pushed out those of the others, so distributions without a recent release are left
+            out to be looked up on their own.
+        """
+        distributions = ' OR '.join(f'"{key}"' for key in keys)
+        size = METACPAN_SEARCH_HITS * len(keys)
+        recent, latest = await asyncio.gather(
+            get_content(METACPAN_SEARCH_URL % (quote(f'distribution:({distributions})'), size)),
+            get_content(METACPAN_SEARCH_URL %
+                        (quote(f'status:latest AND distribution:({distributions})'), len(keys))))
+        recent_hits = recent.json().get('hits', {}).get('hits', []) if recent else []
+        results: dict[str, list[dict[str, str]]] = {}
+        for hit in recent_hits:
+            if (source := hit['_source']).get('distribution') in keys:
+                results.setdefault(source['distribution'], []).append({'tag': source['version']})
+        # A full search may have left out the recent releases of some distributions.
+        complete = set(keys) if len(recent_hits) < size else set(results)
+        for hit in (latest.json().get('hits', {}).get('hits', []) if latest else []):
+            if (source := hit['_source']).get('distribution') in complete:
+                results.setdefault(source['distribution'], []).append({'tag': source['version']})
+        return results
+
+    async def check_one(self, key: str) -> list[dict[str, str]]:  # ruff:ignore[no-self-use]
+        """
+        Look up the releases of one distribution.
+
+        Parameters
+        ----------
+        key : str
+            Distribution name.
+
+        Returns
+        -------
+        list[dict[str, str]]
+            Release versions with the latest release last.
+        """
+        results: list[dict[str, str]] = []
+        url = METACPAN_DOWNLOAD_URL1 % (key)
+        if r := await get_content(url):
+            for hit in r.json().get('hits', {}).get('hits', []):
+                results.extend([{'tag': hit['_source']['version']}])
+
+        # Many times it does not exist as in the previous list,
+        # that is why the latest version is checked again.
+        url = METACPAN_DOWNLOAD_URL2 % (key)
+        if r := await get_content(url):
+            results.append({'tag': r.json().get('version')})
+        return results
+
+
+_releases = MetaCPANReleases()
+register_run_state(_releases.reset)
+
+
 async def get_latest_metacpan_package2(package_name: str, ebuild: str,
                                        settings: LivecheckSettings) -> str:
-    results: list[dict[str, str]] = []
-    url = METACPAN_DOWNLOAD_URL1 % (package_name)
-    if r := await get_content(url):
-        for hit in r.json().get('hits', {}).get('hits', []):
-            results.extend([{'tag': hit['_source']['version']}])
-
-    # Many times it does not exist as in the previous list,
-    # that is why the latest version is checked again.
-    url = METACPAN_DOWNLOAD_URL2 % (package_name)
-    if r := await get_content(url):
-        results.append({'tag': r.json().get('version')})
-
+    results = await _releases.check(package_name)
     last_version = get_last_version(results, package_name, ebuild, settings)
     if last_version:
         return last_version['version']
@@ -1,18 +1,22 @@
 """PECL functions."""
 from __future__ import annotations
 
+from contextlib import aclosing
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
+import logging
 
-from defusedxml import ElementTree as ET  # ruff:ignore[camelcase-imported-as-acronym]
-from livecheck.utils import assert_not_none, get_content
+from livecheck.utils import assert_not_none, stream_text
 from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
+from livecheck.utils.xml_stream import MAX_FEED_ENTRIES, iter_elements
 
 if TYPE_CHECKING:
     from livecheck.settings_model import LivecheckSettings
 
 __all__ = ('PECL_METADATA', 'get_latest_pecl_metadata', 'get_latest_pecl_package', 'is_pecl')
 
+log = logging.getLogger(__name__)
+
 PECL_DOWNLOAD_URL = 'https://pecl.php.net/rest/r/%s/allreleases.xml'
 
 PECL_METADATA = 'pecl'
@@ -24,6 +28,9 @@ async def get_latest_pecl_package(ebuild: str, settings: LivecheckSettings) -> s
     """
     Get the latest version of a PECL package.
 
+    The release list is parsed as it is downloaded and reading stops after
+    :py:data:`~livecheck.utils.xml_stream.MAX_FEED_ENTRIES` matching releases.
+
     Returns
     -------
     str
@@ -43,17 +50,19 @@ async def get_latest_pecl_package2(program_name: str, ebuild: str,
 
     url = PECL_DOWNLOAD_URL % (program_name)
 
-    if not (r := await get_content(url)):
-        return ''
-
     results: list[dict[str, str]] = []
-    for release in ET.fromstring(r.text or '').findall(f'{NAMESPACE}r'):
-        stability = release.find(f'{NAMESPACE}s')
-        stability = assert_not_none(stability)
-        if settings.is_devel(catpkg) or assert_not_none(stability.text) == 'stable':
-            version = release.find(f'{NAMESPACE}v')
-            version = assert_not_none(version)
-            results.append({'tag': assert_not_none(version.text)})
+    body = stream_text(url, max_size=settings.max_body_size)
+    async with aclosing(body), aclosing(iter_elements(body, f'{NAMESPACE}r')) as releases:
+        async for release in releases:
+            stability = release.find(f'{NAMESPACE}s')
+            stability = assert_not_none(stability)
+            if settings.is_devel(catpkg) or assert_not_none(stability.text) == 'stable':
+                version = release.find(f'{NAMESPACE}v')
+                version = assert_not_none(version)
+                results.append({'tag': assert_not_none(version.text)})
+                if len(results) >= MAX_FEED_ENTRIES:
+                    log.debug('Stopped reading %s after %d entries.', url, MAX_FEED_ENTRIES)
+                    break
 
     if last_version := get_last_version(results, '', ebuild, settings):
         return last_version['version']
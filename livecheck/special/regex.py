@@ -1,16 +1,26 @@
 """Special regular expression handling."""
 from __future__ import annotations
 
+from contextlib import aclosing
+from itertools import dropwhile
 from typing import TYPE_CHECKING
 import logging
 import re
 
-from defusedxml import ElementTree as ET  # ruff:ignore[camelcase-imported-as-acronym]
+from defusedxml import (
+    DefusedXmlException,
+    ElementTree as ET,  # ruff:ignore[camelcase-imported-as-acronym]
+)
 from livecheck.constants import RSS_NS
-from livecheck.utils import get_content, is_sha
+from livecheck.utils import is_sha, stream_text
 from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
+from livecheck.utils.string import iter_matches
+from livecheck.utils.xml_stream import ElementStream
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from xml.etree.ElementTree import Element
+
     from livecheck.settings_model import LivecheckSettings
 
 __all__ = ('get_latest_regex_package',)
@@ -18,11 +28,33 @@ __all__ = ('get_latest_regex_package',)
 logger = logging.getLogger(__name__)
 
 
+def _match_value(match: re.Match[str]) -> str:
+    # The first group like ``re.findall()``, or the whole match if the pattern has no groups.
+    return (match.group(1) or '') if match.re.groups else match.group()
+
+
+def _commit_in_feed(entry: Element | None, result: str, ebuild_version: str,
+                    url: str) -> tuple[str, str, str] | None:
+    logger.info('Found commit hash %s in %s.', result, url)
+    if entry is None:
+        return None
+    updated_el = entry.find('updated', RSS_NS)
+    if updated_el is None or updated_el.text is None:
+        return None
+    hash_date = ''
+    if re.search(r'(2[0-9]{7})', ebuild_version):
+        hash_date = updated_el.text.split('T')[0].replace('-', '')
+        logger.debug('Using updated date %s for commit %s.', hash_date, result)
+    return result, hash_date, url
+
+
 async def get_latest_regex_package(ebuild: str, url: str, regex: str,
                                    settings: LivecheckSettings) -> tuple[str, str, str]:
     """
     Get the latest version of a package using a regular expression.
 
+    The document is scanned as it is downloaded, up to ``settings.max_body_size`` bytes.
+
     Parameters
     ----------
     ebuild : str
@@ -48,30 +80,48 @@ async def get_latest_regex_package(ebuild: str, url: str, regex: str,
     method = settings.request_method.get(catpkg, 'GET')
     data = settings.request_data.get(catpkg, {})
     multiline = settings.regex_multiline.get(catpkg, False)
+    # Use re.MULTILINE if multiline flag is set.
+    pattern = re.compile(regex, flags=re.MULTILINE if multiline else 0)
+    # A commit hash is dated from the first entry of the feed it is found in. Parse the text read
+    # as an Atom feed until that entry is complete, the text is not XML or the first match shows
+    # no date is needed.
+    feed: ElementStream | None = ElementStream(f'{{{RSS_NS[""]}}}entry')
+    entry: Element | None = None
+    body = stream_text(url,
+                       headers=headers,
+                       params=params,
+                       method=method,
+                       data=data,
+                       max_size=settings.max_body_size)
 
-    if not (r := await get_content(url, headers=headers, params=params, method=method, data=data)):
-        return '', '', ''
+    async def chunks() -> AsyncIterator[str]:
+        nonlocal entry, feed
+        async for chunk in body:
+            if feed is not None:
+                try:
+                    if entries := feed.feed(chunk):
+                        entry, feed = entries[0], None
+                except (ET.ParseError, DefusedXmlException):
+                    logger.debug('Ignoring XML parse error (URL: %s).', url)
+                    feed = None
+            yield chunk
 
     results: list[dict[str, str]] = []
-    # Use re.MULTILINE if multiline flag is set.
-    regex_flags = re.MULTILINE if multiline else 0
-    text = r.text or ''
-    for result in re.findall(regex, text, flags=regex_flags):
-        if is_sha(result) and not results:
-            logger.info('Found commit hash %s in %s.', result, url)
-            hash_date = ''
-            try:
-                updated_el = ET.fromstring(text).find('entry/updated', RSS_NS)
-            except ET.ParseError:
-                logger.debug('Ignoring XML parse error (URL: %s).', url)
-                continue
-            if updated_el is None or updated_el.text is None:
-                continue
-            if re.search(r'(2[0-9]{7})', ebuild_version):
-                hash_date = updated_el.text.split('T')[0].replace('-', '')
-                logger.debug('Using updated date %s for commit %s.', hash_date, result)
-            return result, hash_date, url
-        results.append({'tag': result})
+    async with aclosing(body), aclosing(iter_matches(chunks(), pattern)) as matches:
+        async for match in matches:
+            result = _match_value(match)
+            if is_sha(result) and not results:
+                pending: list[str] = []
+                while feed is not None and (m := await anext(matches, None)) is not None:
+                    pending.append(_match_value(m))
+                if commit := _commit_in_feed(entry, result, ebuild_version, url):
+                    return commit
+                # Hashes are skipped until a version is found, as this one was.
+                pending.extend([_match_value(m) async for m in matches])
+                results.extend({'tag': r} for r in dropwhile(is_sha, pending))
+                break
+            feed = None
+            results.append({'tag': result})
 
     if last_version := get_last_version(results, '', ebuild, settings):
         return last_version['version'], '', ''
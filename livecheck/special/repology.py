@@ -1,17 +1,185 @@
 """Repology functions."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from bisect import bisect_right
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
+import asyncio
+import logging
 
 from livecheck.utils import get_content
 from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
+from livecheck.utils.requests import register_run_state
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
     from livecheck.settings_model import LivecheckSettings
 
-__all__ = ('get_latest_repology',)
+__all__ = ('RepologyClient', 'TokenBucket', 'get_latest_repology', 'prefetch_repology')
 
 REPOLOGY_DOWNLOAD_URL = 'https://repology.org/api/v1/project/%s'
+REPOLOGY_PROJECTS_URL = 'https://repology.org/api/v1/projects/%s/'
+REPOLOGY_PAGE_SIZE = 200
+"""Projects returned by one request to the projects endpoint."""
+
+Project = list[dict[str, Any]]
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allow ``burst`` requests at once and ``rate`` requests per second after that."""
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Initialise the bucket full.
+
+        Parameters
+        ----------
+        rate : float
+            Tokens added per second.
+        burst : int
+            Capacity of the bucket.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for a token and take it."""
+        async with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._updated = monotonic()
+                self._tokens = 1
+            self._tokens -= 1
+
+
+class RepologyClient:
+    """
+    Repology API client limited to one request per second.
+
+    Repology asks API clients to stay at about one request per second. Projects of packages known
+    in advance are fetched in alphabetical ranges of :py:data:`REPOLOGY_PAGE_SIZE` with
+    :py:meth:`prefetch`. Any other project, and any project missing from the ranges, is requested
+    on its own. Requests also wait for the shared HTTP concurrency limit like any other.
+    """
+    def __init__(self, rate: float = 1) -> None:
+        """
+        Initialise the client.
+
+        Parameters
+        ----------
+        rate : float
+            Requests per second.
+        """
+        self.bucket = TokenBucket(rate)
+        self.projects: dict[str, Project] = {}
+        """Packages of the fetched projects by project name."""
+        self._prefetching: dict[str, asyncio.Event] = {}
+        """Set when the range that would hold a project has been fetched, by project name."""
+
+    def reset(self) -> None:
+        """Forget the fetched projects and the state of the previous run."""
+        self.bucket = TokenBucket(self.bucket.rate, self.bucket.burst)
+        self.projects.clear()
+        self._prefetching.clear()
+
+    async def _get(self, url: str) -> Any:
+        await self.bucket.acquire()
+        if not (r := await get_content(url)):
+            return None
+        try:
+            return r.json()
+        except ValueError:
+            log.debug('Invalid JSON from %s.', url)
+            return None
+
+    def _settle(self, names: Iterable[str]) -> None:
+        for name in names:
+            if (event := self._prefetching.pop(name, None)) is not None:
+                event.set()
+
+    async def _fetch_ranges(self, names: Sequence[str]) -> None:
+        i = 0
+        try:
+            while i < len(names):
+                page = await self._get(REPOLOGY_PROJECTS_URL % quote(names[i], safe=''))
+                if not isinstance(page, dict) or not page:
+                    # Leave the rest to single project requests.
+                    return
+                found = {name: page[name] for name in names[i:] if name in page}
+                log.debug('Prefetched %d Repology project(s) from %s.', len(found), names[i])
+                self.projects.update(found)
+                if len(page) < REPOLOGY_PAGE_SIZE:
+                    return
+                j = bisect_right(names, max(page), lo=i + 1)
+                self._settle(names[i:j])
+                i = j
+        finally:
+            self._settle(names[i:])
+
+    async def prefetch(self, names: Iterable[str]) -> None:
+        """
+        Fetch several projects with as few range requests as possible.
+
+        Parameters
+        ----------
+        names : Iterable[str]
+            Project names.
+        """
+        if not (wanted := sorted(set(names) - self.projects.keys() - self._prefetching.keys())):
+            return
+        log.debug('Prefetching %d Repology project(s).', len(wanted))
+        self._prefetching.update((name, asyncio.Event()) for name in wanted)
+        await self._fetch_ranges(wanted)
+
+    async def project(self, name: str) -> Project | None:
+        """
+        Get the packages of a project.
+
+        If the project is being prefetched, only the range request that covers it is waited for.
+
+        Parameters
+        ----------
+        name : str
+            Project name.
+
+        Returns
+        -------
+        Project | None
+            Packages in every repository, or ``None`` if the request failed.
+        """
+        if (event := self._prefetching.get(name)) is not None:
+            await event.wait()
+        if name not in self.projects:
+            if not isinstance(data := await self._get(REPOLOGY_DOWNLOAD_URL % quote(name, safe='')),
+                              list):
+                return None
+            self.projects[name] = data
+        return self.projects[name]
+
+
+_client = RepologyClient()
+register_run_state(_client.reset)
+
+
+async def prefetch_repology(names: Iterable[str]) -> None:
+    """
+    Fetch the Repology projects of several packages in advance.
+
+    Parameters
+    ----------
+    names : Iterable[str]
+        Project names.
+    """
+    await _client.prefetch(names)
 
 
 async def get_latest_repology(ebuild: str, settings: LivecheckSettings, package: str = '') -> str:
@@ -25,20 +193,19 @@ async def get_latest_repology(ebuild: str, settings: LivecheckSettings, package:
     """
     catpkg, _, pkg, _ = catpkg_catpkgsplit(ebuild)
 
-    results: list[dict[str, str]] = []
-
     if package:
         pkg = package
-    url = REPOLOGY_DOWNLOAD_URL % (pkg)
-    if not (r := await get_content(url)):
-        url = REPOLOGY_DOWNLOAD_URL % (pkg.split('-')[0])
-        if not (r := await get_content(url)):
-            return ''
+    if (project := await _client.project(pkg)) is None and (project := await _client.project(
+            pkg.split('-')[0])) is None:
+        return ''
 
-    for release in r.json():
-        if release.get('srcname') == pkg and (release.get('status') != 'devel'
-                                              or settings.is_devel(catpkg)):
-            results.extend([{'tag': release.get('version')}])
+    results: list[dict[str, str]] = [
+        {
+            'tag': version
+        } for release in project
+        if release.get('srcname') == pkg and (version := release.get('version')) and (
+            release.get('status') != 'devel' or settings.is_devel(catpkg))
+    ]
 
     if last_version := get_last_version(results, '', ebuild, settings):
         return last_version['version']
@@ -1,14 +1,16 @@
 """SourceForge utility functions."""
 from __future__ import annotations
 
+from contextlib import aclosing
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
+import logging
 import re
 
-from defusedxml import ElementTree as ET  # ruff:ignore[camelcase-imported-as-acronym]
-from livecheck.utils import get_content
+from livecheck.utils import stream_text
 from livecheck.utils.portage import get_last_version
+from livecheck.utils.xml_stream import MAX_FEED_ENTRIES, iter_elements
 
 from .utils import get_archive_extension
 
@@ -18,6 +20,8 @@ if TYPE_CHECKING:
 __all__ = ('SOURCEFORGE_METADATA', 'get_latest_sourceforge_metadata',
            'get_latest_sourceforge_package', 'is_sourceforge')
 
+log = logging.getLogger(__name__)
+
 SOURCEFORGE_DOWNLOAD_URL = 'https://sourceforge.net/projects/%s/rss'
 SOURCEFORGE_METADATA = 'sourceforge'
 
@@ -49,6 +53,9 @@ async def get_latest_sourceforge_package(src_uri: str, ebuild: str,
     """
     Get the latest version of a SourceForge package.
 
+    The RSS feed is parsed as it is downloaded and reading stops after
+    :py:data:`~livecheck.utils.xml_stream.MAX_FEED_ENTRIES` release files.
+
     Returns
     -------
     str
@@ -65,15 +72,17 @@ async def get_latest_sourceforge_package2(repository: str,
                                           version_reference: str = '') -> str:
     url = SOURCEFORGE_DOWNLOAD_URL % (repository)
 
-    if not (r := await get_content(url)):
-        return ''
-
     results: list[dict[str, str]] = []
-    for item in ET.fromstring(r.text or '').findall('.//item'):
-        title = item.find('title')
-        version = Path(title.text).name if title is not None and title.text else ''
-        if version and get_archive_extension(version):
-            results.append({'tag': version})
+    body = stream_text(url, max_size=settings.max_body_size)
+    async with aclosing(body), aclosing(iter_elements(body, 'item')) as items:
+        async for item in items:
+            title = item.find('title')
+            version = Path(title.text).name if title is not None and title.text else ''
+            if version and get_archive_extension(version):
+                results.append({'tag': version})
+                if len(results) >= MAX_FEED_ENTRIES:
+                    log.debug('Stopped reading %s after %d entries.', url, MAX_FEED_ENTRIES)
+                    break
 
     if last_version := get_last_version(results,
                                         repository,
@@ -1,14 +1,17 @@
 """SourceHut utility functions."""
 from __future__ import annotations
 
+from contextlib import aclosing
 from datetime import datetime
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
+import logging
 import re
 
-from defusedxml import ElementTree as ET  # ruff:ignore[camelcase-imported-as-acronym]
-from livecheck.utils import get_content, is_sha
+from livecheck.utils import is_sha, stream_text
 from livecheck.utils.portage import catpkg_catpkgsplit, get_last_version
+from livecheck.utils.requests import DEFAULT_MAX_BODY_SIZE
+from livecheck.utils.xml_stream import MAX_FEED_ENTRIES, iter_elements
 
 from .utils import get_archive_extension
 
@@ -18,6 +21,8 @@ if TYPE_CHECKING:
 __all__ = ('SOURCEHUT_METADATA', 'get_latest_sourcehut', 'get_latest_sourcehut_commit',
            'get_latest_sourcehut_metadata', 'get_latest_sourcehut_package', 'is_sourcehut')
 
+log = logging.getLogger(__name__)
+
 SOURCEHUT_DOWNLOAD_URL = 'https://%s/%s/%s/refs/rss.xml'
 SOURCEHUT_COMMIT_URL = 'https://%s/%s/%s/log/%s/rss.xml'
 SOURCEHUT_METADATA = 'sourcehut'
@@ -45,6 +50,9 @@ async def get_latest_sourcehut_package(url: str, ebuild: str, settings: Livechec
     """
     Get the latest version of a SourceHut package.
 
+    The RSS feed is parsed as it is downloaded and reading stops after
+    :py:data:`~livecheck.utils.xml_stream.MAX_FEED_ENTRIES` tags.
+
     Parameters
     ----------
     url : str
@@ -66,14 +74,16 @@ async def get_latest_sourcehut_package(url: str, ebuild: str, settings: Livechec
     version_reference = _sourcehut_version_reference(url)
     url = SOURCEHUT_DOWNLOAD_URL % (domain, owner, repo)
 
-    if not (r := await get_content(url)):
-        return ''
-
     results: list[dict[str, str]] = []
-    for item in ET.fromstring(r.text or '').findall('channel/item'):
-        guid = item.find('guid')
-        if version := guid.text.split('/')[-1] if guid is not None and guid.text else '':
-            results.append({'tag': version})
+    body = stream_text(url, max_size=settings.max_body_size)
+    async with aclosing(body), aclosing(iter_elements(body, 'item')) as items:
+        async for item in items:
+            guid = item.find('guid')
+            if version := guid.text.split('/')[-1] if guid is not None and guid.text else '':
+                results.append({'tag': version})
+                if len(results) >= MAX_FEED_ENTRIES:
+                    log.debug('Stopped reading %s after %d entries.', url, MAX_FEED_ENTRIES)
+                    break
 
     if last_version := get_last_version(results,
                                         repo,
@@ -84,7 +94,10 @@ async def get_latest_sourcehut_package(url: str, ebuild: str, settings: Livechec
     return ''
 
 
-async def get_latest_sourcehut_commit(url: str, branch: str = 'master') -> tuple[str, str]:
+async def get_latest_sourcehut_commit(url: str,
+                                      branch: str = 'master',
+                                      *,
+                                      max_size: int = DEFAULT_MAX_BODY_SIZE) -> tuple[str, str]:
     """
     Get the latest commit hash and date from a SourceHut repository.
 
@@ -94,6 +107,8 @@ async def get_latest_sourcehut_commit(url: str, branch: str = 'master') -> tuple
         Repository URL on SourceHut.
     branch : str
         Branch name for the commit log RSS feed.
+    max_size : int
+        Bytes of the feed read at most.
 
     Returns
     -------
@@ -106,12 +121,13 @@ async def get_latest_sourcehut_commit(url: str, branch: str = 'master') -> tuple
 
     url = SOURCEHUT_COMMIT_URL % (domain, owner, repo, branch)
 
-    if not (r := await get_content(url)):
-        return '', ''
-
-    text = r.text or ''
-    guid = ET.fromstring(text).find('channel/item/guid')
-    pubdate = ET.fromstring(text).find('channel/item/pubDate')
+    body = stream_text(url, max_size=max_size)
+    async with aclosing(body), aclosing(iter_elements(body, 'item')) as items:
+        # Only the newest commit is needed.
+        if (item := await anext(items, None)) is None:
+            return '', ''
+        guid = item.find('guid')
+        pubdate = item.find('pubDate')
     commit = guid.text.split('/')[-1] if guid is not None and guid.text else ''
     date = pubdate.text if pubdate is not None and pubdate.text else ''
 
@@ -181,7 +197,9 @@ async def get_latest_sourcehut(url: str, ebuild: str,
     last_version = top_hash = hash_date = ''
 
     if (branch := get_branch(url, ebuild, settings)):
-        top_hash, hash_date = await get_latest_sourcehut_commit(url, branch)
+        top_hash, hash_date = await get_latest_sourcehut_commit(url,
+                                                                branch,
+                                                                max_size=settings.max_body_size)
     else:
         last_version = await get_latest_sourcehut_package(url, ebuild, settings)
 
@@ -0,0 +1,285 @@
+# ruff:file-ignore[unused-function-argument]
+"""Dispatch of upstream URLs to the handler for their host."""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+from urllib.parse import urlparse
+
+from .bitbucket import get_latest_bitbucket, is_bitbucket
+from .gist import get_latest_gist_package, is_gist
+from .git import get_latest_git, is_git
+from .github import get_latest_github, is_github
+from .gitlab import get_latest_gitlab, is_gitlab
+from .jetbrains import get_latest_jetbrains_package, is_jetbrains
+from .metacpan import get_latest_metacpan_package, is_metacpan
+from .nuget import get_latest_nuget_package, is_nuget
+from .package import get_latest_package, is_package
+from .pecl import get_latest_pecl_package, is_pecl
+from .pypi import get_latest_pypi_package, is_pypi
+from .rubygems import get_latest_rubygems_package, is_rubygems
+from .sourceforge import get_latest_sourceforge_package, is_sourceforge
+from .sourcehut import get_latest_sourcehut, is_sourcehut
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from urllib.parse import ParseResult
+
+    from livecheck.settings import LivecheckSettings
+
+__all__ = ('URLHandler', 'URLHandlerRegistry', 'url_handlers')
+
+
+class CheckURL(Protocol):
+    """Look up the latest version of a package from an upstream URL."""
+    async def __call__(self, url: str, ebuild: str, settings: LivecheckSettings, *,
+                       force_sha: bool) -> tuple[str, str, str, str]:
+        """
+        Check a URL.
+
+        Parameters
+        ----------
+        url : str
+            Upstream URL.
+        ebuild : str
+            Ebuild atom string for context.
+        settings : LivecheckSettings
+            Livecheck settings.
+        force_sha : bool
+            Whether to retain commit hashes when not required.
+
+        Returns
+        -------
+        tuple[str, str, str, str]
+            Last version, top hash, hash date, and resolved URL.
+        """
+
+
+class URLHandler(NamedTuple):
+    """A handler and the URLs it is tried for."""
+    name: str
+    """Name for log messages."""
+    matches: Callable[[str], bool]
+    """Check if the handler supports a URL."""
+    check: CheckURL
+    """Look up the latest version."""
+    hosts: frozenset[str] = frozenset()
+    """Exact host names."""
+    host_suffixes: tuple[str, ...] = ()
+    """Host name suffixes starting with a dot, such as ``.sourceforge.net``."""
+    host_prefixes: tuple[str, ...] = ()
+    """Host name prefixes ending with a dot, such as ``gitlab.``."""
+    schemes: frozenset[str] = frozenset()
+    """Schemes of URLs with any host."""
+
+
+class URLHandlerRegistry:
+    """
+    Handlers indexed by host name, host name suffix and prefix, and scheme.
+
+    A URL is parsed once and only the handlers indexed under its host or scheme are asked if they
+    support it, in registration order.
+    """
+    def __init__(self, handlers: Iterable[URLHandler] = ()) -> None:
+        """
+        Initialise the registry.
+
+        Parameters
+        ----------
+        handlers : Iterable[URLHandler]
+            Handlers to register, highest priority first.
+        """
+        self.handlers: list[URLHandler] = []
+        self._hosts: defaultdict[str, list[int]] = defaultdict(list)
+        self._suffixes: defaultdict[str, list[int]] = defaultdict(list)
+        self._prefixes: defaultdict[str, list[int]] = defaultdict(list)
+        self._schemes: defaultdict[str, list[int]] = defaultdict(list)
+        for handler in handlers:
+            self.register(handler)
+
+    def register(self, handler: URLHandler) -> None:
+        """
+        Add a handler with a lower priority than those already registered.
+
+        Parameters
+        ----------
+        handler : URLHandler
+            Handler to add.
+        """
+        index = len(self.handlers)
+        self.handlers.append(handler)
+        for host in handler.hosts:
+            self._hosts[host].append(index)
+        for suffix in handler.host_suffixes:
+            self._suffixes[suffix].append(index)
+        for prefix in handler.host_prefixes:
+            self._prefixes[prefix].append(index)
+        for scheme in handler.schemes:
+            self._schemes[scheme].append(index)
+
+    def candidates(self, parsed: ParseResult) -> list[URLHandler]:
+        """
+        Get the handlers indexed under the host or scheme of a URL.
+
+        Parameters
+        ----------
+        parsed : ParseResult
+            The parsed URL.
+
+        Returns
+        -------
+        list[URLHandler]
+            Handlers in priority order.
+        """
+        host = parsed.hostname or ''
+        indices = [*self._hosts.get(host, ()), *self._schemes.get(parsed.scheme, ())]
+        label, dot, rest = host.partition('.')
+        if dot:
+            indices.extend(self._prefixes.get(f'{label}.', ()))
+        while dot:
+            indices.extend(self._suffixes.get(f'.{rest}', ()))
+            _, dot, rest = rest.partition('.')
+        return [self.handlers[i] for i in sorted(set(indices))]
+
+    def find(self, url: str, parsed: ParseResult | None = None) -> URLHandler | None:
+        """
+        Get the handler for a URL.
+
+        Parameters
+        ----------
+        url : str
+            URL to dispatch.
+        parsed : ParseResult | None
+            The URL already parsed.
+
+        Returns
+        -------
+        URLHandler | None
+            The first candidate supporting the URL, or ``None``.
+        """
+        return next((h for h in self.candidates(parsed or urlparse(url)) if h.matches(url)), None)
+
+
+async def _check_gist(url: str, ebuild: str, settings: LivecheckSettings, *,
+                      force_sha: bool) -> tuple[str, str, str, str]:
+    top_hash, hash_date = await get_latest_gist_package(url)
+    return '', top_hash, hash_date, url
+
+
+async def _check_github(url: str, ebuild: str, settings: LivecheckSettings, *,
+                        force_sha: bool) -> tuple[str, str, str, str]:
+    return *await get_latest_github(url, ebuild, settings, force_sha=force_sha), url
+
+
+async def _check_sourcehut(url: str, ebuild: str, settings: LivecheckSettings, *,
+                           force_sha: bool) -> tuple[str, str, str, str]:
+    return *await get_latest_sourcehut(url, ebuild, settings), url
+
+
+async def _check_pypi(url: str, ebuild: str, settings: LivecheckSettings, *,
+                      force_sha: bool) -> tuple[str, str, str, str]:
+    last_version, archive_url = await get_latest_pypi_package(url, ebuild, settings)
+    return last_version, '', '', archive_url
+
+
+async def _check_nuget(url: str, ebuild: str, settings: LivecheckSettings, *,
+                       force_sha: bool) -> tuple[str, str, str, str]:
+    last_version, archive_url = await get_latest_nuget_package(url, ebuild, settings)
+    return last_version, '', '', archive_url
+
+
+async def _check_jetbrains(url: str, ebuild: str, settings: LivecheckSettings, *,
+                           force_sha: bool) -> tuple[str, str, str, str]:
+    return await get_latest_jetbrains_package(ebuild, settings), '', '', url
+
+
+async def _check_gitlab(url: str, ebuild: str, settings: LivecheckSettings, *,
+                        force_sha: bool) -> tuple[str, str, str, str]:
+    return *await get_latest_gitlab(url, ebuild, settings, force_sha=force_sha), url
+
+
+async def _check_package(url: str, ebuild: str, settings: LivecheckSettings, *,
+                         force_sha: bool) -> tuple[str, str, str, str]:
+    return await get_latest_package(url, ebuild, settings), '', '', url
+
+
+async def _check_pecl(url: str, ebuild: str, settings: LivecheckSettings, *,
+                      force_sha: bool) -> tuple[str, str, str, str]:
+    return await get_latest_pecl_package(ebuild, settings), '', '', url
+
+
+async def _check_metacpan(url: str, ebuild: str, settings: LivecheckSettings, *,
+                          force_sha: bool) -> tuple[str, str, str, str]:
+    return await get_latest_metacpan_package(url, ebuild, settings), '', '', url
+
+
+async def _check_rubygems(url: str, ebuild: str, settings: LivecheckSettings, *,
+                          force_sha: bool) -> tuple[str, str, str, str]:
+    return await get_latest_rubygems_package(ebuild, settings), '', '', url
+
+
+async def _check_sourceforge(url: str, ebuild: str, settings: LivecheckSettings, *,
+                             force_sha: bool) -> tuple[str, str, str, str]:
+    return await get_latest_sourceforge_package(url, ebuild, settings), '', '', url
+
+
+async def _check_bitbucket(url: str, ebuild: str, settings: LivecheckSettings, *,
+                           force_sha: bool) -> tuple[str, str, str, str]:
+    return *await get_latest_bitbucket(url, ebuild, settings, force_sha=force_sha), url
+
+
+async def _check_git(url: str, ebuild: str, settings: LivecheckSettings, *,
+                     force_sha: bool) -> tuple[str, str, str, str]:
+    return *await get_latest_git(url, ebuild, settings, force_sha=force_sha), url
+
+
+_SOURCEFORGE_SUFFIXES = tuple(
+    f'.{name}.{tld}' for name in ('sf', 'sourceforge') for tld in ('net', 'io', 'jp'))
+
+url_handlers = URLHandlerRegistry((
+    URLHandler('gist',
+               is_gist,
+               _check_gist,
+               hosts=frozenset({'gist.github.com', 'gist.githubusercontent.com'})),
+    URLHandler('github',
+               is_github,
+               _check_github,
+               hosts=frozenset({'github.com', 'github.io'}),
+               host_suffixes=('.github.com', '.github.io')),
+    URLHandler('sourcehut',
+               is_sourcehut,
+               _check_sourcehut,
+               hosts=frozenset({'sr.ht', 'git.sr.ht', 'hg.sr.ht'})),
+    URLHandler('pypi',
+               is_pypi,
+               _check_pypi,
+               hosts=frozenset({'pypi', 'pypi.org', 'pypi.io', 'files.pythonhosted.org'})),
+    URLHandler('nuget',
+               is_nuget,
+               _check_nuget,
+               hosts=frozenset({'api.nuget.org', 'nuget.org', 'www.nuget.org'})),
+    URLHandler('jetbrains',
+               is_jetbrains,
+               _check_jetbrains,
+               hosts=frozenset({'download.jetbrains.com'})),
+    URLHandler('gitlab',
+               is_gitlab,
+               _check_gitlab,
+               hosts=frozenset({'gitlab.com'}),
+               host_prefixes=('gitlab.',)),
+    URLHandler('package',
+               is_package,
+               _check_package,
+               hosts=frozenset({'registry.npmjs.org', 'registry.yarnpkg.com'})),
+    URLHandler('pecl', is_pecl, _check_pecl, hosts=frozenset({'pecl.php.net'})),
+    URLHandler('metacpan', is_metacpan, _check_metacpan, hosts=frozenset({'metacpan.org', 'cpan'})),
+    URLHandler('rubygems', is_rubygems, _check_rubygems, hosts=frozenset({'rubygems.org'})),
+    URLHandler('sourceforge',
+               is_sourceforge,
+               _check_sourceforge,
+               hosts=frozenset({'downloads.sourceforge.net', 'download.sourceforge.net', 'sf.net'}),
+               host_suffixes=_SOURCEFORGE_SUFFIXES),
+    URLHandler('bitbucket', is_bitbucket, _check_bitbucket, hosts=frozenset({'bitbucket.org'})),
+    URLHandler('git', is_git, _check_git, schemes=frozenset({'http', 'https'})),
+))
+"""Handlers of :py:func:`livecheck.main.parse_url`, highest priority first."""
@@ -0,0 +1,180 @@
+"""Freshness policies for cached registry metadata."""
+from __future__ import annotations
+
+from hashlib import sha256
+from http import HTTPStatus
+from time import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple
+import asyncio
+import logging
+
+import niquests
+
+from .http_cache import get_http_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Mapping
+
+    from niquests_cache.typing import CacheEntry
+
+__all__ = ('DEFAULT_FRESHNESS_POLICIES', 'FreshnessCache', 'FreshnessPolicy')
+
+log = logging.getLogger(__name__)
+
+_HOUR = 60 * 60
+
+
+class FreshnessPolicy(NamedTuple):
+    """How long a cached response may be used without asking the server, regardless of headers."""
+    min_ttl: float = 0
+    """Seconds a stored response is used as is."""
+    stale_while_revalidate: float = 0
+    """Seconds after :py:attr:`min_ttl` a stored response is still used while it is refreshed in
+    the background."""
+    stale_if_error: float = 0
+    """Seconds after :py:attr:`min_ttl` a stored response is used if the server cannot be
+    reached or answers with a server error."""
+
+
+_REGISTRY_POLICY = FreshnessPolicy(min_ttl=3 * _HOUR,
+                                   stale_while_revalidate=9 * _HOUR,
+                                   stale_if_error=7 * 24 * _HOUR)
+DEFAULT_FRESHNESS_POLICIES: Mapping[str, FreshnessPolicy] = MappingProxyType({
+    'api.nuget.org': _REGISTRY_POLICY,
+    'data.services.jetbrains.com': _REGISTRY_POLICY,
+    'pypi.org': _REGISTRY_POLICY,
+    'repology.org': _REGISTRY_POLICY,
+    'rubygems.org': _REGISTRY_POLICY,
+})
+"""Registry metadata that is fine to use when it is a few hours old."""
+
+
+def _cache_key(req: niquests.Request) -> str:
+    # Per-call headers such as ``Accept`` or ``Authorization`` select a different representation.
+    prepared = req.prepare()
+    headers = sorted((str(k).lower(), str(v)) for k, v in (prepared.headers or {}).items())
+    return sha256(f'freshness {prepared.method} {prepared.url} {headers}'.encode()).hexdigest()
+
+
+def _entry_from_response(r: niquests.Response) -> CacheEntry:
+    return {
+        'content': r.content or b'',
+        'encoding': r.encoding or 'utf-8',
+        'headers': {
+            k: v if isinstance(v, str) else v.decode()
+            for k, v in r.headers.items()
+        },
+        'status_code': r.status_code or 0,
+        'ts': time(),
+        'url': str(r.url)
+    }
+
+
+def _response_from_entry(entry: CacheEntry) -> niquests.Response:
+    r = niquests.Response()
+    r.status_code = entry['status_code']
+    r._content = entry['content']  # ruff:ignore[private-member-access]
+    r.headers.update(entry['headers'])
+    r.url = entry['url']
+    r.encoding = entry['encoding']
+    return r
+
+
+def _is_server_error(status_code: int | None) -> bool:
+    return status_code is not None and (status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+                                        or status_code == HTTPStatus.TOO_MANY_REQUESTS)
+
+
+class FreshnessCache:
+    """
+    Serve responses of configured hosts from the HTTP cache.
+
+    Stored responses are used according to the host's :py:class:`FreshnessPolicy`, even when the
+    server says ``no-cache``.
+    """
+    def __init__(self, policies: Mapping[str, FreshnessPolicy]) -> None:
+        """
+        Initialise the cache.
+
+        Parameters
+        ----------
+        policies : Mapping[str, FreshnessPolicy]
+            Host name to policy. Requests to other hosts are never served from this cache.
+        """
+        self.policies = policies
+        self._refreshes: dict[str, asyncio.Task[None]] = {}
+
+    async def fetch(self, host: str, req: niquests.Request,
+                    send: Callable[[], Awaitable[niquests.Response]]) -> niquests.Response:
+        """
+        Get the response to a request from the cache or with ``send``.
+
+        Parameters
+        ----------
+        host : str
+            Host name of the request.
+        req : niquests.Request
+            The request. Only ``GET`` requests are cached.
+        send : Callable[[], Awaitable[niquests.Response]]
+            Sends the request.
+
+        Returns
+        -------
+        niquests.Response
+            The stored or received response.
+
+        Raises
+        ------
+        niquests.RequestException
+            If sending fails and no stored response may be used instead.
+        """
+        if (policy := self.policies.get(host)) is None or req.method != 'GET':
+            return await send()
+        key = _cache_key(req)
+        entry = get_http_cache().get(key)
+        age = time() - entry['ts'] if entry else 0
+        if entry and age < policy.min_ttl:
+            log.debug('Using cached %s (%.0fs old).', req.url, age)
+            return _response_from_entry(entry)
+        if entry and age < policy.min_ttl + policy.stale_while_revalidate:
+            log.debug('Using stale %s (%.0fs old) while it is refreshed.', req.url, age)
+            self._refresh(key, send)
+            return _response_from_entry(entry)
+        try:
+            r = await send()
+        except niquests.RequestException:
+            if entry and age < policy.min_ttl + policy.stale_if_error:
+                log.warning('Using stale %s (%.0fs old) because the request failed.', req.url, age)
+                return _response_from_entry(entry)
+            raise
+        if r.status_code == HTTPStatus.OK:
+            get_http_cache().set(key, _entry_from_response(r))
+        elif (entry and _is_server_error(r.status_code)
+              and age < policy.min_ttl + policy.stale_if_error):
+            log.warning('Using stale %s (%.0fs old) because the server answered %d.', req.url, age,
+                        r.status_code)
+            return _response_from_entry(entry)
+        return r
+
+    def _refresh(self, key: str, send: Callable[[], Awaitable[niquests.Response]]) -> None:
+        if key in self._refreshes:
+            return
+
+        async def refresh() -> None:
+            try:
+                r = await send()
+            except niquests.RequestException:
+                log.debug('Background refresh failed.', exc_info=True)
+                return
+            if r.status_code == HTTPStatus.OK:
+                get_http_cache().set(key, _entry_from_response(r))
+
+        task = asyncio.create_task(refresh())
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+
+    async def drain(self) -> None:
+        """Wait for background refreshes to finish."""
+        if self._refreshes:
+            await asyncio.gather(*self._refreshes.values())
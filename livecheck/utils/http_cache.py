@@ -0,0 +1,460 @@
+"""Size-bounded HTTP cache backends with compressed bodies."""
+from __future__ import annotations
+
+from abc import abstractmethod
+from time import time
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import zlib
+
+from niquests_cache.backends.base import BaseBackend
+import platformdirs
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from niquests_cache.typing import CacheEntry
+
+__all__ = ('DEFAULT_MAX_AGE', 'DEFAULT_MAX_SIZE', 'HTTP_CACHE_BACKENDS', 'CacheStats',
+           'FileSystemHTTPCache', 'HTTPCacheBackend', 'SQLiteHTTPCache', 'close_http_cache',
+           'configure_http_cache', 'get_http_cache')
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+"""Default size cap of the cache in bytes."""
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+"""Default number of seconds an entry may go unused before it is evicted."""
+_COMPRESS_MIN_SIZE = 256
+_RAW_SIZE_BYTES = 8
+
+
+def _cache_dir() -> Path:
+    return platformdirs.user_cache_path('livecheck', appauthor=False, ensure_exists=True)
+
+
+def _compress(data: bytes) -> tuple[bytes, bool]:
+    if len(data) < _COMPRESS_MIN_SIZE:
+        return data, False
+    compressed = zlib.compress(data)
+    if len(compressed) >= len(data):
+        return data, False
+    return compressed, True
+
+
+class CacheStats(NamedTuple):
+    """Summary of the contents of a cache."""
+    entries: int
+    """Number of stored responses."""
+    size: int
+    """Bytes used by the stored (compressed) responses."""
+    raw_size: int
+    """Bytes the stored responses would use without compression."""
+    oldest: float = 0
+    """Unix time of the least recently used entry, or ``0`` if the cache is empty."""
+
+
+class HTTPCacheBackend(BaseBackend):
+    """HTTP cache backend that can report its size and evict entries."""
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """
+        Summarise the cache.
+
+        Returns
+        -------
+        CacheStats
+            Entry count and sizes.
+        """
+
+    @abstractmethod
+    def prune(self, *, max_size: int = DEFAULT_MAX_SIZE, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """
+        Evict old and least recently used entries.
+
+        Entries unused for longer than ``max_age`` go first, then least recently used entries
+        until the cache fits in ``max_size``.
+
+        Parameters
+        ----------
+        max_size : int
+            Size cap in bytes. Values ``<= 0`` disable the cap.
+        max_age : float
+            Maximum seconds since an entry was last used. Values ``<= 0`` disable the cap.
+
+        Returns
+        -------
+        int
+            Number of evicted entries.
+        """
+
+    @abstractmethod
+    def vacuum(self) -> None:
+        """Reclaim space left behind by evicted entries."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release open handles."""
+
+
+class SQLiteHTTPCache(HTTPCacheBackend):
+    """
+    Cache responses in one SQLite database in WAL mode.
+
+    Bodies are compressed with zlib when that makes them smaller. Every session shares a single
+    connection, so concurrent checks do not contend on separate writers.
+    """
+    def __init__(self, database: Path) -> None:
+        """
+        Open (and create if needed) the database.
+
+        Parameters
+        ----------
+        database : Path
+            Database file.
+        """
+        self.database = database
+        self._connection = sqlite3.connect(database, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        with self._connection:
+            self._connection.execute('BEGIN')
+            # Table of the unbounded niquests_cache backend this replaces.
+            self._connection.execute('DROP TABLE IF EXISTS niquests_cache')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, '
+                'content BLOB NOT NULL, compressed INTEGER NOT NULL, raw_size INTEGER NOT NULL, '
+                'size INTEGER NOT NULL, encoding TEXT NOT NULL, headers TEXT NOT NULL, '
+                'status_code INTEGER NOT NULL, ts REAL NOT NULL, url TEXT NOT NULL, '
+                'accessed REAL NOT NULL)')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Look up a cached entry and mark it as used.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        CacheEntry | None
+            The stored entry, or ``None`` if the key is unknown or the entry is corrupt.
+        """
+        row = self._connection.execute(
+            'SELECT content, compressed, encoding, headers, status_code, ts, url FROM responses '
+            'WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        content, compressed, encoding, headers, status_code, ts, url = row
+        try:
+            entry: CacheEntry = {
+                'content': zlib.decompress(content) if compressed else bytes(content),
+                'encoding': encoding,
+                'headers': json.loads(headers),
+                'status_code': status_code,
+                'ts': ts,
+                'url': url
+            }
+        except (zlib.error, ValueError):
+            log.debug('Dropping corrupt cache entry for %s.', url)
+            self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+            return None
+        self._connection.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time(), key))
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Persist a cache entry.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        entry : CacheEntry
+            The entry to store.
+        """
+        content, compressed = _compress(entry['content'])
+        headers = json.dumps(dict(entry['headers']))
+        self._connection.execute(
+            'INSERT OR REPLACE INTO responses (key, content, compressed, raw_size, size, encoding, '
+            'headers, status_code, ts, url, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, content, compressed, len(entry['content']) + len(headers),
+             len(content) + len(headers), entry['encoding'], headers, entry['status_code'],
+             entry['ts'], entry['url'], time()))
+
+    def stats(self) -> CacheStats:
+        """
+        Summarise the cache.
+
+        Returns
+        -------
+        CacheStats
+            Entry count and sizes.
+        """
+        entries, size, raw_size, oldest = self._connection.execute(
+            'SELECT COUNT(*), TOTAL(size), TOTAL(raw_size), MIN(accessed) FROM responses').fetchone(
+            )
+        return CacheStats(entries, int(size), int(raw_size), oldest or 0)
+
+    def prune(self, *, max_size: int = DEFAULT_MAX_SIZE, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """
+        Evict old and least recently used entries.
+
+        Entries unused for longer than ``max_age`` go first, then least recently used entries
+        until the cache fits in ``max_size``.
+
+        Parameters
+        ----------
+        max_size : int
+            Size cap in bytes. Values ``<= 0`` disable the cap.
+        max_age : float
+            Maximum seconds since an entry was last used. Values ``<= 0`` disable the cap.
+
+        Returns
+        -------
+        int
+            Number of evicted entries.
+        """
+        count = 0
+        if max_age > 0:
+            count += self._connection.execute('DELETE FROM responses WHERE accessed < ?',
+                                              (time() - max_age,)).rowcount
+        if max_size > 0:
+            count += self._connection.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM (SELECT key, SUM(size) OVER '
+                '(ORDER BY accessed DESC, key) AS running FROM responses) WHERE running > ?)',
+                (max_size,)).rowcount
+        return count
+
+    def vacuum(self) -> None:
+        """Rebuild the database file and truncate the write-ahead log."""
+        self._connection.execute('VACUUM')
+        self._connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+class FileSystemHTTPCache(HTTPCacheBackend):
+    """
+    Cache responses as one compressed file per entry, sharded by the first two key characters.
+
+    Each file starts with the uncompressed size as a big-endian 64-bit integer, followed by the
+    zlib-compressed entry: the JSON-encoded metadata, a newline and the body. The modification time
+    of a file is its last use.
+    """
+    def __init__(self, directory: Path) -> None:
+        """
+        Create the cache directory if needed.
+
+        Parameters
+        ----------
+        directory : Path
+            Root directory of the cache.
+        """
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _files(self) -> list[tuple[Path, os.stat_result]]:
+        return [(path, path.stat()) for path in self.directory.glob('*/*') if path.is_file()]
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Look up a cached entry and mark it as used.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        CacheEntry | None
+            The stored entry, or ``None`` if the key is unknown or the entry is corrupt.
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            meta, _, content = zlib.decompress(data[_RAW_SIZE_BYTES:]).partition(b'\n')
+            entry = {**json.loads(meta), 'content': content}
+        except (zlib.error, ValueError, TypeError):
+            log.debug('Dropping corrupt cache entry %s.', path)
+            path.unlink(missing_ok=True)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return cast('CacheEntry', entry)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Persist a cache entry.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        entry : CacheEntry
+            The entry to store.
+        """
+        meta: dict[str, Any] = {k: v for k, v in entry.items() if k != 'content'}
+        raw = json.dumps(meta).encode() + b'\n' + entry['content']
+        path = self._path(key)
+        tmp = path.with_name(f'.{key}.tmp')
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp.write_bytes(len(raw).to_bytes(_RAW_SIZE_BYTES, 'big') + zlib.compress(raw))
+            tmp.replace(path)
+        except OSError:
+            log.debug('Could not write cache entry %s.', path, exc_info=True)
+
+    def stats(self) -> CacheStats:
+        """
+        Summarise the cache.
+
+        Returns
+        -------
+        CacheStats
+            Entry count and sizes.
+        """
+        files = self._files()
+        raw_size = 0
+        for path, _ in files:
+            with contextlib.suppress(OSError), path.open('rb') as f:
+                raw_size += int.from_bytes(f.read(_RAW_SIZE_BYTES), 'big')
+        return CacheStats(len(files), sum(st.st_size for _, st in files), raw_size,
+                          min((st.st_mtime for _, st in files), default=0))
+
+    def prune(self, *, max_size: int = DEFAULT_MAX_SIZE, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """
+        Evict old and least recently used entries.
+
+        Entries unused for longer than ``max_age`` go first, then least recently used entries
+        until the cache fits in ``max_size``.
+
+        Parameters
+        ----------
+        max_size : int
+            Size cap in bytes. Values ``<= 0`` disable the cap.
+        max_age : float
+            Maximum seconds since an entry was last used. Values ``<= 0`` disable the cap.
+
+        Returns
+        -------
+        int
+            Number of evicted entries.
+        """
+        files = sorted(self._files(), key=lambda item: item[1].st_mtime, reverse=True)
+        cutoff = time() - max_age if max_age > 0 else 0
+        total = 0
+        count = 0
+        for path, st in files:
+            total += st.st_size
+            if st.st_mtime < cutoff or 0 < max_size < total:
+                path.unlink(missing_ok=True)
+                count += 1
+        return count
+
+    def vacuum(self) -> None:
+        """Remove interrupted writes and empty shard directories."""
+        for tmp in self.directory.glob('*/.*.tmp'):
+            tmp.unlink(missing_ok=True)
+        for shard in self.directory.iterdir():
+            if shard.is_dir() and not any(shard.iterdir()):
+                shard.rmdir()
+
+    def close(self) -> None:
+        """Do nothing."""
+
+
+HTTP_CACHE_BACKENDS = ('sqlite', 'filesystem')
+"""Names accepted by :py:func:`configure_http_cache`."""
+
+_backend: HTTPCacheBackend | None = None
+_kind = 'sqlite'
+_max_size = DEFAULT_MAX_SIZE
+_max_age: float = DEFAULT_MAX_AGE
+_directory: Path | None = None
+
+
+def configure_http_cache(kind: str = 'sqlite',
+                         *,
+                         max_size: int = DEFAULT_MAX_SIZE,
+                         max_age: float = DEFAULT_MAX_AGE,
+                         directory: Path | None = None) -> None:
+    """
+    Choose the HTTP cache backend and its caps.
+
+    Must be called before the first session is created. Any open backend is closed.
+
+    Parameters
+    ----------
+    kind : str
+        One of :py:data:`HTTP_CACHE_BACKENDS`.
+    max_size : int
+        Size cap in bytes, enforced when the cache is closed.
+    max_age : float
+        Maximum seconds an entry may go unused, enforced when the cache is closed.
+    directory : Path | None
+        Directory of the cache, or ``None`` for the user cache directory.
+
+    Raises
+    ------
+    ValueError
+        If ``kind`` is not a known backend.
+    """
+    global _directory, _kind, _max_age, _max_size
+    if kind not in HTTP_CACHE_BACKENDS:
+        msg = f'Unknown HTTP cache backend: {kind!r}.'
+        raise ValueError(msg)
+    close_http_cache(prune=False)
+    _kind, _max_size, _max_age, _directory = kind, max_size, max_age, directory
+
+
+def get_http_cache() -> HTTPCacheBackend:
+    """
+    Get the shared HTTP cache backend, opening it if needed.
+
+    Returns
+    -------
+    HTTPCacheBackend
+        The configured backend.
+    """
+    global _backend  # ruff:ignore[global-statement]
+    if _backend is None:
+        directory = _directory or _cache_dir()
+        _backend = (FileSystemHTTPCache(directory / 'http')
+                    if _kind == 'filesystem' else SQLiteHTTPCache(directory / 'http.sqlite'))
+    return _backend
+
+
+def close_http_cache(*, prune: bool = True) -> None:
+    """
+    Close the shared HTTP cache backend if it is open.
+
+    Parameters
+    ----------
+    prune : bool
+        Enforce the configured size and age caps first.
+    """
+    global _backend  # ruff:ignore[global-statement]
+    if _backend is None:
+        return
+    if prune and (count := _backend.prune(max_size=_max_size, max_age=_max_age)):
+        log.debug('Evicted %d HTTP cache entries.', count)
+    _backend.close()
+    _backend = None
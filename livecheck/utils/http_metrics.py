@@ -0,0 +1,285 @@
+"""Per-host HTTP counters and latency histograms, exported as JSON or Prometheus text."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+import json
+import logging
+
+import niquests
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ('CACHE_OUTCOMES', 'LATENCY_BUCKETS', 'HTTPMetrics', 'HostMetrics', 'cache_outcome',
+           'http_metrics', 'network_responses', 'record_network_response')
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""Upper bounds in seconds of the latency histogram buckets."""
+CACHE_OUTCOMES = ('hit', 'revalidated', 'miss')
+"""Served from the cache, served from the cache after a ``304``, or fetched."""
+
+network_responses: ContextVar[list[int] | None] = ContextVar('network_responses', default=None)
+"""Status codes of responses received from the network during the current request."""
+
+
+def record_network_response(response: niquests.Response) -> None:
+    """
+    Note a response received from the network in :py:data:`network_responses`.
+
+    Register as a ``response`` hook. Responses served from the HTTP cache never reach the hook.
+
+    Parameters
+    ----------
+    response : niquests.Response
+        Response received from the network.
+    """
+    if (statuses := network_responses.get()) is not None:
+        statuses.append(response.status_code or 0)
+
+
+def cache_outcome(response: niquests.Response, network: list[int] | None) -> str:
+    """
+    Classify how the HTTP cache was involved in a response.
+
+    Parameters
+    ----------
+    response : niquests.Response
+        The response returned to the caller.
+    network : list[int] | None
+        Status codes received from the network while producing it.
+
+    Returns
+    -------
+    str
+        One of :py:data:`CACHE_OUTCOMES`.
+    """
+    # Responses built from a cache entry are never attached to a request.
+    if response.request is not None:
+        return 'miss'
+    return 'revalidated' if network else 'hit'
+
+
+def _bytes_received(response: niquests.Response) -> int:
+    if isinstance(response, niquests.AsyncResponse):
+        # The body of a streamed response is read by the caller, so use the advertised size.
+        try:
+            return int(response.headers.get('Content-Length', 0))
+        except (TypeError, ValueError):
+            return 0
+    return len(content) if isinstance(content := response.content, bytes) else 0
+
+
+@dataclass
+class HostMetrics:
+    """Counters of one host."""
+    status_codes: Counter[int] = field(default_factory=Counter)
+    """Number of responses per status code."""
+    cache: Counter[str] = field(default_factory=Counter)
+    """Number of responses per :py:data:`CACHE_OUTCOMES` value."""
+    errors: int = 0
+    """Requests that raised instead of returning a response."""
+    bytes_received: int = 0
+    """Size of the response bodies."""
+    semaphore_wait: float = 0
+    """Seconds spent waiting for the shared concurrency limit."""
+    latency_counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    """Responses per latency bucket (not cumulative). The last bucket has no upper bound."""
+    latency_sum: float = 0
+    """Seconds spent on all responses."""
+    @property
+    def requests(self) -> int:
+        """Responses received, including those served from the cache."""
+        return sum(self.latency_counts)
+
+    def cumulative_latency(self) -> list[tuple[str, int]]:
+        """
+        Get the latency histogram in Prometheus form.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            Pairs of upper bound (``+Inf`` last) and number of responses at most that slow.
+        """
+        total = 0
+        result = []
+        for bound, count in zip((*(str(b) for b in LATENCY_BUCKETS), '+Inf'),
+                                self.latency_counts,
+                                strict=True):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+class HTTPMetrics:
+    """Collect per-host HTTP metrics for a run."""
+    def __init__(self) -> None:
+        """Initialise empty metrics."""
+        self.hosts: dict[str, HostMetrics] = {}
+
+    def _host(self, url: str) -> HostMetrics:
+        return self.hosts.setdefault(urlparse(url).hostname or '', HostMetrics())
+
+    def observe(self, url: str, response: niquests.Response, *, latency: float, cache: str) -> None:
+        """
+        Record a response.
+
+        Parameters
+        ----------
+        url : str
+            Requested URL.
+        response : niquests.Response
+            The response.
+        latency : float
+            Seconds from sending the request to receiving the response headers, or the whole body
+            unless streamed.
+        cache : str
+            One of :py:data:`CACHE_OUTCOMES`.
+        """
+        metrics = self._host(url)
+        metrics.status_codes[response.status_code or 0] += 1
+        metrics.cache[cache] += 1
+        metrics.bytes_received += _bytes_received(response)
+        metrics.latency_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        metrics.latency_sum += latency
+
+    def observe_error(self, url: str) -> None:
+        """
+        Record a request that failed without a response.
+
+        Parameters
+        ----------
+        url : str
+            Requested URL.
+        """
+        self._host(url).errors += 1
+
+    def observe_wait(self, url: str, seconds: float) -> None:
+        """
+        Record time spent waiting for the shared concurrency limit.
+
+        Parameters
+        ----------
+        url : str
+            Requested URL.
+        seconds : float
+            Time waited.
+        """
+        self._host(url).semaphore_wait += seconds
+
+    def clear(self) -> None:
+        """Reset all metrics."""
+        self.hosts.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Get the metrics as a JSON-compatible dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            Host name to its metrics.
+        """
+        return {
+            host: {
+                'bytes_received': m.bytes_received,
+                'cache': {
+                    outcome: m.cache[outcome]
+                    for outcome in CACHE_OUTCOMES
+                },
+                'errors': m.errors,
+                'latency_seconds': {
+                    'buckets': dict(m.cumulative_latency()),
+                    'sum': m.latency_sum
+                },
+                'requests': m.requests,
+                'semaphore_wait_seconds': m.semaphore_wait,
+                'status_codes': {
+                    str(code): count
+                    for code, count in sorted(m.status_codes.items())
+                }
+            }
+            for host, m in sorted(self.hosts.items())
+        }
+
+    def prometheus(self) -> str:
+        """
+        Get the metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            Metrics suitable for the node exporter textfile collector.
+        """
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_: str) -> None:
+            lines.extend(
+                (f'# HELP livecheck_http_{name} {help_}', f'# TYPE livecheck_http_{name} {kind}'))
+
+        def sample(name: str, host: str, value: float, **labels: str) -> None:
+            extra = ''.join(f',{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f'livecheck_http_{name}{{host="{_escape(host)}"{extra}}} {value}')
+
+        hosts = sorted(self.hosts.items())
+        family('responses_total', 'counter', 'HTTP responses by status code.')
+        for h, m in hosts:
+            for code, n in sorted(m.status_codes.items()):
+                sample('responses_total', h, n, code=str(code))
+        family('cache_total', 'counter', 'HTTP responses by cache outcome.')
+        for h, m in hosts:
+            for outcome in CACHE_OUTCOMES:
+                sample('cache_total', h, m.cache[outcome], outcome=outcome)
+        family('errors_total', 'counter', 'HTTP requests that failed without a response.')
+        for h, m in hosts:
+            sample('errors_total', h, m.errors)
+        family('received_bytes_total', 'counter', 'Bytes of HTTP response bodies.')
+        for h, m in hosts:
+            sample('received_bytes_total', h, m.bytes_received)
+        family('semaphore_wait_seconds_total', 'counter',
+               'Seconds spent waiting for the concurrency limit.')
+        for h, m in hosts:
+            sample('semaphore_wait_seconds_total', h, m.semaphore_wait)
+        family('request_duration_seconds', 'histogram', 'HTTP response latency.')
+        for h, m in hosts:
+            for le, n in m.cumulative_latency():
+                sample('request_duration_seconds_bucket', h, n, le=le)
+            sample('request_duration_seconds_sum', h, m.latency_sum)
+            sample('request_duration_seconds_count', h, m.requests)
+        return '\n'.join(lines) + '\n'
+
+    def write(self, *, json_path: Path | None = None, prometheus_path: Path | None = None) -> None:
+        """
+        Write the metrics to files.
+
+        The Prometheus file is replaced atomically so a collector never reads a partial file.
+
+        Parameters
+        ----------
+        json_path : Path | None
+            Where to write the metrics as JSON.
+        prometheus_path : Path | None
+            Where to write the metrics in Prometheus text format.
+        """
+        if json_path:
+            json_path.write_text(json.dumps(self.as_dict(), indent=2) + '\n', encoding='utf-8')
+            log.debug('Wrote HTTP metrics to %s.', json_path)
+        if prometheus_path:
+            tmp = prometheus_path.with_name(f'.{prometheus_path.name}.tmp')
+            tmp.write_text(self.prometheus(), encoding='utf-8')
+            tmp.replace(prometheus_path)
+            log.debug('Wrote HTTP metrics to %s.', prometheus_path)
+
+
+http_metrics = HTTPMetrics()
+"""Metrics shared by every session."""
@@ -0,0 +1,263 @@
+"""Resolve ``mirror://`` URIs to the fastest healthy mirror of their group."""
+from __future__ import annotations
+
+from hashlib import sha256
+from time import time
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+import asyncio
+import logging
+
+from .http_cache import get_http_cache
+from .portage import get_thirdpartymirrors
+from .requests import probe_latency
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+
+__all__ = ('MIRROR_PROBE_TIMEOUT', 'MIRROR_TTL', 'MirrorSelector', 'configure_mirrors',
+           'get_selected_mirror', 'load_thirdpartymirrors', 'parse_thirdpartymirrors',
+           'resolve_mirror_uri', 'set_selected_mirror')
+
+log = logging.getLogger(__name__)
+
+MIRROR_PROBE_TIMEOUT = 5.0
+"""Seconds a mirror has to answer a probe."""
+MIRROR_TTL = 24 * 60 * 60
+"""Seconds the mirror selected for a group is used before the whole group is probed again."""
+
+
+def _key(group: str) -> str:
+    return sha256(f'fastest-mirror {group}'.encode()).hexdigest()
+
+
+def get_selected_mirror(group: str) -> str | None:
+    """
+    Look up the mirror selected for a group by a previous run.
+
+    Parameters
+    ----------
+    group : str
+        Group name.
+
+    Returns
+    -------
+    str | None
+        Mirror URL, or ``None`` if none was selected in the last :py:data:`MIRROR_TTL` seconds.
+    """
+    if (entry := get_http_cache().get(_key(group))) is None or time() - entry['ts'] >= MIRROR_TTL:
+        return None
+    return entry['content'].decode()
+
+
+def set_selected_mirror(group: str, mirror: str) -> None:
+    """
+    Remember the mirror selected for a group in the HTTP cache.
+
+    Parameters
+    ----------
+    group : str
+        Group name.
+    mirror : str
+        Mirror URL.
+    """
+    get_http_cache().set(
+        _key(group), {
+            'content': mirror.encode(),
+            'encoding': 'utf-8',
+            'headers': {},
+            'status_code': 200,
+            'ts': time(),
+            'url': f'mirror://{group}/'
+        })
+
+
+def parse_thirdpartymirrors(text: str) -> dict[str, tuple[str, ...]]:
+    """
+    Parse a ``profiles/thirdpartymirrors`` file.
+
+    Parameters
+    ----------
+    text : str
+        File content. Each line is a group name followed by mirror URLs.
+
+    Returns
+    -------
+    dict[str, tuple[str, ...]]
+        Mirror URLs by group.
+    """
+    groups: dict[str, tuple[str, ...]] = {}
+    for line in text.splitlines():
+        if len(fields := line.split('#', 1)[0].split()) > 1:
+            groups[fields[0]] = tuple(fields[1:])
+    return groups
+
+
+def load_thirdpartymirrors(repo_root: Path | None = None) -> dict[str, tuple[str, ...]]:
+    """
+    Get the mirror groups of a repository.
+
+    Parameters
+    ----------
+    repo_root : Path | None
+        Repository root. Its ``profiles/thirdpartymirrors`` overrides the groups of the
+        repositories configured in Portage (usually ``::gentoo``).
+
+    Returns
+    -------
+    dict[str, tuple[str, ...]]
+        Mirror URLs by group.
+    """
+    groups = dict(get_thirdpartymirrors())
+    if repo_root is not None:
+        try:
+            groups.update(
+                parse_thirdpartymirrors(
+                    (repo_root / 'profiles' / 'thirdpartymirrors').read_text(encoding='utf-8')))
+        except OSError:
+            log.debug('%s has no thirdpartymirrors file.', repo_root)
+    return groups
+
+
+class MirrorSelector:
+    """
+    Pick the fastest healthy mirror of each group.
+
+    The mirrors of a group are probed concurrently with ``HEAD`` requests the first time the group
+    is used in a run. The fastest one is remembered for :py:data:`MIRROR_TTL` seconds; later runs
+    probe only it and probe the whole group again if it stopped answering or the time is up.
+    """
+    def __init__(self,
+                 groups: Mapping[str, Sequence[str]] | None = None,
+                 *,
+                 timeout: float = MIRROR_PROBE_TIMEOUT) -> None:
+        """
+        Initialise the selector.
+
+        Parameters
+        ----------
+        groups : Mapping[str, Sequence[str]] | None
+            Mirror URLs by group. Loaded from Portage on first use if not given.
+        timeout : float
+            Seconds a mirror has to answer a probe.
+        """
+        self.groups = None if groups is None else {k: tuple(v) for k, v in groups.items()}
+        self.timeout = timeout
+        self._selected: dict[str, asyncio.Task[str]] = {}
+
+    def mirrors(self, group: str) -> tuple[str, ...]:
+        """
+        Get the mirrors of a group.
+
+        Parameters
+        ----------
+        group : str
+            Group name.
+
+        Returns
+        -------
+        tuple[str, ...]
+            Mirror URLs, empty if the group is unknown.
+        """
+        if self.groups is None:
+            self.groups = load_thirdpartymirrors()
+        return self.groups.get(group, ())
+
+    async def _probe(self, mirror: str) -> float | None:
+        return await probe_latency(f'{mirror.rstrip("/")}/', self.timeout)
+
+    async def _select(self, group: str) -> str:
+        if not (candidates := self.mirrors(group)):
+            log.debug('Unknown mirror group `%s`.', group)
+            return ''
+        if (cached := get_selected_mirror(group)) and cached in candidates:
+            if await self._probe(cached) is not None:
+                log.debug('Using mirror %s for %s again.', cached, group)
+                return cached
+            log.debug('Mirror %s of %s stopped answering.', cached, group)
+        latencies = await asyncio.gather(*map(self._probe, candidates))
+        if not (healthy := [(latency, mirror)
+                            for latency, mirror in zip(latencies, candidates, strict=True)
+                            if latency is not None]):
+            log.warning('No mirror of %s answered.', group)
+            return ''
+        latency, fastest = min(healthy)
+        log.debug('Fastest of %d healthy mirror(s) of %s: %s (%.0f ms).', len(healthy), group,
+                  fastest, latency * 1000)
+        set_selected_mirror(group, fastest)
+        return fastest
+
+    async def select(self, group: str) -> str:
+        """
+        Get the fastest healthy mirror of a group.
+
+        The choice is made once per run and shared by concurrent callers.
+
+        Parameters
+        ----------
+        group : str
+            Group name.
+
+        Returns
+        -------
+        str
+            Mirror URL, or an empty string if the group is unknown or no mirror answered.
+        """
+        if (task := self._selected.get(group)) is None:
+            task = self._selected[group] = asyncio.create_task(self._select(group))
+        return await asyncio.shield(task)
+
+    async def resolve(self, url: str) -> str:
+        """
+        Resolve a ``mirror://`` URI.
+
+        Parameters
+        ----------
+        url : str
+            URI. Other schemes are returned unchanged.
+
+        Returns
+        -------
+        str
+            URL on the selected mirror, or an empty string if the URI cannot be resolved.
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != 'mirror':
+            return url
+        if not (mirror := await self.select(parsed.netloc)):
+            return ''
+        return f'{mirror.rstrip("/")}/{parsed.path.lstrip("/")}'
+
+
+_selector = MirrorSelector()
+
+
+def configure_mirrors(repo_root: Path) -> None:
+    """
+    Use the mirror groups of a repository and forget the mirrors selected so far.
+
+    Parameters
+    ----------
+    repo_root : Path
+        Repository root.
+    """
+    global _selector  # ruff:ignore[global-statement]
+    _selector = MirrorSelector(load_thirdpartymirrors(repo_root))
+
+
+async def resolve_mirror_uri(url: str) -> str:
+    """
+    Resolve a ``mirror://`` URI to the fastest healthy mirror of its group.
+
+    Parameters
+    ----------
+    url : str
+        URI. Other schemes are returned unchanged.
+
+    Returns
+    -------
+    str
+        URL on the selected mirror, or an empty string if the URI cannot be resolved.
+    """
+    return await _selector.resolve(url)
@@ -0,0 +1,160 @@
+"""Remember lookups that failed so later runs can skip them until a TTL expires."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import sha256
+from http import HTTPStatus
+from time import time
+from typing import TYPE_CHECKING
+import logging
+
+from .http_cache import get_http_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ('DEFAULT_NEGATIVE_TTL', 'NEGATIVE_STATUSES', 'LookupOutcome', 'configure_negative_cache',
+           'get_negative_result', 'record_outcome', 'set_negative_result', 'track_outcome')
+
+log = logging.getLogger(__name__)
+
+DEFAULT_NEGATIVE_TTL = 24 * 60 * 60
+"""Seconds a negative result is trusted when running the command line tool."""
+NEGATIVE_STATUSES = frozenset({HTTPStatus.NOT_FOUND, HTTPStatus.GONE})
+"""HTTP status codes that are remembered for ``GET`` requests."""
+
+_ttl: float = 0
+
+
+class LookupOutcome:
+    """HTTP answers received while a lookup ran, to tell *not found* apart from *could not ask*."""
+    def __init__(self) -> None:
+        """Initialise with nothing received."""
+        self.statuses: set[int] = set()
+        """Status codes of the responses."""
+        self.failed = False
+        """Whether a request failed without a response (timeout, connection error)."""
+
+    @property
+    def negative_status(self) -> int | None:
+        """
+        Status code to remember if the lookup found nothing.
+
+        ``None`` if a request failed, nothing was requested, or any error other than ``404`` and
+        ``410`` was received (a server error, or a rate limit such as ``403`` or ``429``).
+        Otherwise ``404`` or ``410`` if one was received, and ``204 No Content`` for successful but
+        empty answers.
+        """
+        if self.failed or not self.statuses:
+            return None
+        found = self.statuses & NEGATIVE_STATUSES
+        if any(not HTTPStatus.OK <= status < HTTPStatus.BAD_REQUEST
+               for status in self.statuses - found):
+            return None
+        return min(found) if found else HTTPStatus.NO_CONTENT
+
+
+_outcome: ContextVar[LookupOutcome | None] = ContextVar('lookup_outcome', default=None)
+
+
+@contextmanager
+def track_outcome() -> Iterator[LookupOutcome]:
+    """
+    Collect the HTTP answers of the requests made in the block, including in tasks it starts.
+
+    Yields
+    ------
+    LookupOutcome
+        The answers received so far.
+    """
+    token = _outcome.set(outcome := LookupOutcome())
+    try:
+        yield outcome
+    finally:
+        _outcome.reset(token)
+
+
+def record_outcome(status_code: int | None) -> None:
+    """
+    Record the answer to a request for :py:func:`track_outcome`.
+
+    Parameters
+    ----------
+    status_code : int | None
+        Status code of the response, or ``None`` if the request failed without one.
+    """
+    if (outcome := _outcome.get()) is None:
+        return
+    if status_code is None:
+        outcome.failed = True
+    else:
+        outcome.statuses.add(status_code)
+
+
+def configure_negative_cache(ttl: float) -> None:
+    """
+    Set how long negative results are trusted.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds. ``0`` disables the negative cache.
+    """
+    global _ttl  # ruff:ignore[global-statement]
+    _ttl = ttl
+
+
+def _key(kind: str, key: str) -> str:
+    return sha256(f'negative {kind} {key}'.encode()).hexdigest()
+
+
+def get_negative_result(kind: str, key: str) -> int | None:
+    """
+    Look up a remembered negative result.
+
+    Parameters
+    ----------
+    kind : str
+        Namespace of the lookup (for example ``http`` or ``homepage``).
+    key : str
+        Key within the namespace, such as the URL.
+
+    Returns
+    -------
+    int | None
+        The remembered status code, or ``None`` if the lookup should be made.
+    """
+    if _ttl <= 0 or (entry := get_http_cache().get(_key(kind, key))) is None:
+        return None
+    if time() - entry['ts'] >= _ttl:
+        return None
+    return entry['status_code']
+
+
+def set_negative_result(kind: str, key: str, status_code: int = HTTPStatus.NO_CONTENT) -> None:
+    """
+    Remember that a lookup failed.
+
+    Parameters
+    ----------
+    kind : str
+        Namespace of the lookup (for example ``http`` or ``homepage``).
+    key : str
+        Key within the namespace, such as the URL.
+    status_code : int
+        HTTP status code of the failure. Defaults to ``204 No Content`` for a handler that found
+        nothing.
+    """
+    if _ttl <= 0:
+        return
+    log.debug('Remembering negative %s result for %s (%d).', kind, key, status_code)
+    get_http_cache().set(
+        _key(kind, key), {
+            'content': b'',
+            'encoding': 'utf-8',
+            'headers': {},
+            'status_code': status_code,
+            'ts': time(),
+            'url': key
+        })
@@ -0,0 +1,106 @@
+"""Persistent cache for effectively immutable lookups."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+import sqlite3
+
+import platformdirs
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ('close_object_cache', 'configure_object_cache', 'get_cached_object',
+           'purge_object_cache', 'set_cached_object')
+
+log = logging.getLogger(__name__)
+
+_connection: sqlite3.Connection | None = None
+_path: Path | None = None
+
+
+def _cache_path() -> Path:
+    return _path or platformdirs.user_cache_path('livecheck', appauthor=False,
+                                                 ensure_exists=True) / 'objects.sqlite'
+
+
+def configure_object_cache(path: Path | None = None) -> None:
+    """
+    Choose the database file of the cache. Any open database is closed.
+
+    Parameters
+    ----------
+    path : Path | None
+        Database file, or ``None`` for ``objects.sqlite`` in the user cache directory.
+    """
+    global _path  # ruff:ignore[global-statement]
+    close_object_cache()
+    _path = path
+
+
+def _connect() -> sqlite3.Connection:
+    global _connection  # ruff:ignore[global-statement]
+    if _connection is None:
+        _connection = sqlite3.connect(_cache_path())
+        _connection.execute('CREATE TABLE IF NOT EXISTS objects (kind TEXT NOT NULL, '
+                            'key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, key))')
+    return _connection
+
+
+def get_cached_object(kind: str, key: str) -> str | None:
+    """
+    Look up a cached immutable value.
+
+    Parameters
+    ----------
+    kind : str
+        Namespace of the value (for example ``github-tag``).
+    key : str
+        Key within the namespace.
+
+    Returns
+    -------
+    str | None
+        The stored value, or ``None`` if it is not cached.
+    """
+    row = _connect().execute('SELECT value FROM objects WHERE kind = ? AND key = ?',
+                             (kind, key)).fetchone()
+    return None if row is None else str(row[0])
+
+
+def set_cached_object(kind: str, key: str, value: str) -> None:
+    """
+    Store an immutable value.
+
+    Entries are never revalidated. Only store facts that cannot change, such as the commit a
+    published tag points to or the date of a commit.
+
+    Parameters
+    ----------
+    kind : str
+        Namespace of the value (for example ``github-tag``).
+    key : str
+        Key within the namespace.
+    value : str
+        Value to store. Empty values are ignored.
+    """
+    if not value:
+        return
+    with _connect() as connection:
+        connection.execute('INSERT OR REPLACE INTO objects (kind, key, value) VALUES (?, ?, ?)',
+                           (kind, key, value))
+
+
+def purge_object_cache() -> None:
+    """Remove every cached immutable value."""
+    with _connect() as connection:
+        count = connection.execute('DELETE FROM objects').rowcount
+    log.info('Purged %d cached immutable lookups.', count)
+
+
+def close_object_cache() -> None:
+    """Close the cache database if it is open."""
+    global _connection  # ruff:ignore[global-statement]
+    if _connection is not None:
+        _connection.close()
+        _connection = None
@@ -20,8 +20,8 @@ if TYPE_CHECKING:
 
 __all__ = ('P', 'catpkg_catpkgsplit', 'catpkgsplit2', 'compare_versions', 'fetch_ebuild', 'get_aux',
            'get_distdir', 'get_fetch_map', 'get_first_src_uri', 'get_highest_matches',
-           'get_last_version', 'get_repository_root_if_inside', 'remove_leading_zeros',
-           'sanitize_version', 'unpack_ebuild')
+           'get_last_version', 'get_repository_root_if_inside', 'get_thirdpartymirrors',
+           'remove_leading_zeros', 'sanitize_version', 'unpack_ebuild')
 
 P = portage.db[portage.root]['porttree'].dbapi
 """Portage tree database API instance.
@@ -174,7 +174,7 @@ async def get_aux(match: str, keys: Iterable[_AuxKey], mytree: str | None = None
     return await P.async_aux_get(match, list(keys), mytree=mytree)
 
 
-async def get_fetch_map(cpv: str) -> dict[str, tuple[str, ...]]:
+async def get_fetch_map(cpv: str, mytree: str | None = None) -> dict[str, tuple[str, ...]]:
     """
     Get the ``SRC_URI`` fetch map via :py:func:`P.async_fetch_map`.
 
@@ -182,13 +182,16 @@ async def get_fetch_map(cpv: str) -> dict[str, tuple[str, ...]]:
     ----------
     cpv : str
         CPV string for an ebuild.
+    mytree : str | None
+        Canonical path of the tree in which the ebuild is located, or ``None`` for automatic
+        lookup.
 
     Returns
     -------
     dict[str, tuple[str, ...]]
         Mapping of each file name to a tuple of alternative URIs.
     """
-    return await P.async_fetch_map(cpv)
+    return await P.async_fetch_map(cpv, mytree=mytree)
 
 
 async def get_first_src_uri(match: str, search_dir: Path | None = None) -> str:
@@ -451,6 +454,20 @@ def get_distdir() -> Path:
     return Path('/var/cache/distfiles')
 
 
+def get_thirdpartymirrors() -> dict[str, tuple[str, ...]]:
+    """
+    Get the ``mirror://`` groups of the configured repositories.
+
+    Returns
+    -------
+    dict[str, tuple[str, ...]]
+        Mirror URLs by group, from the ``profiles/thirdpartymirrors`` files Portage knows about.
+    """
+    mirrors: Mapping[str, Iterable[str]] = (
+        portage.settings.thirdpartymirrors())  # type: ignore[attr-defined]
+    return {group: tuple(urls) for group, urls in mirrors.items()}
+
+
 def fetch_ebuild(ebuild_path: str) -> bool:
     """
     Perform ``ebuild fetch`` operation.
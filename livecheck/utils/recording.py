@@ -0,0 +1,293 @@
+"""Record HTTP exchanges to a directory and replay them without the network."""
+from __future__ import annotations
+
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+import asyncio
+import json
+import logging
+import shutil
+
+from niquests.adapters import AsyncBaseAdapter
+from niquests.models import AsyncResponse
+from niquests.packages.urllib3 import AsyncHTTPResponse  # type: ignore[import-not-found]
+from niquests.structures import CaseInsensitiveDict
+from niquests.utils import get_encoding_from_headers
+import niquests
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from niquests.models import PreparedRequest
+
+__all__ = ('RECORDING_MODES', 'RecordingAdapter', 'ReplayAdapter', 'configure_recording',
+           'mount_recording', 'recording_mode', 'recording_state_directory')
+
+log = logging.getLogger(__name__)
+
+RECORDING_MODES = ('record', 'replay')
+_STRIPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+"""Headers describing the wire encoding, which no longer apply to the decoded body on disk."""
+
+_mode = ''
+_directory = Path()
+_latency: dict[str, float] = {}
+_state: Path | None = None
+_replay_state: TemporaryDirectory[str] | None = None
+STATE_DIRECTORY = 'state'
+"""Subdirectory of a recording holding the caches of the recorded run."""
+
+
+def configure_recording(mode: str = '',
+                        directory: Path | None = None,
+                        latency: Mapping[str, float] | None = None) -> None:
+    """
+    Record HTTP exchanges to a directory or replay them from it.
+
+    Must be called before the first session is created. Caches that would otherwise skip or change
+    requests across runs (immutable lookups, the fastest mirrors, negative results) must be moved
+    to :py:func:`recording_state_directory`. A recording starts with empty caches and keeps them
+    in its ``state`` subdirectory. Each replay starts from a temporary copy of them, so it makes
+    the same requests on any machine.
+
+    Parameters
+    ----------
+    mode : str
+        One of :py:data:`RECORDING_MODES`, or an empty string to use the network normally.
+    directory : Path | None
+        Directory holding the recorded exchanges. Required unless ``mode`` is empty.
+    latency : Mapping[str, float] | None
+        Seconds to wait before answering a replayed request, by host name. The key ``*`` applies
+        to every other host.
+
+    Raises
+    ------
+    ValueError
+        If ``mode`` is unknown or no directory is given.
+    """
+    global _directory, _mode, _replay_state, _state  # ruff:ignore[global-statement]
+    if mode and mode not in RECORDING_MODES:
+        msg = f'Unknown recording mode: {mode!r}.'
+        raise ValueError(msg)
+    if mode and directory is None:
+        msg = f'A directory is required to {mode} HTTP exchanges.'
+        raise ValueError(msg)
+    _mode = mode
+    _directory = directory or Path()
+    _latency.clear()
+    _latency.update(latency or {})
+    if _replay_state is not None:
+        _replay_state.cleanup()
+        _replay_state = None
+    _state = None
+    if mode == 'record':
+        _state = _directory / STATE_DIRECTORY
+        shutil.rmtree(_state, ignore_errors=True)
+        _state.mkdir(parents=True)
+    elif mode == 'replay':
+        _replay_state = TemporaryDirectory(prefix='livecheck-replay-')
+        _state = Path(_replay_state.name) / STATE_DIRECTORY
+        if (_directory / STATE_DIRECTORY).is_dir():
+            shutil.copytree(_directory / STATE_DIRECTORY, _state)
+        else:
+            _state.mkdir()
+
+
+def recording_mode() -> str:
+    """
+    Get the configured recording mode.
+
+    Returns
+    -------
+    str
+        ``record``, ``replay``, or an empty string when the network is used normally.
+    """
+    return _mode
+
+
+def recording_state_directory() -> Path | None:
+    """
+    Get the directory for the caches of a recorded or replayed run.
+
+    Returns
+    -------
+    Path | None
+        The directory, or ``None`` when the network is used normally.
+    """
+    return _state
+
+
+def _exchange_path(directory: Path, request: PreparedRequest) -> Path:
+    body = request.body
+    if isinstance(body, str):
+        body = body.encode()
+    digest = sha256(f'{request.method} {request.url}\n'.encode())
+    if isinstance(body, bytes):
+        digest.update(body)
+    return directory / digest.hexdigest()
+
+
+def _with_body(response: AsyncResponse, content: bytes) -> AsyncResponse:
+    # Consumers read the body from ``raw``, both when streaming and when not.
+    response.raw = AsyncHTTPResponse(body=BytesIO(content),
+                                     headers=dict(response.headers),
+                                     status=response.status_code or 0,
+                                     preload_content=False)
+    response._content = False  # ruff:ignore[private-member-access]
+    response._content_consumed = False  # ruff:ignore[private-member-access]
+    return response
+
+
+class RecordingAdapter(AsyncBaseAdapter):
+    """Send requests with another adapter and save each response to a directory."""
+    def __init__(self, adapter: AsyncBaseAdapter, directory: Path) -> None:
+        """
+        Initialise the adapter.
+
+        Parameters
+        ----------
+        adapter : AsyncBaseAdapter
+            Adapter that sends the requests.
+        directory : Path
+            Directory to save the exchanges to. It is created if needed.
+        """
+        super().__init__()
+        self.adapter = adapter
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+
+    async def send(  # type: ignore[override]
+            self, request: PreparedRequest, **kwargs: Any) -> AsyncResponse:
+        """
+        Send a request and save the exchange.
+
+        The body is read in full to save it, even if the caller streams it.
+
+        Parameters
+        ----------
+        request : PreparedRequest
+            The request.
+        **kwargs : Any
+            Forwarded to the wrapped adapter.
+
+        Returns
+        -------
+        AsyncResponse
+            The response, readable as if it had not been saved.
+        """
+        response = await self.adapter.send(request, **{**kwargs, 'stream': True})
+        content = await response.content or b''
+        path = _exchange_path(self.directory, request)
+        path.with_suffix('.body').write_bytes(content)
+        headers = [(k, v) for k, v in response.headers.items()
+                   if k.lower() not in _STRIPPED_HEADERS]
+        response.headers = CaseInsensitiveDict(headers)
+        exchange = {
+            'elapsed': response.elapsed.total_seconds() if response.elapsed else 0,
+            'headers': headers,
+            'method': request.method,
+            'reason': response.reason,
+            'status_code': response.status_code,
+            'url': request.url
+        }
+        path.with_suffix('.json').write_text(json.dumps(exchange, indent=2), encoding='utf-8')
+        log.debug('Recorded %s %s as %s.', request.method, request.url, path.name)
+        return _with_body(response, content)
+
+    async def close(self) -> None:
+        """Close the wrapped adapter."""
+        await self.adapter.close()
+
+
+class ReplayAdapter(AsyncBaseAdapter):
+    """Answer requests with responses saved by :py:class:`RecordingAdapter`."""
+    def __init__(self, directory: Path, latency: Mapping[str, float] | None = None) -> None:
+        """
+        Initialise the adapter.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory the exchanges were saved to.
+        latency : Mapping[str, float] | None
+            Seconds to wait before answering, by host name. The key ``*`` applies to every other
+            host.
+        """
+        super().__init__()
+        self.directory = directory
+        self.latency = latency or {}
+
+    async def send(  # type: ignore[override]
+            self,
+            request: PreparedRequest,
+            **kwargs: Any  # ruff:ignore[unused-method-argument]
+    ) -> AsyncResponse:
+        """
+        Answer a request from the recording.
+
+        Parameters
+        ----------
+        request : PreparedRequest
+            The request.
+        **kwargs : Any
+            Unused. Replayed bodies can always be streamed.
+
+        Returns
+        -------
+        AsyncResponse
+            The recorded response.
+
+        Raises
+        ------
+        niquests.ConnectionError
+            If the request was not recorded.
+        """
+        path = _exchange_path(self.directory, request)
+        try:
+            exchange = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+            content = path.with_suffix('.body').read_bytes()
+        except OSError as e:
+            msg = f'No recorded response for {request.method} {request.url}.'
+            raise niquests.ConnectionError(msg, request=request) from e
+        host = urlparse(request.url or '').hostname or ''
+        if delay := self.latency.get(host, self.latency.get('*', 0)):
+            await asyncio.sleep(delay)
+        response = AsyncResponse()
+        response.status_code = exchange['status_code']
+        response.reason = exchange['reason']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self  # type: ignore[attr-defined]
+        return _with_body(response, content)
+
+    async def close(self) -> None:
+        """Do nothing."""
+
+
+def mount_recording(session: niquests.AsyncSession) -> None:
+    """
+    Route a session's requests through the configured recording mode.
+
+    The HTTP response cache of the session is turned off so every request is recorded or
+    replayed. Does nothing unless :py:func:`configure_recording` enabled a mode.
+
+    Parameters
+    ----------
+    session : niquests.AsyncSession
+        Session to configure.
+    """
+    if not _mode:
+        return
+    if settings := getattr(session, 'settings', None):
+        settings.disabled = True
+    for prefix in ('https://', 'http://'):
+        session.mount(
+            prefix,
+            RecordingAdapter(session.adapters[prefix], _directory)
+            if _mode == 'record' else ReplayAdapter(_directory, _latency))
@@ -1,35 +1,80 @@
 """Utilities for requests module."""
 from __future__ import annotations
 
+from contextlib import suppress
 from dataclasses import dataclass
 from email.utils import parsedate_to_datetime
 from http import HTTPStatus
-from typing import TYPE_CHECKING
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 from urllib.parse import urlparse
+import asyncio
+import codecs
 import hashlib
 import logging
+import queue
 
+from niquests.packages.urllib3.exceptions import ProtocolError  # type: ignore[import-not-found]
 import niquests
 
 from .credentials import get_api_credentials
-from .session import build_github_session, build_session
+from .freshness import FreshnessCache
+from .http_cache import close_http_cache
+from .http_metrics import http_metrics
+from .negative_cache import (
+    NEGATIVE_STATUSES,
+    get_negative_result,
+    record_outcome,
+    set_negative_result,
+)
+from .session import (
+    HTTP11_ONLY,
+    build_github_session,
+    build_session,
+    connection_stats,
+    protocol_policy,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
-    import asyncio
+    from collections.abc import AsyncGenerator, AsyncIterator, Callable, Mapping
+    from pathlib import Path
 
-__all__ = ('TextDataResponse', 'close_sessions', 'get_content', 'get_last_modified', 'hash_url',
-           'init_sessions', 'session_init')
+    from .freshness import FreshnessPolicy
+
+__all__ = ('DEFAULT_MAX_BODY_SIZE', 'HashedURL', 'TextDataResponse', 'Validators', 'close_sessions',
+           'get_content', 'get_validators', 'hash_url', 'init_sessions', 'probe_latency',
+           'register_run_state', 'session_init', 'stream_text')
 
 log = logging.getLogger(__name__)
 
 _semaphore: asyncio.Semaphore | None = None
 _sessions: dict[str, niquests.AsyncSession] = {}
-
-
-def init_sessions(semaphore: asyncio.Semaphore) -> None:
+_http11_hosts: set[str] = set()
+"""Hosts demoted to HTTP/1.1 after a protocol error during this run."""
+_MODULE_HOSTS = {'github': 'api.github.com', 'pypi': 'pypi.org'}
+"""Host whose protocol policy applies to a module's session."""
+_freshness = FreshnessCache({})
+_run_state_resets: list[Callable[[], object]] = []
+"""Functions forgetting the per-run state of other modules, called by :py:func:`init_sessions`."""
+DEFAULT_MAX_BODY_SIZE = 16 * 1024 * 1024
+"""Bytes of a streamed body read before :py:func:`stream_text` stops."""
+HASH_CHUNK_SIZE = 1024 * 1024
+"""Bytes read from the network at a time while hashing a body."""
+HASH_QUEUE_SIZE = 8
+"""Chunks buffered for each hashing worker before the download waits for it."""
+PROBE_CONCURRENCY = 16
+"""Latency probes in flight at once. They do not count against the shared request limit."""
+_OK_STATUSES = frozenset({
+    HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.ACCEPTED, HTTPStatus.PARTIAL_CONTENT,
+    HTTPStatus.MOVED_PERMANENTLY, HTTPStatus.FOUND, HTTPStatus.TEMPORARY_REDIRECT,
+    HTTPStatus.PERMANENT_REDIRECT
+})
+
+
+def init_sessions(semaphore: asyncio.Semaphore,
+                  freshness_policies: Mapping[str, FreshnessPolicy] | None = None) -> None:
     """
-    Initialise the module-level HTTP semaphore and clear the session cache.
+    Initialise the module-level HTTP semaphore and clear the session cache and per-run state.
 
     Must be called once at the start of the async entry point before any HTTP requests.
 
@@ -37,17 +82,45 @@ def init_sessions(semaphore: asyncio.Semaphore) -> None:
     ----------
     semaphore : asyncio.Semaphore
         Shared semaphore bounding concurrent in-flight HTTP requests.
+    freshness_policies : Mapping[str, FreshnessPolicy] | None
+        Host name to how long its responses are used from the HTTP cache without asking the
+        server. Hosts not in the mapping are cached according to their headers only.
     """
-    global _semaphore  # ruff:ignore[global-statement]
+    global _freshness, _semaphore  # ruff:ignore[global-statement]
     _semaphore = semaphore
+    _freshness = FreshnessCache(freshness_policies or {})
     _sessions.clear()
+    _http11_hosts.clear()
+    http_metrics.clear()
+    for reset in _run_state_resets:
+        reset()
+
+
+def register_run_state(reset: Callable[[], object]) -> None:
+    """
+    Register a function that forgets state kept for the duration of a run.
+
+    Memoised lookups, shared tasks and futures belong to the event loop of the run that created
+    them. They are forgotten by :py:func:`init_sessions` so a later run (another
+    :py:func:`asyncio.run` in the same process) starts clean.
+
+    Parameters
+    ----------
+    reset : Callable[[], object]
+        Called without arguments at the start of every run.
+    """
+    _run_state_resets.append(reset)
 
 
 async def close_sessions() -> None:
-    """Close all cached HTTP sessions."""
+    """Close all cached HTTP sessions and the HTTP cache, and log connection reuse counters."""
+    await _freshness.drain()
     for session in _sessions.values():
         await session.close()
     _sessions.clear()
+    close_http_cache()
+    connection_stats.log_summary()
+    connection_stats.clear()
 
 
 @dataclass
@@ -61,7 +134,7 @@ class TextDataResponse:
         """Do nothing."""
 
 
-def session_init(module: str) -> niquests.AsyncSession:
+def session_init(module: str, *, http11_only: bool = False) -> niquests.AsyncSession:
     """
     Get or create a cached HTTP session for the given module.
 
@@ -69,6 +142,8 @@ def session_init(module: str) -> niquests.AsyncSession:
     ----------
     module : str
         Module name determining default headers and authentication (for example ``github``).
+    http11_only : bool
+        Get a session restricted to HTTP/1.1 instead of the module's protocol policy.
 
     Returns
     -------
@@ -80,13 +155,16 @@ def session_init(module: str) -> niquests.AsyncSession:
     RuntimeError
         If :py:func:`init_sessions` has not been called.
     """
-    if module in _sessions:
-        return _sessions[module]
+    key = f'{module}+http1.1' if http11_only else module
+    if key in _sessions:
+        return _sessions[key]
     if _semaphore is None:
         msg = 'Call init_sessions() before making HTTP requests.'
         raise RuntimeError(msg)
+    policy = HTTP11_ONLY if http11_only else protocol_policy(_MODULE_HOSTS.get(module, ''))
     session: niquests.AsyncSession
-    session = build_github_session(_semaphore) if module == 'github' else build_session(_semaphore)
+    session = (build_github_session(_semaphore, policy) if module == 'github' else build_session(
+        _semaphore, policy))
     match module:
         case 'github':
             token = get_api_credentials('github.com')
@@ -95,7 +173,7 @@ def session_init(module: str) -> niquests.AsyncSession:
             session.headers['Accept'] = 'application/vnd.github.v3+json'
         case 'xml':
             session.headers['Accept'] = 'application/xml'
-        case 'json':
+        case 'json' | 'pypi':
             session.headers['Accept'] = 'application/json'
         case 'gitlab':
             token = get_api_credentials('gitlab.com')
@@ -107,11 +185,133 @@ def session_init(module: str) -> niquests.AsyncSession:
             if token:
                 session.headers['Authorization'] = f'Bearer {token}'
             session.headers['Accept'] = 'application/json'
+        case 'git':
+            session.headers['Git-Protocol'] = 'version=2'
+            session.headers['Content-Type'] = 'application/x-git-upload-pack-request'
+            session.headers['Accept'] = 'application/x-git-upload-pack-result'
     session.headers['timeout'] = '30'
-    _sessions[module] = session
+    _sessions[key] = session
     return session
 
 
+def _is_protocol_error(e: niquests.ConnectionError) -> bool:
+    cause = e.args[0] if e.args else None
+    return isinstance(getattr(cause, 'reason', cause), ProtocolError)
+
+
+async def _send(module: str,
+                host: str,
+                req: niquests.Request,
+                *,
+                allow_redirects: bool,
+                stream: bool = False) -> niquests.Response:
+    """
+    Send a request, falling back to HTTP/1.1 once if the host breaks the HTTP/2 or HTTP/3 protocol.
+
+    The request goes through the session's HTTP cache and waits for the shared concurrency limit.
+    The session records its metrics and its outcome.
+
+    Parameters
+    ----------
+    module : str
+        Session module name.
+    host : str
+        Host name of the request.
+    req : niquests.Request
+        Request to send.
+    allow_redirects : bool
+        Whether to follow redirects.
+    stream : bool
+        Whether to leave the body unread.
+
+    Returns
+    -------
+    niquests.Response
+        The HTTP response.
+
+    Raises
+    ------
+    niquests.ConnectionError
+        If the connection fails for any other reason, or again over HTTP/1.1.
+    """
+    http11_only = host in _http11_hosts or protocol_policy(host) == HTTP11_ONLY
+    session = session_init(module, http11_only=http11_only)
+    # The query string goes in the URL, which is what the HTTP cache keys on.
+    kwargs: dict[str, Any] = {
+        'allow_redirects': allow_redirects,
+        'data': req.data or None,
+        'headers': req.headers,
+        'stream': stream
+    }
+    try:
+        return cast('niquests.Response', await session.request(req.method or 'GET',
+                                                               req.prepare().url or '', **kwargs))
+    except niquests.ConnectionError as e:
+        if http11_only or not _is_protocol_error(e):
+            raise
+    log.warning('Protocol error talking to %s. Using HTTP/1.1 for this host from now on.', host)
+    _http11_hosts.add(host)
+    return await _send(module, host, req, allow_redirects=allow_redirects, stream=stream)
+
+
+def _negative_key(req: niquests.Request) -> str:
+    if req.method != 'GET':
+        return ''
+    try:
+        return req.prepare().url or ''
+    except niquests.RequestException:
+        return ''
+
+
+def _build_request(url: str, headers: Mapping[str, str] | None, params: Mapping[str, str] | None,
+                   method: str, data: Mapping[str, str] | None) -> tuple[str, niquests.Request]:
+    """
+    Build a request and choose the session module for it.
+
+    Parameters
+    ----------
+    url : str
+        URL to request.
+    headers : Mapping[str, str] | None
+        Extra HTTP headers.
+    params : Mapping[str, str] | None
+        Query string parameters.
+    method : str
+        HTTP method name.
+    data : Mapping[str, str] | None
+        Form body.
+
+    Returns
+    -------
+    tuple[str, niquests.Request]
+        Session module name and the request.
+    """
+    hostname = urlparse(url).hostname
+    if hostname == 'api.github.com':
+        module = 'github'
+    elif hostname == 'api.gitlab.com':
+        module = 'gitlab'
+    elif hostname == 'api.bitbucket.org':
+        module = 'bitbucket'
+    elif hostname == 'pypi.org':
+        module = 'pypi'
+    elif hostname == 'repology.org':
+        module = 'json'
+        headers = {'User-Agent': 'DistroWatch', **(headers or {})}
+    elif url.endswith(('.atom', '.xml')):
+        module = 'xml'
+    elif url.endswith('json'):
+        module = 'json'
+    else:
+        module = ''
+    # Sessions are shared by concurrent checks, so per-call headers only go on the request.
+    return module, niquests.Request(method=method.upper(),
+                                    url=url,
+                                    headers=dict(headers) if headers else None,
+                                    data=data,
+                                    params=params)
+
+
 async def get_content(url: str,
                       headers: Mapping[str, str] | None = None,
                       params: Mapping[str, str] | None = None,
@@ -151,41 +351,39 @@ async def get_content(url: str,
         response.status_code = HTTPStatus.NOT_IMPLEMENTED
         return response
 
-    if parsed_uri.hostname == 'api.github.com':
-        session = session_init('github')
-    elif parsed_uri.hostname == 'api.gitlab.com':
-        session = session_init('gitlab')
-    elif parsed_uri.hostname == 'api.bitbucket.org':
-        session = session_init('bitbucket')
-    elif parsed_uri.hostname == 'repology.org':
-        session = session_init('json')
-        session.headers['User-Agent'] = 'DistroWatch'
-    elif url.endswith(('.atom', '.xml')):
-        session = session_init('xml')
-    elif url.endswith('json'):
-        session = session_init('json')
-    else:
-        session = session_init('')
+    module, req = _build_request(url, headers, params, method, data)
+    r: TextDataResponse | niquests.Response
+    if (negative_key := _negative_key(req)) and (status_code := get_negative_result(
+            'http', negative_key)):
+        log.debug('Skipping %s, which answered %d recently.', url, status_code)
+        record_outcome(status_code)
+        r = niquests.Response()
+        r.status_code = status_code
+        r.url = negative_key
+        http_metrics.observe(url, r, latency=0, cache='hit')
+        return r
+    host = parsed_uri.hostname or ''
+    sent = False
 
-    if headers:
-        for key, value in headers.items():
-            session.headers[key] = value
+    async def send() -> niquests.Response:
+        nonlocal sent
+        sent = True
+        return await _send(module, host, req, allow_redirects=allow_redirects)
 
-    r: TextDataResponse | niquests.Response
     try:
-        req = niquests.Request(method=method.upper(), url=url, data=data, params=params)
-        prepared = session.prepare_request(req)
-        r = await session.send(prepared, allow_redirects=allow_redirects)
+        r = await _freshness.fetch(host, req, send)
     except niquests.RequestException:
         log.exception('Caught error attempting to fetch `%s`.', url)
         r = niquests.Response()
         r.status_code = HTTPStatus.SERVICE_UNAVAILABLE
         return r
-    if r.status_code not in {
-            HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.ACCEPTED, HTTPStatus.PARTIAL_CONTENT,
-            HTTPStatus.MOVED_PERMANENTLY, HTTPStatus.FOUND, HTTPStatus.TEMPORARY_REDIRECT,
-            HTTPStatus.PERMANENT_REDIRECT
-    }:
+    if not sent:
+        # Answered by the freshness policy without asking the session.
+        http_metrics.observe(url, r, latency=0, cache='hit')
+        record_outcome(r.status_code)
+    if negative_key and r.status_code in NEGATIVE_STATUSES:
+        set_negative_result('http', negative_key, r.status_code)
+    if r.status_code not in _OK_STATUSES:
         log.error('Error fetching %s. Status code: %d', url, r.status_code)
     elif not r.text:
         log.warning('Empty response for %s.', url)
@@ -193,14 +391,159 @@ async def get_content(url: str,
     return r
 
 
-async def _hash_response_content(r: niquests.AsyncResponse) -> tuple[str, str, int]:
+async def _iter_body(r: niquests.Response, chunk_size: int) -> AsyncIterator[bytes]:
+    if isinstance(r, niquests.AsyncResponse):
+        async for chunk in await r.iter_content(chunk_size=chunk_size):
+            yield chunk
+        return
+    # Responses from the HTTP cache are already in memory.
+    content = r.content or b''
+    for i in range(0, len(content), chunk_size):
+        yield content[i:i + chunk_size]
+
+
+async def stream_text(url: str,
+                      headers: Mapping[str, str] | None = None,
+                      params: Mapping[str, str] | None = None,
+                      method: str = 'GET',
+                      data: Mapping[str, str] | None = None,
+                      *,
+                      max_size: int = DEFAULT_MAX_BODY_SIZE,
+                      chunk_size: int = 65536) -> AsyncGenerator[str]:
+    """
+    Fetch a URL and yield its body as text, one chunk at a time.
+
+    Only one chunk is held in memory. Use :py:func:`contextlib.aclosing` when the caller may stop
+    early so the connection is released.
+
+    Parameters
+    ----------
+    url : str
+        URL to request.
+    headers : Mapping[str, str] | None
+        Optional extra HTTP headers.
+    params : Mapping[str, str] | None
+        Optional query string parameters.
+    method : str
+        HTTP method name (for example ``GET``).
+    data : Mapping[str, str] | None
+        Optional form body for the request.
+    max_size : int
+        Stop after this many bytes of the body.
+    chunk_size : int
+        Bytes to read at a time.
+
+    Yields
+    ------
+    str
+        Decoded text. Nothing is yielded if the request fails.
+    """
+    log.debug('Streaming %s', url)
+    module, req = _build_request(url, headers, params, method, data)
+    if (negative_key := _negative_key(req)) and (status_code := get_negative_result(
+            'http', negative_key)):
+        log.debug('Skipping %s, which was not found recently.', url)
+        record_outcome(status_code)
+        return
+    host = urlparse(url).hostname or ''
+    try:
+        r = await _send(module, host, req, allow_redirects=True, stream=True)
+    except niquests.RequestException:
+        log.exception('Caught error attempting to fetch `%s`.', url)
+        return
+    try:
+        if negative_key and r.status_code in NEGATIVE_STATUSES:
+            set_negative_result('http', negative_key, r.status_code)
+        if r.status_code not in _OK_STATUSES:
+            log.error('Error fetching %s. Status code: %d', url, r.status_code)
+            return
+        try:
+            decoder = codecs.getincrementaldecoder(r.encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        remaining = max_size
+        async for chunk in _iter_body(r, chunk_size):
+            if len(chunk) >= remaining:
+                yield decoder.decode(chunk[:remaining], final=True)
+                log.warning('Stopped reading %s after %d bytes.', url, max_size)
+                return
+            remaining -= len(chunk)
+            if text := decoder.decode(chunk):
+                yield text
+        if text := decoder.decode(b'', final=True):
+            yield text
+    finally:
+        if isinstance(r, niquests.AsyncResponse):
+            with suppress(niquests.RequestException):
+                await r.close()
+
+
+class _ChunkWorker:
+    """
+    Pass chunks to a callable on a worker thread through a bounded queue.
+
+    ``hashlib`` releases the GIL while it hashes large buffers, so several workers fed the same
+    chunks run in parallel without blocking the event loop.
+    """
+    def __init__(self, consume: Callable[[bytes], object]) -> None:
+        self._consume = consume
+        self._queue: queue.Queue[bytes | None] = queue.Queue(HASH_QUEUE_SIZE)
+        self._aborted = False
+        self._error: BaseException | None = None
+        self._task = asyncio.create_task(asyncio.to_thread(self._run))
+
+    def _run(self) -> None:
+        while (chunk := self._queue.get()) is not None and not self._aborted:
+            if self._error is None:
+                try:
+                    self._consume(chunk)
+                except Exception as e:  # ruff:ignore[blind-except]
+                    # Keep draining the queue so the producer never blocks on a dead worker.
+                    self._error = e
+
+    async def put(self, chunk: bytes | None) -> None:
+        """
+        Queue a chunk, waiting in a thread while the queue is full.
+
+        Parameters
+        ----------
+        chunk : bytes | None
+            Data to consume, or ``None`` to stop the worker.
+        """
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, chunk)
+
+    async def close(self) -> None:
+        """Wait for the queued chunks to be consumed and re-raise a failure of the consumer."""
+        await self.put(None)
+        await self._task
+        if self._error is not None:
+            raise self._error
+
+    async def abort(self) -> None:
+        """Stop the worker without consuming the queued chunks."""
+        self._aborted = True
+        with suppress(queue.Full):
+            self._queue.put_nowait(None)
+        await self._task
+
+
+async def _hash_response_content(r: niquests.AsyncResponse,
+                                 save_to: Path | None = None) -> tuple[str, str, int]:
     """
     Stream a response body and hash it with BLAKE2b and SHA-512.
 
+    Each digest (and the optional file write) runs on its own worker thread, so hashing a large
+    distfile does not stall the event loop.
+
     Parameters
     ----------
     r : niquests.AsyncResponse
         A streaming response whose body will be consumed.
+    save_to : Path | None
+        File to also write the body to.
 
     Returns
     -------
@@ -210,20 +553,37 @@ async def _hash_response_content(r: niquests.AsyncResponse) -> tuple[str, str, i
     h_blake2b = hashlib.blake2b()
     h_sha512 = hashlib.sha512()
     size = 0
-    async for chunk in await r.iter_content(chunk_size=8192):
-        if chunk:
-            h_blake2b.update(chunk)
-            h_sha512.update(chunk)
-            size += len(chunk)
+    out = await asyncio.to_thread(save_to.open, 'wb') if save_to else None
+    workers = [_ChunkWorker(h_blake2b.update), _ChunkWorker(h_sha512.update)]
+    if out:
+        workers.append(_ChunkWorker(out.write))
+    try:
+        async for chunk in await r.iter_content(chunk_size=HASH_CHUNK_SIZE):
+            if chunk:
+                size += len(chunk)
+                for worker in workers:
+                    await worker.put(chunk)
+        for worker in workers:
+            await worker.close()
+    except BaseException:
+        for worker in workers:
+            await worker.abort()
+        raise
+    finally:
+        if out:
+            await asyncio.to_thread(out.close)
     return h_blake2b.hexdigest(), h_sha512.hexdigest(), size
 
 
 async def hash_url(url: str,
                    headers: Mapping[str, str] | None = None,
-                   params: Mapping[str, str] | None = None) -> tuple[str, str, int]:
+                   params: Mapping[str, str] | None = None,
+                   save_to: Path | None = None) -> HashedURL:
     """
     Hash the content of a URL using BLAKE2b and SHA-512.
 
+    The response headers are returned too, so callers need no separate ``HEAD`` request.
+
     Parameters
     ----------
     url : str
@@ -232,14 +592,17 @@ async def hash_url(url: str,
         Optional HTTP headers for the GET request.
     params : Mapping[str, str] | None
         Optional query string parameters.
+    save_to : Path | None
+        File to save the body to while it is hashed, such as a distfile in ``DISTDIR``. It is only
+        replaced once the whole body has been received.
 
     Returns
     -------
-    tuple[str, str, int]
-        BLAKE2b hex digest, SHA-512 hex digest, and byte length; or two empty strings and ``0`` on
-        failure.
+    HashedURL
+        Digests, size, final URL and validators of the body; empty on failure.
     """
     session = session_init('')
+    part = save_to.with_name(f'.{save_to.name}.part') if save_to else None
     try:
         r = await session.get(url,
                               headers=dict(headers) if headers else None,
@@ -247,44 +610,168 @@ async def hash_url(url: str,
                               stream=True,
                               timeout=30)
         r.raise_for_status()
-        return await _hash_response_content(r)
+        hashes = HashedURL(*await _hash_response_content(r, part),
+                           url=str(r.url or url),
+                           validators=_response_validators(r))
+        if save_to and part:
+            part.replace(save_to)
     except niquests.RequestException:
         log.exception('Error hashing URL %s.', url)
+    except OSError:
+        log.exception('Error saving %s to %s.', url, save_to)
+    else:
+        if save_to:
+            log.debug('Saved %s to %s.', hashes.url, save_to)
+        return hashes
+    finally:
+        if part:
+            part.unlink(missing_ok=True)
+
+    return HashedURL()
+
+
+async def probe_latency(url: str, timeout: float = 5) -> float | None:
+    """
+    Time a ``HEAD`` request.
 
-    return '', '', 0
+    The HTTP cache is bypassed and the request does not wait for the shared concurrency limit, so
+    the time measured is the server's. Any answer but a server error counts, since file mirrors
+    often refuse to list their root with 403 or 404.
 
+    Parameters
+    ----------
+    url : str
+        URL to request.
+    timeout : float
+        Seconds to wait for the response.
 
-async def get_last_modified(url: str,
-                            headers: Mapping[str, str] | None = None,
-                            params: Mapping[str, str] | None = None) -> str:
+    Returns
+    -------
+    float | None
+        Seconds until the response arrived, or ``None`` if the request failed or the server
+        answered with a server error.
     """
-    Get the last modified date of a URL.
+    if (session := _sessions.get('probe')) is None:
+        probe_session = build_session(asyncio.Semaphore(PROBE_CONCURRENCY))
+        probe_session.settings.disabled = True
+        session = _sessions['probe'] = probe_session
+    start = perf_counter()
+    try:
+        r = await session.head(url, timeout=timeout)
+    except niquests.RequestException as e:
+        log.debug('Probe of %s failed: %s', url, e)
+        return None
+    if r.status_code is None or r.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        log.debug('Probe of %s failed with status %s.', url, r.status_code)
+        return None
+    return perf_counter() - start
+
+
+class Validators(NamedTuple):
+    """Response headers that change when the body of a URL does."""
+    etag: str = ''
+    """``ETag`` header."""
+    last_modified: str = ''
+    """``Last-Modified`` header."""
+    content_length: str = ''
+    """``Content-Length`` header, or empty if the body is compressed in transit."""
+    def matches(self, other: Validators) -> bool:
+        """
+        Check if another set of validators describes the same body.
+
+        Entity tags are compared if both sets have one, otherwise modification dates. Sizes must
+        not differ.
+
+        Parameters
+        ----------
+        other : Validators
+            Validators seen later.
+
+        Returns
+        -------
+        bool
+            ``True`` if the body is known to be unchanged.
+        """
+        if self.content_length and other.content_length not in {'', self.content_length}:
+            return False
+        if self.etag and other.etag:
+            return self.etag == other.etag
+        return bool(self.last_modified) and self.last_modified == other.last_modified
+
+    @property
+    def last_modified_date(self) -> str:
+        """``Last-Modified`` as ``YYYYMMDD``, or an empty string if missing or invalid."""
+        if self.last_modified:
+            with suppress(TypeError, ValueError):
+                return parsedate_to_datetime(self.last_modified).strftime('%Y%m%d')
+        return ''
+
+
+def _response_validators(r: niquests.Response) -> Validators:
+    return Validators(etag=str(r.headers.get('ETag', '')),
+                      last_modified=str(r.headers.get('Last-Modified', '')),
+                      content_length='' if r.headers.get('Content-Encoding') else str(
+                          r.headers.get('Content-Length', '')))
+
+
+class HashedURL(NamedTuple):
+    """Digests of a response body and the headers it was served with."""
+    blake2b: str = ''
+    """BLAKE2b hex digest, or empty if the body could not be hashed."""
+    sha512: str = ''
+    """SHA-512 hex digest."""
+    size: int = 0
+    """Length of the body in bytes."""
+    url: str = ''
+    """URL the body was served from after redirects."""
+    validators: Validators = Validators()
+    """``ETag``, ``Last-Modified`` and ``Content-Length`` of the response."""
+
+
+async def get_validators(url: str,
+                         headers: Mapping[str, str] | None = None,
+                         params: Mapping[str, str] | None = None,
+                         known: Validators | None = None) -> Validators | None:
+    """
+    Get the validators of a URL with a ``HEAD`` request, without reading the body.
+
+    The request is conditional on ``known``, and never answered from the HTTP cache.
 
     Parameters
     ----------
     url : str
-        URL to request with ``HEAD``.
+        URL to request. Redirects are followed.
     headers : Mapping[str, str] | None
         Optional HTTP headers.
     params : Mapping[str, str] | None
         Optional query string parameters.
+    known : Validators | None
+        Validators seen before.
 
     Returns
     -------
-    str
-        ``Last-Modified`` as ``YYYYMMDD``, or an empty string if unavailable or on error.
+    Validators | None
+        The current validators (``known`` if the server answered ``304 Not Modified``), or
+        ``None`` on error.
     """
+    request_headers = dict(headers or {})
+    if known and known.etag:
+        request_headers['If-None-Match'] = known.etag
+    if known and known.last_modified:
+        request_headers['If-Modified-Since'] = known.last_modified
     try:
-        session = session_init('')
-        r = await session.head(url,
-                               headers=dict(headers) if headers else None,
-                               params=params,
-                               timeout=30)
-        r.raise_for_status()
-        if last_modified := str(r.headers.get('last-modified', '')):
-            return parsedate_to_datetime(last_modified).strftime('%Y%m%d')
-
+        r = await session_init('').head(url,
+                                        headers=request_headers or None,
+                                        params=params,
+                                        allow_redirects=True,
+                                        force_refresh=True,
+                                        timeout=30)
     except niquests.RequestException:
-        log.exception('Error fetching last modified header for %s.', url)
-
-    return ''
+        log.debug('Could not get the validators of %s.', url, exc_info=True)
+        return None
+    if known and r.status_code == HTTPStatus.NOT_MODIFIED:
+        return known
+    if r.status_code != HTTPStatus.OK:
+        log.debug('HEAD %s answered %s.', url, r.status_code)
+        return None
+    return _response_validators(r)
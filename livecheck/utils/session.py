@@ -1,19 +1,31 @@
 """Session helpers for HTTP access with caching and concurrency control."""
 from __future__ import annotations
 
-__all__ = ('build_github_session', 'build_retry', 'build_session')
+__all__ = ('HTTP11_ONLY', 'ConnectionStats', 'HostConnectionStats', 'ProtocolPolicy',
+           'build_github_session', 'build_retry', 'build_session', 'connection_stats',
+           'protocol_policy')
 
+from collections import Counter
+from dataclasses import dataclass, field
 from http import HTTPStatus
-from time import time
-from typing import TYPE_CHECKING, Any
+from time import perf_counter, time
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import urlparse
 import asyncio
+import contextlib
 import logging
 
 from niquests import RetryConfiguration as Retry
 from niquests_cache import AsyncCachedSession
-import platformdirs
+
+from .http_cache import get_http_cache
+from .http_metrics import cache_outcome, http_metrics, network_responses, record_network_response
+from .negative_cache import record_outcome
+from .recording import mount_recording
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     import niquests
 
 log = logging.getLogger(__name__)
@@ -23,8 +35,113 @@ _GITHUB_SECONDARY_BACKOFF_BASE = 60.0
 _RATE_LIMIT_BODY_HINTS = ('rate limit', 'abuse detection', 'secondary rate')
 
 
-def _cache_path() -> Any:
-    return platformdirs.user_cache_path('livecheck', appauthor=False, ensure_exists=True) / 'http'
+class ProtocolPolicy(NamedTuple):
+    """HTTP versions a session may negotiate. HTTP/1.1 is always allowed."""
+    http2: bool = True
+    """Allow HTTP/2 (negotiated with ALPN)."""
+    http3: bool = True
+    """Allow HTTP/3 (QUIC), used once the server advertises it with ``Alt-Svc``."""
+
+
+HTTP11_ONLY = ProtocolPolicy(http2=False, http3=False)
+"""Policy for hosts that misbehave with HTTP/2 or HTTP/3."""
+
+HOST_PROTOCOL_POLICIES: dict[str, ProtocolPolicy] = {
+    # Skip the HTTP/3 (QUIC) upgrade so later lookups reuse the pooled HTTP/2 connection instead
+    # of opening a QUIC one after the first response.
+    'api.github.com': ProtocolPolicy(http3=False),
+    'pypi.org': ProtocolPolicy(http3=False),
+}
+"""Protocol policy of hosts that need something other than the default."""
+
+
+def protocol_policy(host: str) -> ProtocolPolicy:
+    """
+    Get the protocol policy of a host.
+
+    Parameters
+    ----------
+    host : str
+        Host name.
+
+    Returns
+    -------
+    ProtocolPolicy
+        The configured policy, or the default policy allowing every HTTP version.
+    """
+    return HOST_PROTOCOL_POLICIES.get(host, ProtocolPolicy())
+
+
+@dataclass
+class HostConnectionStats:
+    """Connection reuse counters of one host."""
+    requests: int = 0
+    """Responses received from the network."""
+    connections: int = 0
+    """Requests that had to open a new connection."""
+    versions: Counter[str] = field(default_factory=Counter)
+    """Number of responses per negotiated HTTP version."""
+    @property
+    def reused(self) -> int:
+        """Requests sent over an already open connection."""
+        return self.requests - self.connections
+
+
+class ConnectionStats:
+    """
+    Count connections opened versus requests sent, per host.
+
+    Register :py:meth:`record` as a ``response`` hook. Responses served from the HTTP cache never
+    reach the hook.
+    """
+    def __init__(self) -> None:
+        """Initialise empty counters."""
+        self.hosts: dict[str, HostConnectionStats] = {}
+
+    def record(self, response: niquests.Response) -> None:
+        """
+        Record a response.
+
+        Parameters
+        ----------
+        response : niquests.Response
+            Response received from the network.
+        """
+        host = urlparse(response.url or '').hostname or ''
+        stats = self.hosts.setdefault(host, HostConnectionStats())
+        stats.requests += 1
+        if (conn_info := response.conn_info) is None:
+            return
+        # A request sent over a pooled connection reports no connection establishment time.
+        if conn_info.established_latency:
+            stats.connections += 1
+        if conn_info.http_version is not None:
+            stats.versions[conn_info.http_version.value] += 1
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        self.hosts.clear()
+
+    def log_summary(self) -> None:
+        """Log the counters of every host at debug level."""
+        for host, stats in sorted(self.hosts.items()):
+            log.debug('%s: %d requests over %d new connections (%d reused); %s.', host,
+                      stats.requests, stats.connections, stats.reused,
+                      ', '.join(f'{k}={v}' for k, v in sorted(stats.versions.items())) or 'n/a')
+
+
+connection_stats = ConnectionStats()
+"""Connection counters shared by every session."""
+
+
+def _protocol_kwargs(policy: ProtocolPolicy) -> dict[str, Any]:
+    return {
+        'disable_http2': not policy.http2,
+        'disable_http3': not policy.http3,
+        'hooks': {
+            'response': [connection_stats.record, record_network_response]
+        }
+    }
 
 
 def build_retry() -> Retry:
@@ -87,8 +204,35 @@ class _ConcurrencyLimitedSession(AsyncCachedSession):
         niquests.Response
             The HTTP response.
         """
+        async with self._acquire(url):
+            return await self._cached_request(method, url, *args, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def _acquire(self, url: str) -> AsyncIterator[None]:
+        start = perf_counter()
         async with self._semaphore:
-            return await super().request(method, url, *args, **kwargs)
+            http_metrics.observe_wait(url, perf_counter() - start)
+            yield
+
+    async def _cached_request(self, method: str, url: str, *args: Any,
+                              **kwargs: Any) -> niquests.Response:
+        token = network_responses.set([])
+        start = perf_counter()
+        try:
+            response = await AsyncCachedSession.request(self, method, url, *args, **kwargs)
+        except Exception:
+            http_metrics.observe_error(url)
+            record_outcome(None)
+            raise
+        finally:
+            network = network_responses.get()
+            network_responses.reset(token)
+        record_outcome(response.status_code)
+        http_metrics.observe(url,
+                             response,
+                             latency=perf_counter() - start,
+                             cache=cache_outcome(response, network))
+        return response
 
 
 class _GitHubSession(_ConcurrencyLimitedSession):
@@ -114,10 +258,10 @@ class _GitHubSession(_ConcurrencyLimitedSession):
         niquests.Response
             The response after any rate-limit-driven retries.
         """
-        async with self._semaphore:
+        async with self._acquire(url):
             response: niquests.Response
             for attempt in range(_GITHUB_MAX_RATE_LIMIT_RETRIES + 1):
-                response = await AsyncCachedSession.request(self, method, url, *args, **kwargs)
+                response = await self._cached_request(method, url, *args, **kwargs)
                 sleep_for = self._rate_limit_sleep(response, attempt)
                 if sleep_for is None:
                     await self._park_if_depleted(response)
@@ -209,7 +353,8 @@ class _GitHubSession(_ConcurrencyLimitedSession):
             return None
 
 
-def build_session(semaphore: asyncio.Semaphore) -> _ConcurrencyLimitedSession:
+def build_session(semaphore: asyncio.Semaphore,
+                  policy: ProtocolPolicy | None = None) -> _ConcurrencyLimitedSession:
     """
     Build a cached async session with concurrency limiting.
 
@@ -217,20 +362,25 @@ def build_session(semaphore: asyncio.Semaphore) -> _ConcurrencyLimitedSession:
     ----------
     semaphore : asyncio.Semaphore
         Shared semaphore bounding concurrent in-flight requests.
+    policy : ProtocolPolicy | None
+        HTTP versions the session may use. Every version is allowed by default.
 
     Returns
     -------
     _ConcurrencyLimitedSession
-        An async session backed by a SQLite cache with HTTP cache-control honoured.
+        An async session backed by the shared HTTP cache with HTTP cache-control honoured.
     """
-    return _ConcurrencyLimitedSession(cache_name=_cache_path(),
-                                      backend='sqlite',
-                                      cache_control=True,
-                                      retries=build_retry(),
-                                      semaphore=semaphore)
+    session = _ConcurrencyLimitedSession(backend=get_http_cache(),
+                                         cache_control=True,
+                                         retries=build_retry(),
+                                         semaphore=semaphore,
+                                         **_protocol_kwargs(policy or ProtocolPolicy()))
+    mount_recording(session)
+    return session
 
 
-def build_github_session(semaphore: asyncio.Semaphore) -> _GitHubSession:
+def build_github_session(semaphore: asyncio.Semaphore,
+                         policy: ProtocolPolicy | None = None) -> _GitHubSession:
     """
     Build a GitHub-aware cached async session.
 
@@ -241,15 +391,19 @@ def build_github_session(semaphore: asyncio.Semaphore) -> _GitHubSession:
     ----------
     semaphore : asyncio.Semaphore
         Shared semaphore bounding concurrent in-flight requests.
+    policy : ProtocolPolicy | None
+        HTTP versions the session may use. Defaults to the policy of ``api.github.com``.
 
     Returns
     -------
     _GitHubSession
         An async session that honours GitHub's REST API rate-limit headers.
     """
-    return _GitHubSession(cache_name=_cache_path(),
-                          backend='sqlite',
-                          cache_control=True,
-                          always_revalidate=True,
-                          retries=_build_github_retry(),
-                          semaphore=semaphore)
+    session = _GitHubSession(backend=get_http_cache(),
+                             cache_control=True,
+                             always_revalidate=True,
+                             retries=_build_github_retry(),
+                             semaphore=semaphore,
+                             **_protocol_kwargs(policy or protocol_policy('api.github.com')))
+    mount_recording(session)
+    return session
@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 from functools import cache
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urlparse
 import logging
 import re
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterable
+
 log = logging.getLogger(__name__)
 # From parse-package-name
 # https://github.com/egoist/parse-package-name/blob/main/src/index.ts
@@ -79,6 +82,55 @@ def extract_sha(text: str) -> str:
     return match.group(0) if match else ''
 
 
+async def iter_matches(chunks: AsyncIterable[str],
+                       pattern: re.Pattern[str],
+                       *,
+                       window: int = 4096) -> AsyncGenerator[re.Match[str]]:
+    """
+    Find the matches of a pattern in text that arrives in chunks.
+
+    The matches are those :py:meth:`re.Pattern.finditer` finds in the whole text, as long as none is
+    longer than ``window`` characters. Only about ``window`` characters and one chunk are held in
+    memory. Match positions are relative to an internal buffer, so use the matched groups only.
+
+    Parameters
+    ----------
+    chunks : AsyncIterable[str]
+        The text.
+    pattern : re.Pattern[str]
+        Compiled pattern.
+    window : int
+        Characters kept from one chunk to the next so matches may span chunks.
+
+    Yields
+    ------
+    re.Match[str]
+        Each match, in order.
+    """
+    buffer = ''
+    offset = 0
+    async for chunk in chunks:
+        buffer += chunk
+        if (limit := len(buffer) - window) <= offset:
+            continue
+        keep = limit
+        for match in pattern.finditer(buffer, offset):
+            # This match might continue in the next chunk.
+            if match.end() >= limit:
+                keep = match.start()
+                break
+            yield match
+        # Keep a character before the scan position so ``^`` and ``\b`` see what preceded it.
+        cut = max(keep - 1, 0)
+        buffer = buffer[cut:]
+        offset = keep - cut
+    if not buffer:
+        # No text at all, not even for a pattern that matches an empty string.
+        return
+    for match in pattern.finditer(buffer, offset):
+        yield match
+
+
 class InvalidPackageName(ValueError):
     """Raised when a package name is invalid."""
     def __init__(self, pkg: str) -> None:
@@ -0,0 +1,129 @@
+"""Incremental XML parsing."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from xml.etree.ElementTree import TreeBuilder  # ruff:ignore[suspicious-xml-etree-import]
+import logging
+
+from defusedxml.ElementTree import ParseError, XMLParser
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterable
+    from xml.etree.ElementTree import Element
+
+__all__ = ('MAX_FEED_ENTRIES', 'ElementStream', 'iter_elements')
+
+log = logging.getLogger(__name__)
+
+MAX_FEED_ENTRIES = 50
+"""Matching entries of a release feed read before the rest is ignored. SourceForge and SourceHut
+RSS feeds and PECL release lists put the newest entries first."""
+
+
+class _Collector(TreeBuilder):
+    def __init__(self, tag: str) -> None:
+        super().__init__()
+        self.tag = tag
+        self.done: list[Element] = []
+
+    def end(self, tag: str) -> Element:
+        element = super().end(tag)
+        if element.tag == self.tag:
+            self.done.append(element)
+        return element
+
+
+class ElementStream:
+    """
+    Parse an XML document as it arrives and collect the elements with a given tag.
+
+    Entities and external references are refused like :py:func:`defusedxml.ElementTree.fromstring`
+    does. The tree builder only receives what the defused parser accepted.
+    """
+    def __init__(self, tag: str) -> None:
+        """
+        Initialise the parser.
+
+        Parameters
+        ----------
+        tag : str
+            Tag of the elements to collect, with the namespace in braces if there is one (for
+            example ``{http://www.w3.org/2005/Atom}entry``).
+        """
+        self._collector = _Collector(tag)
+        self._parser = XMLParser(target=self._collector)
+
+    def _take(self) -> list[Element]:
+        done, self._collector.done = self._collector.done, []
+        return done
+
+    def feed(self, data: str) -> list[Element]:
+        """
+        Parse the next part of the document.
+
+        Parameters
+        ----------
+        data : str
+            Text following what was fed so far.
+
+        Returns
+        -------
+        list[Element]
+            Elements with the tag that were completed by ``data``, in document order. A
+            :py:class:`~xml.etree.ElementTree.ParseError` is raised if the document is not
+            well-formed.
+        """
+        self._parser.feed(data)
+        return self._take()
+
+    def close(self) -> list[Element]:
+        """
+        Finish the document.
+
+        Returns
+        -------
+        list[Element]
+            Elements with the tag that were completed at the end of the document.
+        """
+        self._parser.close()
+        return self._take()
+
+
+async def iter_elements(chunks: AsyncIterable[str], tag: str) -> AsyncGenerator[Element]:
+    """
+    Parse an XML document that arrives in chunks and yield the elements with a given tag.
+
+    Each element is yielded as soon as its end tag is parsed, so the caller can stop reading the
+    document once it has what it needs. Elements are cleared after the caller resumes, so only
+    about one chunk and one element are held in memory. Parse errors are raised when they are
+    reached, except at the end of a document that was cut short (for example by the ``max_size``
+    of :py:func:`~livecheck.utils.requests.stream_text`): the elements already yielded are kept.
+
+    Parameters
+    ----------
+    chunks : AsyncIterable[str]
+        The document. Nothing is yielded if it is empty.
+    tag : str
+        Tag of the elements, with the namespace in braces if there is one.
+
+    Yields
+    ------
+    Element
+        Each complete element with the tag, in document order.
+    """
+    stream = ElementStream(tag)
+    empty = True
+    async for chunk in chunks:
+        empty = empty and not chunk
+        for element in stream.feed(chunk):
+            yield element
+            element.clear()
+    if empty:
+        return
+    try:
+        done = stream.close()
+    except ParseError:
+        log.debug('XML document ended before it was complete.', exc_info=True)
+        return
+    for element in done:
+        yield element
@@ -7,6 +7,10 @@ import contextlib
 import os
 
 from click.testing import CliRunner
+from livecheck.utils.http_cache import configure_http_cache
+from livecheck.utils.mirrors import MirrorSelector
+from livecheck.utils.negative_cache import configure_negative_cache
+from livecheck.utils.object_cache import configure_object_cache
 from livecheck.utils.requests import close_sessions, init_sessions
 from niquests_cache.session import CacheMixin
 from niquests_mock import MockRouter
@@ -14,10 +18,13 @@ from niquests_mock.router import build_response
 import pytest
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import AsyncIterator, Iterator
+    from pathlib import Path
+    from unittest.mock import MagicMock
 
     from niquests import Response
     from niquests.models import PreparedRequest
+    from pytest_mock import MockerFixture
 
 if os.getenv('_PYTEST_RAISE', '0') != '0':  # pragma no cover
 
@@ -99,6 +106,55 @@ def requests_mock(monkeypatch: pytest.MonkeyPatch) -> Iterator[NiquestsMocker]:
         yield NiquestsMocker(router)
 
 
+class StreamTextMocker:
+    """Make ``stream_text`` yield fixed chunks in the module that imported it."""
+    def __init__(self, mocker: MockerFixture) -> None:
+        """
+        Initialise the mocker.
+
+        Parameters
+        ----------
+        mocker : MockerFixture
+            Fixture used to patch.
+        """
+        self._mocker = mocker
+
+    def __call__(self, module: str, *chunks: str) -> MagicMock:
+        """
+        Patch ``stream_text`` in a module.
+
+        Parameters
+        ----------
+        module : str
+            Dotted path of the module, for example ``livecheck.special.regex``.
+        *chunks : str
+            Text yielded by every call.
+
+        Returns
+        -------
+        MagicMock
+            The patched function.
+        """
+        async def body(*_: object, **__: object) -> AsyncIterator[str]:  # ruff:ignore[unused-async]
+            for chunk in chunks:
+                yield chunk
+
+        return self._mocker.patch(f'{module}.stream_text', side_effect=body)
+
+
+@pytest.fixture
+def stream_text_mock(mocker: MockerFixture) -> StreamTextMocker:
+    """
+    Patch ``stream_text`` in a module to yield given chunks.
+
+    Returns
+    -------
+    StreamTextMocker
+        Call it with the module path and the chunks.
+    """
+    return StreamTextMocker(mocker)
+
+
 @pytest.fixture(autouse=True)
 def _init_test_sessions() -> Iterator[None]:
     """Bootstrap the session infrastructure for every test."""
@@ -108,6 +164,37 @@ def _init_test_sessions() -> Iterator[None]:
         asyncio.run(close_sessions())
 
 
+@pytest.fixture(autouse=True)
+def _isolate_object_cache(tmp_path: Path) -> Iterator[None]:
+    """Keep the immutable object cache out of the user cache directory."""
+    configure_object_cache(tmp_path / 'objects.sqlite')
+    yield
+    configure_object_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_mirrors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the mirror groups of the host's repositories out of tests."""
+    monkeypatch.setattr('livecheck.utils.mirrors._selector', MirrorSelector({}))
+
+
+@pytest.fixture(scope='session')
+def _http_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Shared by all tests because creating a database in WAL mode is slow.
+    return tmp_path_factory.mktemp('http-cache')
+
+
+@pytest.fixture(autouse=True)
+def _isolate_http_cache(_http_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Keep the HTTP cache out of the user cache directory."""
+    monkeypatch.setattr('livecheck.utils.http_cache._cache_dir', lambda: _http_cache_dir)
+    configure_http_cache()
+    configure_negative_cache(0)
+    yield
+    configure_http_cache()
+    configure_negative_cache(0)
+
+
 @pytest.fixture
 def runner() -> CliRunner:
     return CliRunner()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import asyncio
+
+from livecheck.special.batch import BatchHandler
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class _Doubler(BatchHandler[int, int]):
+    def __init__(self, *, window: float = 0.01, max_batch: int = 20) -> None:
+        super().__init__(window=window, max_batch=max_batch)
+        self.batches: list[list[int]] = []
+        self.singles: list[int] = []
+
+    async def check_many(self, keys: Sequence[int]) -> dict[int, int]:
+        await asyncio.sleep(0)
+        self.batches.append(list(keys))
+        if any(key < 0 for key in keys):
+            msg = 'negative key'
+            raise ValueError(msg)
+        return {key: key * 2 for key in keys if key % 2 == 0}
+
+    async def check_one(self, key: int) -> int:
+        await asyncio.sleep(0)
+        self.singles.append(key)
+        if key == 5:
+            msg = 'unknown key'
+            raise ValueError(msg)
+        return -key
+
+
+@pytest.mark.asyncio
+async def test_check_groups_concurrent_keys() -> None:
+    handler = _Doubler()
+    results = await asyncio.gather(*(handler.check(key) for key in (2, 4, 2, 3)))
+    assert results == [4, 8, 4, -3]
+    assert handler.batches == [[2, 4, 3]]
+    assert handler.singles == [3]
+
+
+@pytest.mark.asyncio
+async def test_check_flushes_full_batch_immediately() -> None:
+    handler = _Doubler(window=60, max_batch=2)
+    results = await asyncio.wait_for(asyncio.gather(handler.check(2), handler.check(4)), 5)
+    assert list(results) == [4, 8]
+    assert handler.batches == [[2, 4]]
+
+
+@pytest.mark.asyncio
+async def test_check_separate_batches() -> None:
+    handler = _Doubler(window=0)
+    assert await handler.check(2) == 4
+    assert await handler.check(6) == 12
+    assert handler.batches == [[2], [6]]
+
+
+@pytest.mark.asyncio
+async def test_check_falls_back_to_single_lookups_when_batch_fails() -> None:
+    handler = _Doubler()
+    results = await asyncio.gather(handler.check(2), handler.check(-1))
+    assert list(results) == [-2, 1]
+    assert handler.batches == [[2, -1]]
+    assert handler.singles == [2, -1]
+
+
+@pytest.mark.asyncio
+async def test_check_error_only_reaches_callers_of_its_key() -> None:
+    handler = _Doubler()
+    results = await asyncio.gather(handler.check(5),
+                                   handler.check(5),
+                                   handler.check(3),
+                                   return_exceptions=True)
+    assert isinstance(results[0], ValueError)
+    assert isinstance(results[1], ValueError)
+    assert results[2] == -3
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_the_shared_lookup() -> None:
+    handler = _Doubler()
+    first = asyncio.create_task(handler.check(2))
+    second = asyncio.create_task(handler.check(2))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 4
+    assert first.cancelled()
+
+
+def test_reset_forgets_pending_keys_of_previous_run() -> None:
+    handler = _Doubler(window=60)
+
+    async def abandon() -> None:
+        # Left pending when the loop closes, like a run interrupted mid-batch.
+        asyncio.create_task(handler.check(2))  # ruff:ignore[asyncio-dangling-task]
+        await asyncio.sleep(0)
+
+    asyncio.run(abandon())
+    handler.reset()
+    handler.window = 0
+    assert asyncio.run(handler.check(2)) == 4
+    assert handler.batches == [[2]]
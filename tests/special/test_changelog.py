@@ -6,7 +6,10 @@ from livecheck.special.changelog import get_latest_changelog_package
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from pytest_mock import MockerFixture
+    from tests.conftest import StreamTextMocker
 
 pytestmark = pytest.mark.asyncio
 
@@ -21,11 +24,10 @@ def make_settings(mocker: MockerFixture) -> Any:
 
 
 async def test_get_latest_changelog_package_extracts_bracketed_headings(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    response = mocker.Mock()
-    response.text = '# Changelog\n\n## [17.1.0] - 2023-05-29\n\n### Added\n\n## [17.0.0-2]'
-    mocker.patch('livecheck.special.changelog.get_content', return_value=response)
+    stream_text_mock('livecheck.special.changelog',
+                     '# Changelog\n\n## [17.1.0] - 2023-05-29\n\n### Added\n\n## [17.0.0-2]')
 
     def fake_get_last_version(results: list[dict[str, str]], repo: str, ebuild: str,
                               settings_arg: Any) -> dict[str, str]:
@@ -42,11 +44,10 @@ async def test_get_latest_changelog_package_extracts_bracketed_headings(
 
 
 async def test_get_latest_changelog_package_extracts_v_prefixed_headings(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    response = mocker.Mock()
-    response.text = '# Changelog\n\n## v1.1.2\n\n### Added or Changed\n\n## v1.1.1'
-    mocker.patch('livecheck.special.changelog.get_content', return_value=response)
+    stream_text_mock('livecheck.special.changelog',
+                     '# Changelog\n\n## v1.1.2\n\n### Added or Changed\n\n## v1.1.1')
     mock_get_last_version = mocker.patch('livecheck.special.changelog.get_last_version',
                                          return_value={'version': '1.1.2'})
     result = await get_latest_changelog_package('cat/pkg-1.1.1', 'https://example.com/CHANGELOG.md',
@@ -55,12 +56,12 @@ async def test_get_latest_changelog_package_extracts_v_prefixed_headings(
     assert mock_get_last_version.call_args.args[0] == [{'tag': 'v1.1.2'}, {'tag': 'v1.1.1'}]
 
 
-async def test_get_latest_changelog_package_ignores_date_headings(mocker: MockerFixture) -> None:
+async def test_get_latest_changelog_package_ignores_date_headings(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    response = mocker.Mock()
-    response.text = ('# Changelog\n\n## [2024-01-31]\n\n### Added\n\n## 20240130\n\n'
-                     '## 2024.01.29\n\n## 1.2.3\n\n### Fixed\n\n## 2023-01-01\n')
-    mocker.patch('livecheck.special.changelog.get_content', return_value=response)
+    stream_text_mock('livecheck.special.changelog',
+                     ('# Changelog\n\n## [2024-01-31]\n\n### Added\n\n## 20240130\n\n'
+                      '## 2024.01.29\n\n## 1.2.3\n\n### Fixed\n\n## 2023-01-01\n'))
     mock_get_last_version = mocker.patch('livecheck.special.changelog.get_last_version',
                                          return_value={'version': '1.2.3'})
     result = await get_latest_changelog_package('cat/pkg-1.0.0', 'https://example.com/CHANGELOG.md',
@@ -69,11 +70,11 @@ async def test_get_latest_changelog_package_ignores_date_headings(mocker: Mocker
     assert mock_get_last_version.call_args.args[0] == [{'tag': '1.2.3'}]
 
 
-async def test_get_latest_changelog_package_only_date_headings(mocker: MockerFixture) -> None:
+async def test_get_latest_changelog_package_only_date_headings(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    response = mocker.Mock()
-    response.text = '# Changelog\n\n## 2024-01-31\n\n### Added\n\n## 2023-01-01\n'
-    mocker.patch('livecheck.special.changelog.get_content', return_value=response)
+    stream_text_mock('livecheck.special.changelog',
+                     '# Changelog\n\n## 2024-01-31\n\n### Added\n\n## 2023-01-01\n')
     mock_get_last_version = mocker.patch('livecheck.special.changelog.get_last_version',
                                          return_value={})
     result = await get_latest_changelog_package('cat/pkg-1.0.0', 'https://example.com/CHANGELOG.md',
@@ -83,11 +84,10 @@ async def test_get_latest_changelog_package_only_date_headings(mocker: MockerFix
 
 
 async def test_get_latest_changelog_package_keeps_date_headings_for_date_version(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    response = mocker.Mock()
-    response.text = '# Changelog\n\n## 2024-01-31\n\n### Added\n\n## 2023-01-01\n'
-    mocker.patch('livecheck.special.changelog.get_content', return_value=response)
+    stream_text_mock('livecheck.special.changelog',
+                     '# Changelog\n\n## 2024-01-31\n\n### Added\n\n## 2023-01-01\n')
     mock_get_last_version = mocker.patch('livecheck.special.changelog.get_last_version',
                                          return_value={'version': '2024.01.31'})
     result = await get_latest_changelog_package('cat/pkg-2023.01.01',
@@ -96,19 +96,19 @@ async def test_get_latest_changelog_package_keeps_date_headings_for_date_version
     assert mock_get_last_version.call_args.args[0] == [{'tag': '2024-01-31'}, {'tag': '2023-01-01'}]
 
 
-async def test_get_latest_changelog_package_no_content(mocker: MockerFixture) -> None:
+async def test_get_latest_changelog_package_no_content(mocker: MockerFixture,
+                                                       stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    mocker.patch('livecheck.special.changelog.get_content', return_value=None)
+    stream_text_mock('livecheck.special.changelog')
     result = await get_latest_changelog_package('cat/pkg-1.0.0', 'https://example.com/CHANGELOG.md',
                                                 settings)
     assert not result
 
 
-async def test_get_latest_changelog_package_no_last_version(mocker: MockerFixture) -> None:
+async def test_get_latest_changelog_package_no_last_version(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
-    response = mocker.Mock()
-    response.text = '# Changelog\n\n## Unreleased\n\n### Added\n'
-    mocker.patch('livecheck.special.changelog.get_content', return_value=response)
+    stream_text_mock('livecheck.special.changelog', '# Changelog\n\n## Unreleased\n\n### Added\n')
     mock_get_last_version = mocker.patch('livecheck.special.changelog.get_last_version',
                                          return_value={})
     result = await get_latest_changelog_package('cat/pkg-1.0.0', 'https://example.com/CHANGELOG.md',
@@ -117,22 +117,40 @@ async def test_get_latest_changelog_package_no_last_version(mocker: MockerFixtur
     assert mock_get_last_version.call_args.args[0] == []
 
 
-async def test_get_latest_changelog_package_uses_request_options(mocker: MockerFixture) -> None:
+async def test_get_latest_changelog_package_uses_request_options(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     settings = make_settings(mocker)
     settings.request_data = {'cat/pkg': {'token': 'abc'}}
     settings.request_headers = {'cat/pkg': {'Accept': 'text/markdown'}}
     settings.request_method = {'cat/pkg': 'POST'}
     settings.request_params = {'cat/pkg': {'download': '1'}}
-    response = mocker.Mock()
-    response.text = '## 2.0.0\n'
-    mock_get_content = mocker.patch('livecheck.special.changelog.get_content',
-                                    return_value=response)
+    stream_text = stream_text_mock('livecheck.special.changelog', '## 2.0.0\n')
     mocker.patch('livecheck.special.changelog.get_last_version', return_value={'version': '2.0.0'})
     result = await get_latest_changelog_package('cat/pkg-1.0.0', 'https://example.com/CHANGELOG.md',
                                                 settings)
     assert result == '2.0.0'
-    mock_get_content.assert_called_once_with('https://example.com/CHANGELOG.md',
-                                             data={'token': 'abc'},
-                                             headers={'Accept': 'text/markdown'},
-                                             method='POST',
-                                             params={'download': '1'})
+    stream_text.assert_called_once_with('https://example.com/CHANGELOG.md',
+                                        data={'token': 'abc'},
+                                        headers={'Accept': 'text/markdown'},
+                                        method='POST',
+                                        params={'download': '1'},
+                                        max_size=settings.max_body_size)
+
+
+async def test_get_latest_changelog_package_reads_oldest_first_changelog(
+        mocker: MockerFixture) -> None:
+    settings = make_settings(mocker)
+
+    async def body(*_: object, **__: object) -> AsyncIterator[str]:  # ruff:ignore[unused-async]
+        for minor in range(1, 101):
+            yield f'## 1.{minor}.0\n\n' + 'Text.\n' * 100
+
+    mocker.patch('livecheck.special.changelog.stream_text', side_effect=body)
+    mock_get_last_version = mocker.patch('livecheck.special.changelog.get_last_version',
+                                         return_value={'version': '1.100.0'})
+    result = await get_latest_changelog_package('cat/pkg-1.0.0', 'https://example.com/CHANGELOG.md',
+                                                settings)
+    assert result == '1.100.0'
+    tags = [r['tag'] for r in mock_get_last_version.call_args.args[0]]
+    assert len(tags) == 100
+    assert tags[-1] == '1.100.0'
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+import asyncio
+import hashlib
+import json
+import os
 
 from anyio import Path as AnyioPath
 from livecheck.special.checksum import (
@@ -8,14 +12,23 @@ from livecheck.special.checksum import (
     get_latest_location_checksum_package,
     update_checksum_metadata,
 )
+from livecheck.utils.object_cache import get_cached_object, set_cached_object
+from livecheck.utils.requests import HashedURL, Validators
 import pytest
 
 if TYPE_CHECKING:
     from pathlib import Path
+    from unittest.mock import MagicMock
 
     from pytest_mock import MockerFixture
 
 
+@pytest.fixture(autouse=True)
+def get_validators(mocker: MockerFixture, tmp_path: Path) -> MagicMock:
+    mocker.patch('livecheck.special.checksum.get_distdir', return_value=tmp_path / 'distfiles')
+    return mocker.patch('livecheck.special.checksum.get_validators', return_value=None)
+
+
 @pytest.mark.asyncio
 async def test_get_latest_checksum_package_match_and_checksum_mismatch(
         mocker: MockerFixture) -> None:
@@ -28,13 +41,42 @@ async def test_get_latest_checksum_package_match_and_checksum_mismatch(
                  return_value=('cat/foo', 'foo', 'r0', '1.0'))
     mock_open = mocker.mock_open(read_data=manifest_content)
     mocker.patch('pathlib.Path.open', mock_open)
-    mocker.patch('livecheck.special.checksum.hash_url', return_value=('beefdead', 'beefcafe', 1234))
-    mocker.patch('livecheck.special.checksum.get_last_modified',
-                 return_value='2024-06-01T12:00:00Z')
+    mocker.patch('livecheck.special.checksum.hash_url',
+                 return_value=HashedURL(
+                     'beefdead',
+                     'beefcafe',
+                     1234,
+                     validators=Validators(last_modified='Sat, 01 Jun 2024 12:00:00 GMT')))
     version, last_modified, returned_url = await get_latest_checksum_package(url, ebuild, repo_root)
     assert version == '1.0'
-    assert last_modified == '2024-06-01T12:00:00Z'
+    assert last_modified == '20240601'
     assert returned_url == url
+    assert get_cached_object('distfile-validators', f'{url} beefdead')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_mirror(mocker: MockerFixture, tmp_path: Path) -> None:
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'cat' / 'foo' /
+     'Manifest').write_text('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    mocker.patch('livecheck.special.checksum.resolve_mirror_uri',
+                 return_value='https://mirror.example.com/gnu/foo-1.0.tar.gz')
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url',
+                            return_value=HashedURL('beefdead', 'beefcafe', 1234))
+    assert await get_latest_checksum_package(
+        'mirror://gnu/foo-1.0.tar.gz', 'cat/foo-1.0',
+        str(tmp_path)) == ('1.0', '', 'https://mirror.example.com/gnu/foo-1.0.tar.gz')
+    assert hash_url.call_args.args[0] == 'https://mirror.example.com/gnu/foo-1.0.tar.gz'
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_unresolved_mirror(mocker: MockerFixture) -> None:
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url')
+    assert await get_latest_checksum_package('mirror://unknown/foo-1.0.tar.gz', 'cat/foo-1.0',
+                                             '/repo') == ('', '', '')
+    hash_url.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -48,7 +90,8 @@ async def test_get_latest_checksum_package_match_and_checksum_match(mocker: Mock
                  return_value=('cat/foo', 'foo', 'r0', '1.0'))
     mock_open = mocker.mock_open(read_data=manifest_content)
     mocker.patch('pathlib.Path.open', mock_open)
-    mocker.patch('livecheck.special.checksum.hash_url', return_value=('deadbeef', 'cafebabe', 1234))
+    mocker.patch('livecheck.special.checksum.hash_url',
+                 return_value=HashedURL('deadbeef', 'cafebabe', 1234))
     result = await get_latest_checksum_package(url, ebuild, repo_root)
     assert result == ('', '', '')
 
@@ -66,7 +109,8 @@ async def test_get_latest_checksum_package_single_dist_line_matching_hash(
     mock_open = mocker.mock_open(read_data=manifest_content)
     mocker.patch('pathlib.Path.open', mock_open)
     # Hash matches - no update needed
-    mocker.patch('livecheck.special.checksum.hash_url', return_value=('123456', '789abc', 5678))
+    mocker.patch('livecheck.special.checksum.hash_url',
+                 return_value=HashedURL('123456', '789abc', 5678))
     result = await get_latest_checksum_package(url, ebuild, repo_root)
     assert result == ('', '', '')
 
@@ -84,10 +128,17 @@ async def test_get_latest_checksum_package_single_dist_line_different_hash(
     mock_open = mocker.mock_open(read_data=manifest_content)
     mocker.patch('pathlib.Path.open', mock_open)
     # Hash differs - update needed
-    mocker.patch('livecheck.special.checksum.hash_url', return_value=('different', 'hashes', 1234))
-    mocker.patch('livecheck.special.checksum.get_last_modified', return_value='20240601')
+    mocker.patch('livecheck.special.checksum.hash_url',
+                 return_value=HashedURL('different',
+                                        'hashes',
+                                        1234,
+                                        url='https://cdn.example.com/foo-1.0.tar.gz',
+                                        validators=Validators(last_modified='bad date')))
+    log = mocker.patch('livecheck.special.checksum.log')
     result = await get_latest_checksum_package(url, ebuild, repo_root)
-    assert result == ('1.0', '20240601', url)
+    assert result == ('1.0', '', url)
+    log.debug.assert_any_call('Digests of %s changed (served from %s).', url,
+                              'https://cdn.example.com/foo-1.0.tar.gz')
 
 
 @pytest.mark.asyncio
@@ -121,7 +172,8 @@ async def test_get_latest_checksum_package_multiple_dist_lines_matching_hash(
     mock_open = mocker.mock_open(read_data=manifest_content)
     mocker.patch('pathlib.Path.open', mock_open)
     # Hash matches - no update needed
-    mocker.patch('livecheck.special.checksum.hash_url', return_value=('deadbeef', 'cafebabe', 1234))
+    mocker.patch('livecheck.special.checksum.hash_url',
+                 return_value=HashedURL('deadbeef', 'cafebabe', 1234))
     result = await get_latest_checksum_package(url, ebuild, repo_root)
     assert result == ('', '', '')
 
@@ -147,7 +199,8 @@ def _setup_update_checksum(mocker: MockerFixture, tmp_path: Path,
     mocker.patch('livecheck.special.checksum.EbuildTempFile', _FakeTempFile)
     mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
                  return_value=('cat/foo', 'foo', 'r0', '1.0'))
-    mocker.patch('livecheck.special.checksum.hash_url', return_value=('newbeef', 'newcafe', 4321))
+    mocker.patch('livecheck.special.checksum.hash_url',
+                 return_value=HashedURL('newbeef', 'newcafe', 4321))
     return manifest_file, written
 
 
@@ -246,3 +299,277 @@ async def test_get_latest_location_checksum_package_with_headers_and_params(
                                              allow_redirects=False,
                                              headers=headers,
                                              params=params)
+
+
+_VALIDATORS = Validators('"v1"', 'Wed, 21 Oct 2015 07:28:00 GMT', '1234')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_skips_hash_when_validators_match(
+        mocker: MockerFixture, get_validators: MagicMock, tmp_path: Path) -> None:
+    url = 'https://example.com/foo-1.0.tar.gz'
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'cat' / 'foo' /
+     'Manifest').write_text('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url',
+                            return_value=HashedURL('deadbeef', 'cafebabe', 1234))
+    get_validators.return_value = _VALIDATORS
+    assert await get_latest_checksum_package(url, 'cat/foo/foo-1.0.ebuild',
+                                             str(tmp_path)) == ('', '', '')
+    hash_url.assert_awaited_once()
+    assert get_cached_object('distfile-validators', f'{url} deadbeef')
+    assert await get_latest_checksum_package(url, 'cat/foo/foo-1.0.ebuild',
+                                             str(tmp_path)) == ('', '', '')
+    hash_url.assert_awaited_once()
+    assert get_validators.call_args.kwargs['known'] == _VALIDATORS
+    get_validators.return_value = _VALIDATORS._replace(etag='"v2"')
+    assert await get_latest_checksum_package(url, 'cat/foo/foo-1.0.ebuild',
+                                             str(tmp_path)) == ('', '', '')
+    assert hash_url.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_size_changed(mocker: MockerFixture,
+                                                        get_validators: MagicMock,
+                                                        tmp_path: Path) -> None:
+    url = 'https://example.com/foo-1.0.tar.gz'
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'cat' / 'foo' /
+     'Manifest').write_text('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url')
+    set_cached_object('distfile-validators', f'{url} deadbeef', '["\\"v1\\"", "", "1234"]')
+    get_validators.return_value = _VALIDATORS._replace(content_length='4321')
+    assert await get_latest_checksum_package(url, 'cat/foo/foo-1.0.ebuild',
+                                             str(tmp_path)) == ('1.0', '20151021', url)
+    hash_url.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_saves_to_distdir(mocker: MockerFixture,
+                                                            tmp_path: Path) -> None:
+    url = 'https://example.com/foo-1.0.tar.gz'
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    manifest = tmp_path / 'cat' / 'foo' / 'Manifest'
+    manifest.write_text('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    mocker.patch('livecheck.special.checksum.get_distdir', return_value=tmp_path)
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url',
+                            return_value=HashedURL('newbeef', 'newcafe', 4321))
+    assert await get_latest_checksum_package(url,
+                                             'cat/foo/foo-1.0.ebuild',
+                                             str(tmp_path),
+                                             save_to_distdir=True) == ('1.0', '', url)
+    assert hash_url.call_args.kwargs['save_to'] == tmp_path / 'foo-1.0.tar.gz'
+    await update_checksum_metadata('cat/foo-1.0', url, str(tmp_path))
+    hash_url.assert_awaited_once()
+    assert manifest.read_text() == 'DIST foo-1.0.tar.gz 4321 BLAKE2B newbeef SHA512 newcafe\n'
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_distdir_not_writable(mocker: MockerFixture,
+                                                                tmp_path: Path) -> None:
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'cat' / 'foo' /
+     'Manifest').write_text('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    mocker.patch('livecheck.special.checksum.get_distdir', return_value=tmp_path)
+    mocker.patch('livecheck.special.checksum.os.access', return_value=False)
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url',
+                            return_value=HashedURL('deadbeef', 'cafebabe', 1234))
+    assert await get_latest_checksum_package('https://example.com/foo-1.0.tar.gz',
+                                             'cat/foo/foo-1.0.ebuild',
+                                             str(tmp_path),
+                                             save_to_distdir=True) == ('', '', '')
+    assert hash_url.call_args.kwargs['save_to'] is None
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_all_distfiles(mocker: MockerFixture,
+                                                         tmp_path: Path) -> None:
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    manifest = tmp_path / 'cat' / 'foo' / 'Manifest'
+    manifest.write_text('DIST foo-0.9.tar.gz 1 BLAKE2B 0d SHA512 0d\n'
+                        'DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n'
+                        'DIST foo-data-1.0.tar.gz 10 BLAKE2B da7a SHA512 da7a\n'
+                        'DIST foo-docs-1.0.tar.gz 20 BLAKE2B d0c5 SHA512 d0c5\n'
+                        'DIST foo-extra-1.0.tar.gz 30 BLAKE2B e7 SHA512 e7\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    mocker.patch('livecheck.special.checksum.MAX_DISTFILES_PER_HOST', 1)
+    mocker.patch('livecheck.special.checksum.get_fetch_map',
+                 return_value={
+                     'foo-1.0.tar.gz': ('https://example.com/foo-1.0.tar.gz',),
+                     'foo-data-1.0.tar.gz': ('https://example.com/foo-data-1.0.tar.gz',),
+                     'foo-docs-1.0.tar.gz': ('https://docs.example.org/foo-docs-1.0.tar.gz',),
+                     'foo-extra-1.0.tar.gz': ('mirror://sourceforge/foo-extra-1.0.tar.gz',)
+                 })
+    in_flight: dict[str, int] = {}
+    most_in_flight = 0
+
+    async def hash_url(url: str, **_: object) -> HashedURL:
+        nonlocal most_in_flight
+        host = url.split('/')[2]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        most_in_flight = max(most_in_flight, in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        name = url.rsplit('/', 1)[1]
+        if name == 'foo-1.0.tar.gz':
+            return HashedURL('deadbeef', 'cafebabe', 1234)
+        return HashedURL(
+            f'new-{name}',
+            'new',
+            99,
+            validators=Validators(
+                last_modified='Wed, 21 Oct 2015 07:28:00 GMT' if 'docs' in name else ''))
+
+    mocker.patch('livecheck.special.checksum.hash_url', side_effect=hash_url)
+    assert await get_latest_checksum_package(
+        'https://example.com/foo-1.0.tar.gz', 'cat/foo-1.0', str(tmp_path),
+        all_distfiles=True) == ('1.0', '20151021', 'https://example.com/foo-data-1.0.tar.gz')
+    assert most_in_flight == 1
+    await update_checksum_metadata('cat/foo-1.0', 'https://example.com/foo-data-1.0.tar.gz',
+                                   str(tmp_path))
+    assert manifest.read_text() == (
+        'DIST foo-0.9.tar.gz 1 BLAKE2B 0d SHA512 0d\n'
+        'DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n'
+        'DIST foo-data-1.0.tar.gz 99 BLAKE2B new-foo-data-1.0.tar.gz SHA512 new\n'
+        'DIST foo-docs-1.0.tar.gz 99 BLAKE2B new-foo-docs-1.0.tar.gz SHA512 new\n'
+        'DIST foo-extra-1.0.tar.gz 30 BLAKE2B e7 SHA512 e7\n')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_all_distfiles_renamed(mocker: MockerFixture,
+                                                                 get_validators: MagicMock,
+                                                                 tmp_path: Path) -> None:
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'distfiles').mkdir()
+    manifest = tmp_path / 'cat' / 'foo' / 'Manifest'
+    manifest.write_text('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n'
+                        'DIST foo-data-1.0.tar.gz 3 BLAKE2B da7a SHA512 da7a\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    # The second distfile is renamed with an arrow in SRC_URI.
+    mocker.patch('livecheck.special.checksum.get_fetch_map',
+                 return_value={
+                     'foo-1.0.tar.gz': ('https://example.com/foo-1.0.tar.gz',),
+                     'foo-data-1.0.tar.gz': ('https://example.com/v1.0/data.tar.gz',)
+                 })
+
+    async def hash_url(url: str, save_to: Path | None = None, **_: object) -> HashedURL:
+        if url.endswith('/foo-1.0.tar.gz'):
+            return HashedURL('deadbeef', 'cafebabe', 1234)
+        assert save_to is not None
+        await AnyioPath(save_to).write_bytes(b'abc')
+        return HashedURL(hashlib.blake2b(b'abc').hexdigest(), hashlib.sha512(b'abc').hexdigest(), 3)
+
+    hash_url_mock = mocker.patch('livecheck.special.checksum.hash_url', side_effect=hash_url)
+    data_url = 'https://example.com/v1.0/data.tar.gz'
+    assert await get_latest_checksum_package('https://example.com/foo-1.0.tar.gz',
+                                             'cat/foo-1.0',
+                                             str(tmp_path),
+                                             save_to_distdir=True,
+                                             all_distfiles=True) == ('1.0', '', data_url)
+    assert (tmp_path / 'distfiles' / 'foo-data-1.0.tar.gz').read_bytes() == b'abc'
+    # Without the digests computed while checking, the copy saved in DISTDIR is hashed.
+    mocker.patch.dict('livecheck.special.checksum._hashes', clear=True)
+    hash_url_mock.reset_mock()
+    get_validators.return_value = _VALIDATORS._replace(content_length='3')
+    await update_checksum_metadata('cat/foo-1.0', data_url, str(tmp_path))
+    hash_url_mock.assert_not_called()
+    assert manifest.read_text() == ('DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n'
+                                    f'DIST foo-data-1.0.tar.gz 3 BLAKE2B '
+                                    f'{hashlib.blake2b(b"abc").hexdigest()} SHA512 '
+                                    f'{hashlib.sha512(b"abc").hexdigest()}\n')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_all_distfiles_unchanged(mocker: MockerFixture,
+                                                                   tmp_path: Path) -> None:
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'cat' / 'foo' / 'Manifest').write_text(
+        'DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n'
+        'DIST foo-data-1.0.tar.gz 10 BLAKE2B deadbeef SHA512 cafebabe\n')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    mocker.patch('livecheck.special.checksum.get_fetch_map', side_effect=KeyError)
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url',
+                            return_value=HashedURL('deadbeef', 'cafebabe', 1234))
+    assert await get_latest_checksum_package('https://example.com/foo-1.0.tar.gz',
+                                             'cat/foo-1.0',
+                                             str(tmp_path),
+                                             all_distfiles=True) == ('', '', '')
+    hash_url.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_checksum_metadata_uses_distdir_copy(mocker: MockerFixture,
+                                                          get_validators: MagicMock,
+                                                          tmp_path: Path) -> None:
+    url = 'https://example.com/foo-1.0.tar.gz'
+    manifest_file, _ = _setup_update_checksum(
+        mocker, tmp_path, 'DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n')
+    distfile = tmp_path / 'distfiles' / 'foo-1.0.tar.gz'
+    distfile.parent.mkdir()
+    distfile.write_bytes(b'abc')
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url')
+    get_validators.return_value = _VALIDATORS._replace(content_length='3')
+    await update_checksum_metadata('cat/foo-1.0', url, str(tmp_path))
+    hash_url.assert_not_called()
+    assert manifest_file.read_text() == (f'DIST foo-1.0.tar.gz 3 BLAKE2B '
+                                         f'{hashlib.blake2b(b"abc").hexdigest()} SHA512 '
+                                         f'{hashlib.sha512(b"abc").hexdigest()}\n')
+
+
+@pytest.mark.asyncio
+async def test_update_checksum_metadata_outdated_distdir_copy(mocker: MockerFixture,
+                                                              get_validators: MagicMock,
+                                                              tmp_path: Path) -> None:
+    url = 'https://example.com/foo-1.0.tar.gz'
+    manifest = 'DIST foo-1.0.tar.gz 1234 BLAKE2B deadbeef SHA512 cafebabe\n'
+    manifest_file, _ = _setup_update_checksum(mocker, tmp_path, manifest)
+    distfile = tmp_path / 'distfiles' / 'foo-1.0.tar.gz'
+    distfile.parent.mkdir()
+    distfile.write_bytes(b'')
+    os.utime(distfile, (0, 0))
+    get_validators.return_value = _VALIDATORS._replace(content_length='0')
+    await update_checksum_metadata('cat/foo-1.0', url, str(tmp_path))
+    assert manifest_file.read_text() == 'DIST foo-1.0.tar.gz 4321 BLAKE2B newbeef SHA512 newcafe\n'
+    # Validators were recorded when this digest was downloaded before.
+    manifest_file.write_text(manifest)
+    set_cached_object('distfile-validators', f'{url} {hashlib.blake2b().hexdigest()}',
+                      json.dumps(get_validators.return_value))
+    await update_checksum_metadata('cat/foo-1.0', url, str(tmp_path))
+    assert manifest_file.read_text() == (
+        f'DIST foo-1.0.tar.gz 0 BLAKE2B {hashlib.blake2b().hexdigest()} '
+        f'SHA512 {hashlib.sha512().hexdigest()}\n')
+    # Size mismatch.
+    manifest_file.write_text(manifest)
+    get_validators.return_value = _VALIDATORS
+    await update_checksum_metadata('cat/foo-1.0', url, str(tmp_path))
+    assert manifest_file.read_text() == 'DIST foo-1.0.tar.gz 4321 BLAKE2B newbeef SHA512 newcafe\n'
+
+
+@pytest.mark.asyncio
+async def test_get_latest_checksum_package_hashes_distdir_copy(mocker: MockerFixture,
+                                                               get_validators: MagicMock,
+                                                               tmp_path: Path) -> None:
+    (tmp_path / 'cat' / 'foo').mkdir(parents=True)
+    (tmp_path / 'cat' / 'foo' / 'Manifest').write_text(
+        f'DIST foo-1.0.tar.gz 3 BLAKE2B {hashlib.blake2b(b"abc").hexdigest()} '
+        f'SHA512 {hashlib.sha512(b"abc").hexdigest()}\n')
+    (tmp_path / 'distfiles').mkdir()
+    (tmp_path / 'distfiles' / 'foo-1.0.tar.gz').write_bytes(b'abc')
+    mocker.patch('livecheck.special.checksum.catpkg_catpkgsplit',
+                 return_value=('cat/foo', 'foo', 'r0', '1.0'))
+    hash_url = mocker.patch('livecheck.special.checksum.hash_url')
+    get_validators.return_value = _VALIDATORS._replace(content_length='3')
+    assert await get_latest_checksum_package('https://example.com/foo-1.0.tar.gz', 'cat/foo-1.0',
+                                             str(tmp_path)) == ('', '', '')
+    hash_url.assert_not_called()
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-
-from livecheck.special.directory import get_latest_directory_package
+import asyncio
+
+from livecheck.special.directory import (
+    extract_hrefs,
+    get_directory_listing,
+    get_latest_directory_package,
+)
+from livecheck.utils.requests import init_sessions
 import pytest
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
 
-pytestmark = pytest.mark.asyncio
-
 
+@pytest.mark.asyncio
 async def test_get_latest_directory_package_returns_latest(mocker: MockerFixture) -> None:
     # Arrange
     url = 'https://example.com/packages/foo-1.0.tar.gz'
@@ -37,6 +42,7 @@ async def test_get_latest_directory_package_returns_latest(mocker: MockerFixture
     assert file_url == '/packages/foo-2.0.tar.gz'
 
 
+@pytest.mark.asyncio
 async def test_get_latest_directory_get_last_version_falsy(mocker: MockerFixture) -> None:
     url = 'https://example.com/packages/foo-1.0.tar.gz'
     ebuild = 'foo-1.0.ebuild'
@@ -52,6 +58,7 @@ async def test_get_latest_directory_get_last_version_falsy(mocker: MockerFixture
     assert not file_url
 
 
+@pytest.mark.asyncio
 async def test_get_latest_directory_package_no_results(mocker: MockerFixture) -> None:
     url = 'https://example.com/packages/foo-1.0.tar.gz'
     ebuild = 'foo-1.0.ebuild'
@@ -67,6 +74,7 @@ async def test_get_latest_directory_package_no_results(mocker: MockerFixture) ->
     assert not file_url
 
 
+@pytest.mark.asyncio
 async def test_get_latest_directory_package_no_content(mocker: MockerFixture) -> None:
     url = 'https://example.com/packages/foo-1.0.tar.gz'
     ebuild = 'foo-1.0.ebuild'
@@ -77,6 +85,35 @@ async def test_get_latest_directory_package_no_content(mocker: MockerFixture) ->
     assert not file_url
 
 
+@pytest.mark.asyncio
+async def test_get_latest_directory_package_lists_mirror(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.directory.resolve_mirror_uri',
+                 return_value='https://mirror.example.com/gnu/foo/foo-1.0.tar.gz')
+    mock_response = mocker.Mock()
+    mock_response.text = '<a href="foo-1.0.tar.gz">1.0</a><a href="foo-2.0.tar.gz">2.0</a>'
+    get_content = mocker.patch('livecheck.special.directory.get_content',
+                               return_value=mock_response)
+    get_last_version = mocker.patch('livecheck.special.directory.get_last_version',
+                                    return_value={
+                                        'version': '2.0',
+                                        'url': '/gnu/foo/foo-2.0.tar.gz'
+                                    })
+    assert await get_latest_directory_package('mirror://gnu/foo/foo-1.0.tar.gz', 'foo-1.0.ebuild',
+                                              mocker.Mock()) == ('2.0', '/gnu/foo/foo-2.0.tar.gz')
+    get_content.assert_awaited_once_with('https://mirror.example.com/gnu/foo/')
+    assert [r['tag']
+            for r in get_last_version.call_args.args[0]] == ['foo-1.0.tar.gz', 'foo-2.0.tar.gz']
+
+
+@pytest.mark.asyncio
+async def test_get_latest_directory_package_unresolved_mirror(mocker: MockerFixture) -> None:
+    get_content = mocker.patch('livecheck.special.directory.get_content')
+    assert await get_latest_directory_package('mirror://unknown/foo-1.0.tar.gz', 'foo-1.0.ebuild',
+                                              mocker.Mock()) == ('', '')
+    get_content.assert_not_called()
+
+
+@pytest.mark.asyncio
 async def test_get_latest_directory_package_strips_archive_extension_from_reference(
         mocker: MockerFixture) -> None:
     url = 'https://example.com/packages/foo-1.0.tar.gz'
@@ -94,6 +131,7 @@ async def test_get_latest_directory_package_strips_archive_extension_from_refere
     assert mock_get_last_version.call_args.kwargs.get('version_reference') == 'foo-1.0'
 
 
+@pytest.mark.asyncio
 async def test_get_latest_directory_package_accepts_release_with_different_archive_extension(
         mocker: MockerFixture) -> None:
     url = 'https://example.com/packages/foo-1.0.tar.gz'
@@ -119,6 +157,7 @@ async def test_get_latest_directory_package_accepts_release_with_different_archi
     assert file_url == '/packages/foo-1.1.zip'
 
 
+@pytest.mark.asyncio
 async def test_get_latest_directory_package_no_match_in_url(mocker: MockerFixture) -> None:
     url = 'https://example.com/packages/'
     ebuild = 'foo-1.0.ebuild'
@@ -126,3 +165,61 @@ async def test_get_latest_directory_package_no_match_in_url(mocker: MockerFixtur
     version, file_url = await get_latest_directory_package(url, ebuild, settings)
     assert not version
     assert not file_url
+
+
+@pytest.mark.parametrize(('html', 'expected'), [
+    ('<a href="a-1.tar.gz">a</a><A HREF=\'b-1.zip\'>b</A><a class=x href=c-1.tar.xz>c</a>',
+     ['a-1.tar.gz', 'b-1.zip', 'c-1.tar.xz']),
+    ('<a title="t" href = "d.tar.gz?x=1&amp;y=2">d</a>', ['d.tar.gz?x=1&y=2']),
+    ('<a href="">empty</a><abbr href="no">x</abbr><link href="style.css">', ['']),
+])
+def test_extract_hrefs(html: str, expected: list[str]) -> None:
+    assert extract_hrefs(html) == expected
+
+
+@pytest.mark.asyncio
+async def test_get_directory_listing_falls_back_to_html5lib(mocker: MockerFixture) -> None:
+    response = mocker.Mock()
+    response.text = '<a\nhref="foo-1.0.tar.gz">foo</a>'
+    mocker.patch('livecheck.special.directory.get_content', return_value=response)
+    mocker.patch('livecheck.special.directory.extract_hrefs', return_value=[])
+    assert await get_directory_listing('https://example.com/') == ['foo-1.0.tar.gz']
+
+
+@pytest.mark.asyncio
+async def test_get_directory_listing_fetches_once(mocker: MockerFixture) -> None:
+    response = mocker.Mock()
+    response.text = '<a href="foo-1.0.tar.gz">foo</a><a href="bar-2.0.tar.gz">bar</a>'
+    get_content = mocker.patch('livecheck.special.directory.get_content', return_value=response)
+    settings = mocker.Mock()
+    get_last_version = mocker.patch('livecheck.special.directory.get_last_version',
+                                    side_effect=lambda results, *_, **__: {
+                                        'version': results[0]['tag'],
+                                        'url': results[0]['url']
+                                    })
+    results = await asyncio.gather(
+        get_latest_directory_package('https://example.com/gnu/foo-0.9.tar.gz', 'cat/foo-0.9',
+                                     settings),
+        get_latest_directory_package('https://example.com/gnu/bar-1.0.tar.gz', 'cat/bar-1.0',
+                                     settings))
+    assert list(results) == [('foo-1.0.tar.gz', '/gnu/foo-1.0.tar.gz'),
+                             ('bar-2.0.tar.gz', '/gnu/bar-2.0.tar.gz')]
+    get_content.assert_called_once_with('https://example.com/gnu/')
+    assert get_last_version.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_directory_listing_caches_failure(mocker: MockerFixture) -> None:
+    get_content = mocker.patch('livecheck.special.directory.get_content', return_value=None)
+    assert await get_directory_listing('https://example.com/') is None
+    assert await get_directory_listing('https://example.com/') is None
+    get_content.assert_called_once()
+
+
+def test_get_directory_listing_is_forgotten_between_runs(mocker: MockerFixture) -> None:
+    get_content = mocker.patch('livecheck.special.directory.get_content',
+                               return_value=mocker.Mock(text='<a href="a-1.tar.gz">a</a>'))
+    for _ in range(2):
+        init_sessions(asyncio.Semaphore(1))
+        assert asyncio.run(get_directory_listing('https://example.com/a/')) == ['a-1.tar.gz']
+    assert get_content.call_count == 2
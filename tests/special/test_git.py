@@ -0,0 +1,304 @@
+# ruff:file-ignore[start-process-with-partial-path, builtin-argument-shadowing]
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from shutil import which
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+import os
+import subprocess
+import threading
+
+from livecheck.settings_model import LivecheckSettings
+from livecheck.special.git import (
+    GitRefs,
+    build_ls_refs_request,
+    extract_repository,
+    get_latest_git,
+    get_latest_git_commit,
+    get_latest_git_package,
+    is_git,
+    ls_refs,
+    parse_ls_refs_response,
+)
+from livecheck.utils.requests import session_init
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+SHA_A = 'a' * 40
+SHA_B = 'b' * 40
+SHA_C = 'c' * 40
+
+
+def _pkt(data: str) -> bytes:
+    return f'{len(data) + 4:04x}'.encode() + data.encode()
+
+
+def test_build_ls_refs_request() -> None:
+    body = build_ls_refs_request()
+    assert body.startswith(b'0014command=ls-refs\n')
+    assert b'00010009peel\n' in body
+    assert b'ref-prefix refs/tags/\n' in body
+    assert body.endswith(b'0000')
+
+
+def test_parse_ls_refs_response() -> None:
+    data = b''.join(
+        (_pkt(f'{SHA_A} HEAD symref-target:refs/heads/main\n'), _pkt(f'{SHA_A} refs/heads/main\n'),
+         _pkt(f'{SHA_B} refs/heads/dev\n'), _pkt(f'{SHA_C} refs/tags/v1.0.0 peeled:{SHA_A}\n'),
+         _pkt(f'{SHA_B} refs/tags/v0.9.0\n'), _pkt('unborn refs/heads/empty\n'), b'0000'))
+    assert parse_ls_refs_response(data) == GitRefs(heads={
+        'main': SHA_A,
+        'dev': SHA_B
+    },
+                                                   tags={
+                                                       'v1.0.0': SHA_A,
+                                                       'v0.9.0': SHA_B
+                                                   },
+                                                   head='main')
+
+
+@pytest.mark.parametrize('data', [
+    b'0011ERR no repo\n',
+    b'zzzz',
+    b'00ffshort',
+    b'0009\xff\xfe\xfd\xfc\xfb',
+])
+def test_parse_ls_refs_response_invalid(data: bytes) -> None:
+    assert parse_ls_refs_response(data) == GitRefs({}, {})
+
+
+@pytest.mark.parametrize(('url', 'expected'), [
+    ('https://git.example.org/foo.git', 'https://git.example.org/foo.git'),
+    ('https://git.example.org/foo.git/', 'https://git.example.org/foo.git'),
+    (f'https://git.example.org/foo.git/commit/{SHA_A}', 'https://git.example.org/foo.git'),
+    ('https://git.example.org/foo/commit/', 'https://git.example.org/foo'),
+    ('https://git.example.org/foo.git?a=b#c', 'https://git.example.org/foo.git'),
+    ('git://git.example.org/foo.git', ''),
+    ('https://git.example.org/', ''),
+    ('egit_url/commit/', ''),
+])
+def test_extract_repository(url: str, expected: str) -> None:
+    assert extract_repository(url) == expected
+
+
+@pytest.mark.parametrize(('url', 'expected'), [
+    ('https://git.example.org/foo.git', True),
+    (f'https://git.example.org/foo.git/commit/{SHA_A}', True),
+    ('https://git.example.org/foo', False),
+    ('git://git.example.org/foo.git', False),
+])
+def test_is_git(
+        url: str,
+        expected: bool  # ruff:ignore[boolean-type-hint-positional-argument]
+) -> None:
+    assert is_git(url) is expected
+
+
+@pytest.mark.asyncio
+async def test_ls_refs_posts_to_upload_pack(mocker: MockerFixture) -> None:
+    response = mocker.Mock(content=_pkt(f'{SHA_A} refs/heads/main\n') + b'0000')
+    post = mocker.patch.object(session_init('git'), 'post', return_value=response)
+    refs = await ls_refs(f'https://git.example.org/foo.git/commit/{SHA_B}')
+    assert refs.heads == {'main': SHA_A}
+    assert post.call_args.args[0] == 'https://git.example.org/foo.git/git-upload-pack'
+    assert post.call_args.kwargs['data'] == build_ls_refs_request()
+
+
+@pytest.mark.asyncio
+async def test_ls_refs_request_exception(mocker: MockerFixture) -> None:
+    mocker.patch.object(session_init('git'), 'post', side_effect=niquests.RequestException('fail'))
+    assert await ls_refs('https://git.example.org/foo.git') == GitRefs({}, {})
+
+
+@pytest.mark.asyncio
+async def test_ls_refs_invalid_url(mocker: MockerFixture) -> None:
+    post = mocker.patch.object(session_init('git'), 'post')
+    assert await ls_refs('egit_url/commit/') == GitRefs({}, {})
+    post.assert_not_called()
+
+
+def test_session_init_git_sets_protocol_headers() -> None:
+    session = session_init('git')
+    assert session.headers['Git-Protocol'] == 'version=2'
+    assert session.headers['Content-Type'] == 'application/x-git-upload-pack-request'
+
+
+@pytest.mark.asyncio
+async def test_get_latest_git_package(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.git.ls_refs',
+                 return_value=GitRefs({}, {
+                     'foo-1.0.0': SHA_A,
+                     'foo-1.1.0': SHA_B
+                 }))
+    result = await get_latest_git_package('https://git.example.org/foo.git', 'cat/foo-1.0.0',
+                                          LivecheckSettings())
+    assert result == ('1.1.0', SHA_B)
+
+
+@pytest.mark.asyncio
+async def test_get_latest_git_package_no_tags(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.git.ls_refs', return_value=GitRefs({}, {}))
+    result = await get_latest_git_package('https://git.example.org/foo.git', 'cat/foo-1.0.0',
+                                          LivecheckSettings())
+    assert result == ('', '')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_git_commit_default_branch(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.git.ls_refs',
+                 return_value=GitRefs({
+                     'main': SHA_A,
+                     'dev': SHA_B
+                 }, {}, 'main'))
+    assert await get_latest_git_commit('https://git.example.org/foo.git') == SHA_A
+    assert await get_latest_git_commit('https://git.example.org/foo.git', 'dev') == SHA_B
+    assert not await get_latest_git_commit('https://git.example.org/foo.git', 'missing')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_git_commit_pinned(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.git.ls_refs',
+                 return_value=GitRefs({'main': SHA_B}, {'v2.0.0': SHA_C}, 'main'))
+    result = await get_latest_git(f'https://git.example.org/foo.git/commit/{SHA_A}',
+                                  'cat/foo-1.0.0',
+                                  LivecheckSettings(),
+                                  force_sha=True)
+    assert result == ('', SHA_B, '')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_git_configured_branch(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.git.ls_refs',
+                 return_value=GitRefs({
+                     'main': SHA_B,
+                     'stable': SHA_C
+                 }, {}, 'main'))
+    result = await get_latest_git('https://git.example.org/foo.git',
+                                  'cat/foo-1.0.0',
+                                  LivecheckSettings(branches={'cat/foo': 'stable'}),
+                                  force_sha=False)
+    assert result == ('', SHA_C, '')
+
+
+@pytest.mark.parametrize(('force_sha', 'expected'), [(True, ('2.0.0', SHA_C, '')),
+                                                     (False, ('2.0.0', '', ''))])
+@pytest.mark.asyncio
+async def test_get_latest_git_tags(
+        mocker: MockerFixture,
+        force_sha: bool,  # ruff:ignore[boolean-type-hint-positional-argument]
+        expected: tuple[str, str, str]) -> None:
+    mocker.patch('livecheck.special.git.ls_refs',
+                 return_value=GitRefs({'main': SHA_B}, {'v2.0.0': SHA_C}, 'main'))
+    result = await get_latest_git('https://git.example.org/foo.git',
+                                  'cat/foo-1.0.0',
+                                  LivecheckSettings(),
+                                  force_sha=force_sha)
+    assert result == expected
+
+
+class _GitHttpBackendHandler(BaseHTTPRequestHandler):
+    project_root = ''
+
+    def _run_backend(self) -> None:
+        parsed = urlparse(self.path)
+        length = int(self.headers.get('Content-Length', '0'))
+        body = self.rfile.read(length) if length else b''
+        env = {
+            **os.environ, 'GIT_PROJECT_ROOT': self.project_root,
+            'GIT_HTTP_EXPORT_ALL': '1',
+            'REQUEST_METHOD': self.command,
+            'PATH_INFO': parsed.path,
+            'QUERY_STRING': parsed.query,
+            'CONTENT_TYPE': self.headers.get('Content-Type', ''),
+            'CONTENT_LENGTH': str(length),
+            'HTTP_GIT_PROTOCOL': self.headers.get('Git-Protocol', ''),
+            'REMOTE_ADDR': '127.0.0.1'
+        }
+        proc = subprocess.run(['git', 'http-backend'],
+                              input=body,
+                              capture_output=True,
+                              env=env,
+                              check=False)
+        raw_headers, _, payload = proc.stdout.partition(b'\r\n\r\n')
+        status = 200
+        headers: list[tuple[str, str]] = []
+        for line in raw_headers.decode().split('\r\n'):
+            key, _, value = line.partition(':')
+            if key.lower() == 'status':
+                status = int(value.strip().split(' ')[0])
+            elif key:
+                headers.append((key, value.strip()))
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._run_backend()
+
+    def do_POST(self) -> None:
+        self._run_backend()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def git_http_backend(tmp_path: Path) -> Iterator[tuple[str, dict[str, str]]]:
+    work = tmp_path / 'work'
+    work.mkdir()
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ['git', '-C', str(work), *args],
+            capture_output=True,
+            check=True,
+            text=True,
+            env={
+                **os.environ, 'GIT_AUTHOR_NAME': 'a',
+                'GIT_AUTHOR_EMAIL': 'a@example.org',
+                'GIT_COMMITTER_NAME': 'a',
+                'GIT_COMMITTER_EMAIL': 'a@example.org'
+            }).stdout.strip()
+
+    git('init', '-q', '-b', 'main')
+    git('commit', '-q', '--allow-empty', '-m', 'one')
+    git('tag', 'foo-1.0.0')
+    git('commit', '-q', '--allow-empty', '-m', 'two')
+    git('tag', '-a', '-m', 'release', 'foo-1.1.0')
+    shas = {'foo-1.0.0': git('rev-parse', 'foo-1.0.0^{commit}'), 'main': git('rev-parse', 'main')}
+    subprocess.run(['git', 'clone', '-q', '--bare',
+                    str(work), str(tmp_path / 'foo.git')],
+                   check=True)
+    _GitHttpBackendHandler.project_root = str(tmp_path)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _GitHttpBackendHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}/foo.git', shas
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(which('git') is None, reason='git is not installed')
+@pytest.mark.asyncio
+async def test_ls_refs_against_git_http_backend(
+        git_http_backend: tuple[str, dict[str, str]]) -> None:
+    url, shas = git_http_backend
+    refs = await ls_refs(url)
+    assert refs.head == 'main'
+    assert refs.heads == {'main': shas['main']}
+    # The annotated tag is reported peeled to the commit it points at.
+    assert refs.tags == {'foo-1.0.0': shas['foo-1.0.0'], 'foo-1.1.0': shas['main']}
+    result = await get_latest_git(url, 'cat/foo-1.0.0', LivecheckSettings(), force_sha=True)
+    assert result == ('1.1.0', shas['main'], '')
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
+import asyncio
 
+from livecheck.settings_model import LivecheckSettings
 from livecheck.special.github import (
     extract_owner_repo,
     get_branch,
@@ -13,6 +15,7 @@ from livecheck.special.github import (
     get_latest_github_package,
     is_github,
 )
+import livecheck.special.github
 import pytest
 
 if TYPE_CHECKING:
@@ -20,6 +23,23 @@ if TYPE_CHECKING:
 
     from pytest_mock import MockerFixture
 
+_get_github_commit_sha = (
+    livecheck.special.github._get_github_commit_sha)  # ruff:ignore[private-member-access]
+
+
+@pytest.fixture(autouse=True)
+def _no_fast_paths(mocker: MockerFixture) -> None:
+    # Tests pass ``Mock`` settings, whose ``github_graphql_flag`` is truthy.
+    mocker.patch('livecheck.special.github.lookup_github_repository', return_value=None)
+    mocker.patch('livecheck.utils.requests.get_api_credentials', return_value=None)
+    # Exercise the branch object path unless a test opts into the SHA media type.
+    mocker.patch('livecheck.special.github._get_github_commit_sha', return_value='')
+
+
+def _with_sha_media_type(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.github._get_github_commit_sha', new=_get_github_commit_sha)
+
+
 test_cases = {
     'test_extract_owner_repo_valid_github_com': {
         'url': 'https://github.com/username/repo',
@@ -211,27 +231,62 @@ async def test_get_latest_github_package_no_response_2(mocker: MockerFixture) ->
     assert result == ('version', '')
 
 
+@pytest.mark.asyncio
+async def test_get_latest_github_package_caches_tag_commit(mocker: MockerFixture) -> None:
+    tags_response = mocker.Mock()
+    tags_response.json.return_value = [{'name': 'v1.0.0'}]
+    ref_response = mocker.Mock()
+    ref_response.json.return_value = {'object': {'sha': 'deadbeef', 'type': 'commit'}}
+    mock_get_content = mocker.patch('livecheck.special.github.get_content',
+                                    side_effect=[tags_response, ref_response, tags_response])
+    mocker.patch('livecheck.special.github.get_last_version',
+                 return_value={
+                     'version': '1.0.0',
+                     'id': 'v1.0.0'
+                 })
+    for _ in range(2):
+        result = await get_latest_github_package('https://github.com/owner/repo', 'cat/repo-0.9.0',
+                                                 mocker.Mock())
+        assert result == ('1.0.0', 'deadbeef')
+    assert mock_get_content.call_count == 3
+
+
+def _github_branch_api(mocker: MockerFixture, heads: list[str], statuses: Mapping[str, str]) -> Any:
+    """Route ``matching-refs`` and ``compare`` requests to canned responses."""
+    def get_content(url: str) -> Any:
+        if '/git/matching-refs/heads/' in url:
+            response = mocker.Mock()
+            response.json.return_value = [{'ref': f'refs/heads/{head}'} for head in heads]
+            return response
+        branch = url.rsplit('...', 1)[-1]
+        if branch not in statuses:
+            return None
+        response = mocker.Mock()
+        response.json.return_value = {'status': statuses[branch]}
+        return response
+
+    return mocker.patch('livecheck.special.github.get_content', side_effect=get_content)
+
+
 @pytest.mark.asyncio
 async def test_get_github_branch_for_commit_uses_version_series(mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/composer/composer', 'composer', 'composer'))
-    ahead_response = mocker.Mock()
-    ahead_response.json.return_value = {'status': 'ahead'}
-    mocker.patch('livecheck.special.github.get_content', return_value=ahead_response)
+    get_content = _github_branch_api(mocker, ['main', '2.9', '2.8'], {'2.9': 'ahead', '2': 'ahead'})
 
     result = await get_github_branch_for_commit('https://github.com/composer/composer/releases',
                                                 '2.9.8', '39ee8baff8e97a1b657bbfcd6a236ff93a5efbb2')
 
     assert result == '2.9'
+    # One branch listing plus one compare for the only candidate that is a branch.
+    assert get_content.call_count == 2
 
 
 @pytest.mark.asyncio
 async def test_get_github_branch_for_commit_two_part_version(mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/org/repo', 'org', 'repo'))
-    ahead_response = mocker.Mock()
-    ahead_response.json.return_value = {'status': 'identical'}
-    mocker.patch('livecheck.special.github.get_content', return_value=ahead_response)
+    _github_branch_api(mocker, ['10.4', 'v10.4'], {'10.4': 'identical', 'v10.4': 'identical'})
 
     result = await get_github_branch_for_commit('https://github.com/org/repo/releases', '10.4',
                                                 'c' * 40)
@@ -245,7 +300,8 @@ async def test_get_latest_github_package_uses_release_download_tag(mocker: Mocke
     tags_response.json.return_value = [{'name': 'helm-loki-7.0.0'}, {'name': 'v3.7.2'}]
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/grafana/loki', 'grafana', 'loki'))
-    mocker.patch('livecheck.special.github.get_content', side_effect=[tags_response, None])
+    # No ``releases/latest``, so every tag is enumerated.
+    mocker.patch('livecheck.special.github.get_content', side_effect=[None, tags_response, None])
     settings = mocker.Mock()
     settings.regex_version = {}
     settings.restrict_version = {}
@@ -383,6 +439,77 @@ async def test_get_latest_github_commit2_missing_commit_key(mocker: MockerFixtur
         await get_latest_github_commit2('owner', 'repo', 'main')
 
 
+@pytest.mark.asyncio
+async def test_get_latest_github_commit2_sha_media_type(mocker: MockerFixture) -> None:
+    _with_sha_media_type(mocker)
+    sha = 'a' * 40
+    commit_response = mocker.Mock()
+    commit_response.json.return_value = {'commit': {'committer': {'date': '2024-06-01T12:34:56Z'}}}
+
+    async def fake_get_content(url: str, headers: Mapping[str, str] | None = None) -> Any:
+        await asyncio.sleep(0)
+        return mocker.Mock(text=f'{sha}\n') if headers else commit_response
+
+    mock_get_content = mocker.patch('livecheck.special.github.get_content',
+                                    side_effect=fake_get_content)
+
+    assert await get_latest_github_commit2('owner', 'repo', 'release/2.9') == (sha, '20240601')
+    # The commit date is immutable and is served from the object cache the second time.
+    assert await get_latest_github_commit2('owner', 'repo', 'release/2.9') == (sha, '20240601')
+    assert await get_latest_github_commit2('owner', 'repo', 'main', with_date=False) == (sha, '')
+
+    assert mock_get_content.call_args_list[0] == mocker.call(
+        'https://api.github.com/repos/owner/repo/commits/release%2F2.9',
+        headers={'Accept': 'application/vnd.github.sha'})
+    assert mock_get_content.call_args.args[0] == ('https://api.github.com/repos/owner/repo/commits/'
+                                                  'main')
+    assert mock_get_content.call_args_list[1] == mocker.call(
+        f'https://api.github.com/repos/owner/repo/commits/{sha}')
+    assert mock_get_content.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_get_latest_github_commit2_sha_media_type_error(mocker: MockerFixture) -> None:
+    _with_sha_media_type(mocker)
+    mock_get_content = mocker.patch('livecheck.special.github.get_content', return_value=None)
+    assert await get_latest_github_commit2('owner', 'repo', 'main') == ('', '')
+    assert mock_get_content.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_latest_github_package_latest_release(mocker: MockerFixture) -> None:
+    release_response = mocker.Mock()
+    release_response.json.return_value = {'tag_name': 'v3.7.2'}
+    ref_response = mocker.Mock()
+    ref_response.json.return_value = {'object': {'sha': 'abc', 'type': 'commit'}}
+    mock_get_content = mocker.patch('livecheck.special.github.get_content',
+                                    side_effect=[release_response, ref_response])
+
+    result = await get_latest_github_package(
+        'https://github.com/grafana/loki/releases/download/v3.7.1/loki-3.7.1.x86_64.rpm',
+        'app-metrics/loki-3.7.1', LivecheckSettings())
+
+    assert result == ('3.7.2', 'abc')
+    assert mock_get_content.call_args_list[0].args[0] == (
+        'https://api.github.com/repos/grafana/loki/releases/latest')
+
+
+@pytest.mark.asyncio
+async def test_get_latest_github_skips_date_for_non_date_versions(mocker: MockerFixture) -> None:
+    mock_commit = mocker.patch('livecheck.special.github.get_latest_github_commit',
+                               return_value=('sha', ''))
+    await get_latest_github('https://github.com/o/r/commits/main.atom',
+                            'cat/r-1.0.0',
+                            LivecheckSettings(),
+                            force_sha=True)
+    assert mock_commit.call_args.kwargs['with_date'] is False
+    await get_latest_github('https://github.com/o/r/commits/main.atom',
+                            'cat/r-0_pre20240101',
+                            LivecheckSettings(),
+                            force_sha=True)
+    assert mock_commit.call_args.kwargs['with_date'] is True
+
+
 @pytest.mark.parametrize(
     ('url', 'ebuild', 'branches_dict', 'expected_branch'),
     [
@@ -590,9 +717,7 @@ async def test_get_latest_github_package_annotated_tag_success(mocker: MockerFix
 async def test_get_github_branch_for_commit_non_numeric_version(mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/org/repo', 'org', 'repo'))
-    ahead_response = mocker.Mock()
-    ahead_response.json.return_value = {'status': 'ahead'}
-    mocker.patch('livecheck.special.github.get_content', return_value=ahead_response)
+    _github_branch_api(mocker, ['main'], {'main': 'ahead'})
     result = await get_github_branch_for_commit('https://github.com/org/repo/releases', 'main',
                                                 'a' * 40)
     assert result == 'main'
@@ -613,29 +738,34 @@ async def test_get_github_branch_for_commit_skips_when_get_content_falsy(
         mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/org/repo', 'org', 'repo'))
-    branch_response = mocker.Mock()
-    ahead_response = mocker.Mock()
-    ahead_response.json.return_value = {'status': 'identical'}
-    # First candidate's branch check fails; the second candidate resolves.
-    mocker.patch('livecheck.special.github.get_content',
-                 side_effect=[None, branch_response, ahead_response])
+    # The first candidate's compare request fails; the second candidate resolves.
+    _github_branch_api(mocker, ['2.9', 'v2.9'], {'v2.9': 'identical'})
     result = await get_github_branch_for_commit('https://github.com/org/repo/releases', '2.9',
                                                 'a' * 40)
     assert result == 'v2.9'
 
 
+@pytest.mark.asyncio
+async def test_get_github_branch_for_commit_branch_listing_fails(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.github.extract_owner_repo',
+                 return_value=('https://github.com/org/repo', 'org', 'repo'))
+    invalid = mocker.Mock()
+    invalid.json.side_effect = ValueError
+    not_a_list = mocker.Mock()
+    not_a_list.json.return_value = {'message': 'Not Found'}
+    get_content = mocker.patch('livecheck.special.github.get_content',
+                               side_effect=[None, invalid, not_a_list])
+    for _ in range(3):
+        assert not await get_github_branch_for_commit('https://github.com/org/repo/releases', '2.9',
+                                                      'a' * 40)
+    assert get_content.call_count == 3
+
+
 @pytest.mark.asyncio
 async def test_get_github_branch_for_commit_skips_unreachable_status(mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/org/repo', 'org', 'repo'))
-    branch_response = mocker.Mock()
-    behind = mocker.Mock()
-    behind.json.return_value = {'status': 'behind'}
-    ahead = mocker.Mock()
-    ahead.json.return_value = {'status': 'ahead'}
-    # Each candidate first passes the branch-existence check, then the compare check.
-    mocker.patch('livecheck.special.github.get_content',
-                 side_effect=[branch_response, behind, branch_response, ahead])
+    _github_branch_api(mocker, ['2.9', 'v2.9'], {'2.9': 'behind', 'v2.9': 'ahead'})
     result = await get_github_branch_for_commit('https://github.com/org/repo/releases', '2.9',
                                                 'a' * 40)
     assert result == 'v2.9'
@@ -645,13 +775,14 @@ async def test_get_github_branch_for_commit_skips_unreachable_status(mocker: Moc
 async def test_get_github_branch_for_commit_skips_tag_only_candidate(mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/composer/composer', 'composer', 'composer'))
-    # No candidate exists as a branch (every branch-existence check returns falsy), so even
-    # though the version tag would compare as identical, no branch is returned.
-    mocker.patch('livecheck.special.github.get_content', return_value=None)
+    # No candidate exists as a branch, so even though the version tag would compare as
+    # identical, no branch is returned and no compare request is made.
+    get_content = _github_branch_api(mocker, ['main'], {'2.10.1': 'identical'})
     result = await get_github_branch_for_commit('https://github.com/composer/composer/releases',
                                                 '2.10.1',
                                                 '39ee8baff8e97a1b657bbfcd6a236ff93a5efbb2')
     assert not result
+    get_content.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -659,9 +790,7 @@ async def test_get_github_branch_for_commit_returns_empty_when_no_candidate_matc
         mocker: MockerFixture) -> None:
     mocker.patch('livecheck.special.github.extract_owner_repo',
                  return_value=('https://github.com/org/repo', 'org', 'repo'))
-    behind = mocker.Mock()
-    behind.json.return_value = {'status': 'behind'}
-    mocker.patch('livecheck.special.github.get_content', return_value=behind)
+    _github_branch_api(mocker, ['2.9', 'v2.9'], {'2.9': 'behind', 'v2.9': 'behind'})
     result = await get_github_branch_for_commit('https://github.com/org/repo/releases', '2.9',
                                                 'a' * 40)
     assert not result
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import asyncio
+
+from livecheck.settings_model import LivecheckSettings
+from livecheck.special.github import get_latest_github_commit, get_latest_github_package
+from livecheck.special.github_graphql import (
+    GITHUB_GRAPHQL_URL,
+    GitHubGraphQLBatcher,
+    GitHubRepositoryRefs,
+    build_query,
+    parse_repository,
+)
+from livecheck.utils.requests import session_init
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+SHA_A = 'a' * 40
+SHA_B = 'b' * 40
+SHA_C = 'c' * 40
+
+
+@pytest.fixture(autouse=True)
+def _no_credentials(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.utils.requests.get_api_credentials', return_value=None)
+
+
+def _repository(**extra: Any) -> dict[str, Any]:
+    return {
+        'latestRelease': {
+            'tagName': 'v1.1.0'
+        },
+        'defaultBranchRef': {
+            'name': 'main',
+            'target': {
+                'oid': SHA_A,
+                'committedDate': '2024-01-31T12:00:00Z'
+            }
+        },
+        'refs': {
+            'nodes': [{
+                'name': 'v1.1.0',
+                'target': {
+                    'oid': SHA_C,
+                    'target': {
+                        'oid': SHA_B
+                    }
+                }
+            }, {
+                'name': 'v1.0.0',
+                'target': {
+                    'oid': SHA_A
+                }
+            }]
+        },
+        **extra
+    }
+
+
+def test_build_query() -> None:
+    query, variables = build_query([('o', 'r', ''), ('o2', 'r2', 'dev')])
+    assert query.startswith('query($o0: String!, $n0: String!, $o1: String!, $n1: String!, '
+                            '$b1: String!)')
+    assert 'r0: repository(owner: $o0, name: $n0)' in query
+    assert 'r1: repository(owner: $o1, name: $n1)' in query
+    assert query.count('branch: ref(qualifiedName:') == 1
+    assert variables == {'o0': 'o', 'n0': 'r', 'o1': 'o2', 'n1': 'r2', 'b1': 'refs/heads/dev'}
+
+
+def test_parse_repository_default_branch() -> None:
+    assert parse_repository(_repository()) == GitHubRepositoryRefs(tags={
+        'v1.1.0': SHA_B,
+        'v1.0.0': SHA_A
+    },
+                                                                   latest_release='v1.1.0',
+                                                                   branch_sha=SHA_A,
+                                                                   branch_date='20240131')
+
+
+def test_parse_repository_requested_branch() -> None:
+    refs = parse_repository(
+        _repository(branch={'target': {
+            'oid': SHA_C,
+            'committedDate': '2023-05-06T00:00:00Z'
+        }}))
+    assert (refs.branch_sha, refs.branch_date) == (SHA_C, '20230506')
+
+
+def test_parse_repository_missing_branch() -> None:
+    refs = parse_repository(_repository(branch=None, latestRelease=None))
+    assert (refs.branch_sha, refs.branch_date, refs.latest_release) == ('', '', '')
+
+
+@pytest.mark.asyncio
+async def test_batcher_resolves_concurrent_lookups_with_one_query(mocker: MockerFixture) -> None:
+    response = mocker.Mock()
+    response.json.return_value = {
+        'data': {
+            'r0': _repository(),
+            'r1': None
+        },
+        'errors': [{
+            'message': 'Could not resolve to a Repository.'
+        }]
+    }
+    post = mocker.patch.object(session_init('github'), 'post', return_value=response)
+    batcher = GitHubGraphQLBatcher(window=0.01)
+    first, duplicate, missing = await asyncio.gather(batcher.lookup('o', 'r'),
+                                                     batcher.lookup('o', 'r'),
+                                                     batcher.lookup('o', 'missing'))
+    assert post.call_count == 1
+    assert post.call_args.args[0] == GITHUB_GRAPHQL_URL
+    assert post.call_args.kwargs['json']['variables'] == {
+        'o0': 'o',
+        'n0': 'r',
+        'o1': 'o',
+        'n1': 'missing'
+    }
+    assert first is not None
+    assert first.tags['v1.1.0'] == SHA_B
+    assert duplicate == first
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_full_batch_immediately(mocker: MockerFixture) -> None:
+    response = mocker.Mock()
+    response.json.return_value = {'data': {'r0': _repository(), 'r1': _repository()}}
+    post = mocker.patch.object(session_init('github'), 'post', return_value=response)
+    batcher = GitHubGraphQLBatcher(window=60, max_batch=2)
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.lookup('o', 'a'), batcher.lookup('o', 'b')), 5)
+    assert post.call_count == 1
+    assert all(result is not None for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batcher_request_exception(mocker: MockerFixture) -> None:
+    mocker.patch.object(session_init('github'),
+                        'post',
+                        side_effect=niquests.RequestException('fail'))
+    batcher = GitHubGraphQLBatcher(window=0)
+    assert await batcher.lookup('o', 'r') is None
+
+
+@pytest.mark.asyncio
+async def test_get_latest_github_package_graphql(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.github.lookup_github_repository',
+                 return_value=parse_repository(_repository()))
+    mock_get_content = mocker.patch('livecheck.special.github.get_content')
+    result = await get_latest_github_package('https://github.com/o/r', 'cat/r-1.0.0',
+                                             LivecheckSettings(github_graphql_flag=True))
+    assert result == ('1.1.0', SHA_B)
+    mock_get_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_latest_github_package_graphql_falls_back(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.github.lookup_github_repository', return_value=None)
+    mock_get_content = mocker.patch('livecheck.special.github.get_content', return_value=None)
+    result = await get_latest_github_package('https://github.com/o/r', 'cat/r-1.0.0',
+                                             LivecheckSettings(github_graphql_flag=True))
+    assert result == ('', '')
+    mock_get_content.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_latest_github_commit_graphql(mocker: MockerFixture) -> None:
+    lookup = mocker.patch('livecheck.special.github.lookup_github_repository',
+                          return_value=parse_repository(_repository()))
+    mock_commit2 = mocker.patch('livecheck.special.github.get_latest_github_commit2')
+    result = await get_latest_github_commit('https://github.com/o/r', 'main', graphql=True)
+    assert result == (SHA_A, '20240131')
+    lookup.assert_called_once_with('o', 'r', 'main')
+    mock_commit2.assert_not_called()
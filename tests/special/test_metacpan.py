@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
+import asyncio
 
 from livecheck.special.metacpan import (
     extract_perl_package,
@@ -152,3 +153,93 @@ async def test_get_latest_metacpan_metadata(mocker: MockerFixture, remote: str,
     settings = mocker.Mock()
     result = await get_latest_metacpan_metadata(remote, ebuild, settings)
     assert result == expected_version
+
+
+@pytest.mark.asyncio
+async def test_get_latest_metacpan_package_batched(mocker: MockerFixture) -> None:
+    def hit(distribution: str, version: str) -> dict[str, Any]:
+        return {'_source': {'distribution': distribution, 'version': version}}
+
+    def fake_get_content(url: str) -> Any:
+        response = mocker.Mock()
+        if 'status%3Alatest' in url:
+            response.json.return_value = {'hits': {'hits': [hit('Foo-Bar', '1.2')]}}
+        elif 'release/_search' in url:
+            response.json.return_value = {
+                'hits': {
+                    'hits': [hit('Foo-Bar', '1.1'),
+                             hit('Baz', '0.9'),
+                             hit('Other', '5.0')]
+                }
+            }
+        else:
+            response.json.return_value = {'version': '3.0'}
+        return response
+
+    get_content = mocker.patch('livecheck.special.metacpan.get_content',
+                               side_effect=fake_get_content)
+    get_last_version = mocker.patch('livecheck.special.metacpan.get_last_version',
+                                    side_effect=lambda results, *_: {'version': results[-1]['tag']})
+    settings = mocker.Mock()
+    results = await asyncio.gather(
+        get_latest_metacpan_package('https://metacpan.org/release/Foo-Bar-1.0', 'a', settings),
+        get_latest_metacpan_metadata('Baz', 'b', settings),
+        get_latest_metacpan_metadata('Gone', 'c', settings))
+    assert list(results) == ['1.2', '0.9', '3.0']
+    assert get_last_version.call_args_list[0].args[0] == [{'tag': '1.1'}, {'tag': '1.2'}]
+    search_urls = [call.args[0] for call in get_content.call_args_list[:2]]
+    assert all('%22Foo-Bar%22%20OR%20%22Baz%22%20OR%20%22Gone%22' in url for url in search_urls)
+    assert 'size=30' in search_urls[0]
+    assert 'size=3' in search_urls[1]
+    assert get_content.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_get_latest_metacpan_package_batched_crowded_out(mocker: MockerFixture) -> None:
+    def hit(distribution: str, version: str) -> dict[str, Any]:
+        return {'_source': {'distribution': distribution, 'version': version}}
+
+    def fake_get_content(url: str) -> Any:
+        response = mocker.Mock()
+        if 'status%3Alatest' in url:
+            response.json.return_value = {
+                'hits': {
+                    'hits': [hit('Busy', '3.0'), hit('Quiet', '1.0')]
+                }
+            }
+        elif 'release/_search?q=distribution%3A%28' in url:
+            # Busy released more often than the search returns.
+            response.json.return_value = {
+                'hits': {
+                    'hits': [hit('Busy', '3.2'), hit('Busy', '3.1')]
+                }
+            }
+        elif 'release/_search' in url:
+            response.json.return_value = {'hits': {'hits': [hit('Quiet', '1.1-TRIAL')]}}
+        else:
+            response.json.return_value = {'version': '1.0'}
+        return response
+
+    mocker.patch('livecheck.special.metacpan.METACPAN_SEARCH_HITS', 1)
+    get_content = mocker.patch('livecheck.special.metacpan.get_content',
+                               side_effect=fake_get_content)
+    get_last_version = mocker.patch('livecheck.special.metacpan.get_last_version',
+                                    side_effect=lambda results, *_: {'version': results[-1]['tag']})
+    settings = mocker.Mock()
+    await asyncio.gather(get_latest_metacpan_metadata('Busy', 'a', settings),
+                         get_latest_metacpan_metadata('Quiet', 'b', settings))
+    assert [call.args[0] for call in get_last_version.call_args_list] == [
+        [{
+            'tag': '3.2'
+        }, {
+            'tag': '3.1'
+        }, {
+            'tag': '3.0'
+        }],
+        [{
+            'tag': '1.1-TRIAL'
+        }, {
+            'tag': '1.0'
+        }],
+    ]
+    assert get_content.call_count == 4
@@ -11,6 +11,7 @@ import pytest
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
+    from tests.conftest import StreamTextMocker
 
 
 @pytest.mark.asyncio
@@ -40,7 +41,8 @@ async def test_get_latest_pecl_package_no_prefix(mocker: MockerFixture) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_latest_pecl_package2_returns_latest_stable(mocker: MockerFixture) -> None:
+async def test_get_latest_pecl_package2_returns_latest_stable(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     ebuild = 'dev-php/foo-1.0.0'
     settings = mocker.Mock()
     settings.is_devel.return_value = False
@@ -53,25 +55,25 @@ async def test_get_latest_pecl_package2_returns_latest_stable(mocker: MockerFixt
       <r><v>2.0.0</v><s>stable</s></r>
     </a>
     """
-    mock_get_content = mocker.patch('livecheck.special.pecl.get_content',
-                                    return_value=mocker.Mock(text=xml))
+    stream_text = stream_text_mock('livecheck.special.pecl', xml)
     mock_get_last_version = mocker.patch('livecheck.special.pecl.get_last_version',
                                          return_value={'version': '2.0.0'})
 
     result = await get_latest_pecl_package2('foo', ebuild, settings)
 
     assert result == '2.0.0'
-    mock_get_content.assert_called_once()
+    stream_text.assert_called_once()
     mock_get_last_version.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_get_latest_pecl_package2_returns_empty_on_no_content(mocker: MockerFixture) -> None:
+async def test_get_latest_pecl_package2_returns_empty_on_no_content(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     ebuild = 'dev-php/foo-1.0.0'
     settings = mocker.Mock()
     mocker.patch('livecheck.special.pecl.catpkg_catpkgsplit',
                  return_value=('dev-php', None, 'foo', None))
-    mocker.patch('livecheck.special.pecl.get_content', return_value=None)
+    stream_text_mock('livecheck.special.pecl')
 
     result = await get_latest_pecl_package2('foo', ebuild, settings)
     assert not result
@@ -79,7 +81,7 @@ async def test_get_latest_pecl_package2_returns_empty_on_no_content(mocker: Mock
 
 @pytest.mark.asyncio
 async def test_get_latest_pecl_package2_returns_empty_on_no_last_version(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     ebuild = 'dev-php/foo-1.0.0'
     settings = mocker.Mock()
     mocker.patch('livecheck.special.pecl.catpkg_catpkgsplit',
@@ -89,7 +91,7 @@ async def test_get_latest_pecl_package2_returns_empty_on_no_last_version(
       <r><v>1.0.0</v><s>stable</s></r>
     </a>
     """
-    mocker.patch('livecheck.special.pecl.get_content', return_value=mocker.Mock(text=xml))
+    stream_text_mock('livecheck.special.pecl', xml)
     mocker.patch('livecheck.special.pecl.get_last_version', return_value=None)
 
     await get_latest_pecl_package2('foo', ebuild, settings)
@@ -97,7 +99,7 @@ async def test_get_latest_pecl_package2_returns_empty_on_no_last_version(
 
 @pytest.mark.asyncio
 async def test_get_latest_pecl_package2_filters_only_stable_when_not_devel(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     ebuild = 'dev-php/foo-1.0.0'
     settings = mocker.Mock()
     settings.is_devel.return_value = False
@@ -111,7 +113,7 @@ async def test_get_latest_pecl_package2_filters_only_stable_when_not_devel(
         <r><v>3.0.0</v><s>alpha</s></r>
     </a>
     """
-    mocker.patch('livecheck.special.pecl.get_content', return_value=mocker.Mock(text=xml))
+    stream_text_mock('livecheck.special.pecl', xml)
     mock_get_last_version = mocker.patch('livecheck.special.pecl.get_last_version',
                                          return_value={'version': '2.0.0'})
 
@@ -126,7 +128,8 @@ async def test_get_latest_pecl_package2_filters_only_stable_when_not_devel(
 
 
 @pytest.mark.asyncio
-async def test_get_latest_pecl_package2_includes_all_when_devel(mocker: MockerFixture) -> None:
+async def test_get_latest_pecl_package2_includes_all_when_devel(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     ebuild = 'dev-php/foo-1.0.0'
     settings = mocker.Mock()
     settings.is_devel.return_value = True
@@ -140,7 +143,7 @@ async def test_get_latest_pecl_package2_includes_all_when_devel(mocker: MockerFi
         <r><v>3.0.0</v><s>alpha</s></r>
     </a>
     """
-    mocker.patch('livecheck.special.pecl.get_content', return_value=mocker.Mock(text=xml))
+    stream_text_mock('livecheck.special.pecl', xml)
     mock_get_last_version = mocker.patch('livecheck.special.pecl.get_last_version',
                                          return_value={'version': '3.0.0'})
 
@@ -155,7 +158,8 @@ async def test_get_latest_pecl_package2_includes_all_when_devel(mocker: MockerFi
 
 
 @pytest.mark.asyncio
-async def test_get_latest_pecl_package2_returns_empty_if_no_releases(mocker: MockerFixture) -> None:
+async def test_get_latest_pecl_package2_returns_empty_if_no_releases(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     ebuild = 'dev-php/foo-1.0.0'
     settings = mocker.Mock()
     settings.is_devel.return_value = False
@@ -165,7 +169,7 @@ async def test_get_latest_pecl_package2_returns_empty_if_no_releases(mocker: Moc
     <a xmlns="http://pear.php.net/dtd/rest.allreleases">
     </a>
     """
-    mocker.patch('livecheck.special.pecl.get_content', return_value=mocker.Mock(text=xml))
+    stream_text_mock('livecheck.special.pecl', xml)
     mock_get_last_version = mocker.patch('livecheck.special.pecl.get_last_version',
                                          return_value=None)
 
@@ -2,89 +2,83 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from defusedxml import ElementTree as ET  # ruff:ignore[camelcase-imported-as-acronym]
 from livecheck.special.regex import get_latest_regex_package
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from pytest_mock import MockerFixture
+    from tests.conftest import StreamTextMocker
 
 pytestmark = pytest.mark.asyncio
 
+ATOM = 'http://www.w3.org/2005/Atom'
+
 
-async def test_get_latest_regex_package_no_content(mocker: MockerFixture) -> None:
-    mocker.patch('livecheck.special.regex.get_content', return_value=None)
+async def test_get_latest_regex_package_no_content(mocker: MockerFixture,
+                                                   stream_text_mock: StreamTextMocker) -> None:
+    stream_text_mock('livecheck.special.regex')
     result = await get_latest_regex_package('cat/pkg-1.0', 'http://example.com', r'.*',
                                             mocker.Mock())
     assert result == ('', '', '')
 
 
-async def test_get_latest_regex_package_commit_hash_found(mocker: MockerFixture) -> None:
+async def test_get_latest_regex_package_commit_hash_found(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
                  return_value=('cat', 'pkg', '', '20240601'))
-    mock_response = mocker.Mock()
-    mock_response.text = '<entry><id>abc123</id><updated>2024-06-01T12:00:00Z</updated></entry>'
-    mocker.patch('livecheck.special.regex.get_content', return_value=mock_response)
+    stream_text_mock(
+        'livecheck.special.regex', f'<feed xmlns="{ATOM}"><entry><id>abc123</id>'
+        '<updated>2024-06-01T12:00:00Z</updated></entry></feed>')
     mocker.patch('livecheck.special.regex.is_sha', return_value=True)
-    mocker.patch('livecheck.special.regex.ET.fromstring',
-                 return_value=mocker.Mock(find=mocker.Mock(return_value=mocker.Mock(
-                     text='2024-06-01T12:00:00Z'))))
     result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com', r'(abc123)',
                                             mocker.Mock())
     assert result == ('abc123', '20240601', 'http://example.com')
 
 
-async def test_get_latest_regex_package_commit_hash_parse_error(mocker: MockerFixture) -> None:
+async def test_get_latest_regex_package_commit_hash_parse_error(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
                  return_value=('cat', 'pkg', '', '20240601'))
-    mock_response = mocker.Mock()
-    mock_response.text = 'abc123<invalid>'
-    mocker.patch('livecheck.special.regex.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.regex', 'abc123<invalid>')
     mocker.patch('livecheck.special.regex.is_sha', return_value=True)
-    mocker.patch('livecheck.special.regex.ET.fromstring', side_effect=ET.ParseError)
     result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com', r'(abc123)',
                                             mocker.Mock())
     assert result == ('', '', '')
 
 
 async def test_get_latest_regex_package_commit_missing_updated_element(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
                  return_value=('cat', 'pkg', '', '20240601'))
-    mock_response = mocker.Mock()
-    mock_response.text = '<feed>abc123</feed>'
-    mocker.patch('livecheck.special.regex.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.regex',
+                     f'<feed xmlns="{ATOM}"><entry><id>abc123</id></entry></feed>')
     mocker.patch('livecheck.special.regex.is_sha', return_value=True)
-    mocker.patch('livecheck.special.regex.ET.fromstring',
-                 return_value=mocker.Mock(find=mocker.Mock(return_value=None)))
     result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com', r'(abc123)',
                                             mocker.Mock())
     assert result == ('', '', '')
 
 
-async def test_get_latest_regex_package_commit_invalid_date(mocker: MockerFixture) -> None:
+async def test_get_latest_regex_package_commit_invalid_date(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
                  return_value=('cat', 'pkg', '', '202'))
-    mock_response = mocker.Mock()
-    mock_response.text = '<entry><id>abc123</id><updated>2024-06-01T12:00:00Z</updated></entry>'
-    mocker.patch('livecheck.special.regex.get_content', return_value=mock_response)
+    stream_text_mock(
+        'livecheck.special.regex', f'<feed xmlns="{ATOM}"><entry><id>abc123</id>'
+        '<updated>2024-06-01T12:00:00Z</updated></entry></feed>')
     mocker.patch('livecheck.special.regex.is_sha', return_value=True)
-    mocker.patch('livecheck.special.regex.ET.fromstring',
-                 return_value=mocker.Mock(find=mocker.Mock(return_value=mocker.Mock(
-                     text='2024-06-01T12:00:00Z'))))
     result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com', r'(abc123)',
                                             mocker.Mock())
     assert result == ('abc123', '', 'http://example.com')
 
 
-async def test_get_latest_regex_package_no_commit_hash_last_version(mocker: MockerFixture) -> None:
+async def test_get_latest_regex_package_no_commit_hash_last_version(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
                  return_value=('cat', 'pkg', '', '1.0'))
-    mock_response = mocker.Mock()
-    mock_response.text = 'v1.2.3 v1.2.4'
-    mocker.patch('livecheck.special.regex.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.regex', 'v1.2.3 v1.2.4')
     mocker.patch('livecheck.special.regex.is_sha', return_value=False)
-    mocker.patch('re.findall', return_value=['v1.2.3', 'v1.2.4'])
     mocker.patch('livecheck.special.regex.get_last_version', return_value={'version': 'v1.2.4'})
     result = await get_latest_regex_package('cat/pkg-1.0', 'http://example.com',
                                             r'(v\d+\.\d+\.\d+)', mocker.Mock())
@@ -92,15 +86,90 @@ async def test_get_latest_regex_package_no_commit_hash_last_version(mocker: Mock
 
 
 async def test_get_latest_regex_package_no_commit_hash_no_last_version(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
                  return_value=('cat', 'pkg', '', '1.0'))
-    mock_response = mocker.Mock()
-    mock_response.text = 'v1.2.3 v1.2.4'
-    mocker.patch('livecheck.special.regex.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.regex', 'v1.2.3 v1.2.4')
     mocker.patch('livecheck.special.regex.is_sha', return_value=False)
-    mocker.patch('re.findall', return_value=['v1.2.3', 'v1.2.4'])
     mocker.patch('livecheck.special.regex.get_last_version', return_value=None)
     result = await get_latest_regex_package('cat/pkg-1.0', 'http://example.com',
                                             r'(v\d+\.\d+\.\d+)', mocker.Mock())
     assert result == ('', '', '')
+
+
+async def test_get_latest_regex_package_scans_chunks(mocker: MockerFixture,
+                                                     stream_text_mock: StreamTextMocker) -> None:
+    mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
+                 return_value=('cat', 'pkg', '', '1.0'))
+    stream_text_mock('livecheck.special.regex', 'foo-1.', '2.tar.gz foo-1.10.tar', '.gz')
+    get_last_version = mocker.patch('livecheck.special.regex.get_last_version',
+                                    return_value={'version': '1.10'})
+    result = await get_latest_regex_package('cat/pkg-1.0', 'http://example.com',
+                                            r'foo-([\d.]+)\.tar\.gz', mocker.Mock())
+    assert result == ('1.10', '', '')
+    assert get_last_version.call_args.args[0] == [{'tag': '1.2'}, {'tag': '1.10'}]
+
+
+async def test_get_latest_regex_package_commit_hash_reads_whole_feed(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
+    mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
+                 return_value=('cat', 'pkg', '', '20240601'))
+    stream_text_mock('livecheck.special.regex',
+                     '<feed xmlns="http://www.w3.org/2005/Atom"><entry><id>', 'a' * 40 + '</id>',
+                     '<updated>2024-06-02T12:00:00Z</updated></entry></feed>')
+    result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com',
+                                            r'<id>([0-9a-f]{40})</id>', mocker.Mock())
+    assert result == ('a' * 40, '20240602', 'http://example.com')
+
+
+async def test_get_latest_regex_package_commit_hash_then_versions(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
+    mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
+                 return_value=('cat', 'pkg', '', '1.0'))
+    stream_text_mock('livecheck.special.regex', 'abc1234 ', 'def5678 1.1 ', 'abc9999 1.2')
+    get_last_version = mocker.patch('livecheck.special.regex.get_last_version',
+                                    return_value={'version': '1.2'})
+    result = await get_latest_regex_package('cat/pkg-1.0', 'http://example.com', r'\S+',
+                                            mocker.Mock())
+    assert result == ('1.2', '', '')
+    assert get_last_version.call_args.args[0] == [{
+        'tag': '1.1'
+    }, {
+        'tag': 'abc9999'
+    }, {
+        'tag': '1.2'
+    }]
+
+
+async def test_get_latest_regex_package_commit_hash_stops_after_first_entry(
+        mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
+                 return_value=('cat', 'pkg', '', '20240601'))
+    read: list[str] = []
+
+    async def body(*_: object, **__: object) -> AsyncIterator[str]:  # ruff:ignore[unused-async]
+        for chunk in (f'<feed xmlns="{ATOM}"><entry><id>{"a" * 40}</id>',
+                      '<updated>2024-06-02T12:00:00Z</updated></entry>' + ' ' * 8192,
+                      f'<entry><id>{"b" * 40}</id>' + ' ' * 8192, 'never read'):
+            read.append(chunk)
+            yield chunk
+
+    mocker.patch('livecheck.special.regex.stream_text', side_effect=body)
+    result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com',
+                                            r'<id>([0-9a-f]{40})</id>', mocker.Mock())
+    assert result == ('a' * 40, '20240602', 'http://example.com')
+    assert 'never read' not in read
+
+
+async def test_get_latest_regex_package_commit_hash_entity_in_page(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
+    mocker.patch('livecheck.special.regex.catpkg_catpkgsplit',
+                 return_value=('cat', 'pkg', '', '20240601'))
+    stream_text_mock('livecheck.special.regex',
+                     '<!DOCTYPE html [<!ENTITY x "y">]><html>abc1234 1.2</html>')
+    get_last_version = mocker.patch('livecheck.special.regex.get_last_version',
+                                    return_value={'version': '1.2'})
+    result = await get_latest_regex_package('cat/pkg-20240601', 'http://example.com',
+                                            r'abc1234|1\.2', mocker.Mock())
+    assert result == ('1.2', '', '')
+    assert get_last_version.call_args.args[0] == [{'tag': '1.2'}]
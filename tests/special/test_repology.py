@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
+import asyncio
 
 from livecheck.special import repology
 import pytest
@@ -13,6 +14,11 @@ if TYPE_CHECKING:
 pytestmark = pytest.mark.asyncio
 
 
+@pytest.fixture(autouse=True)
+def client(mocker: MockerFixture) -> repology.RepologyClient:
+    return mocker.patch.object(repology, '_client', repology.RepologyClient(rate=1000))
+
+
 @pytest.fixture
 def mock_settings(mocker: MockerFixture) -> Any:
     settings = mocker.Mock()
@@ -117,6 +123,26 @@ async def test_get_latest_repology_no_matching_release(mock_catpkg_catpkgsplit:
     assert not result
 
 
+async def test_get_latest_repology_skips_releases_without_version(mock_catpkg_catpkgsplit: Mock,
+                                                                  mocker: MockerFixture,
+                                                                  mock_get_last_version: Mock,
+                                                                  mock_settings: Mock) -> None:
+    mock_response = mocker.Mock()
+    mock_response.json.return_value = [{
+        'srcname': 'pkg',
+        'status': 'stable'
+    }, {
+        'srcname': 'pkg',
+        'status': 'stable',
+        'version': '1.0'
+    }]
+    mocker.patch('livecheck.special.repology.get_content', return_value=mock_response)
+    mock_get_last_version.return_value = {'version': '1.0'}
+
+    assert await repology.get_latest_repology('cat/pkg', mock_settings) == '1.0'
+    assert mock_get_last_version.call_args.args[0] == [{'tag': '1.0'}]
+
+
 async def test_get_latest_repology_devel_status_allowed(mock_catpkg_catpkgsplit: Mock,
                                                         mocker: MockerFixture,
                                                         mock_get_last_version: Mock,
@@ -130,3 +156,127 @@ async def test_get_latest_repology_devel_status_allowed(mock_catpkg_catpkgsplit:
 
     result = await repology.get_latest_repology('cat/pkg', mock_settings)
     assert result == '3.3.3'
+
+
+async def test_prefetch_walks_project_ranges(mocker: MockerFixture,
+                                             client: repology.RepologyClient) -> None:
+    mocker.patch.object(repology, 'REPOLOGY_PAGE_SIZE', 3)
+    pages = {
+        'a': {
+            'a': [{
+                'version': '1'
+            }],
+            'b': [],
+            'c': [{
+                'version': '3'
+            }]
+        },
+        'd': {
+            'e': [{
+                'version': '5'
+            }]
+        },
+    }
+
+    def fake_get_content(url: str) -> Mock:
+        response: Mock = mocker.Mock()
+        response.json.return_value = pages[url.rstrip('/').rsplit('/', 1)[-1]]
+        return response
+
+    get_content = mocker.patch('livecheck.special.repology.get_content',
+                               side_effect=fake_get_content)
+    await repology.prefetch_repology(['c', 'a', 'd', 'e', 'a'])
+    assert [call.args[0] for call in get_content.call_args_list] == [
+        'https://repology.org/api/v1/projects/a/', 'https://repology.org/api/v1/projects/d/'
+    ]
+    assert client.projects == {
+        'a': [{
+            'version': '1'
+        }],
+        'c': [{
+            'version': '3'
+        }],
+        'e': [{
+            'version': '5'
+        }]
+    }
+    project_response = mocker.Mock()
+    project_response.json.return_value = []
+    get_content.side_effect = None
+    get_content.return_value = project_response
+    assert await client.project('a') == [{'version': '1'}]
+    assert await client.project('d') == []
+    assert get_content.call_args.args[0] == 'https://repology.org/api/v1/project/d'
+
+
+async def test_project_waits_for_prefetch(mocker: MockerFixture, mock_settings: Mock,
+                                          mock_catpkg_catpkgsplit: Mock,
+                                          mock_get_last_version: Mock) -> None:
+    released = asyncio.Event()
+
+    async def fake_get_content(url: str) -> Mock:
+        await released.wait()
+        response: Mock = mocker.Mock()
+        response.json.return_value = {'pkg': [{'srcname': 'pkg', 'version': '1.0'}]}
+        return response
+
+    get_content = mocker.patch('livecheck.special.repology.get_content',
+                               side_effect=fake_get_content)
+    mock_get_last_version.return_value = {'version': '1.0'}
+    prefetch = asyncio.create_task(repology.prefetch_repology(['pkg']))
+    latest = asyncio.create_task(repology.get_latest_repology('cat/pkg', mock_settings))
+    await asyncio.sleep(0)
+    released.set()
+    await prefetch
+    assert await latest == '1.0'
+    get_content.assert_called_once_with('https://repology.org/api/v1/projects/pkg/')
+
+
+async def test_project_waits_only_for_its_range(mocker: MockerFixture,
+                                                client: repology.RepologyClient) -> None:
+    mocker.patch.object(repology, 'REPOLOGY_PAGE_SIZE', 2)
+    released = asyncio.Event()
+    pages = {'a': {'a': [{'version': '1'}], 'b': []}, 'c': {'c': [{'version': '3'}]}}
+
+    async def fake_get_content(url: str) -> Mock:
+        start = url.rstrip('/').rsplit('/', 1)[-1]
+        if start != 'a':
+            await released.wait()
+        response: Mock = mocker.Mock()
+        response.json.return_value = pages[start]
+        return response
+
+    mocker.patch('livecheck.special.repology.get_content', side_effect=fake_get_content)
+    prefetch = asyncio.create_task(client.prefetch(['a', 'c']))
+    await asyncio.sleep(0)
+    later = asyncio.create_task(client.project('c'))
+    assert await client.project('a') == [{'version': '1'}]
+    assert not prefetch.done()
+    assert not later.done()
+    released.set()
+    await prefetch
+    assert await later == [{'version': '3'}]
+
+
+async def test_prefetch_failure_falls_back_to_project(mocker: MockerFixture,
+                                                      client: repology.RepologyClient) -> None:
+    response = mocker.Mock()
+    response.json.return_value = [{'version': '2'}]
+    get_content = mocker.patch('livecheck.special.repology.get_content',
+                               side_effect=[None, response])
+    await client.prefetch(['pkg'])
+    assert await client.project('pkg') == [{'version': '2'}]
+    assert get_content.call_count == 2
+
+
+async def test_token_bucket_spaces_requests(mocker: MockerFixture) -> None:
+    sleep = mocker.patch('livecheck.special.repology.asyncio.sleep')
+    monotonic = mocker.patch('livecheck.special.repology.monotonic', return_value=100.0)
+    bucket = repology.TokenBucket(2)
+    await bucket.acquire()
+    sleep.assert_not_called()
+    await bucket.acquire()
+    sleep.assert_awaited_once_with(0.5)
+    monotonic.return_value = 101.0
+    await bucket.acquire()
+    assert sleep.await_count == 1
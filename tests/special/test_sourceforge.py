@@ -9,10 +9,12 @@ from livecheck.special.sourceforge import (
     get_latest_sourceforge_package2,
     is_sourceforge,
 )
+from livecheck.utils.xml_stream import MAX_FEED_ENTRIES
+import pytest
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
-import pytest
+    from tests.conftest import StreamTextMocker
 
 
 @pytest.mark.parametrize(
@@ -36,10 +38,11 @@ def test_extract_repository(url: str, expected: str) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourceforge_package_returns_latest_version(mocker: MockerFixture) -> None:
+async def test_get_latest_sourceforge_package_returns_latest_version(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     # Mock extract_repository to return a repository name
     mocker.patch('livecheck.special.sourceforge.extract_repository', return_value='sample_project')
-    # Mock get_content to return a dummy RSS feed
+    # Mock stream_text to return a dummy RSS feed
     dummy_rss = """
     <rss>
         <channel>
@@ -52,9 +55,7 @@ async def test_get_latest_sourceforge_package_returns_latest_version(mocker: Moc
         </channel>
     </rss>
     """
-    mock_response = mocker.Mock()
-    mock_response.text = dummy_rss
-    mocker.patch('livecheck.special.sourceforge.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.sourceforge', dummy_rss)
     # Mock get_archive_extension to always return True
     mocker.patch('livecheck.special.sourceforge.get_archive_extension', return_value=True)
     # Mock get_last_version to return the latest version dict
@@ -65,7 +66,8 @@ async def test_get_latest_sourceforge_package_returns_latest_version(mocker: Moc
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourceforge_package_download_url(mocker: MockerFixture) -> None:
+async def test_get_latest_sourceforge_package_download_url(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.sourceforge.extract_repository', return_value='sample_project')
     dummy_rss = """
     <rss>
@@ -76,9 +78,7 @@ async def test_get_latest_sourceforge_package_download_url(mocker: MockerFixture
         </channel>
     </rss>
     """
-    mock_response = mocker.Mock()
-    mock_response.text = dummy_rss
-    mocker.patch('livecheck.special.sourceforge.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.sourceforge', dummy_rss)
     mocker.patch('livecheck.special.sourceforge.get_archive_extension', return_value=True)
     mock_get_last_version = mocker.patch('livecheck.special.sourceforge.get_last_version',
                                          return_value={'version': '1.2.3'})
@@ -92,15 +92,18 @@ async def test_get_latest_sourceforge_package_download_url(mocker: MockerFixture
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourceforge_package_no_content(mocker: MockerFixture) -> None:
+async def test_get_latest_sourceforge_package_no_content(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.sourceforge.extract_repository', return_value='sample_project')
-    mocker.patch('livecheck.special.sourceforge.get_content', return_value=None)
-    result = await get_latest_sourceforge_package('dummy_url', 'dummy_ebuild', mocker.Mock())
+    stream_text_mock('livecheck.special.sourceforge')
+    result = await get_latest_sourceforge_package('dummy_url', 'cat/sample_project-1.0',
+                                                  mocker.Mock())
     assert not result
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourceforge_package_no_versions_found(mocker: MockerFixture) -> None:
+async def test_get_latest_sourceforge_package_no_versions_found(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     mocker.patch('livecheck.special.sourceforge.extract_repository', return_value='sample_project')
     dummy_rss = """
     <rss>
@@ -111,9 +114,7 @@ async def test_get_latest_sourceforge_package_no_versions_found(mocker: MockerFi
         </channel>
     </rss>
     """
-    mock_response = mocker.Mock()
-    mock_response.text = dummy_rss
-    mocker.patch('livecheck.special.sourceforge.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.sourceforge', dummy_rss)
     mocker.patch('livecheck.special.sourceforge.get_archive_extension', return_value=False)
     mocker.patch('livecheck.special.sourceforge.get_last_version', return_value=None)
     result = await get_latest_sourceforge_package('dummy_url', 'dummy_ebuild', mocker.Mock())
@@ -122,7 +123,7 @@ async def test_get_latest_sourceforge_package_no_versions_found(mocker: MockerFi
 
 @pytest.mark.asyncio
 async def test_get_latest_sourceforge_package2_calls_get_last_version(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     dummy_rss = """
     <rss>
         <channel>
@@ -132,9 +133,7 @@ async def test_get_latest_sourceforge_package2_calls_get_last_version(
         </channel>
     </rss>
     """
-    mock_response = mocker.Mock()
-    mock_response.text = dummy_rss
-    mocker.patch('livecheck.special.sourceforge.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.sourceforge', dummy_rss)
     mocker.patch('livecheck.special.sourceforge.get_archive_extension', return_value=True)
     get_last_version = mocker.patch('livecheck.special.sourceforge.get_last_version',
                                     return_value={'version': '2.0.0'})
@@ -145,7 +144,7 @@ async def test_get_latest_sourceforge_package2_calls_get_last_version(
 
 @pytest.mark.asyncio
 async def test_get_latest_sourceforge_package2_returns_empty_if_no_last_version(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     dummy_rss = """
     <rss>
         <channel>
@@ -155,9 +154,7 @@ async def test_get_latest_sourceforge_package2_returns_empty_if_no_last_version(
         </channel>
     </rss>
     """
-    mock_response = mocker.Mock()
-    mock_response.text = dummy_rss
-    mocker.patch('livecheck.special.sourceforge.get_content', return_value=mock_response)
+    stream_text_mock('livecheck.special.sourceforge', dummy_rss)
     mocker.patch('livecheck.special.sourceforge.get_archive_extension', return_value=True)
     mocker.patch('livecheck.special.sourceforge.get_last_version', return_value=None)
     result = await get_latest_sourceforge_package2('sample_project', 'dummy_ebuild', mocker.Mock())
@@ -210,3 +207,24 @@ async def test_get_latest_sourceforge_metadata_with_none_return(mocker: MockerFi
     settings = mocker.Mock()
     result = await get_latest_sourceforge_metadata(remote, ebuild, settings)
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_latest_sourceforge_package2_stops_reading(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
+    items = ''.join(
+        f'<item><title>/1.{i}/sample_project-1.{i}.tar.gz</title></item>' for i in range(60, 0, -1))
+    stream_text = stream_text_mock('livecheck.special.sourceforge', f'<rss><channel>{items}',
+                                   '<item>never parsed')
+    get_last_version = mocker.patch('livecheck.special.sourceforge.get_last_version',
+                                    return_value={'version': '1.60'})
+    log = mocker.patch('livecheck.special.sourceforge.log')
+    assert await get_latest_sourceforge_package2('sample_project', 'cat/sample_project-1.0',
+                                                 mocker.Mock()) == '1.60'
+    tags = [r['tag'] for r in get_last_version.call_args.args[0]]
+    assert len(tags) == MAX_FEED_ENTRIES
+    log.debug.assert_called_once_with('Stopped reading %s after %d entries.',
+                                      'https://sourceforge.net/projects/sample_project/rss',
+                                      MAX_FEED_ENTRIES)
+    assert tags[0] == 'sample_project-1.60.tar.gz'
+    assert stream_text.call_args.args == ('https://sourceforge.net/projects/sample_project/rss',)
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from collections.abc import Collection
 
     from pytest_mock import MockerFixture
+    from tests.conftest import StreamTextMocker
 
 EBUILD = 'app-portage/livecheck-1.0'
 
@@ -101,10 +102,11 @@ def make_rss_xml(tags: Collection[str]) -> str:
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_package_returns_latest(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_package_returns_latest(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     tags = ['v1.0.0', 'v1.2.0', 'v1.1.0']
     xml = make_rss_xml(tags)
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     mocker.patch('livecheck.special.sourcehut.get_last_version', return_value={'version': 'v1.2.0'})
     url = 'https://git.sr.ht/~owner/repo'
     ebuild = 'app-portage/livecheck-1.0'
@@ -115,9 +117,9 @@ async def test_get_latest_sourcehut_package_returns_latest(mocker: MockerFixture
 
 @pytest.mark.asyncio
 async def test_get_latest_sourcehut_package_archive_url_with_extension(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     xml = make_rss_xml([])
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     mock_get_last_version = mocker.patch('livecheck.special.sourcehut.get_last_version',
                                          return_value=None)
     url = 'https://git.sr.ht/~owner/repo/archive/v1.0.0.tar.gz'
@@ -130,9 +132,9 @@ async def test_get_latest_sourcehut_package_archive_url_with_extension(
 
 @pytest.mark.asyncio
 async def test_get_latest_sourcehut_package_archive_url_without_extension(
-        mocker: MockerFixture) -> None:
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     xml = make_rss_xml([])
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     mock_get_last_version = mocker.patch('livecheck.special.sourcehut.get_last_version',
                                          return_value=None)
     url = 'https://git.sr.ht/~owner/repo/archive/v1.2.3'
@@ -153,8 +155,9 @@ async def test_get_latest_sourcehut_package_no_owner_repo(mocker: MockerFixture)
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_package_no_content(mocker: MockerFixture) -> None:
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=None)
+async def test_get_latest_sourcehut_package_no_content(mocker: MockerFixture,
+                                                       stream_text_mock: StreamTextMocker) -> None:
+    stream_text_mock('livecheck.special.sourcehut')
     url = 'https://git.sr.ht/~owner/repo'
     ebuild = 'app-portage/livecheck-1.0'
     settings = mocker.Mock()
@@ -163,9 +166,10 @@ async def test_get_latest_sourcehut_package_no_content(mocker: MockerFixture) ->
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_package_no_versions(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_package_no_versions(mocker: MockerFixture,
+                                                        stream_text_mock: StreamTextMocker) -> None:
     xml = make_rss_xml([])
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     mocker.patch('livecheck.special.sourcehut.get_last_version', return_value=None)
     url = 'https://git.sr.ht/~owner/repo'
     ebuild = 'app-portage/livecheck-1.0'
@@ -175,7 +179,8 @@ async def test_get_latest_sourcehut_package_no_versions(mocker: MockerFixture) -
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_package_guid_missing(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_package_guid_missing(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     xml = """<?xml version="1.0"?>
     <rss>
         <channel>
@@ -185,7 +190,7 @@ async def test_get_latest_sourcehut_package_guid_missing(mocker: MockerFixture)
         </channel>
     </rss>
     """
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     mocker.patch('livecheck.special.sourcehut.get_last_version', return_value=None)
     url = 'https://git.sr.ht/~owner/repo'
     ebuild = 'app-portage/livecheck-1.0'
@@ -199,13 +204,14 @@ async def test_get_latest_sourcehut_branch_returns_commit_and_date(mocker: Mocke
     mocker.patch('livecheck.special.sourcehut.get_branch', return_value='main')
     mock_commit = 'abcdef1234567890'
     mock_date = '20240601'
-    mocker.patch('livecheck.special.sourcehut.get_latest_sourcehut_commit',
-                 return_value=(mock_commit, mock_date))
+    get_commit = mocker.patch('livecheck.special.sourcehut.get_latest_sourcehut_commit',
+                              return_value=(mock_commit, mock_date))
     url = 'https://git.sr.ht/~owner/repo'
     ebuild = 'app-portage/livecheck-1.0'
     settings = mocker.Mock()
     result = await sourcehut.get_latest_sourcehut(url, ebuild, settings)
     assert result == ('', mock_commit, mock_date)
+    get_commit.assert_awaited_once_with(url, 'main', max_size=settings.max_body_size)
 
 
 @pytest.mark.asyncio
@@ -299,14 +305,27 @@ def make_commit_rss_xml(commit: str, pubdate: str) -> str:
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_commit_returns_commit_and_date(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_commit_returns_commit_and_date(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     commit = 'abcdef1234567890'
     pubdate = 'Sat, 01 Jun 2024 12:34:56 +0000'
     xml = make_commit_rss_xml(commit, pubdate)
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text = stream_text_mock('livecheck.special.sourcehut', xml)
     url = 'https://git.sr.ht/~owner/repo'
-    result = await sourcehut.get_latest_sourcehut_commit(url, branch='main')
+    result = await sourcehut.get_latest_sourcehut_commit(url, branch='main', max_size=1024)
     assert result == (commit, '20240601')
+    assert stream_text.call_args.kwargs['max_size'] == 1024
+
+
+@pytest.mark.asyncio
+async def test_get_latest_sourcehut_commit_reads_first_item_only(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
+    stream_text_mock(
+        'livecheck.special.sourcehut',
+        '<rss><channel><item><guid>https://git.sr.ht/~owner/repo/abc</guid>'
+        '<pubDate>Sat, 01 Jun 2024 12:34:56 +0000</pubDate></item>', '</broken>')
+    result = await sourcehut.get_latest_sourcehut_commit('https://git.sr.ht/~owner/repo')
+    assert result == ('abc', '20240601')
 
 
 @pytest.mark.asyncio
@@ -317,15 +336,17 @@ async def test_get_latest_sourcehut_commit_invalid_url(mocker: MockerFixture) ->
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_commit_no_content(mocker: MockerFixture) -> None:
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=None)
+async def test_get_latest_sourcehut_commit_no_content(mocker: MockerFixture,
+                                                      stream_text_mock: StreamTextMocker) -> None:
+    stream_text_mock('livecheck.special.sourcehut')
     url = 'https://git.sr.ht/~owner/repo'
     result = await sourcehut.get_latest_sourcehut_commit(url, branch='main')
     assert result == ('', '')
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_commit_missing_guid_and_pubdate(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_commit_missing_guid_and_pubdate(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     xml = """<?xml version="1.0"?>
     <rss>
         <channel>
@@ -335,25 +356,27 @@ async def test_get_latest_sourcehut_commit_missing_guid_and_pubdate(mocker: Mock
         </channel>
     </rss>
     """
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     url = 'https://git.sr.ht/~owner/repo'
     result = await sourcehut.get_latest_sourcehut_commit(url, branch='main')
     assert result == ('', '')
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_commit_invalid_date_format(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_commit_invalid_date_format(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     commit = 'abcdef1234567890'
     pubdate = 'not a date'
     xml = make_commit_rss_xml(commit, pubdate)
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     url = 'https://git.sr.ht/~owner/repo'
     result = await sourcehut.get_latest_sourcehut_commit(url, branch='main')
     assert result == (commit, '')
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_commit_guid_missing_text(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_commit_guid_missing_text(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     xml = """<?xml version="1.0"?>
     <rss>
         <channel>
@@ -364,14 +387,15 @@ async def test_get_latest_sourcehut_commit_guid_missing_text(mocker: MockerFixtu
         </channel>
     </rss>
     """
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     url = 'https://git.sr.ht/~owner/repo'
     result = await sourcehut.get_latest_sourcehut_commit(url, branch='main')
     assert result == ('', '20240601')
 
 
 @pytest.mark.asyncio
-async def test_get_latest_sourcehut_commit_pubdate_missing_text(mocker: MockerFixture) -> None:
+async def test_get_latest_sourcehut_commit_pubdate_missing_text(
+        mocker: MockerFixture, stream_text_mock: StreamTextMocker) -> None:
     commit = 'abcdef1234567890'
     xml = f"""<?xml version="1.0"?>
     <rss>
@@ -383,7 +407,7 @@ async def test_get_latest_sourcehut_commit_pubdate_missing_text(mocker: MockerFi
         </channel>
     </rss>
     """
-    mocker.patch('livecheck.special.sourcehut.get_content', return_value=mocker.MagicMock(text=xml))
+    stream_text_mock('livecheck.special.sourcehut', xml)
     url = 'https://git.sr.ht/~owner/repo'
     result = await sourcehut.get_latest_sourcehut_commit(url, branch='main')
     assert result == (commit, '')
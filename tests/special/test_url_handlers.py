@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from livecheck.special.url_handlers import URLHandler, URLHandlerRegistry, url_handlers
+import pytest
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@pytest.mark.parametrize(('url', 'expected'), [
+    ('https://gist.github.com/foo/0123abcd', 'gist'),
+    ('https://gist.githubusercontent.com/foo/0123abcd/raw/x', 'gist'),
+    ('https://github.com/foo/bar', 'github'),
+    ('https://foo.github.io/bar', 'github'),
+    ('https://GitHub.com/foo/bar', None),
+    ('https://git.sr.ht/~foo/bar', 'sourcehut'),
+    ('mirror://pypi/f/foo/foo-1.0.tar.gz', 'pypi'),
+    ('https://www.nuget.org/packages/A.B/1.0.0', 'nuget'),
+    ('https://download.jetbrains.com/idea/ideaIC-1.0.tar.gz', 'jetbrains'),
+    ('https://gitlab.com/foo/bar', 'gitlab'),
+    ('https://gitlab.gnome.org/GNOME/foo', 'gitlab'),
+    ('https://registry.yarnpkg.com/foo/-/foo-1.0.tgz', 'package'),
+    ('https://pecl.php.net/get/foo-1.0.tgz', 'pecl'),
+    ('https://metacpan.org/release/Foo-Bar', None),
+    ('mirror://cpan/authors/id/F/FO/FOO/Foo-1.0.tar.gz', 'metacpan'),
+    ('https://rubygems.org/gems/foo-1.0.gem', 'rubygems'),
+    ('https://downloads.sourceforge.net/foo/foo-1.0.tar.gz', 'sourceforge'),
+    ('https://foo.sf.jp/', 'sourceforge'),
+    ('mirror://sourceforge/foo/foo-1.0.tar.gz', None),
+    ('https://bitbucket.org/foo/bar', 'bitbucket'),
+    ('https://example.com/foo/bar.git', 'git'),
+    ('https://github.com/foo', None),
+    ('https://example.com/foo/bar', None),
+])
+def test_find_matches_predicate_chain(url: str, expected: str | None) -> None:
+    handler = url_handlers.find(url)
+    assert (handler.name if handler else None) == expected
+    assert next((h.name for h in url_handlers.handlers if h.matches(url)), None) == expected
+
+
+def test_find_falls_through_to_lower_priority(mocker: MockerFixture) -> None:
+    first = URLHandler('first', lambda _: False, mocker.AsyncMock(), hosts=frozenset({'a.b'}))
+    second = URLHandler('second', lambda _: True, mocker.AsyncMock(), host_suffixes=('.b',))
+    registry = URLHandlerRegistry((first, second))
+    assert registry.find('https://a.b/') is second
+    assert registry.find('https://c.a.b/') is second
+    assert registry.find('https://b/') is None
+
+
+def test_candidates_in_priority_order(mocker: MockerFixture) -> None:
+    registry = URLHandlerRegistry()
+    fallback = URLHandler('fallback', bool, mocker.AsyncMock(), schemes=frozenset({'https'}))
+    host = URLHandler('host', bool, mocker.AsyncMock(), hosts=frozenset({'gitlab.example.org'}))
+    prefix = URLHandler('prefix', bool, mocker.AsyncMock(), host_prefixes=('gitlab.',))
+    registry.register(prefix)
+    registry.register(host)
+    registry.register(fallback)
+    assert registry.candidates(urlparse('https://gitlab.example.org/a')) == [prefix, host, fallback]
+    assert registry.candidates(urlparse('ftp://gitlab.example.org/a')) == [prefix, host]
+    assert not registry.candidates(urlparse('ftp://example.org/a'))
+
+
+@pytest.mark.asyncio
+async def test_check_adapters(mocker: MockerFixture) -> None:
+    settings = mocker.Mock()
+    mocker.patch('livecheck.special.url_handlers.get_latest_pypi_package',
+                 return_value=('1.0', 'https://pypi.org/foo-1.0.tar.gz'))
+    handler = url_handlers.find('mirror://pypi/f/foo/foo-0.9.tar.gz')
+    assert handler is not None
+    assert await handler.check('mirror://pypi/f/foo/foo-0.9.tar.gz',
+                               'cat/foo-0.9',
+                               settings,
+                               force_sha=False) == ('1.0', '', '',
+                                                    'https://pypi.org/foo-1.0.tar.gz')
+    rubygems = mocker.patch('livecheck.special.url_handlers.get_latest_rubygems_package',
+                            return_value='2.0')
+    handler = url_handlers.find('https://rubygems.org/gems/foo-1.0.gem')
+    assert handler is not None
+    assert await handler.check('https://rubygems.org/gems/foo-1.0.gem',
+                               'cat/foo-1.0',
+                               settings,
+                               force_sha=True) == ('2.0', '', '',
+                                                   'https://rubygems.org/gems/foo-1.0.gem')
+    rubygems.assert_awaited_once_with('cat/foo-1.0', settings)
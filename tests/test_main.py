@@ -21,10 +21,14 @@ from livecheck.main import (
     str_version,
     update_egit_branch,
 )
+from livecheck.special.url_handlers import url_handlers
+from livecheck.utils.http_cache import CacheStats, FileSystemHTTPCache
+from livecheck.utils.negative_cache import configure_negative_cache, record_outcome
 import click
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
     from pathlib import Path
     from unittest.mock import Mock
 
@@ -2153,92 +2157,106 @@ async def test_process_submodules_sha_matches_no_replacement(mocker: MockerFixtu
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize(
-    ('src_uri', 'is_gist_ret', 'is_github_ret', 'is_sourcehut_ret', 'is_pypi_ret',
-     'is_jetbrains_ret', 'is_gitlab_ret', 'is_package_ret', 'is_pecl_ret', 'is_metacpan_ret',
-     'is_rubygems_ret', 'is_sourceforge_ret', 'is_bitbucket_ret', 'expected'),
-    [('https://gist.github.com/foo/bar', True, False, False, False, False, False, False, False,
-      False, False, False, False, ('', 'sha', 'date', 'https://gist.github.com/foo/bar')),
-     ('https://github.com/foo/bar', False, True, False, False, False, False, False, False, False,
-      False, False, False, ('ver', 'sha', 'date', 'https://github.com/foo/bar')),
-     ('https://git.sr.ht/~foo/bar', False, False, True, False, False, False, False, False, False,
-      False, False, False, ('ver', 'sha', 'date', 'https://git.sr.ht/~foo/bar')),
-     ('https://pypi.org/project/foo', False, False, False, True, False, False, False, False, False,
-      False, False, False, ('ver', '', '', 'url')),
-     ('https://jetbrains.com/foo', False, False, False, False, True, False, False, False, False,
-      False, False, False, ('ver', '', '', 'https://jetbrains.com/foo')),
-     ('https://gitlab.com/foo/bar', False, False, False, False, False, True, False, False, False,
-      False, False, False, ('ver', 'sha', 'date', 'https://gitlab.com/foo/bar')),
-     ('https://example.com/package', False, False, False, False, False, False, True, False, False,
-      False, False, False, ('ver', '', '', 'https://example.com/package')),
-     ('https://pecl.php.net/package/foo', False, False, False, False, False, False, False, True,
-      False, False, False, False, ('ver', '', '', 'https://pecl.php.net/package/foo')),
-     ('https://metacpan.org/release/foo', False, False, False, False, False, False, False, False,
-      True, False, False, False, ('ver', '', '', 'https://metacpan.org/release/foo')),
-     ('https://rubygems.org/gems/foo', False, False, False, False, False, False, False, False,
-      False, True, False, False, ('ver', '', '', 'https://rubygems.org/gems/foo')),
-     ('https://sourceforge.net/projects/foo', False, False, False, False, False, False, False,
-      False, False, False, True, False, ('ver', '', '', 'https://sourceforge.net/projects/foo')),
-     ('https://bitbucket.org/foo/bar', False, False, False, False, False, False, False, False,
-      False, False, False, True, ('ver', 'sha', 'date', 'https://bitbucket.org/foo/bar')),
-     ('https://unknown.org/foo/bar', False, False, False, False, False, False, False, False, False,
-      False, False, False, ('', '', '', 'https://unknown.org/foo/bar')),
-     ('not_a_url', False, False, False, False, False, False, False, False, False, False, False,
-      False, ('', '', '', 'not_a_url'))])
-async def test_parse_url_variants(mocker: MockerFixture, src_uri: str, is_gist_ret: bool,
-                                  is_github_ret: bool, is_sourcehut_ret: bool, is_pypi_ret: bool,
-                                  is_jetbrains_ret: bool, is_gitlab_ret: bool, is_package_ret: bool,
-                                  is_pecl_ret: bool, is_metacpan_ret: bool, is_rubygems_ret: bool,
-                                  is_sourceforge_ret: bool, is_bitbucket_ret: bool,
-                                  expected: tuple[str, str, str, str]) -> None:
-    mocker.patch('livecheck.main.is_pypi', return_value=is_pypi_ret)
-    mocker.patch('livecheck.main.is_jetbrains', return_value=is_jetbrains_ret)
-    mocker.patch('livecheck.main.is_package', return_value=is_package_ret)
-    mocker.patch('livecheck.main.is_metacpan', return_value=is_metacpan_ret)
-    mocker.patch('livecheck.main.is_sourceforge', return_value=is_sourceforge_ret)
-
-    if src_uri == 'not_a_url':
-        mocker.patch('livecheck.main.urlparse', return_value=mocker.Mock(hostname=None, path=''))
-    else:
-        mocker.patch('livecheck.main.urlparse',
-                     return_value=mocker.Mock(hostname='host', path='/foo/bar'))
-
-    mocker.patch('livecheck.main.get_latest_gist_package', return_value=('sha', 'date'))
-    mocker.patch('livecheck.main.get_latest_github', return_value=('ver', 'sha', 'date'))
-    mocker.patch('livecheck.main.get_latest_sourcehut', return_value=('ver', 'sha', 'date'))
-    mocker.patch('livecheck.main.get_latest_pypi_package', return_value=('ver', 'url'))
-    mocker.patch('livecheck.main.get_latest_jetbrains_package', return_value='ver')
-    mocker.patch('livecheck.main.get_latest_gitlab', return_value=('ver', 'sha', 'date'))
-    mocker.patch('livecheck.main.get_latest_package', return_value='ver')
-    mocker.patch('livecheck.main.get_latest_pecl_package', return_value='ver')
-    mocker.patch('livecheck.main.get_latest_metacpan_package', return_value='ver')
-    mocker.patch('livecheck.main.get_latest_rubygems_package', return_value='ver')
-    mocker.patch('livecheck.main.get_latest_sourceforge_package', return_value='ver')
-    mocker.patch('livecheck.main.get_latest_bitbucket', return_value=('ver', 'sha', 'date'))
+@pytest.mark.parametrize(('src_uri', 'getter', 'returned', 'expected'), [
+    ('https://gist.github.com/foo/0123abcd', 'get_latest_gist_package', ('sha', 'date'),
+     ('', 'sha', 'date', 'https://gist.github.com/foo/0123abcd')),
+    ('https://github.com/foo/bar', 'get_latest_github', ('ver', 'sha', 'date'),
+     ('ver', 'sha', 'date', 'https://github.com/foo/bar')),
+    ('https://git.sr.ht/~foo/bar', 'get_latest_sourcehut', ('ver', 'sha', 'date'),
+     ('ver', 'sha', 'date', 'https://git.sr.ht/~foo/bar')),
+    ('https://files.pythonhosted.org/packages/source/f/foo/foo-1.0.tar.gz',
+     'get_latest_pypi_package', ('ver', 'url'), ('ver', '', '', 'url')),
+    ('https://download.jetbrains.com/idea/ideaIC-1.0.tar.gz', 'get_latest_jetbrains_package', 'ver',
+     ('ver', '', '', 'https://download.jetbrains.com/idea/ideaIC-1.0.tar.gz')),
+    ('https://gitlab.com/foo/bar', 'get_latest_gitlab', ('ver', 'sha', 'date'),
+     ('ver', 'sha', 'date', 'https://gitlab.com/foo/bar')),
+    ('https://registry.npmjs.org/foo/-/foo-1.0.tgz', 'get_latest_package', 'ver',
+     ('ver', '', '', 'https://registry.npmjs.org/foo/-/foo-1.0.tgz')),
+    ('https://pecl.php.net/get/foo-1.0.tgz', 'get_latest_pecl_package', 'ver',
+     ('ver', '', '', 'https://pecl.php.net/get/foo-1.0.tgz')),
+    ('mirror://cpan/authors/id/F/FO/FOO/Foo-1.0.tar.gz', 'get_latest_metacpan_package', 'ver',
+     ('ver', '', '', 'mirror://cpan/authors/id/F/FO/FOO/Foo-1.0.tar.gz')),
+    ('https://rubygems.org/gems/foo-1.0.gem', 'get_latest_rubygems_package', 'ver',
+     ('ver', '', '', 'https://rubygems.org/gems/foo-1.0.gem')),
+    ('https://foo.sourceforge.io/', 'get_latest_sourceforge_package', 'ver',
+     ('ver', '', '', 'https://foo.sourceforge.io/')),
+    ('https://bitbucket.org/foo/bar', 'get_latest_bitbucket', ('ver', 'sha', 'date'),
+     ('ver', 'sha', 'date', 'https://bitbucket.org/foo/bar')),
+    ('https://example.com/foo/bar.git', 'get_latest_git', ('ver', 'sha', 'date'),
+     ('ver', 'sha', 'date', 'https://example.com/foo/bar.git')),
+])
+async def test_parse_url_variants(mocker: MockerFixture, src_uri: str, getter: str,
+                                  returned: object, expected: tuple[str, str, str, str]) -> None:
+    getter_mock = mocker.patch(f'livecheck.special.url_handlers.{getter}', return_value=returned)
     mock_log_unhandled = mocker.patch('livecheck.main.log_unhandled_pkg')
+    result = await parse_url(src_uri, 'cat/pkg-1.0.0', mocker.Mock(), force_sha=False)
+    assert result == expected
+    getter_mock.assert_awaited_once()
+    mock_log_unhandled.assert_not_called()
 
-    settings = mocker.Mock()
-    ebuild = 'cat/pkg-1.0.0'
-    force_sha = False
 
-    result = await parse_url(src_uri, ebuild, settings, force_sha=force_sha)
-    assert result == expected
+@pytest.mark.asyncio
+async def test_parse_url_resolves_mirror_without_handler(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.main.resolve_mirror_uri',
+                 return_value='https://downloads.sourceforge.net/foo/foo-1.0.tar.gz')
+    getter = mocker.patch('livecheck.special.url_handlers.get_latest_sourceforge_package',
+                          return_value='ver')
+    result = await parse_url('mirror://sourceforge/foo/foo-1.0.tar.gz',
+                             'cat/pkg-1.0.0',
+                             mocker.Mock(),
+                             force_sha=False)
+    assert result == ('ver', '', '', 'https://downloads.sourceforge.net/foo/foo-1.0.tar.gz')
+    getter.assert_awaited_once()
 
-    if not any((is_gist_ret, is_github_ret, is_sourcehut_ret, is_pypi_ret, is_jetbrains_ret,
-                is_gitlab_ret, is_package_ret, is_pecl_ret, is_metacpan_ret, is_rubygems_ret,
-                is_sourceforge_ret, is_bitbucket_ret)) and src_uri != 'not_a_url':
-        mock_log_unhandled.assert_called_once_with(ebuild, src_uri)
-    else:
-        mock_log_unhandled.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_parse_url_unresolved_mirror(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.main.resolve_mirror_uri', return_value='')
+    mock_log_unhandled = mocker.patch('livecheck.main.log_unhandled_pkg')
+    result = await parse_url('mirror://unknown/foo-1.0.tar.gz',
+                             'cat/pkg-1.0.0',
+                             mocker.Mock(),
+                             force_sha=False)
+    assert result == ('', '', '', 'mirror://unknown/foo-1.0.tar.gz')
+    mock_log_unhandled.assert_called_once_with('cat/pkg-1.0.0', 'mirror://unknown/foo-1.0.tar.gz')
+
+
+@pytest.mark.asyncio
+async def test_parse_url_unhandled(mocker: MockerFixture) -> None:
+    mock_log_unhandled = mocker.patch('livecheck.main.log_unhandled_pkg')
+    result = await parse_url('https://unknown.org/foo/bar',
+                             'cat/pkg-1.0.0',
+                             mocker.Mock(),
+                             force_sha=False)
+    assert result == ('', '', '', 'https://unknown.org/foo/bar')
+    mock_log_unhandled.assert_called_once_with('cat/pkg-1.0.0', 'https://unknown.org/foo/bar')
+
+
+@pytest.mark.asyncio
+async def test_parse_url_no_hostname(mocker: MockerFixture) -> None:
+    find = mocker.spy(url_handlers, 'find')
+    mock_log_unhandled = mocker.patch('livecheck.main.log_unhandled_pkg')
+    result = await parse_url('not_a_url', 'cat/pkg-1.0.0', mocker.Mock(), force_sha=False)
+    assert result == ('', '', '', 'not_a_url')
+    find.assert_not_called()
+    mock_log_unhandled.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_url_passes_force_sha(mocker: MockerFixture) -> None:
+    github = mocker.patch('livecheck.special.url_handlers.get_latest_github',
+                          return_value=('ver', 'sha', 'date'))
+    settings = mocker.Mock()
+    await parse_url('https://github.com/foo/bar', 'cat/pkg-1.0.0', settings, force_sha=True)
+    github.assert_awaited_once_with('https://github.com/foo/bar',
+                                    'cat/pkg-1.0.0',
+                                    settings,
+                                    force_sha=True)
 
 
 @pytest.mark.asyncio
 async def test_parse_url_dispatches_to_nuget(mocker: MockerFixture) -> None:
-    mocker.patch('livecheck.main.is_pypi', return_value=False)
-    mocker.patch('livecheck.main.is_nuget', return_value=True)
-    mocker.patch('livecheck.main.urlparse',
-                 return_value=mocker.Mock(hostname='api.nuget.org', path='/v3-flatcontainer/foo'))
-    nuget_call = mocker.patch('livecheck.main.get_latest_nuget_package',
+    nuget_call = mocker.patch('livecheck.special.url_handlers.get_latest_nuget_package',
                               return_value=('1.2.3', 'https://api.nuget.org/.../foo.1.2.3.nupkg'))
     settings = mocker.Mock()
     last_version, top_hash, hash_date, url = await parse_url(
@@ -2778,12 +2796,14 @@ async def test_get_props_type_repology_calls_get_latest_repology(mocker: MockerF
     mocker.patch('livecheck.main.log')
     mock_get_latest_repology = mocker.patch('livecheck.main.get_latest_repology',
                                             return_value='repo_ver')
+    mock_prefetch = mocker.patch('livecheck.main.prefetch_repology')
     results = await get_props(search_dir=fake_repo,
                               repo_root=fake_repo,
                               settings=mock_settings2,
                               names=['cat/pkg'],
                               exclude=[])
     assert results == [('cat', 'pkg', '1.0.0', 'repo_ver', '', '', '')]
+    mock_prefetch.assert_awaited_once_with(['repology_pkg'])
     mock_get_latest_repology.assert_called_once_with('cat/pkg-1.0.0', mock_settings2,
                                                      'repology_pkg')
 
@@ -2843,6 +2863,8 @@ async def test_get_props_type_checksum_calls_get_latest_checksum_package(
     mocker.patch('livecheck.main.log')
     mock_get_latest_checksum_package = mocker.patch('livecheck.main.get_latest_checksum_package',
                                                     return_value=('cs_ver', 'cs_date', 'cs_url'))
+    mock_settings2.auto_update_flag = False
+    mock_settings2.checksum_all_distfiles = {}
     results = await get_props(search_dir=fake_repo,
                               repo_root=fake_repo,
                               settings=mock_settings2,
@@ -2853,7 +2875,9 @@ async def test_get_props_type_checksum_calls_get_latest_checksum_package(
                                                              'cat/pkg-1.0.0',
                                                              str(fake_repo),
                                                              headers={},
-                                                             params={})
+                                                             params={},
+                                                             save_to_distdir=False,
+                                                             all_distfiles=False)
 
 
 @pytest.mark.asyncio
@@ -2863,6 +2887,8 @@ async def test_get_props_type_checksum_uses_custom_url(mocker: MockerFixture, fa
     mock_settings2.custom_livechecks = {'cat/pkg': ('https://custom.example.com/file.tar.gz', '')}
     mock_settings2.request_headers = {'cat/pkg': {'Referer': 'https://example.com'}}
     mock_settings2.request_params = {'cat/pkg': {'key': 'value'}}
+    mock_settings2.auto_update_flag = True
+    mock_settings2.checksum_all_distfiles = {'cat/pkg': True}
     mocker.patch('livecheck.main.get_highest_matches', return_value=['cat/pkg-1.0.0'])
     mocker.patch('livecheck.main.catpkg_catpkgsplit',
                  return_value=('cat/pkg', 'cat', 'pkg', '1.0.0'))
@@ -2890,7 +2916,9 @@ async def test_get_props_type_checksum_uses_custom_url(mocker: MockerFixture, fa
         'cat/pkg-1.0.0',
         str(fake_repo),
         headers={'Referer': 'https://example.com'},
-        params={'key': 'value'})
+        params={'key': 'value'},
+        save_to_distdir=True,
+        all_distfiles=True)
 
 
 @pytest.mark.asyncio
@@ -3611,6 +3639,20 @@ def test_main_exclude_logs_message(mocker: MockerFixture, runner: CliRunner, tmp
     assert 'Excluding cat/pkg, cat2/pkg2.' in caplog.messages
 
 
+def test_main_purge_immutable_cache(mocker: MockerFixture, runner: CliRunner,
+                                    tmp_path: Path) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    mocker.patch('livecheck.main.gather_settings')
+    mocker.patch('livecheck.main.get_props')
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    mock_purge = mocker.patch('livecheck.main.purge_object_cache')
+    result = runner.invoke(main, ['--purge-immutable-cache', '--working-dir', str(tmp_path)])
+    assert result.exit_code == 0
+    mock_purge.assert_called_once_with()
+
+
 def test_main_rejects_dist_github_flags_used_alone(mocker: MockerFixture, runner: CliRunner,
                                                    tmp_path: Path) -> None:
     mocker.patch('livecheck.main.chdir')
@@ -3658,6 +3700,21 @@ def test_main_handles_exception_in_get_props(mocker: MockerFixture, runner: CliR
     assert result.exit_code != 0
 
 
+def test_main_metrics_write_error_keeps_original_error(mocker: MockerFixture, runner: CliRunner,
+                                                       tmp_path: Path) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    mocker.patch('livecheck.main.gather_settings')
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    mocker.patch('livecheck.main.get_props', side_effect=ValueError('fail'))
+    mocker.patch('livecheck.main.http_metrics.write', side_effect=PermissionError)
+    mock_log = mocker.patch('livecheck.main.log')
+    result = runner.invoke(main, ['--working-dir', str(tmp_path)])
+    assert isinstance(result.exception, ValueError)
+    mock_log.exception.assert_any_call('Failed to write HTTP metrics.')
+
+
 def test_main_auto_update_git_happy_path(mocker: MockerFixture, runner: CliRunner,
                                          tmp_path: Path) -> None:
     mock_settings = mocker.Mock()
@@ -3801,6 +3858,7 @@ async def test_get_props_type_location_checksum_calls_get_latest_location_checks
     mock_get_latest_location_checksum_package = mocker.patch(
         'livecheck.main.get_latest_location_checksum_package',
         return_value=('loc_ver', 'loc_date', 'loc_url'))
+    mock_settings2.auto_update_flag = False
     results = await get_props(exclude=[],
                               names=['cat/pkg'],
                               repo_root=fake_repo,
@@ -3812,7 +3870,8 @@ async def test_get_props_type_location_checksum_calls_get_latest_location_checks
         'cat/pkg-1.0.0',
         str(fake_repo),
         headers={'Referer': 'https://example.com'},
-        params={'agree': 'Yes'})
+        params={'agree': 'Yes'},
+        save_to_distdir=False)
 
 
 def test_get_old_sha_bare_hex_string(tmp_path: Path) -> None:
@@ -4069,3 +4128,163 @@ async def test_get_props_type_ida_free_calls_handler(mocker: MockerFixture, fake
     mock_ida_handler.assert_called_once_with('dev-util/ida-free-9.2', mock_settings2)
     # Verify result includes the version from the handler
     assert results == [('dev-util', 'ida-free', '9.2', '9.3', '', '', '')]
+
+
+def test_main_configures_http_cache(mocker: MockerFixture, runner: CliRunner,
+                                    tmp_path: Path) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    mocker.patch('livecheck.main.gather_settings')
+    mocker.patch('livecheck.main.get_props')
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    mock_configure = mocker.patch('livecheck.main.configure_http_cache')
+    result = runner.invoke(main, [
+        '--http-cache', 'filesystem', '--http-cache-max-size', '2', '--http-cache-max-age', '1',
+        '--working-dir',
+        str(tmp_path)
+    ])
+    assert result.exit_code == 0
+    mock_configure.assert_called_once_with('filesystem',
+                                           max_size=2 * 1024 * 1024,
+                                           max_age=86400,
+                                           directory=None)
+
+
+def test_main_cache_stats(mocker: MockerFixture, runner: CliRunner) -> None:
+    mocker.patch('livecheck.main.get_http_cache').return_value.stats.return_value = CacheStats(
+        3, 1024 * 1024, 4 * 1024 * 1024, 86400.0)
+    result = runner.invoke(main, ['--cache-stats'])
+    assert result.exit_code == 0
+    assert result.output == ('Entries: 3\nSize: 1.0 MiB (4.0 MiB uncompressed)\n'
+                             'Least recently used: 1970-01-02 00:00:00 UTC\n')
+
+
+def test_main_cache_prune(mocker: MockerFixture, runner: CliRunner) -> None:
+    backend = mocker.patch('livecheck.main.get_http_cache').return_value
+    backend.prune.return_value = 2
+    result = runner.invoke(main, ['--cache-prune', '--http-cache-max-size', '1'])
+    assert result.exit_code == 0
+    assert result.output == 'Evicted 2 entries.\n'
+    backend.prune.assert_called_once_with(max_size=1024 * 1024, max_age=30 * 86400)
+
+
+def test_main_cache_vacuum(mocker: MockerFixture, runner: CliRunner) -> None:
+    mock_configure = mocker.patch('livecheck.main.configure_http_cache')
+    backend = mocker.patch('livecheck.main.get_http_cache').return_value
+    result = runner.invoke(main, ['--cache-vacuum', '--http-cache', 'filesystem'])
+    assert result.exit_code == 0
+    mock_configure.assert_called_once_with('filesystem')
+    backend.vacuum.assert_called_once_with()
+    backend.prune.assert_not_called()
+
+
+def test_main_checks_package_named_cache(mocker: MockerFixture, runner: CliRunner,
+                                         tmp_path: Path) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    mocker.patch('livecheck.main.gather_settings')
+    mocker.patch('livecheck.main.configure_http_cache')
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    get_props = mocker.patch('livecheck.main.get_props', return_value=[])
+    maintain = mocker.patch('livecheck.main._maintain_http_cache')
+    result = runner.invoke(main, ['--working-dir', str(tmp_path), 'cache'])
+    assert result.exit_code == 0
+    maintain.assert_not_called()
+    assert get_props.call_args.args[3] == ['cache']
+
+
+def _answered(status_code: int | None, result: object) -> Callable[..., Awaitable[object]]:
+    async def probe(*args: object, **kwargs: object) -> object:  # ruff:ignore[unused-async]
+        record_outcome(status_code)
+        return result
+
+    return probe
+
+
+@pytest.mark.parametrize(('status_code', 'probed_once'), [(200, True), (404, True), (503, False),
+                                                          (403, False), (None, False)])
+@pytest.mark.asyncio
+async def test_get_props_skips_probes_that_found_nothing(mocker: MockerFixture, fake_repo: Path,
+                                                         mock_settings2: Mock, tmp_path: Path,
+                                                         status_code: int | None,
+                                                         probed_once: bool) -> None:
+    mocker.patch('livecheck.utils.negative_cache.get_http_cache',
+                 return_value=FileSystemHTTPCache(tmp_path / 'http'))
+    configure_negative_cache(3600)
+    mocker.patch('livecheck.main.get_highest_matches', return_value=['cat/pkg-1.0.0'])
+    mocker.patch('livecheck.main.get_first_src_uri',
+                 return_value='https://example.com/pkg-1.0.0.tar.gz')
+    mocker.patch('livecheck.main.get_egit_repo', return_value=('', ''))
+    mocker.patch('livecheck.main.get_latest_repology', return_value='')
+    mocker.patch('livecheck.main.get_aux',
+                 new_callable=mocker.AsyncMock,
+                 return_value=['https://homepage1'])
+    parse_url_mock = mocker.patch('livecheck.main.parse_url',
+                                  side_effect=_answered(status_code, ('', '', '', '')))
+    directory_mock = mocker.patch('livecheck.main.get_latest_directory_package',
+                                  side_effect=_answered(status_code, ('', '')))
+    for _ in range(2):
+        assert await get_props(search_dir=fake_repo,
+                               repo_root=fake_repo,
+                               settings=mock_settings2,
+                               names=['cat/pkg'],
+                               exclude=[]) == []
+    # SRC_URI is parsed on every run; the HOMEPAGE and directory probes only on the first unless
+    # the server could not answer.
+    assert parse_url_mock.call_count == 4 - probed_once
+    assert directory_mock.call_count == 4 - 2 * probed_once
+
+
+def test_main_negative_cache_ttl(mocker: MockerFixture, runner: CliRunner, tmp_path: Path) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    settings = mocker.patch('livecheck.main.gather_settings').return_value
+    mocker.patch('livecheck.main.get_props', return_value=[])
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    mock_configure = mocker.patch('livecheck.main.configure_negative_cache')
+    result = runner.invoke(main, ['--negative-cache-ttl', '2', '--working-dir', str(tmp_path)])
+    assert result.exit_code == 0
+    assert settings.negative_cache_ttl == 7200
+    mock_configure.assert_called_once_with(7200)
+
+
+def test_main_replay(mocker: MockerFixture, runner: CliRunner, tmp_path: Path) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    settings = mocker.patch('livecheck.main.gather_settings').return_value
+    mocker.patch('livecheck.main.get_props', return_value=[])
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    mock_configure = mocker.patch('livecheck.main.configure_recording')
+    mocker.patch('livecheck.main.recording_state_directory', return_value=tmp_path / 'state')
+    configure_object_cache = mocker.patch('livecheck.main.configure_object_cache')
+    configure_http_cache = mocker.patch('livecheck.main.configure_http_cache')
+    result = runner.invoke(main, [
+        '--replay',
+        str(tmp_path), '--replay-latency', 'pypi.org=250', '--replay-latency', '*=10',
+        '--working-dir',
+        str(tmp_path)
+    ])
+    assert result.exit_code == 0
+    mock_configure.assert_called_once_with('replay', tmp_path, {'pypi.org': 0.25, '*': 0.01})
+    assert settings.freshness_policies == {}
+    assert settings.negative_cache_ttl == 0
+    configure_object_cache.assert_called_once_with(tmp_path / 'state' / 'objects.sqlite')
+    assert configure_http_cache.call_args.kwargs['directory'] == tmp_path / 'state'
+
+
+@pytest.mark.parametrize('args', [['--record', 'a', '--replay', '.'], ['--replay-latency', 'x=y']])
+def test_main_record_replay_errors(mocker: MockerFixture, runner: CliRunner, tmp_path: Path,
+                                   args: list[str]) -> None:
+    mocker.patch('livecheck.main.chdir')
+    mocker.patch('livecheck.main.setup_logging')
+    mocker.patch('livecheck.main.gather_settings')
+    mocker.patch('livecheck.main.get_repository_root_if_inside',
+                 return_value=(str(tmp_path), 'repo'))
+    mock_configure = mocker.patch('livecheck.main.configure_recording')
+    result = runner.invoke(main, [*args, '--working-dir', str(tmp_path)])
+    assert result.exit_code != 0
+    mock_configure.assert_not_called()
@@ -14,6 +14,7 @@ from livecheck.settings import (
     check_instance,
     gather_settings,
 )
+from livecheck.utils.freshness import DEFAULT_FRESHNESS_POLICIES, FreshnessPolicy
 import pytest
 
 if TYPE_CHECKING:
@@ -794,6 +795,13 @@ def test_gather_settings_with_checksum_type_no_url(tmp_path: Path) -> None:
     assert result.type_packages['cat/pkg'] == 'checksum'
 
 
+def test_gather_settings_with_checksum_all_distfiles(tmp_path: Path) -> None:
+    make_json_file(tmp_path, 'cat/pkg/livecheck.json', {'type': 'checksum', 'all_distfiles': True})
+    make_json_file(tmp_path, 'cat/other/livecheck.json', {'type': 'regex', 'all_distfiles': True})
+    result = gather_settings(tmp_path)
+    assert result.checksum_all_distfiles == {'cat/pkg': True}
+
+
 def test_gather_settings_with_location_checksum_type(tmp_path: Path) -> None:
     data = {'type': 'location+hash-check', 'url': 'https://example.com/redirect'}
     make_json_file(tmp_path, 'cat/pkg/livecheck.json', data)
@@ -824,3 +832,41 @@ def test_gather_settings_type_location_checksum_missing_url_logs_error(
     result = gather_settings(tmp_path)
     logger.error.assert_any_call('No "url" in %s.', mocker.ANY)
     assert 'cat/pkg' not in result.custom_livechecks
+
+
+def test_gather_settings_freshness(tmp_path: Path, mocker: MockerFixture) -> None:
+    logger = mocker.patch('livecheck.settings.log')
+    make_json_file(
+        tmp_path, 'cat/pkg/livecheck.json', {
+            'freshness': {
+                'api.example.com': {
+                    'min_ttl': 600,
+                    'stale_if_error': 3600
+                },
+                'pypi.org': {
+                    'min_ttl': 60
+                },
+                'bad.example.com': {
+                    'min_ttl': '1h'
+                },
+                'typo.example.com': {
+                    'max_ttl': 1
+                },
+                'list.example.com': []
+            }
+        })
+    result = gather_settings(tmp_path)
+    assert result.freshness_policies['api.example.com'] == FreshnessPolicy(min_ttl=600,
+                                                                           stale_if_error=3600)
+    assert result.freshness_policies['pypi.org'] == FreshnessPolicy(min_ttl=60)
+    assert result.freshness_policies['rubygems.org'] == DEFAULT_FRESHNESS_POLICIES['rubygems.org']
+    assert not {'bad.example.com', 'typo.example.com', 'list.example.com'
+                } & result.freshness_policies.keys()
+    assert logger.error.call_count == 3
+
+
+def test_gather_settings_freshness_not_a_dict(tmp_path: Path, mocker: MockerFixture) -> None:
+    logger = mocker.patch('livecheck.settings.log')
+    make_json_file(tmp_path, 'cat/pkg/livecheck.json', {'freshness': ['pypi.org']})
+    assert gather_settings(tmp_path).freshness_policies == dict(DEFAULT_FRESHNESS_POLICIES)
+    logger.error.assert_called_once()
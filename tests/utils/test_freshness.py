@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from time import time
+from typing import TYPE_CHECKING
+import asyncio
+
+from livecheck.utils.freshness import DEFAULT_FRESHNESS_POLICIES, FreshnessCache, FreshnessPolicy
+from livecheck.utils.http_cache import FileSystemHTTPCache
+from livecheck.utils.requests import get_content, init_sessions
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+POLICY = FreshnessPolicy(min_ttl=100, stale_while_revalidate=100, stale_if_error=1000)
+URL = 'https://pypi.org/pypi/foo/json'
+
+
+def _response(status_code: int = 200, content: bytes = b'{"a": 1}') -> niquests.Response:
+    r = niquests.Response()
+    r.status_code = status_code
+    r._content = content  # ruff:ignore[private-member-access]
+    r.url = URL
+    r.headers['Content-Type'] = 'application/json'
+    return r
+
+
+class _Sender:
+    def __init__(self, *results: niquests.Response | Exception) -> None:
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self) -> niquests.Response:
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def cache(tmp_path: Path, mocker: MockerFixture) -> FileSystemHTTPCache:
+    backend = FileSystemHTTPCache(tmp_path / 'http')
+    mocker.patch('livecheck.utils.freshness.get_http_cache', return_value=backend)
+    return backend
+
+
+def _age_entries(cache: FileSystemHTTPCache, seconds: float) -> None:
+    for path in cache.directory.glob('*/*'):
+        key = path.name
+        entry = cache.get(key)
+        assert entry is not None
+        entry['ts'] = time() - seconds
+        cache.set(key, entry)
+
+
+def _get(params: dict[str, str] | None = None) -> niquests.Request:
+    return niquests.Request(method='GET', url=URL, params=params)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_from_cache(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    send = _Sender(_response(), _response())
+    first = await freshness.fetch('pypi.org', _get(), send)
+    second = await freshness.fetch('pypi.org', _get(), send)
+    assert send.calls == 1
+    assert second.json() == first.json() == {'a': 1}
+    assert second.headers['Content-Type'] == 'application/json'
+    assert second.url == URL
+
+
+@pytest.mark.asyncio
+async def test_query_parameters_are_part_of_the_key(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    send = _Sender(_response(), _response(content=b'{"a": 2}'))
+    await freshness.fetch('pypi.org', _get({'page': '1'}), send)
+    assert (await freshness.fetch('pypi.org', _get({'page': '2'}), send)).json() == {'a': 2}
+    assert send.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_request_headers_are_part_of_the_key(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    send = _Sender(_response(), _response(content=b'{"a": 2}'))
+    json_request = niquests.Request(method='GET', url=URL, headers={'Accept': 'application/json'})
+    html_request = niquests.Request(method='GET', url=URL, headers={'Accept': 'text/html'})
+    await freshness.fetch('pypi.org', json_request, send)
+    assert (await freshness.fetch('pypi.org', html_request, send)).json() == {'a': 2}
+    assert (await freshness.fetch('pypi.org', json_request, send)).json() == {'a': 1}
+    assert send.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_other_hosts_and_methods_are_not_cached(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    send = _Sender(*(_response() for _ in range(4)))
+    for _ in range(2):
+        await freshness.fetch('example.org', _get(), send)
+        await freshness.fetch('pypi.org', niquests.Request(method='POST', url=URL), send)
+    assert send.calls == 4
+    assert not list(cache.directory.glob('*/*'))
+
+
+@pytest.mark.asyncio
+async def test_error_responses_are_not_stored(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    send = _Sender(_response(404), _response())
+    assert (await freshness.fetch('pypi.org', _get(), send)).status_code == 404
+    assert (await freshness.fetch('pypi.org', _get(), send)).status_code == 200
+    assert send.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    await freshness.fetch('pypi.org', _get(), _Sender(_response()))
+    _age_entries(cache, 150)
+    send = _Sender(_response(content=b'{"a": 2}'))
+    stale = await freshness.fetch('pypi.org', _get(), send)
+    # A second stale hit does not start another refresh.
+    await freshness.fetch('pypi.org', _get(), send)
+    assert stale.json() == {'a': 1}
+    await freshness.drain()
+    assert send.calls == 1
+    assert (await freshness.fetch('pypi.org', _get(), send)).json() == {'a': 2}
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_keeps_entry(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    await freshness.fetch('pypi.org', _get(), _Sender(_response()))
+    _age_entries(cache, 150)
+    await freshness.fetch('pypi.org', _get(), _Sender(niquests.ConnectionError('down')))
+    await freshness.drain()
+    assert (await freshness.fetch('pypi.org', _get(), _Sender())).json() == {'a': 1}
+
+
+@pytest.mark.parametrize('result', [niquests.ConnectionError('down'), _response(503)])
+@pytest.mark.asyncio
+async def test_stale_if_error(cache: FileSystemHTTPCache,
+                              result: niquests.Response | Exception) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    await freshness.fetch('pypi.org', _get(), _Sender(_response()))
+    _age_entries(cache, 500)
+    assert (await freshness.fetch('pypi.org', _get(), _Sender(result))).json() == {'a': 1}
+
+
+@pytest.mark.asyncio
+async def test_too_old_for_stale_if_error(cache: FileSystemHTTPCache) -> None:
+    freshness = FreshnessCache({'pypi.org': POLICY})
+    await freshness.fetch('pypi.org', _get(), _Sender(_response()))
+    _age_entries(cache, 5000)
+    with pytest.raises(niquests.ConnectionError):
+        await freshness.fetch('pypi.org', _get(), _Sender(niquests.ConnectionError('down')))
+    assert (await freshness.fetch('pypi.org', _get(), _Sender(_response(503)))).status_code == 503
+
+
+def test_default_policies_cover_registries() -> None:
+    assert {'pypi.org', 'rubygems.org', 'api.nuget.org',
+            'repology.org'} <= set(DEFAULT_FRESHNESS_POLICIES)
+    assert all(p.min_ttl > 0 for p in DEFAULT_FRESHNESS_POLICIES.values())
+
+
+@pytest.mark.asyncio
+async def test_get_content_uses_policies(cache: FileSystemHTTPCache, mocker: MockerFixture) -> None:
+    init_sessions(asyncio.Semaphore(1), {'pypi.org': POLICY})
+    send = mocker.patch('livecheck.utils.requests._send', return_value=_response())
+    http_metrics = mocker.patch('livecheck.utils.requests.http_metrics')
+    await get_content(URL)
+    assert (await get_content(URL)).json() == {'a': 1}
+    send.assert_awaited_once()
+    # The session records the response it sent. Only the cached one is recorded here.
+    http_metrics.observe.assert_called_once()
+    assert http_metrics.observe.call_args.kwargs['cache'] == 'hit'
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from time import time
+from typing import TYPE_CHECKING
+import os
+
+from livecheck.utils.http_cache import (
+    FileSystemHTTPCache,
+    HTTPCacheBackend,
+    SQLiteHTTPCache,
+    close_http_cache,
+    configure_http_cache,
+    get_http_cache,
+)
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from niquests_cache.typing import CacheEntry
+    from pytest_mock import MockerFixture
+
+
+def _entry(content: bytes) -> CacheEntry:
+    return {
+        'content': content,
+        'encoding': 'utf-8',
+        'headers': {
+            'ETag': '"x"'
+        },
+        'status_code': 200,
+        'ts': 1000.0,
+        'url': 'https://pypi.org/pypi/foo/json'
+    }
+
+
+@pytest.fixture(params=['sqlite', 'filesystem'])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[HTTPCacheBackend]:
+    cache: HTTPCacheBackend = (SQLiteHTTPCache(tmp_path / 'http.sqlite') if request.param
+                               == 'sqlite' else FileSystemHTTPCache(tmp_path / 'http'))
+    yield cache
+    cache.close()
+
+
+def _age(backend: HTTPCacheBackend, key: str, seconds: float) -> None:
+    when = time() - seconds
+    if isinstance(backend, SQLiteHTTPCache):
+        backend._connection.execute(  # ruff:ignore[private-member-access]
+            'UPDATE responses SET accessed = ? WHERE key = ?', (when, key))
+    elif isinstance(backend, FileSystemHTTPCache):
+        os.utime(backend.directory / key[:2] / key, (when, when))
+
+
+def test_round_trip_compresses_bodies(backend: HTTPCacheBackend) -> None:
+    body = b'{"releases": {}}' * 1000
+    backend.set('ab' * 32, _entry(body))
+    backend.set('cd' * 32, _entry(b'\x00\xff'))
+    assert backend.get('ab' * 32) == _entry(body)
+    assert backend.get('cd' * 32) == _entry(b'\x00\xff')
+    assert backend.get('ef' * 32) is None
+    stats = backend.stats()
+    assert stats.entries == 2
+    assert stats.size < len(body) < stats.raw_size
+    assert stats.oldest > 0
+
+
+def test_empty_stats(backend: HTTPCacheBackend) -> None:
+    assert backend.stats() == (0, 0, 0, 0)
+
+
+def test_prune_by_age(backend: HTTPCacheBackend) -> None:
+    backend.set('ab' * 32, _entry(b'old'))
+    backend.set('cd' * 32, _entry(b'new'))
+    _age(backend, 'ab' * 32, 3600)
+    assert backend.prune(max_size=0, max_age=60) == 1
+    assert backend.get('ab' * 32) is None
+    assert backend.get('cd' * 32) is not None
+
+
+def test_prune_evicts_least_recently_used(backend: HTTPCacheBackend) -> None:
+    for i, key in enumerate(('aa', 'bb', 'cc')):
+        backend.set(key * 32, _entry(os.urandom(1000)))
+        _age(backend, key * 32, 100 - i)
+    backend.get('aa' * 32)
+    one_entry = backend.stats().size // 3
+    assert backend.prune(max_size=one_entry * 2 + 10, max_age=0) == 1
+    assert backend.get('bb' * 32) is None
+    assert backend.get('aa' * 32) is not None
+    assert backend.get('cc' * 32) is not None
+    assert backend.prune(max_size=0, max_age=0) == 0
+
+
+def test_vacuum(backend: HTTPCacheBackend) -> None:
+    backend.set('ab' * 32, _entry(b'x'))
+    backend.prune(max_size=1, max_age=0)
+    backend.vacuum()
+    assert backend.stats().entries == 0
+
+
+def test_sqlite_drops_corrupt_entry(tmp_path: Path) -> None:
+    cache = SQLiteHTTPCache(tmp_path / 'http.sqlite')
+    cache.set('ab' * 32, _entry(b'x' * 1000))
+    cache._connection.execute(  # ruff:ignore[private-member-access]
+        "UPDATE responses SET content = x'00'")
+    assert cache.get('ab' * 32) is None
+    assert cache.stats().entries == 0
+    cache.close()
+
+
+def test_sqlite_drops_legacy_table(tmp_path: Path) -> None:
+    cache = SQLiteHTTPCache(tmp_path / 'http.sqlite')
+    cache._connection.execute(  # ruff:ignore[private-member-access]
+        'CREATE TABLE niquests_cache (key TEXT)')
+    cache.close()
+    cache = SQLiteHTTPCache(tmp_path / 'http.sqlite')
+    assert cache._connection.execute(  # ruff:ignore[private-member-access]
+        "SELECT name FROM sqlite_master WHERE name = 'niquests_cache'").fetchone() is None
+    cache.close()
+
+
+def test_filesystem_drops_corrupt_entry_and_vacuums(tmp_path: Path) -> None:
+    cache = FileSystemHTTPCache(tmp_path / 'http')
+    cache.set('ab' * 32, _entry(b'x'))
+    (tmp_path / 'http' / 'ab' / ('ab' * 32)).write_bytes(b'\x00' * 8 + b'garbage')
+    (tmp_path / 'http' / 'ab' / '.tmp.tmp').write_bytes(b'')
+    (tmp_path / 'http' / 'cd').mkdir()
+    assert cache.get('ab' * 32) is None
+    cache.vacuum()
+    assert not list((tmp_path / 'http').iterdir())
+
+
+def test_filesystem_set_ignores_write_errors(tmp_path: Path, mocker: MockerFixture) -> None:
+    cache = FileSystemHTTPCache(tmp_path / 'http')
+    mocker.patch('pathlib.Path.write_bytes', side_effect=OSError)
+    cache.set('ab' * 32, _entry(b'x'))
+    assert cache.get('ab' * 32) is None
+
+
+def test_configure_http_cache_filesystem() -> None:
+    configure_http_cache('filesystem')
+    assert isinstance(get_http_cache(), FileSystemHTTPCache)
+    assert get_http_cache() is get_http_cache()
+
+
+def test_configure_http_cache_unknown_backend() -> None:
+    with pytest.raises(ValueError, match='Unknown HTTP cache backend'):
+        configure_http_cache('redis')
+
+
+def test_close_http_cache_prunes(mocker: MockerFixture) -> None:
+    configure_http_cache(max_size=10, max_age=20)
+    prune = mocker.patch.object(get_http_cache(), 'prune', return_value=3)
+    close_http_cache()
+    prune.assert_called_once_with(max_size=10, max_age=20)
+    close_http_cache()
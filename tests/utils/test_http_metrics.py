@@ -0,0 +1,173 @@
+# ruff:file-ignore[builtin-argument-shadowing]
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+import asyncio
+import json
+import threading
+
+from livecheck.utils.http_metrics import HTTPMetrics, cache_outcome, http_metrics
+from livecheck.utils.requests import get_content
+from livecheck.utils.session import build_github_session, build_session
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def _response(status_code: int = 200, content: bytes = b'abc') -> niquests.Response:
+    r = niquests.Response()
+    r.status_code = status_code
+    r._content = content  # ruff:ignore[private-member-access]
+    return r
+
+
+def test_observe_and_export(tmp_path: Path) -> None:
+    metrics = HTTPMetrics()
+    metrics.observe('https://pypi.org/a', _response(), latency=0.07, cache='miss')
+    metrics.observe('https://pypi.org/b', _response(404, b''), latency=100, cache='hit')
+    metrics.observe_wait('https://pypi.org/a', 1.5)
+    metrics.observe_error('https://example.org/"x"')
+    data = metrics.as_dict()
+    assert data['pypi.org'] == {
+        'bytes_received': 3,
+        'cache': {
+            'hit': 1,
+            'revalidated': 0,
+            'miss': 1
+        },
+        'errors': 0,
+        'latency_seconds': {
+            'buckets': {
+                '0.05': 0,
+                '0.1': 1,
+                '0.25': 1,
+                '0.5': 1,
+                '1.0': 1,
+                '2.5': 1,
+                '5.0': 1,
+                '10.0': 1,
+                '30.0': 1,
+                '+Inf': 2
+            },
+            'sum': 100.07
+        },
+        'requests': 2,
+        'semaphore_wait_seconds': 1.5,
+        'status_codes': {
+            '200': 1,
+            '404': 1
+        }
+    }
+    assert data['example.org']['errors'] == 1
+    text = metrics.prometheus()
+    assert '# TYPE livecheck_http_request_duration_seconds histogram\n' in text
+    assert 'livecheck_http_responses_total{host="pypi.org",code="404"} 1\n' in text
+    assert 'livecheck_http_cache_total{host="pypi.org",outcome="miss"} 1\n' in text
+    assert 'livecheck_http_request_duration_seconds_bucket{host="pypi.org",le="+Inf"} 2\n' in text
+    assert 'livecheck_http_request_duration_seconds_count{host="pypi.org"} 2\n' in text
+    assert 'livecheck_http_semaphore_wait_seconds_total{host="pypi.org"} 1.5\n' in text
+    metrics.write(json_path=tmp_path / 'm.json', prometheus_path=tmp_path / 'm.prom')
+    assert json.loads((tmp_path / 'm.json').read_text()) == data
+    assert (tmp_path / 'm.prom').read_text() == text
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['m.json', 'm.prom']
+    metrics.clear()
+    assert metrics.prometheus().count('\n') == 12
+
+
+def test_streamed_bytes_use_content_length() -> None:
+    metrics = HTTPMetrics()
+    r = niquests.AsyncResponse()
+    r.status_code = 200
+    r.headers['Content-Length'] = '1234'
+    metrics.observe('https://example.org/a.tar.gz', r, latency=1, cache='miss')
+    r.headers['Content-Length'] = 'x'
+    metrics.observe('https://example.org/a.tar.gz', r, latency=1, cache='miss')
+    assert metrics.hosts['example.org'].bytes_received == 1234
+
+
+def test_cache_outcome() -> None:
+    network = _response()
+    network.request = niquests.Request('GET', 'https://example.org').prepare()
+    assert cache_outcome(network, [200]) == 'miss'
+    assert cache_outcome(_response(), []) == 'hit'
+    assert cache_outcome(_response(), [304]) == 'revalidated'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path == '/fresh':
+            self.send_response(200)
+            self.send_header('Cache-Control', 'max-age=3600')
+        elif self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', '4')
+        self.end_headers()
+        self.wfile.write(b'body')
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.asyncio
+async def test_session_records_cache_outcomes(server: str) -> None:
+    session = build_session(asyncio.Semaphore(1))
+    github_session = build_github_session(asyncio.Semaphore(1))
+    for _ in range(2):
+        assert (await session.get(f'{server}/fresh')).content == b'body'
+        # Always revalidated.
+        assert (await github_session.get(f'{server}/etag')).content == b'body'
+    await session.close()
+    await github_session.close()
+    metrics = http_metrics.hosts['127.0.0.1']
+    assert metrics.cache == {'miss': 2, 'hit': 1, 'revalidated': 1}
+    assert metrics.status_codes == {200: 4}
+    assert metrics.bytes_received == 16
+    assert metrics.requests == 4
+    assert metrics.semaphore_wait >= 0
+
+
+@pytest.mark.asyncio
+async def test_session_records_errors(mocker: MockerFixture) -> None:
+    session = build_session(asyncio.Semaphore(1))
+    mocker.patch('niquests_cache.AsyncCachedSession.request',
+                 side_effect=niquests.ConnectionError('down'))
+    with pytest.raises(niquests.ConnectionError):
+        await session.get('https://down.example.org/')
+    assert http_metrics.hosts['down.example.org'].errors == 1
+
+
+@pytest.mark.asyncio
+async def test_get_content_records_metrics(mocker: MockerFixture) -> None:
+    mocker.patch('niquests_cache.AsyncCachedSession.request',
+                 side_effect=[_response(), niquests.ConnectionError('down')])
+    observe_wait = mocker.spy(http_metrics, 'observe_wait')
+    await get_content('https://metrics.example.org/a')
+    await get_content('https://metrics.example.org/b')
+    metrics = http_metrics.hosts['metrics.example.org']
+    assert metrics.requests == 1
+    assert metrics.errors == 1
+    assert metrics.bytes_received == 3
+    # Both requests waited for the shared concurrency limit.
+    assert observe_wait.call_count == 2
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from time import time
+from typing import TYPE_CHECKING
+import asyncio
+
+from livecheck.utils.http_cache import FileSystemHTTPCache
+from livecheck.utils.mirrors import (
+    MIRROR_TTL,
+    MirrorSelector,
+    configure_mirrors,
+    get_selected_mirror,
+    load_thirdpartymirrors,
+    parse_thirdpartymirrors,
+    resolve_mirror_uri,
+    set_selected_mirror,
+)
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
+GROUPS = {
+    'gnu': ('https://slow.example.org/gnu', 'https://fast.example.com/gnu/',
+            'https://down.example.net/gnu')
+}
+LATENCIES = {
+    'https://slow.example.org/gnu/': 0.5,
+    'https://fast.example.com/gnu/': 0.05,
+    'https://down.example.net/gnu/': None
+}
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path: Path, mocker: MockerFixture) -> FileSystemHTTPCache:
+    backend = FileSystemHTTPCache(tmp_path / 'http')
+    mocker.patch('livecheck.utils.mirrors.get_http_cache', return_value=backend)
+    return backend
+
+
+@pytest.fixture
+def probe(mocker: MockerFixture) -> MagicMock:
+    async def probe_latency(url: str, timeout: float) -> float | None:
+        await asyncio.sleep(0)
+        return LATENCIES[url]
+
+    return mocker.patch('livecheck.utils.mirrors.probe_latency', side_effect=probe_latency)
+
+
+def test_parse_thirdpartymirrors() -> None:
+    assert parse_thirdpartymirrors(
+        '# comment\n'
+        'gnu https://ftp.gnu.org/gnu https://mirrors.kernel.org/gnu\n'
+        '\n'
+        'empty\n'
+        'kde   https://download.kde.org/  # trailing\n') == {
+            'gnu': ('https://ftp.gnu.org/gnu', 'https://mirrors.kernel.org/gnu'),
+            'kde': ('https://download.kde.org/',)
+        }
+
+
+def test_load_thirdpartymirrors_repo_overrides(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch('livecheck.utils.mirrors.get_thirdpartymirrors',
+                 return_value={
+                     'gnu': ('https://ftp.gnu.org/gnu',),
+                     'kde': ('https://download.kde.org',)
+                 })
+    (tmp_path / 'profiles').mkdir()
+    (tmp_path / 'profiles' / 'thirdpartymirrors').write_text('gnu https://mirror.example/gnu\n')
+    assert load_thirdpartymirrors(tmp_path) == {
+        'gnu': ('https://mirror.example/gnu',),
+        'kde': ('https://download.kde.org',)
+    }
+    assert load_thirdpartymirrors(tmp_path / 'missing')['gnu'] == ('https://ftp.gnu.org/gnu',)
+
+
+@pytest.mark.asyncio
+async def test_resolve_picks_fastest_healthy_mirror(probe: MagicMock) -> None:
+    selector = MirrorSelector(GROUPS)
+    results = await asyncio.gather(selector.resolve('mirror://gnu/hello/hello-2.12.tar.gz'),
+                                   selector.resolve('mirror://gnu/hello/'))
+    assert list(results) == [
+        'https://fast.example.com/gnu/hello/hello-2.12.tar.gz',
+        'https://fast.example.com/gnu/hello/'
+    ]
+    assert probe.call_count == len(GROUPS['gnu'])
+    assert get_selected_mirror('gnu') == 'https://fast.example.com/gnu/'
+
+
+@pytest.mark.asyncio
+async def test_resolve_reuses_mirror_from_previous_run(probe: MagicMock) -> None:
+    set_selected_mirror('gnu', 'https://slow.example.org/gnu')
+    url = await MirrorSelector(GROUPS).resolve('mirror://gnu/a.tar.gz')
+    assert url == 'https://slow.example.org/gnu/a.tar.gz'
+    probe.assert_called_once_with('https://slow.example.org/gnu/', 5.0)
+
+
+@pytest.mark.asyncio
+async def test_resolve_probes_again_when_remembered_mirror_is_down(probe: MagicMock) -> None:
+    set_selected_mirror('gnu', 'https://down.example.net/gnu')
+    url = await MirrorSelector(GROUPS).resolve('mirror://gnu/a.tar.gz')
+    assert url == 'https://fast.example.com/gnu/a.tar.gz'
+    assert probe.call_count == 1 + len(GROUPS['gnu'])
+    assert get_selected_mirror('gnu') == 'https://fast.example.com/gnu/'
+
+
+@pytest.mark.asyncio
+async def test_resolve_probes_again_after_ttl(probe: MagicMock, mocker: MockerFixture) -> None:
+    set_selected_mirror('gnu', 'https://slow.example.org/gnu')
+    mocker.patch('livecheck.utils.mirrors.time', return_value=time() + MIRROR_TTL)
+    url = await MirrorSelector(GROUPS).resolve('mirror://gnu/a.tar.gz')
+    assert url == 'https://fast.example.com/gnu/a.tar.gz'
+    assert probe.call_count == len(GROUPS['gnu'])
+
+
+@pytest.mark.asyncio
+async def test_resolve_unresolvable(mocker: MockerFixture) -> None:
+    mocker.patch('livecheck.utils.mirrors.probe_latency', return_value=None)
+    selector = MirrorSelector(GROUPS)
+    assert not await selector.resolve('mirror://gnu/a.tar.gz')
+    assert not await selector.resolve('mirror://unknown/a.tar.gz')
+    assert get_selected_mirror('gnu') is None
+    assert await selector.resolve('https://example.com/a') == 'https://example.com/a'
+
+
+@pytest.mark.asyncio
+async def test_configure_mirrors(mocker: MockerFixture, probe: MagicMock, tmp_path: Path) -> None:
+    mocker.patch('livecheck.utils.mirrors.get_thirdpartymirrors', return_value=GROUPS)
+    configure_mirrors(tmp_path)
+    url = await resolve_mirror_uri('mirror://gnu/a.tar.gz')
+    assert url == 'https://fast.example.com/gnu/a.tar.gz'
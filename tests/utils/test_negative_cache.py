@@ -0,0 +1,121 @@
+# ruff:file-ignore[boolean-type-hint-positional-argument]
+from __future__ import annotations
+
+from time import time
+from typing import TYPE_CHECKING
+
+from livecheck.utils.http_cache import FileSystemHTTPCache
+from livecheck.utils.negative_cache import (
+    configure_negative_cache,
+    get_negative_result,
+    record_outcome,
+    set_negative_result,
+    track_outcome,
+)
+from livecheck.utils.requests import get_content
+import niquests
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def cache(tmp_path: Path, mocker: MockerFixture) -> FileSystemHTTPCache:
+    backend = FileSystemHTTPCache(tmp_path / 'http')
+    mocker.patch('livecheck.utils.negative_cache.get_http_cache', return_value=backend)
+    configure_negative_cache(3600)
+    return backend
+
+
+def test_round_trip(cache: FileSystemHTTPCache) -> None:
+    assert get_negative_result('homepage', 'a') is None
+    set_negative_result('homepage', 'a')
+    set_negative_result('http', 'a', 410)
+    assert get_negative_result('homepage', 'a') == 204
+    assert get_negative_result('http', 'a') == 410
+    assert get_negative_result('http', 'b') is None
+
+
+def test_expires(cache: FileSystemHTTPCache, mocker: MockerFixture) -> None:
+    set_negative_result('http', 'a', 404)
+    mocker.patch('livecheck.utils.negative_cache.time', return_value=time() + 3600)
+    assert get_negative_result('http', 'a') is None
+
+
+def test_disabled(cache: FileSystemHTTPCache) -> None:
+    configure_negative_cache(0)
+    set_negative_result('http', 'a', 404)
+    assert not list(cache.directory.glob('*/*'))
+    configure_negative_cache(3600)
+    assert get_negative_result('http', 'a') is None
+
+
+def _response(status_code: int) -> niquests.Response:
+    r = niquests.Response()
+    r.status_code = status_code
+    r._content = b''  # ruff:ignore[private-member-access]
+    return r
+
+
+@pytest.mark.parametrize('status_code', [404, 410])
+@pytest.mark.asyncio
+async def test_get_content_skips_known_missing_urls(cache: FileSystemHTTPCache,
+                                                    mocker: MockerFixture,
+                                                    status_code: int) -> None:
+    send = mocker.patch('livecheck.utils.requests._send', return_value=_response(status_code))
+    url = 'https://repology.org/api/v1/project/foo'
+    assert (await get_content(url)).status_code == status_code
+    r = await get_content(url)
+    assert r.status_code == status_code
+    assert r.url == url
+    send.assert_awaited_once()
+    await get_content(url, params={'a': 'b'})
+    assert send.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_content_does_not_remember_other_failures(cache: FileSystemHTTPCache,
+                                                            mocker: MockerFixture) -> None:
+    send = mocker.patch('livecheck.utils.requests._send', return_value=_response(500))
+    url = 'https://example.org/foo'
+    await get_content(url)
+    await get_content(url)
+    await get_content(url, method='POST')
+    assert send.await_count == 3
+
+
+@pytest.mark.parametrize(('statuses', 'failed', 'expected'), [({200}, False, 204),
+                                                              ({200, 301, 404}, False, 404),
+                                                              ({410}, False, 410),
+                                                              (set(), False, None),
+                                                              ({200}, True, None),
+                                                              ({200, 503}, False, None),
+                                                              ({403}, False, None),
+                                                              ({429, 404}, False, None)])
+def test_lookup_outcome_negative_status(statuses: set[int], failed: bool,
+                                        expected: int | None) -> None:
+    with track_outcome() as outcome:
+        for status_code in statuses:
+            record_outcome(status_code)
+        if failed:
+            record_outcome(None)
+    record_outcome(None)
+    assert outcome.negative_status == expected
+
+
+@pytest.mark.asyncio
+async def test_get_content_records_outcome(cache: FileSystemHTTPCache,
+                                           mocker: MockerFixture) -> None:
+    mocker.patch('niquests_cache.AsyncCachedSession.request',
+                 side_effect=[_response(404), niquests.ConnectionError('down')])
+    with track_outcome() as outcome:
+        await get_content('https://example.org/missing')
+        await get_content('https://example.org/missing')
+    assert outcome.statuses == {404}
+    assert not outcome.failed
+    with track_outcome() as outcome:
+        await get_content('https://example.org/down')
+    assert outcome.failed
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import logging
+
+from livecheck.utils.object_cache import (
+    close_object_cache,
+    get_cached_object,
+    purge_object_cache,
+    set_cached_object,
+)
+
+if TYPE_CHECKING:
+    from _pytest.logging import LogCaptureFixture
+
+
+def test_set_and_get_cached_object() -> None:
+    assert get_cached_object('github-tag', 'o/r@v1') is None
+    set_cached_object('github-tag', 'o/r@v1', 'abc')
+    assert get_cached_object('github-tag', 'o/r@v1') == 'abc'
+    assert get_cached_object('commit-date', 'o/r@v1') is None
+
+
+def test_cached_object_persists_across_connections() -> None:
+    set_cached_object('github-tag', 'o/r@v1', 'abc')
+    close_object_cache()
+    assert get_cached_object('github-tag', 'o/r@v1') == 'abc'
+
+
+def test_set_cached_object_ignores_empty_value() -> None:
+    set_cached_object('github-tag', 'o/r@v1', '')
+    assert get_cached_object('github-tag', 'o/r@v1') is None
+
+
+def test_purge_object_cache(caplog: LogCaptureFixture) -> None:
+    set_cached_object('github-tag', 'o/r@v1', 'abc')
+    set_cached_object('github-tag', 'o/r@v2', 'def')
+    with caplog.at_level(logging.INFO):
+        purge_object_cache()
+    assert get_cached_object('github-tag', 'o/r@v1') is None
+    assert 'Purged 2 cached immutable lookups.' in caplog.messages
+
+
+def test_close_object_cache_when_closed() -> None:
+    close_object_cache()
+    close_object_cache()
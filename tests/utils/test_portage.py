@@ -977,4 +977,4 @@ async def test_get_fetch_map_calls_async_fetch_map(mocker: MockerFixture) -> Non
     mock_p.async_fetch_map = mocker.AsyncMock(return_value={'src.tar.gz': ('uri',)})
     result = await get_fetch_map('cat/pkg-1.2.3')
     assert result == {'src.tar.gz': ('uri',)}
-    mock_p.async_fetch_map.assert_awaited_once_with('cat/pkg-1.2.3')
+    mock_p.async_fetch_map.assert_awaited_once_with('cat/pkg-1.2.3', mytree=None)
@@ -0,0 +1,195 @@
+# ruff:file-ignore[builtin-argument-shadowing]
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+import asyncio
+import gzip
+import threading
+import time
+
+from livecheck.main import get_props
+from livecheck.settings import TYPE_DIRECTORY
+from livecheck.settings_model import LivecheckSettings
+from livecheck.utils.http_cache import configure_http_cache
+from livecheck.utils.mirrors import MirrorSelector, set_selected_mirror
+from livecheck.utils.object_cache import configure_object_cache
+from livecheck.utils.recording import (
+    configure_recording,
+    recording_mode,
+    recording_state_directory,
+)
+from livecheck.utils.requests import (
+    HashedURL,
+    close_sessions,
+    get_content,
+    hash_url,
+    init_sessions,
+    session_init,
+)
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from livecheck.typing import PropTuple
+    from pytest_mock import MockerFixture
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        match self.path:
+            case '/redirect':
+                self.send_response(302)
+                self.send_header('Location', '/json')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            case '/json':
+                body = gzip.compress(b'{"version": "1.2.3"}')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            case '/m1/pkg/' | '/m2/pkg/':
+                body = b'<a href="pkg-1.0.tar.gz">1.0</a> <a href="pkg-2.0.tar.gz">2.0</a>'
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            case '/archive.tar.gz':
+                self.send_response(200)
+                self.send_header('Content-Length', '3')
+                self.end_headers()
+                self.wfile.write(b'abc')
+            case _:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+    def do_HEAD(self) -> None:
+        if self.path == '/m2/':
+            time.sleep(0.2)
+        self.send_response(200 if self.path in {'/m1/', '/m2/'} else 404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.upper())
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[ThreadingHTTPServer]:
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_recording() -> Iterator[None]:
+    yield
+    configure_recording()
+
+
+async def _run(base: str) -> tuple[object, int | None, bytes | None, HashedURL]:
+    json = (await get_content(f'{base}/redirect')).json()
+    missing = (await get_content(f'{base}/missing')).status_code
+    post = (await session_init('').post(f'{base}/echo', data=b'abc')).content
+    hashes = await hash_url(f'{base}/archive.tar.gz')
+    return json, missing, post, hashes
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(server: ThreadingHTTPServer, tmp_path: Path) -> None:
+    base = f'http://127.0.0.1:{server.server_port}'
+    configure_recording('record', tmp_path)
+    init_sessions(asyncio.Semaphore(1))
+    recorded = await _run(base)
+    await close_sessions()
+    assert recorded[:3] == ({'version': '1.2.3'}, 404, b'ABC')
+    assert recorded[3][2] == 3
+    server.shutdown()
+    configure_recording('replay', tmp_path)
+    init_sessions(asyncio.Semaphore(1))
+    assert await _run(base) == recorded
+
+
+@pytest.mark.asyncio
+async def test_replay_missing_exchange(tmp_path: Path) -> None:
+    configure_recording('replay', tmp_path)
+    init_sessions(asyncio.Semaphore(1))
+    assert (await get_content('https://example.org/never-recorded')).status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_replay_latency(server: ThreadingHTTPServer, tmp_path: Path,
+                              mocker: MockerFixture) -> None:
+    base = f'http://127.0.0.1:{server.server_port}'
+    configure_recording('record', tmp_path)
+    init_sessions(asyncio.Semaphore(1))
+    await get_content(f'{base}/json')
+    await close_sessions()
+    configure_recording('replay', tmp_path, {'127.0.0.1': 0.25, '*': 1})
+    init_sessions(asyncio.Semaphore(1))
+    sleep = mocker.patch('livecheck.utils.recording.asyncio.sleep')
+    await get_content(f'{base}/json')
+    sleep.assert_awaited_once_with(0.25)
+
+
+def test_configure_recording_errors(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match='Unknown recording mode'):
+        configure_recording('rewind', tmp_path)
+    with pytest.raises(ValueError, match='directory is required'):
+        configure_recording('replay')
+    assert not recording_mode()
+
+
+async def _get_props(base: str, repo: Path, mocker: MockerFixture) -> list[PropTuple]:
+    # What ``main`` does before checking packages.
+    if (state := recording_state_directory()) is not None:
+        configure_object_cache(state / 'objects.sqlite')
+    configure_http_cache(directory=state)
+    mocker.patch('livecheck.utils.mirrors._selector',
+                 MirrorSelector({'local': (f'{base}/m1/', f'{base}/m2/')}))
+    init_sessions(asyncio.Semaphore(1))
+    settings = LivecheckSettings()
+    settings.type_packages['cat/pkg'] = TYPE_DIRECTORY
+    settings.custom_livechecks['cat/pkg'] = ('mirror://local/pkg/pkg-1.0.tar.gz', '')
+    try:
+        return await get_props(repo, repo, settings, names=['cat/pkg'])
+    finally:
+        await close_sessions()
+
+
+@pytest.mark.asyncio
+async def test_replay_get_props_ignores_user_caches(server: ThreadingHTTPServer, tmp_path: Path,
+                                                    mocker: MockerFixture) -> None:
+    base = f'http://127.0.0.1:{server.server_port}'
+    repo = tmp_path / 'repo'
+    mocker.patch('livecheck.main.get_highest_matches', return_value=['cat/pkg-1.0'])
+    mocker.patch('livecheck.main.get_first_src_uri', return_value='')
+    mocker.patch('livecheck.main.get_egit_repo', return_value=('', ''))
+    configure_recording('record', tmp_path / 'recording')
+    recorded = await _get_props(base, repo, mocker)
+    assert recorded == [('cat', 'pkg', '1.0', '2.0', '', '', '/m1/pkg/pkg-2.0.tar.gz')]
+    server.shutdown()
+    # The user's cache remembers the other mirror, whose listing was never recorded.
+    configure_http_cache(directory=tmp_path)
+    set_selected_mirror('local', f'{base}/m2/')
+    configure_recording('replay', tmp_path / 'recording')
+    assert await _get_props(base, repo, mocker) == recorded
+    configure_recording('replay', tmp_path / 'recording')
+    assert await _get_props(base, repo, mocker) == recorded
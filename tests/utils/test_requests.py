@@ -2,20 +2,45 @@ from __future__ import annotations
 
 from http import HTTPStatus
 from typing import TYPE_CHECKING
+import asyncio
 import hashlib
 import re
 
-from livecheck.utils.requests import get_content, get_last_modified, hash_url, session_init
+from anyio import Path as AnyioPath
+from livecheck.utils.requests import (
+    DEFAULT_MAX_BODY_SIZE,
+    HashedURL,
+    Validators,
+    close_sessions,
+    get_content,
+    get_validators,
+    hash_url,
+    init_sessions,
+    probe_latency,
+    register_run_state,
+    session_init,
+    stream_text,
+)
+from niquests.packages.urllib3.exceptions import ProtocolError  # type: ignore[import-not-found]
 import niquests
 import pytest
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
+    from pathlib import Path
 
     from pytest_mock import MockerFixture
     from tests.conftest import NiquestsMocker
 
 
+def _response(text: str) -> niquests.Response:
+    r = niquests.Response()
+    r.status_code = HTTPStatus.OK
+    r._content = text.encode()  # ruff:ignore[private-member-access]
+    r.encoding = 'utf-8'
+    return r
+
+
 @pytest.mark.asyncio
 async def test_get_content_success_github(requests_mock: NiquestsMocker,
                                           mocker: MockerFixture) -> None:
@@ -93,6 +118,57 @@ async def test_get_content_empty_text_warns(requests_mock: NiquestsMocker) -> No
     assert r.status_code == HTTPStatus.OK
 
 
+@pytest.mark.asyncio
+async def test_get_content_headers_do_not_leak_into_session(requests_mock: NiquestsMocker) -> None:
+    url = 'https://example.com/headers'
+    requests_mock.get(url, text='ok', status_code=HTTPStatus.OK)
+    session = session_init('')
+    before = dict(session.headers)
+    r = await get_content(url, headers={'X-Custom': 'value'})
+    assert r.request is not None
+    assert r.request.headers is not None
+    assert r.request.headers['X-Custom'] == 'value'
+    assert dict(session.headers) == before
+    r = await get_content(url)
+    assert r.request is not None
+    assert r.request.headers is not None
+    assert 'X-Custom' not in r.request.headers
+
+
+@pytest.mark.asyncio
+async def test_get_content_repology_user_agent_is_per_request(
+        requests_mock: NiquestsMocker) -> None:
+    requests_mock.get('https://repology.org/api/v1/project/foo', json=[])
+    requests_mock.get('https://example.com/data.json', json={})
+    r = await get_content('https://repology.org/api/v1/project/foo')
+    assert r.request is not None
+    assert r.request.headers is not None
+    assert r.request.headers['User-Agent'] == 'DistroWatch'
+    r = await get_content('https://example.com/data.json')
+    assert r.request is not None
+    assert r.request.headers is not None
+    assert r.request.headers['User-Agent'] != 'DistroWatch'
+
+
+@pytest.mark.asyncio
+async def test_get_content_concurrent_per_request_headers(mocker: MockerFixture) -> None:
+    session = session_init('')
+    before = dict(session.headers)
+
+    async def echo(prepared: niquests.PreparedRequest, **_kwargs: object) -> object:
+        # Yield so that every request is prepared before any of them is answered.
+        await asyncio.sleep(0)
+        assert prepared.headers is not None
+        return _response(str(prepared.headers['X-Package']))
+
+    mocker.patch.object(session, 'send', side_effect=echo)
+    responses = await asyncio.gather(
+        *(get_content(f'https://example.com/{i}', headers={'X-Package': str(i)})
+          for i in range(500)))
+    assert [r.text for r in responses] == [str(i) for i in range(500)]
+    assert dict(session.headers) == before
+
+
 def test_session_init_github_sets_headers_and_token(mocker: MockerFixture) -> None:
     mocker.patch('livecheck.utils.requests.get_api_credentials', return_value='gh-token')
     session = session_init('github')
@@ -137,6 +213,21 @@ def test_session_init_json_sets_accept_header() -> None:
     assert session.headers['timeout'] == '30'
 
 
+def test_session_init_pypi_uses_http2_without_quic() -> None:
+    session = session_init('pypi')
+    assert session.headers['Accept'] == 'application/json'
+    assert not session._disable_http2  # ruff:ignore[private-member-access]
+    assert session._disable_http3  # ruff:ignore[private-member-access]
+
+
+def test_session_init_http11_only_is_separate() -> None:
+    session = session_init('json', http11_only=True)
+    assert session is not session_init('json')
+    assert session is session_init('json', http11_only=True)
+    assert session.headers['Accept'] == 'application/json'
+    assert session._disable_http2  # ruff:ignore[private-member-access]
+
+
 def test_session_init_default() -> None:
     session = session_init('')
     assert session.headers['timeout'] == '30'
@@ -170,7 +261,7 @@ async def test_hash_url_success(mocker: MockerFixture) -> None:
     mock_response.raise_for_status.return_value = None
     mock_response.iter_content = mocker.AsyncMock(return_value=_iter_content())
     mocker.patch.object(session_init(''), 'get', return_value=mock_response)
-    h_blake2b, h_sha512, size = await hash_url(url)
+    h_blake2b, h_sha512, size, *_ = await hash_url(url)
     expected_blake2b = hashlib.blake2b(b'abcdef').hexdigest()
     expected_sha512 = hashlib.sha512(b'abcdef').hexdigest()
     assert h_blake2b == expected_blake2b
@@ -182,7 +273,7 @@ async def test_hash_url_success(mocker: MockerFixture) -> None:
 async def test_hash_url_request_exception(mocker: MockerFixture) -> None:
     url = 'https://example.com/file.txt'
     mocker.patch.object(session_init(''), 'get', side_effect=niquests.RequestException('fail'))
-    h_blake2b, h_sha512, size = await hash_url(url)
+    h_blake2b, h_sha512, size, *_ = await hash_url(url)
     assert not h_blake2b
     assert not h_sha512
     assert size == 0
@@ -200,9 +291,9 @@ async def test_hash_url_with_headers_and_params(mocker: MockerFixture) -> None:
     mock_response.raise_for_status.return_value = None
     mock_response.iter_content = mocker.AsyncMock(return_value=_iter_content())
     mocker.patch.object(session_init(''), 'get', return_value=mock_response)
-    h_blake2b, h_sha512, size = await hash_url(url,
-                                               headers={'Referer': 'https://example.com'},
-                                               params={'key': 'value'})
+    h_blake2b, h_sha512, size, *_ = await hash_url(url,
+                                                   headers={'Referer': 'https://example.com'},
+                                                   params={'key': 'value'})
     expected_blake2b = hashlib.blake2b(b'abc').hexdigest()
     expected_sha512 = hashlib.sha512(b'abc').hexdigest()
     assert h_blake2b == expected_blake2b
@@ -211,41 +302,15 @@ async def test_hash_url_with_headers_and_params(mocker: MockerFixture) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_last_modified_success(requests_mock: NiquestsMocker) -> None:
-    url = 'https://example.com/file.txt'
-    requests_mock.head(url,
-                       headers={'last-modified': 'Wed, 21 Oct 2015 07:28:00 GMT'},
-                       status_code=HTTPStatus.OK)
-    result = await get_last_modified(url)
-    assert result == '20151021'
-
-
-@pytest.mark.asyncio
-async def test_get_last_modified_no_last_modified_header(requests_mock: NiquestsMocker) -> None:
-    url = 'https://example.com/file.txt'
-    requests_mock.head(url, status_code=HTTPStatus.OK)
-    result = await get_last_modified(url)
-    assert not result
-
-
-@pytest.mark.asyncio
-async def test_get_last_modified_request_exception(mocker: MockerFixture) -> None:
-    url = 'https://example.com/file.txt'
-    mocker.patch.object(session_init(''), 'head', side_effect=niquests.RequestException('fail'))
-    result = await get_last_modified(url)
-    assert not result
-
-
-@pytest.mark.asyncio
-async def test_get_last_modified_with_headers_and_params(requests_mock: NiquestsMocker) -> None:
-    url = 'https://example.com/file.txt'
-    requests_mock.head(re.compile(r'https://example\.com/file\.txt'),
-                       headers={'last-modified': 'Wed, 21 Oct 2015 07:28:00 GMT'},
-                       status_code=HTTPStatus.OK)
-    result = await get_last_modified(url,
-                                     headers={'Referer': 'https://example.com'},
-                                     params={'key': 'value'})
-    assert result == '20151021'
+async def test_probe_latency(requests_mock: NiquestsMocker) -> None:
+    requests_mock.head('https://up.example.com/', status_code=HTTPStatus.MOVED_PERMANENTLY)
+    requests_mock.head('https://private.example.com/', status_code=HTTPStatus.FORBIDDEN)
+    requests_mock.head('https://down.example.com/', status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+    latency = await probe_latency('https://up.example.com/')
+    assert latency is not None
+    assert latency >= 0
+    assert await probe_latency('https://private.example.com/') is not None
+    assert await probe_latency('https://down.example.com/') is None
 
 
 @pytest.mark.asyncio
@@ -294,7 +359,7 @@ async def test_hash_url_raise_for_status_exception(mocker: MockerFixture) -> Non
     mock_response = mocker.MagicMock()
     mock_response.raise_for_status.side_effect = niquests.RequestException('bad status')
     mocker.patch.object(session_init(''), 'get', return_value=mock_response)
-    h_blake2b, h_sha512, size = await hash_url(url)
+    h_blake2b, h_sha512, size, *_ = await hash_url(url)
     assert not h_blake2b
     assert not h_sha512
     assert size == 0
@@ -320,7 +385,7 @@ async def test_hash_url_skips_empty_chunks(mocker: MockerFixture) -> None:
     mock_response.raise_for_status.return_value = None
     mock_response.iter_content = mocker.AsyncMock(return_value=_iter_content())
     mocker.patch.object(session_init(''), 'get', return_value=mock_response)
-    h_blake2b, h_sha512, size = await hash_url(url)
+    h_blake2b, h_sha512, size, *_ = await hash_url(url)
     expected_blake2b = hashlib.blake2b(b'abcdef').hexdigest()
     expected_sha512 = hashlib.sha512(b'abcdef').hexdigest()
     assert h_blake2b == expected_blake2b
@@ -334,3 +399,199 @@ async def test_get_content_atom_url(requests_mock: NiquestsMocker) -> None:
     requests_mock.get(url, text='<feed></feed>', status_code=HTTPStatus.OK)
     r = await get_content(url)
     assert r.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_get_content_falls_back_to_http11_on_protocol_error(mocker: MockerFixture) -> None:
+    error = niquests.ConnectionError(ProtocolError('invalid HTTP/2 frame'))
+    send = mocker.patch.object(session_init('pypi'), 'send', side_effect=error)
+    ok = _response('{}')
+    fallback = mocker.patch.object(session_init('pypi', http11_only=True), 'send', return_value=ok)
+    assert await get_content('https://pypi.org/pypi/foo/json') is ok
+    assert await get_content('https://pypi.org/pypi/bar/json') is ok
+    send.assert_called_once()
+    assert fallback.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_content_no_fallback_on_other_connection_errors(mocker: MockerFixture) -> None:
+    mocker.patch.object(session_init(''),
+                        'send',
+                        side_effect=niquests.ConnectionError(OSError('refused')))
+    fallback = mocker.patch.object(session_init('', http11_only=True), 'send')
+    r = await get_content('https://example.com/')
+    assert r.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    fallback.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_close_sessions_logs_connection_stats(mocker: MockerFixture) -> None:
+    stats = mocker.patch('livecheck.utils.requests.connection_stats')
+    await close_sessions()
+    stats.log_summary.assert_called_once_with()
+    stats.clear.assert_called_once_with()
+
+
+async def _read(url: str,
+                *,
+                max_size: int = DEFAULT_MAX_BODY_SIZE,
+                chunk_size: int = 65536) -> list[str]:
+    return [chunk async for chunk in stream_text(url, max_size=max_size, chunk_size=chunk_size)]
+
+
+@pytest.mark.asyncio
+async def test_stream_text(requests_mock: NiquestsMocker) -> None:
+    url = 'https://example.com/CHANGELOG.md'
+    requests_mock.get(url,
+                      content='# Über\n'.encode() * 3,
+                      headers={'Content-Type': 'text/markdown; charset=utf-8'})
+    assert ''.join(await _read(url, chunk_size=4)) == '# Über\n' * 3
+
+
+@pytest.mark.asyncio
+async def test_stream_text_stops_at_max_size(requests_mock: NiquestsMocker) -> None:
+    url = 'https://example.com/big.html'
+    requests_mock.get(url, content=b'a' * 100)
+    assert ''.join(await _read(url, max_size=10, chunk_size=4)) == 'a' * 10
+
+
+@pytest.mark.asyncio
+async def test_stream_text_from_http_cache(mocker: MockerFixture) -> None:
+    request = mocker.patch('niquests_cache.AsyncCachedSession.request',
+                           return_value=_response('cached body'))
+    assert await _read('https://example.com/cached', chunk_size=4) == ['cach', 'ed b', 'ody']
+    assert request.call_args.kwargs['stream'] is True
+
+
+@pytest.mark.asyncio
+async def test_stream_text_errors(requests_mock: NiquestsMocker, mocker: MockerFixture) -> None:
+    url = 'https://example.com/missing'
+    requests_mock.get(url, status_code=HTTPStatus.NOT_FOUND, content=b'not found')
+    assert not await _read(url)
+    mocker.patch.object(session_init(''), 'send', side_effect=niquests.ConnectionError('down'))
+    assert not await _read('https://example.com/down')
+
+
+@pytest.mark.asyncio
+async def test_get_validators(requests_mock: NiquestsMocker, mocker: MockerFixture) -> None:
+    url = 'https://example.com/foo.tar.gz'
+    requests_mock.head(url,
+                       headers={
+                           'ETag': '"v1"',
+                           'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+                           'Content-Length': '1234'
+                       })
+    validators = await get_validators(url)
+    assert validators == Validators('"v1"', 'Wed, 21 Oct 2015 07:28:00 GMT', '1234')
+    requests_mock.head(url, status_code=HTTPStatus.NOT_MODIFIED)
+    head = mocker.spy(session_init(''), 'head')
+    assert await get_validators(url, known=validators) is validators
+    assert head.call_args.kwargs['headers'] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': validators.last_modified
+    }
+    requests_mock.head(url, status_code=HTTPStatus.METHOD_NOT_ALLOWED)
+    assert await get_validators(url) is None
+
+
+@pytest.mark.asyncio
+async def test_get_validators_errors(mocker: MockerFixture) -> None:
+    mocker.patch.object(session_init(''), 'head', side_effect=niquests.ConnectionError('down'))
+    assert await get_validators('https://example.com/foo.tar.gz') is None
+
+
+def test_validators_matches() -> None:
+    known = Validators('"v1"', 'Wed, 21 Oct 2015 07:28:00 GMT', '1234')
+    assert known.matches(known._replace(last_modified='Thu, 22 Oct 2015 07:28:00 GMT'))
+    assert known.matches(known._replace(content_length=''))
+    assert not known.matches(known._replace(etag='"v2"'))
+    assert not known.matches(known._replace(content_length='1'))
+    assert Validators(last_modified='a').matches(Validators(last_modified='a'))
+    assert not Validators(last_modified='a').matches(Validators(last_modified='b'))
+    assert not Validators().matches(Validators())
+
+
+@pytest.mark.asyncio
+async def test_hash_url_waits_for_workers(mocker: MockerFixture) -> None:
+    chunks = [bytes([i]) * 1000 for i in range(50)]
+
+    async def _body(**_: object) -> AsyncGenerator[bytes]:  # ruff:ignore[unused-async]
+        for chunk in chunks:
+            yield chunk
+
+    mocker.patch('livecheck.utils.requests.HASH_QUEUE_SIZE', 1)
+    mock_response = mocker.MagicMock()
+    mock_response.iter_content = mocker.AsyncMock(return_value=_body())
+    mocker.patch.object(session_init(''), 'get', return_value=mock_response)
+    body = b''.join(chunks)
+    assert (await
+            hash_url('https://example.com/file.txt'))[:3] == (hashlib.blake2b(body).hexdigest(),
+                                                              hashlib.sha512(body).hexdigest(),
+                                                              50000)
+
+
+@pytest.mark.asyncio
+async def test_hash_url_stream_error(mocker: MockerFixture) -> None:
+    async def _body(**_: object) -> AsyncGenerator[bytes]:  # ruff:ignore[unused-async]
+        yield b'abc'
+        raise niquests.ConnectionError
+
+    mock_response = mocker.MagicMock()
+    mock_response.iter_content = mocker.AsyncMock(return_value=_body())
+    mocker.patch.object(session_init(''), 'get', return_value=mock_response)
+    assert await hash_url('https://example.com/file.txt') == HashedURL()
+
+
+@pytest.mark.asyncio
+async def test_hash_url_write_error(requests_mock: NiquestsMocker, tmp_path: Path,
+                                    mocker: MockerFixture) -> None:
+    url = 'https://example.com/foo.tar.gz'
+    requests_mock.get(url, content=b'abcdef')
+    out = mocker.MagicMock()
+    out.write.side_effect = OSError('No space left on device')
+    mocker.patch('pathlib.Path.open', return_value=out)
+    assert await hash_url(url, save_to=tmp_path / 'foo.tar.gz') == HashedURL()
+    out.close.assert_called_once_with()
+    assert [p async for p in AnyioPath(tmp_path).iterdir()] == []
+
+
+@pytest.mark.asyncio
+async def test_hash_url_saves_body(requests_mock: NiquestsMocker, tmp_path: Path) -> None:
+    url = 'https://example.com/foo.tar.gz'
+    requests_mock.get(url,
+                      content=b'abcdef',
+                      headers={
+                          'ETag': '"v1"',
+                          'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'
+                      })
+    hashed = await hash_url(url, save_to=tmp_path / 'foo.tar.gz')
+    assert hashed.blake2b == hashlib.blake2b(b'abcdef').hexdigest()
+    assert hashed.sha512 == hashlib.sha512(b'abcdef').hexdigest()
+    assert hashed.size == 6
+    assert hashed.url == url
+    assert hashed.validators.etag == '"v1"'
+    assert hashed.validators.last_modified_date == '20151021'
+    assert [p.name async for p in AnyioPath(tmp_path).iterdir()] == ['foo.tar.gz']
+    assert await AnyioPath(tmp_path / 'foo.tar.gz').read_bytes() == b'abcdef'
+
+
+@pytest.mark.asyncio
+async def test_hash_url_keeps_old_file_on_error(requests_mock: NiquestsMocker,
+                                                tmp_path: Path) -> None:
+    url = 'https://example.com/foo.tar.gz'
+    requests_mock.get(url, status_code=HTTPStatus.NOT_FOUND)
+    await AnyioPath(tmp_path / 'foo.tar.gz').write_bytes(b'old')
+    assert await hash_url(url, save_to=tmp_path / 'foo.tar.gz') == HashedURL()
+    assert [p.name async for p in AnyioPath(tmp_path).iterdir()] == ['foo.tar.gz']
+    assert await AnyioPath(tmp_path / 'foo.tar.gz').read_bytes() == b'old'
+    requests_mock.get(url, content=b'new')
+    assert await hash_url(url, save_to=tmp_path / 'missing' / 'foo.tar.gz') == HashedURL()
+
+
+def test_init_sessions_resets_registered_run_state(mocker: MockerFixture) -> None:
+    reset = mocker.Mock()
+    mocker.patch('livecheck.utils.requests._run_state_resets', [])
+    register_run_state(reset)
+    init_sessions(asyncio.Semaphore(1))
+    init_sessions(asyncio.Semaphore(1))
+    assert reset.call_count == 2
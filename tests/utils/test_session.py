@@ -1,18 +1,32 @@
-# ruff:file-ignore[raw-string-in-exception, mutable-class-default, float-equality-comparison, private-member-access]
+# ruff:file-ignore[raw-string-in-exception, mutable-class-default, float-equality-comparison, private-member-access, builtin-argument-shadowing]
 from __future__ import annotations
 
+from datetime import timedelta
 from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from time import time
 from typing import TYPE_CHECKING, Any, cast
 from unittest.mock import AsyncMock
 import asyncio
-
-from livecheck.utils.session import build_github_session, build_retry, build_session
+import threading
+
+from livecheck.utils.session import (
+    HTTP11_ONLY,
+    ConnectionStats,
+    ProtocolPolicy,
+    build_github_session,
+    build_retry,
+    build_session,
+    protocol_policy,
+)
+import niquests
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from _pytest.logging import LogCaptureFixture
     from pytest_mock import MockerFixture
-    import niquests
 
 
 def test_build_retry_returns_retry_with_expected_status_codes() -> None:
@@ -327,6 +341,8 @@ async def test_github_session_handles_response_with_unreadable_body(mocker: Mock
     class _BadTextResponse:
         status_code = HTTPStatus.FORBIDDEN
         headers: dict[str, Any] = {}
+        content = b''
+        request = None
 
         @property
         def text(self) -> str:
@@ -342,3 +358,82 @@ async def test_github_session_handles_response_with_unreadable_body(mocker: Mock
     result = await session.request('GET', 'https://api.github.com/test')
     assert result.status_code == HTTPStatus.FORBIDDEN
     assert mock_request.call_count == 1
+
+
+def test_protocol_policy() -> None:
+    assert protocol_policy('api.github.com') == ProtocolPolicy(http2=True, http3=False)
+    assert protocol_policy('pypi.org') == ProtocolPolicy(http2=True, http3=False)
+    assert protocol_policy('example.org') == ProtocolPolicy(http2=True, http3=True)
+
+
+def test_build_session_applies_protocol_policy() -> None:
+    sem = asyncio.Semaphore(1)
+    assert not build_session(sem)._disable_http3
+    session = build_session(sem, HTTP11_ONLY)
+    assert session._disable_http2
+    assert session._disable_http3
+    github = build_github_session(sem)
+    assert not github._disable_http2
+    assert github._disable_http3
+
+
+def _response(mocker: MockerFixture, url: str, established: timedelta | None,
+              version: str) -> niquests.Response:
+    conn_info = None if established is None else mocker.Mock(
+        established_latency=established, http_version=mocker.Mock(value=version))
+    return cast('niquests.Response', mocker.Mock(url=url, conn_info=conn_info))
+
+
+def test_connection_stats_record(mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+    stats = ConnectionStats()
+    stats.record(_response(mocker, 'https://pypi.org/a', timedelta(milliseconds=20), 'HTTP/2.0'))
+    stats.record(_response(mocker, 'https://pypi.org/b', timedelta(0), 'HTTP/2.0'))
+    stats.record(_response(mocker, 'https://pypi.org/c', timedelta(0), 'HTTP/2.0'))
+    stats.record(_response(mocker, 'https://example.org/', None, ''))
+    pypi = stats.hosts['pypi.org']
+    assert (pypi.requests, pypi.connections, pypi.reused) == (3, 1, 2)
+    assert pypi.versions == {'HTTP/2.0': 3}
+    assert (stats.hosts['example.org'].requests, stats.hosts['example.org'].connections) == (1, 0)
+    caplog.set_level('DEBUG', logger='livecheck.utils.session')
+    stats.log_summary()
+    assert 'pypi.org: 3 requests over 1 new connections (2 reused); HTTP/2.0=3.' in caplog.text
+    assert 'example.org: 1 requests over 0 new connections (1 reused); n/a.' in caplog.text
+    stats.clear()
+    assert not stats.hosts
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def keep_alive_server() -> Iterator[str]:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_connection_stats_counts_pooled_connections(keep_alive_server: str) -> None:
+    stats = ConnectionStats()
+    hooks = {'response': [stats.record]}
+    async with niquests.AsyncSession(hooks=hooks) as session:  # type: ignore[arg-type]
+        for _ in range(3):
+            (await session.get(f'{keep_alive_server}/')).raise_for_status()
+    host = stats.hosts['127.0.0.1']
+    assert (host.requests, host.connections) == (3, 1)
+    assert host.versions == {'HTTP/1.1': 3}
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+import re
+
 from livecheck.utils.string import (
     InvalidPackageName,
     dash_to_underscore,
     dotize,
     extract_sha,
     is_sha,
+    iter_matches,
     parse_npm_package_name,
     prefix_v,
 )
 import pytest
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 
 def test_parse_npm_package_name_scoped() -> None:
     result = parse_npm_package_name('@scope/pkg@1.2.3')
@@ -272,3 +279,30 @@ def test_is_sha_non_hex_sha() -> None:
     sha = 'zzzzzzz'
     url = f'https://example.com/commit/{sha}'
     assert is_sha(url) == 0
+
+
+async def _chunks(*chunks: str) -> AsyncIterator[str]:  # ruff:ignore[unused-async]
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_matches_across_chunks() -> None:
+    pattern = re.compile(r'v(\d+\.\d+)')
+    chunks = _chunks('v1.0 v1', '.1', ' ' * 20, 'v2.', '0 v3.0')
+    assert [m[1]
+            async for m in iter_matches(chunks, pattern, window=8)] == ['1.0', '1.1', '2.0', '3.0']
+
+
+@pytest.mark.asyncio
+async def test_iter_matches_keeps_anchors() -> None:
+    pattern = re.compile(r'^## (\S+)', re.MULTILINE)
+    chunks = _chunks('## 2.0\n', 'x ## 1.5\n#', '# 1.0\n', '\n' * 10)
+    assert [m[1] async for m in iter_matches(chunks, pattern, window=4)] == ['2.0', '1.0']
+    chunks = _chunks('abc', 'abc', 'abc')
+    assert [m.group() async for m in iter_matches(chunks, re.compile(r'^abc'), window=1)] == ['abc']
+
+
+@pytest.mark.asyncio
+async def test_iter_matches_no_text() -> None:
+    assert not [m async for m in iter_matches(_chunks(), re.compile(r'.*'))]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from defusedxml import (
+    DefusedXmlException,
+    ElementTree as ET,  # ruff:ignore[camelcase-imported-as-acronym]
+)
+from livecheck.utils.requests import stream_text
+from livecheck.utils.xml_stream import ElementStream, iter_elements
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from tests.conftest import NiquestsMocker
+
+FEED = ('<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>'
+        '<entry><id>1</id><updated>2024-06-01</updated></entry>'
+        '<entry><id>2</id></entry></feed>')
+ENTRY = '{http://www.w3.org/2005/Atom}entry'
+
+
+async def _chunks(text: str, size: int) -> AsyncIterator[str]:  # ruff:ignore[unused-async]
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def test_element_stream() -> None:
+    stream = ElementStream(ENTRY)
+    assert not stream.feed(FEED[:100])
+    entries = stream.feed(FEED[100:])
+    assert [e.findtext('{http://www.w3.org/2005/Atom}id') for e in entries] == ['1', '2']
+    assert not stream.close()
+
+
+def test_element_stream_refuses_entities() -> None:
+    with pytest.raises(DefusedXmlException):
+        ElementStream('a').feed('<!DOCTYPE a [<!ENTITY e "x">]><a>&e;</a>')
+
+
+@pytest.mark.asyncio
+async def test_iter_elements() -> None:
+    ids = [
+        e.findtext('{http://www.w3.org/2005/Atom}id')
+        async for e in iter_elements(_chunks(FEED, 7), ENTRY)
+    ]
+    assert ids == ['1', '2']
+
+
+@pytest.mark.asyncio
+async def test_iter_elements_clears_previous_element() -> None:
+    elements = [e async for e in iter_elements(_chunks(FEED, 7), ENTRY)]
+    assert [len(e) for e in elements] == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_iter_elements_empty() -> None:
+    assert [e async for e in iter_elements(_chunks('', 1), ENTRY)] == []
+
+
+@pytest.mark.asyncio
+async def test_iter_elements_parse_error() -> None:
+    elements = iter_elements(_chunks('<a><b/><b></a>', 4), 'b')
+    assert (await anext(elements)).tag == 'b'
+    with pytest.raises(ET.ParseError):
+        await anext(elements)
+
+
+@pytest.mark.asyncio
+async def test_iter_elements_truncated(requests_mock: NiquestsMocker) -> None:
+    url = 'https://example.com/feed.atom'
+    requests_mock.get(url, text=FEED)
+    body = stream_text(url, max_size=FEED.index('<entry><id>2'))
+    ids = [e.findtext('{http://www.w3.org/2005/Atom}id') async for e in iter_elements(body, ENTRY)]
+    assert ids == ['1']